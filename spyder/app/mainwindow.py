@@ -897,6 +897,7 @@ class MainWindow(QMainWindow):
         from spyder.plugins.projects import Projects
         self.projects = Projects(self)
         self.projects.register_plugin()
+        self.projects.sig_file_list_updated.connect(self.update_fileswitcher)
         self.project_path = self.projects.get_pythonpath(at_start=True)
 
         # Find in files
@@ -2765,10 +2766,19 @@ class MainWindow(QMainWindow):
             self.fileswitcher.plugin = self.editor
         else:
             self.fileswitcher.set_search_text('')
+        if self.projects is not None:
+            self.fileswitcher.set_project_files(self.projects.get_file_list())
+            self.projects.update_file_list()
         self.fileswitcher.setup()
         self.fileswitcher.show()
         self.fileswitcher.is_visible = True
 
+    def update_fileswitcher(self):
+        """Update the File Switcher list if it's visible."""
+        if (self.fileswitcher is not None and self.fileswitcher.is_visible
+                and self.fileswitcher.mode == self.fileswitcher.FILE_MODE):
+            self.fileswitcher.setup()
+
     def open_symbolfinder(self):
         """Open symbol list management dialog box."""
         self.open_fileswitcher(symbol=True)
@@ -2782,6 +2792,8 @@ class MainWindow(QMainWindow):
             self.fileswitcher.sig_goto_file.connect(
                     plugin.get_current_tab_manager().set_stack_index
                 )
+            self.fileswitcher.sig_open_file.connect(
+                    lambda fname, line: self.editor.load(fname, goto=line))
         else:
             self.fileswitcher.add_plugin(plugin, tabs, data, icon)
             self.fileswitcher.sig_goto_file.connect(
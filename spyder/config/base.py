@@ -401,6 +401,11 @@ def get_supported_types():
         editable_types.append(Image.Image)
     except ImportError:
         pass
+    # HDF5 datasets are viewed without loading them, but only if h5py is
+    # already imported (importing it is slow and can freeze Spyder)
+    h5py = sys.modules.get('h5py')
+    if h5py is not None:
+        editable_types.append(h5py.Dataset)
     return dict(picklable=picklable_types, editable=editable_types)
 
 # Variable explorer display / check all elements data types for sequences:
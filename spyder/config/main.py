@@ -118,6 +118,7 @@ DEFAULTS = [
             ('internal_console',
              {
               'max_line_count': 300,
+              'throughput_mode': True,
               'working_dir_history': 30,
               'working_dir_adjusttocontents': False,
               'wrap': True,
@@ -136,6 +137,7 @@ DEFAULTS = [
               'umr/enabled': True,
               'umr/verbose': True,
               'umr/namelist': [],
+              'umr/incremental': False,
               }),
             ('ipython_console',
              {
@@ -161,7 +163,8 @@ DEFAULTS = [
               'in_prompt': '',
               'out_prompt': '',
               'light_color': True,
-              'dark_color': False
+              'dark_color': False,
+              'spare_kernels': 1
               }),
             ('variable_explorer',
              {
@@ -278,6 +281,7 @@ DEFAULTS = [
               'search_text_samples': [codeanalysis.TASKS_PATTERN],
               'in_python_path': False,
               'more_options': False,
+              'max_results': 1000,
               }),
             ('workingdir',
              {
@@ -637,15 +641,19 @@ DEFAULTS = [
 # 3. You don't need to touch this value if you're just adding a new option
 CONF_VERSION = '39.0.0'
 
+# Changes done within this number of seconds are saved together, so that
+# setting many options doesn't write the .ini file each time
+SAVE_DELAY = 1
+
 # Main configuration instance
 try:
     CONF = UserConfig('spyder', defaults=DEFAULTS, load=(not TEST),
                       version=CONF_VERSION, subfolder=SUBFOLDER, backup=True,
-                      raw_mode=True)
+                      raw_mode=True, save_delay=SAVE_DELAY)
 except:
     CONF = UserConfig('spyder', defaults=DEFAULTS, load=False,
                       version=CONF_VERSION, subfolder=SUBFOLDER, backup=True,
-                      raw_mode=True)
+                      raw_mode=True, save_delay=SAVE_DELAY)
 
 # Removing old .spyder.ini location:
 old_location = osp.join(get_home_dir(), '.spyder.ini')
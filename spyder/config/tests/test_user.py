@@ -47,6 +47,35 @@ def test_userconfig_set_with_string(userconfig):
         expected += "[section]\noption = new value\n\n"
     assert iniContents == expected
 
+def test_userconfig_cached_values(userconfig):
+    userconfig.set('section', 'list', [1, 2])
+    value = userconfig.get('section', 'list')
+    assert value == [1, 2]
+    # Cached values can be modified by callers without affecting others
+    value.append(3)
+    assert userconfig.get('section', 'list') == [1, 2]
+    userconfig.set('section', 'list', [4])
+    assert userconfig.get('section', 'list') == [4]
+    userconfig.set_default('main', 'option', 5)
+    assert userconfig.get_default('main', 'option') == 5
+    userconfig.remove_option('section', 'list')
+    assert userconfig.get('section', 'list', default=6) == 6
+
+def test_userconfig_delayed_save(tmpdir, monkeypatch):
+    monkeypatch.setattr('spyder.config.user.get_conf_path', lambda: str(tmpdir))
+    userconfig = UserConfig('foo', defaults={'option': 0}, subfolder=True,
+                            version='1.0.0', raw_mode=True, save_delay=60)
+    num_saves = userconfig.get_stats()['num_saves']
+    for value in range(10):
+        userconfig.set('main', 'option', value)
+    assert userconfig.get_stats()['num_saves'] == num_saves
+    userconfig.sync()
+    assert userconfig.get_stats()['num_saves'] == num_saves + 1
+    with open(userconfig.filename()) as inifile:
+        assert 'option = 9' in inifile.read()
+    userconfig.sync()
+    assert userconfig.get_stats()['num_saves'] == num_saves + 1
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -14,10 +14,13 @@ from __future__ import print_function
 
 # Std imports
 import ast
+import atexit
+import copy
 import os
 import re
 import os.path as osp
 import shutil
+import threading
 import time
 
 # Local imports
@@ -25,7 +28,8 @@ from spyder.config.base import (get_conf_path, get_home_dir,
                                 get_module_source_path, TEST)
 from spyder.utils.programs import check_version
 from spyder.py3compat import configparser as cp
-from spyder.py3compat import PY2, is_text_string, to_text_string
+from spyder.py3compat import (PY2, NUMERIC_TYPES, TEXT_TYPES, is_text_string,
+                              to_text_string)
 
 # Std imports for Python 2
 if PY2:
@@ -39,6 +43,10 @@ class NoDefault:
     pass
 
 
+# Types of the values that can be returned from the cache without a copy
+IMMUTABLE_TYPES = TEXT_TYPES + NUMERIC_TYPES + (bool, type(None))
+
+
 #==============================================================================
 # Defaults class
 #==============================================================================
@@ -51,6 +59,7 @@ class DefaultsConfig(cp.ConfigParser):
         cp.ConfigParser.__init__(self)
         self.name = name
         self.subfolder = subfolder
+        self.num_saves = 0
 
     def _write(self, fp):
         """
@@ -98,14 +107,23 @@ class DefaultsConfig(cp.ConfigParser):
         fname = self.filename()
 
         def _write_file(fname):
+            # Write to a temporary file first, so that the file is never
+            # left half written
+            tmp_fname = fname + '.tmp'
             if PY2:
                 # Python 2
-                with codecs.open(fname, 'w', encoding='utf-8') as configfile:
+                with codecs.open(tmp_fname, 'w',
+                                 encoding='utf-8') as configfile:
                     self._write(configfile)
+                if os.name == 'nt' and osp.isfile(fname):
+                    os.remove(fname)
+                os.rename(tmp_fname, fname)
             else:
                 # Python 3
-                with open(fname, 'w', encoding='utf-8') as configfile:
+                with open(tmp_fname, 'w', encoding='utf-8') as configfile:
                     self.write(configfile)
+                os.replace(tmp_fname, fname)
+            self.num_saves += 1
 
         try: # the "easy" way
             _write_file(fname)
@@ -174,21 +192,34 @@ class UserConfig(DefaultsConfig):
               *or* list of tuples (section_name, options)
     version: version of the configuration file (X.Y.Z format)
     subfolder: configuration file will be saved in %home%/subfolder/%name%.ini
+    save_delay: if not None, changes are saved at most once every save_delay
+                seconds (pending changes are saved at exit or by 'sync')
     
     Note that 'get' and 'set' arguments number and type
     differ from the overriden methods
+
+    Values are parsed once and kept in memory until they change.
     """
     DEFAULT_SECTION_NAME = 'main'
     def __init__(self, name, defaults=None, load=True, version=None,
                  subfolder=None, backup=False, raw_mode=False,
-                 remove_obsolete=False):
+                 remove_obsolete=False, save_delay=None):
+        start_time = time.time()
         DefaultsConfig.__init__(self, name, subfolder)
         self.raw = 1 if raw_mode else 0
+        self.save_delay = save_delay
+        self._save_timer = None
+        self._lock = threading.RLock()
+        # Parsed values and default values, by (section, option)
+        self._values = {}
+        self._default_values = {}
+        self._default_sections = set()
         if (version is not None) and (re.match('^(\d+).(\d+).(\d+)$', version) is None):
             raise ValueError("Version number %r is incorrect - must be in X.Y.Z format" % version)
         if isinstance(defaults, dict):
             defaults = [ (self.DEFAULT_SECTION_NAME, defaults) ]
         self.defaults = defaults
+        self._index_defaults()
         if defaults is not None:
             self.reset_to_defaults(save=False)
         fname = self.filename()
@@ -224,7 +255,57 @@ class UserConfig(DefaultsConfig):
             if defaults is None:
                 # If no defaults are defined, set .ini file settings as default
                 self.set_as_defaults()
-        
+        if save_delay is not None:
+            atexit.register(self.sync)
+        self.load_time = time.time() - start_time
+
+    def get_stats(self):
+        """Return a dict with the time taken to load the config and the
+        number of times it was saved"""
+        return dict(load_time=self.load_time, num_saves=self.num_saves)
+
+    def _save(self):
+        """
+        Save config into the associated .ini file
+
+        If saves are delayed, the file is saved save_delay seconds after the
+        first change, together with the changes done in the meantime
+        """
+        with self._lock:
+            if self.save_delay is None:
+                DefaultsConfig._save(self)
+            elif self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.sync)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def sync(self):
+        """Save the pending changes, if any, into the associated .ini file"""
+        with self._lock:
+            if self._save_timer is None:
+                return
+            self._save_timer.cancel()
+            self._save_timer = None
+            DefaultsConfig._save(self)
+
+    def _set(self, section, option, value, verbose):
+        """
+        Private set method
+        """
+        with self._lock:
+            self._values.pop((section, option), None)
+            DefaultsConfig._set(self, section, option, value, verbose)
+
+    def _index_defaults(self):
+        """Index default values by (section, option)"""
+        self._default_values = {}
+        self._default_sections = set()
+        for section, options in self.defaults or []:
+            self._default_sections.add(section)
+            for option in options:
+                self._default_values.setdefault((section, option),
+                                                options[option])
+
     def get_version(self, version='0.0.0'):
         """Return configuration (not application!) version"""
         return self.get(self.DEFAULT_SECTION_NAME, 'version', version)
@@ -237,6 +318,7 @@ class UserConfig(DefaultsConfig):
         """
         Load config from the associated .ini file
         """
+        self._values = {}
         try:
             if PY2:
                 # Python 2
@@ -317,6 +399,8 @@ class UserConfig(DefaultsConfig):
             for option, value in self.items(section, raw=self.raw):
                 secdict[option] = value
             self.defaults.append( (section, secdict) )
+        self._index_defaults()
+        self._values = {}
 
     def reset_to_defaults(self, save=True, verbose=False, section=None):
         """
@@ -348,12 +432,7 @@ class UserConfig(DefaultsConfig):
         -> useful for type checking in 'get' method
         """
         section = self._check_section_option(section, option)
-        for sec, options in self.defaults:
-            if sec == section:
-                if option in options:
-                    return options[ option ]
-        else:
-            return NoDefault
+        return self._default_values.get((section, option), NoDefault)
                 
     def get(self, section, option, default=NoDefault):
         """
@@ -363,6 +442,10 @@ class UserConfig(DefaultsConfig):
         will be raised if option doesn't exist)
         """
         section = self._check_section_option(section, option)
+        try:
+            return self._copy_value(self._values[(section, option)])
+        except KeyError:
+            pass
 
         if not self.has_section(section):
             if default is NoDefault:
@@ -405,7 +488,14 @@ class UserConfig(DefaultsConfig):
                 value = ast.literal_eval(value)
             except (SyntaxError, ValueError):
                 pass
-        return value
+        self._values[(section, option)] = value
+        return self._copy_value(value)
+
+    def _copy_value(self, value):
+        """Copy a cached value, if it can be modified by the caller"""
+        if isinstance(value, IMMUTABLE_TYPES):
+            return value
+        return copy.deepcopy(value)
 
     def set_default(self, section, option, default_value):
         """
@@ -416,6 +506,9 @@ class UserConfig(DefaultsConfig):
         for sec, options in self.defaults:
             if sec == section:
                 options[ option ] = default_value
+        if section in self._default_sections:
+            self._default_values[(section, option)] = default_value
+        self._values.pop((section, option), None)
 
     def set(self, section, option, value, verbose=False, save=True):
         """
@@ -445,9 +538,13 @@ class UserConfig(DefaultsConfig):
             self._save()
             
     def remove_section(self, section):
-        cp.ConfigParser.remove_section(self, section)
+        with self._lock:
+            self._values = {}
+            cp.ConfigParser.remove_section(self, section)
         self._save()
             
     def remove_option(self, section, option):
-        cp.ConfigParser.remove_option(self, section, option)
+        with self._lock:
+            self._values.pop((section, option), None)
+            cp.ConfigParser.remove_option(self, section, option)
         self._save()
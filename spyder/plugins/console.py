@@ -60,6 +60,7 @@ class Console(SpyderPluginWidget):
                                    self.get_plugin_font(), exitfunc, profile,
                                    multithreaded,
                                    light_background=light_background)
+        self.shell.set_throughput_mode(self.get_option('throughput_mode'))
         self.shell.status.connect(lambda msg: self.show_message.emit(msg, 0))
         self.shell.go_to_error.connect(self.go_to_error)
         self.shell.focus_changed.connect(lambda: self.focus_changed.emit())
@@ -156,6 +157,13 @@ class Console(SpyderPluginWidget):
                             _("Buffer..."), None,
                             tip=_("Set maximum line count"),
                             triggered=self.change_max_line_count)
+        throughput_action = create_action(self,
+                            _("Drop lines exceeding the buffer"),
+                            tip=_("Skip output lines that don't fit in the "
+                                  "buffer when they are printed faster than "
+                                  "they can be shown"),
+                            toggled=self.toggle_throughput_mode)
+        throughput_action.setChecked(self.get_option('throughput_mode'))
         exteditor_action = create_action(self,
                             _("External editor path..."), None, None,
                             _("Set external editor executable path"),
@@ -179,9 +187,10 @@ class Console(SpyderPluginWidget):
         
         option_menu = QMenu(_('Internal console settings'), self)
         option_menu.setIcon(ima.icon('tooloptions'))
-        add_actions(option_menu, (buffer_action, wrap_action,
-                                  calltips_action, codecompletion_action,
-                                  codecompenter_action, exteditor_action))
+        add_actions(option_menu, (buffer_action, throughput_action,
+                                  wrap_action, calltips_action,
+                                  codecompletion_action, codecompenter_action,
+                                  exteditor_action))
                     
         plugin_actions = [None, run_action, environ_action, syspath_action,
                           option_menu, None, quit_action]
@@ -344,6 +353,12 @@ class Console(SpyderPluginWidget):
         self.shell.toggle_wrap_mode(checked)
         self.set_option('wrap', checked)
     
+    @Slot(bool)
+    def toggle_throughput_mode(self, checked):
+        """Toggle throughput mode"""
+        self.shell.set_throughput_mode(checked)
+        self.set_option('throughput_mode', checked)
+
     @Slot(bool)
     def toggle_calltips(self, checked):
         """Toggle calltips"""
@@ -41,8 +41,8 @@ from spyder.utils import icon_manager as ima
 from spyder.utils.introspection.manager import IntrospectionManager
 from spyder.utils.qthelpers import create_action, add_actions, MENU_SEPARATOR
 from spyder.widgets.findreplace import FindReplace
-from spyder.widgets.editor import (EditorMainWindow, EditorSplitter,
-                                   EditorStack, Printer)
+from spyder.widgets.editor import (close_analysis_pool, EditorMainWindow,
+                                   EditorSplitter, EditorStack, Printer)
 from spyder.widgets.sourcecode.codeeditor import CodeEditor
 from spyder.widgets.status import (CursorPositionStatus, EncodingStatus,
                                    EOLStatus, ReadWriteStatus)
@@ -383,6 +383,8 @@ class Editor(SpyderPluginWidget):
     redirect_stdio = Signal(bool)
     open_dir = Signal(str)
     breakpoints_saved = Signal()
+    # Breakpoints of the files that changed, by filename
+    breakpoints_changed = Signal(object)
     run_in_current_extconsole = Signal(str, str, str, bool, bool)
     open_file_update = Signal(str)
 
@@ -632,6 +634,7 @@ class Editor(SpyderPluginWidget):
             else:
                 for win in self.editorwindows[:]:
                     win.close()
+                close_analysis_pool()
                 return True
         except IndexError:
             return True
@@ -1372,6 +1375,8 @@ class Editor(SpyderPluginWidget):
         for editorstack in self.editorstacks:
             if str(id(editorstack)) != editorstack_id_str:
                 editorstack.file_saved_in_other_editorstack(index, filename)
+        if self.projects is not None:
+            self.projects.update_search_index_file(filename)
 
     @Slot(str, int, str)
     def file_renamed_in_data_in_editorstack(self, editorstack_id_str,
@@ -1665,6 +1670,11 @@ class Editor(SpyderPluginWidget):
             breakpoints = []
         save_breakpoints(filename, breakpoints)
         self.breakpoints_saved.emit()
+        self.breakpoints_changed.emit({filename: breakpoints})
+
+    def get_breakpoints(self):
+        """Return the breakpoints of all files, by filename"""
+        return _load_all_breakpoints()
         
     #------ File I/O
     def __load_temp_file(self):
@@ -1925,6 +1935,9 @@ class Editor(SpyderPluginWidget):
                 # (the one that can't be destroyed), then cloning this
                 # editor widget in all other editorstacks:
                 finfo = self.editorstacks[0].load(filename, set_current=False)
+                if finfo is None:
+                    # -- Closed while loading
+                    continue
                 finfo.path = self.main.get_spyder_pythonpath()
                 self._clone_file_everywhere(finfo)
                 current_editor = current_es.set_current_filename(filename,
@@ -2313,8 +2326,11 @@ class Editor(SpyderPluginWidget):
     @Slot()
     def clear_all_breakpoints(self):
         """Clear breakpoints in all files"""
+        filenames = list(_load_all_breakpoints().keys())
         clear_all_breakpoints()
         self.breakpoints_saved.emit()
+        self.breakpoints_changed.emit(dict((filename, [])
+                                           for filename in filenames))
         editorstack = self.get_current_editorstack()
         if editorstack is not None:
             for data in editorstack.data:
@@ -2325,6 +2341,8 @@ class Editor(SpyderPluginWidget):
         """Remove a single breakpoint"""
         clear_breakpoint(filename, lineno)
         self.breakpoints_saved.emit()
+        self.breakpoints_changed.emit(
+            {filename: load_breakpoints(filename)})
         editorstack = self.get_current_editorstack()
         if editorstack is not None:
             index = self.is_file_opened(filename)
@@ -52,13 +52,15 @@ class FindInFiles(SpyderPluginWidget):
         exclude_regexp = self.get_option('exclude_regexp')
         in_python_path = self.get_option('in_python_path')
         more_options = self.get_option('more_options')
+        max_results = self.get_option('max_results', 1000)
 
         self.findinfiles = FindInFilesWidget(
                                    self,
                                    search_text, search_text_regexp, search_path,
                                    exclude, exclude_idx, exclude_regexp,
                                    supported_encodings,
-                                   in_python_path, more_options)
+                                   in_python_path, more_options,
+                                   max_results)
 
         layout = QVBoxLayout()
         layout.addWidget(self.findinfiles)
@@ -273,18 +273,33 @@ class SphinxThread(QThread):
         self.context = None
         self.html_text_no_doc = html_text_no_doc
         self.math_option = False
+        self._pending = None
+        self.finished.connect(self._render_pending)
 
     def render(self, doc, context=None, math_option=False, img_path=''):
-        """Start thread to render a given documentation"""
-        # If the thread is already running wait for it to finish before
-        # starting it again.
-        if self.wait():
-            self.doc = doc
-            self.context = context
-            self.math_option = math_option
-            self.img_path = img_path
-            # This causes run() to be executed in separate thread
-            self.start()
+        """
+        Start thread to render a given documentation.
+
+        If the thread is already running, the documentation is rendered
+        when it finishes instead of the one being rendered, and replaces
+        any other documentation waiting to be rendered.
+        """
+        if self.isRunning():
+            self._pending = (doc, context, math_option, img_path)
+            return
+        self.doc = doc
+        self.context = context
+        self.math_option = math_option
+        self.img_path = img_path
+        # This causes run() to be executed in separate thread
+        self.start()
+
+    def _render_pending(self):
+        """Render the latest documentation requested while running."""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self.wait()
+            self.render(*pending)
 
     def run(self):
         html_text = self.html_text_no_doc
@@ -304,15 +319,19 @@ class SphinxThread(QThread):
                         html_text += '<div class="hr"></div>'
                         html_text += '<div id="doc-warning">%s</div>' % msg
                 except Exception as error:
-                    self.error_msg.emit(to_text_string(error))
+                    if self._pending is None:
+                        self.error_msg.emit(to_text_string(error))
                     return
             elif self.context is not None:
                 try:
                     html_text = sphinxify(doc, self.context)
                 except Exception as error:
-                    self.error_msg.emit(to_text_string(error))
+                    if self._pending is None:
+                        self.error_msg.emit(to_text_string(error))
                     return
-        self.html_ready.emit(html_text)
+        # Results of documentation requested since then are not shown
+        if self._pending is None:
+            self.html_ready.emit(html_text)
 
 
 class Help(SpyderPluginWidget):
@@ -55,6 +55,7 @@ from spyder.utils import encoding, programs, sourcecode
 from spyder.utils.misc import get_error_match, remove_backslashes
 from spyder.widgets.findreplace import FindReplace
 from spyder.widgets.ipythonconsole import ClientWidget
+from spyder.widgets.ipythonconsole.client import get_stderr_file
 from spyder.widgets.tabs import Tabs
 
 
@@ -75,6 +76,15 @@ IPYTHON_REQVER = ">=4.0;<6.0" if PY2 else ">=4.0"
 dependencies.add("IPython", _("IPython interactive python environment"),
                  required_version=IPYTHON_REQVER)
 
+# Options read by our kernels when they start
+# (see utils/ipython/start_kernel.py)
+KERNEL_OPTIONS = ['pylab', 'pylab/autoload', 'pylab/backend',
+                  'pylab/inline/figure_format', 'pylab/inline/resolution',
+                  'pylab/inline/width', 'pylab/inline/height',
+                  'startup/run_lines', 'startup/use_run_file',
+                  'startup/run_file', 'autocall', 'greedy_completer',
+                  'symbolic_math']
+
 #------------------------------------------------------------------------------
 # Existing kernels
 #------------------------------------------------------------------------------
@@ -464,6 +474,23 @@ class IPythonConsoleConfigPage(PluginConfigPage):
         run_file_layout.addWidget(file_radio)
         run_file_layout.addWidget(run_file_browser)
         run_file_group.setLayout(run_file_layout)
+
+        # Spare kernels Group
+        spare_group = QGroupBox(_("Spare kernels"))
+        spare_label = QLabel(_("Kernels can be started in the background "
+                               "before they are needed, so that new "
+                               "consoles are ready right away. Each spare "
+                               "kernel uses as much memory as an empty "
+                               "console."))
+        spare_label.setWordWrap(True)
+        spare_spin = self.create_spinbox(_("Spare kernels:") + "  ", "",
+                                         'spare_kernels', min_=0, max_=5,
+                                         step=1)
+
+        spare_layout = QVBoxLayout()
+        spare_layout.addWidget(spare_label)
+        spare_layout.addWidget(spare_spin)
+        spare_group.setLayout(spare_layout)
         
         # ---- Advanced settings ----
         # Greedy completer group
@@ -562,8 +589,8 @@ class IPythonConsoleConfigPage(PluginConfigPage):
                                     source_code_group), _("Display"))
         tabs.addTab(self.create_tab(pylab_group, backend_group, inline_group),
                                     _("Graphics"))
-        tabs.addTab(self.create_tab(run_lines_group, run_file_group),
-                                    _("Startup"))
+        tabs.addTab(self.create_tab(run_lines_group, run_file_group,
+                                    spare_group), _("Startup"))
         tabs.addTab(self.create_tab(greedy_group, autocall_group, sympy_group,
                                     prompts_group), _("Advanced Settings"))
 
@@ -605,9 +632,13 @@ class IPythonConsole(SpyderPluginWidget):
         self.master_clients = 0
         self.clients = []
         self.filenames = []
+        self.spare_kernels = []
         self.mainwindow_close = False
         self.create_new_client_if_empty = True
         self.testing = testing
+        # Value of the breakpoints/enabled option when breakpoints were
+        # last sent to the clients
+        self.breakpoints_enabled = None
 
         # Initialize plugin
         if not self.testing:
@@ -679,6 +710,7 @@ class IPythonConsole(SpyderPluginWidget):
                 control.set_help_enabled(help_o)
             if color_scheme_n in options:
                 client.set_color_scheme(color_scheme_o)
+        self.update_spare_kernels()
 
     def toggle_view(self, checked):
         """Toggle view"""
@@ -718,6 +750,7 @@ class IPythonConsole(SpyderPluginWidget):
         for client in self.clients:
             client.shutdown()
             client.close()
+        self.close_spare_kernels()
         return True
 
     def refresh_plugin(self):
@@ -798,13 +831,18 @@ class IPythonConsole(SpyderPluginWidget):
                          lambda fname, lineno, word, processevents:
                              self.editor.load(fname, lineno, word,
                                               processevents=processevents))
-        self.editor.breakpoints_saved.connect(self.set_spyder_breakpoints)
+        self.editor.breakpoints_changed.connect(self.update_spyder_breakpoints)
         self.editor.run_in_current_ipyclient.connect(self.run_script)
         self.main.workingdirectory.set_current_console_wd.connect(
                                      self.set_current_client_working_directory)
 
         self.tabwidget.currentChanged.connect(self.update_working_directory)
 
+        # Check the modules of the interpreter used by our consoles while
+        # Spyder starts
+        if not CONF.get('main_interpreter', 'default'):
+            programs.update_module_versions(
+                CONF.get('main_interpreter', 'executable'))
 
     #------ Public API (for clients) ------------------------------------------
     def get_clients(self):
@@ -863,6 +901,8 @@ class IPythonConsole(SpyderPluginWidget):
                 line += "\"%s\"" % to_text_string(filename)
                 if args:
                     line += " %s" % norm(args)
+            if debug:
+                self.refresh_spyder_breakpoints()
             self.execute_code(line, current_client, clear_variables)
             self.visibility_changed(True)
             self.raise_()
@@ -928,7 +968,11 @@ class IPythonConsole(SpyderPluginWidget):
         self.master_clients += 1
         client_id = dict(int_id=to_text_string(self.master_clients),
                          str_id='A')
-        cf = self._new_connection_file()
+        kernel = self.get_spare_kernel()
+        if kernel is not None:
+            cf = kernel[0].connection_file
+        else:
+            cf = self._new_connection_file()
         client = ClientWidget(self, id_=client_id,
                               history_filename=get_conf_path('history.py'),
                               config_options=self.config_options(),
@@ -947,7 +991,7 @@ class IPythonConsole(SpyderPluginWidget):
 
         # Check if ipykernel is present in the external interpreter.
         # Else we won't be able to create a client
-        if not CONF.get('main_interpreter', 'default'):
+        if kernel is None and not CONF.get('main_interpreter', 'default'):
             pyexec = CONF.get('main_interpreter', 'executable')
             ipykernel_present = programs.is_module_installed('ipykernel',
                                                             interpreter=pyexec)
@@ -965,11 +1009,15 @@ class IPythonConsole(SpyderPluginWidget):
                                      "<tt>conda install ipykernel</tt>"))
                 return
 
-        self.connect_client_to_kernel(client)
+        self.connect_client_to_kernel(client, kernel)
         if client.shellwidget.kernel_manager is None:
             return
         self.register_client(client)
 
+        # Replace the spare kernel used by this client
+        if not self.testing:
+            self.update_spare_kernels()
+
     @Slot()
     def create_client_for_kernel(self):
         """Create a client connected to an existing kernel"""
@@ -981,12 +1029,20 @@ class IPythonConsole(SpyderPluginWidget):
             self._create_client_for_kernel(connection_file, hostname, sshkey,
                                            password)
 
-    def connect_client_to_kernel(self, client):
-        """Connect a client to its kernel"""
-        connection_file = client.connection_file
-        stderr_file = client.stderr_file
-        km, kc = self.create_kernel_manager_and_kernel_client(connection_file,
-                                                              stderr_file)
+    def connect_client_to_kernel(self, client, kernel=None):
+        """
+        Connect a client to its kernel
+
+        kernel: (kernel manager, kernel client) of a spare kernel to use
+                instead of starting a new one
+        """
+        if kernel is not None:
+            km, kc = kernel
+        else:
+            connection_file = client.connection_file
+            stderr_file = client.stderr_file
+            km, kc = self.create_kernel_manager_and_kernel_client(
+                         connection_file, stderr_file)
         # An error occurred if this is True
         if is_string(km) and kc is None:
             client.shellwidget.kernel_manager = None
@@ -1149,6 +1205,11 @@ class IPythonConsole(SpyderPluginWidget):
                               lambda fname, lineno, shellwidget=shellwidget:
                               self.pdb_has_stopped(fname, lineno, shellwidget))
 
+        # Send breakpoints to the kernel, so that it doesn't have to read
+        # them from our config when debugging
+        if not self.refresh_spyder_breakpoints():
+            shellwidget.set_spyder_breakpoints(self.get_spyder_breakpoints())
+
         # Set shell cwd according to preferences
         cwd_path = ''
         if CONF.get('workingdir', 'console/use_project_or_home_directory'):
@@ -1286,10 +1347,37 @@ class IPythonConsole(SpyderPluginWidget):
         self.activateWindow()
         shellwidget._control.setFocus()
 
-    def set_spyder_breakpoints(self):
-        """Set Spyder breakpoints into all clients"""
+    def get_spyder_breakpoints(self):
+        """
+        Return the breakpoints to send to the kernels: the ones of all
+        files, or none if breakpoints are disabled
+        """
+        if (self.editor is None or
+                not CONF.get('run', 'breakpoints/enabled', True)):
+            return {}
+        return self.editor.get_breakpoints()
+
+    def refresh_spyder_breakpoints(self):
+        """
+        Send all breakpoints again to all clients if the breakpoints/enabled
+        option changed since they were last sent, and return True if they
+        were sent
+        """
+        enabled = CONF.get('run', 'breakpoints/enabled', True)
+        if enabled == self.breakpoints_enabled:
+            return False
+        self.breakpoints_enabled = enabled
+        breakpoints = self.get_spyder_breakpoints()
         for cl in self.clients:
-            cl.shellwidget.set_spyder_breakpoints()
+            cl.shellwidget.set_spyder_breakpoints(breakpoints)
+        return True
+
+    def update_spyder_breakpoints(self, breakpoints):
+        """Update Spyder breakpoints of some files into all clients"""
+        if self.refresh_spyder_breakpoints() or not self.breakpoints_enabled:
+            return
+        for cl in self.clients:
+            cl.shellwidget.update_spyder_breakpoints(breakpoints)
 
     @Slot(str)
     def create_client_from_path(self, path):
@@ -1355,10 +1443,11 @@ class IPythonConsole(SpyderPluginWidget):
         return SpyderKernelSpec()
 
     def create_kernel_manager_and_kernel_client(self, connection_file,
-                                                stderr_file):
+                                                stderr_file, kernel_spec=None):
         """Create kernel manager and client."""
         # Kernel spec
-        kernel_spec = self.create_kernel_spec()
+        if kernel_spec is None:
+            kernel_spec = self.create_kernel_spec()
         if not kernel_spec.env.get('PYTHONPATH'):
             error_msg = _("This error was most probably caused by installing "
                           "Spyder in a directory with non-ascii characters "
@@ -1392,6 +1481,46 @@ class IPythonConsole(SpyderPluginWidget):
         if client is not None:
             client.restart_kernel()
 
+    def get_spare_kernel(self):
+        """
+        Return the (kernel manager, kernel client) of a spare kernel
+        started with the current settings, or None if there are none
+        """
+        if not self.spare_kernels:
+            return None
+        self._close_stale_spare_kernels(self.create_kernel_spec())
+        if self.spare_kernels:
+            km, kc, _key = self.spare_kernels.pop(0)
+            return km, kc
+
+    def update_spare_kernels(self):
+        """
+        Start spare kernels in the background, up to the number set in
+        Preferences, replacing those started with other settings
+        """
+        number = self.get_option('spare_kernels')
+        if not number and not self.spare_kernels:
+            return
+        kernel_spec = self.create_kernel_spec()
+        key = self._close_stale_spare_kernels(kernel_spec)
+        while len(self.spare_kernels) > number:
+            self._close_spare_kernel(self.spare_kernels.pop())
+        while len(self.spare_kernels) < number:
+            connection_file = self._new_connection_file()
+            if connection_file is None:
+                return
+            km, kc = self.create_kernel_manager_and_kernel_client(
+                         connection_file, get_stderr_file(connection_file),
+                         kernel_spec)
+            if kc is None:
+                return
+            self.spare_kernels.append((km, kc, key))
+
+    def close_spare_kernels(self):
+        """Shutdown all spare kernels"""
+        while self.spare_kernels:
+            self._close_spare_kernel(self.spare_kernels.pop())
+
     #------ Public API (for tabs) ---------------------------------------------
     def add_tab(self, widget, name, filename=''):
         """Add tab"""
@@ -1506,6 +1635,35 @@ class IPythonConsole(SpyderPluginWidget):
             cf = cf if not os.path.exists(cf) else ''
         return cf
 
+    def _get_kernel_key(self, kernel_spec):
+        """
+        Return the command, environment and options used to start
+        kernels with kernel_spec, to know which kernels can be reused
+        """
+        options = [(option, self.get_option(option))
+                   for option in KERNEL_OPTIONS]
+        return (kernel_spec.argv, sorted(kernel_spec.env.items()), options)
+
+    def _close_stale_spare_kernels(self, kernel_spec):
+        """
+        Shutdown spare kernels started with other settings than those of
+        kernel_spec and return the key of the current settings
+        """
+        key = self._get_kernel_key(kernel_spec)
+        for spare_kernel in self.spare_kernels[:]:
+            if spare_kernel[2] != key:
+                self.spare_kernels.remove(spare_kernel)
+                self._close_spare_kernel(spare_kernel)
+        return key
+
+    def _close_spare_kernel(self, spare_kernel):
+        """Shutdown a spare kernel without waiting for it"""
+        kernel_manager = spare_kernel[0]
+        try:
+            kernel_manager.shutdown_kernel(now=True)
+        except Exception:
+            pass
+
     def process_started(self, client):
         if self.help is not None:
             self.help.set_shell(client.shellwidget)
@@ -118,6 +118,11 @@ class MainInterpreterConfigPage(GeneralConfigPage):
                                 'umr/verbose', msg_info=_(
                                 "Please note that these changes will "
                                 "be applied only to new consoles"))
+        umr_incremental_box = newcb(_("Only reload changed modules and the "
+                                      "modules importing them"),
+                                    'umr/incremental', msg_info=_(
+                                    "Please note that these changes will "
+                                    "be applied only to new consoles"))
         umr_namelist_btn = QPushButton(
                             _("Set UMR excluded (not reloaded) modules"))
         umr_namelist_btn.clicked.connect(self.set_umr_namelist)
@@ -126,6 +131,7 @@ class MainInterpreterConfigPage(GeneralConfigPage):
         umr_layout.addWidget(umr_label)
         umr_layout.addWidget(umr_enabled_box)
         umr_layout.addWidget(umr_verbose_box)
+        umr_layout.addWidget(umr_incremental_box)
         umr_layout.addWidget(umr_namelist_btn)
         umr_group.setLayout(umr_layout)
 
@@ -224,3 +230,6 @@ class MainInterpreterConfigPage(GeneralConfigPage):
 
     def apply_settings(self, options):
         self.main.apply_settings()
+        # Check the modules of the new interpreter before consoles need them
+        if not self.get_option('default'):
+            programs.update_module_versions(self.get_option('executable'))
@@ -13,6 +13,7 @@ updating the file tree explorer associated with a project
 
 # Standard library imports
 import os.path as osp
+import re
 
 # Third party imports
 from qtpy.compat import getexistingdirectory
@@ -24,7 +25,13 @@ from spyder.config.base import _, get_home_dir
 from spyder.api.plugins import SpyderPluginWidget
 from spyder.py3compat import is_text_string, to_text_string, getcwd
 from spyder.utils import icon_manager as ima
+from spyder.utils.filesearch import (FileList, TrigramIndex,
+                                     register_trigram_index,
+                                     unregister_trigram_index)
 from spyder.utils.qthelpers import add_actions, create_action, MENU_SEPARATOR
+from spyder.utils.workers import WorkerManager
+from spyder.widgets.projects.config import (EXCLUDE_PATTERN, PROJECT_FOLDER,
+                                            WORKSPACE)
 from spyder.widgets.projects.explorer import ProjectExplorerWidget
 from spyder.widgets.projects.projectdialog import ProjectDialog
 from spyder.widgets.projects import EmptyProject
@@ -38,6 +45,7 @@ class Projects(SpyderPluginWidget):
     sig_project_created = Signal(object, object, object)
     sig_project_loaded = Signal(object)
     sig_project_closed = Signal(object)
+    sig_file_list_updated = Signal()
 
     def __init__(self, parent=None):
         """Initialization."""
@@ -56,6 +64,10 @@ class Projects(SpyderPluginWidget):
         self.recent_projects = self.get_option('recent_projects', default=[])
         self.current_active_project = None
         self.latest_project = None
+        self.search_index = None
+        self.file_list = None
+        self._file_list_worker = None
+        self._worker_manager = WorkerManager()
 
         self.editor = None
         self.workingdirectory = None
@@ -164,6 +176,8 @@ class Projects(SpyderPluginWidget):
         """Perform actions before parent main window is closed"""
         self.save_config()
         self.explorer.closing_widget()
+        if self.file_list is not None:
+            self.file_list.close()
         return True
 
     #------ Public API ---------------------------------------------------------
@@ -204,8 +218,8 @@ class Projects(SpyderPluginWidget):
     def edit_project_preferences(self):
         """Edit Spyder active project preferences"""
         from spyder.widgets.projects.configdialog import ProjectPreferences
-        if self.project_active:
-            active_project = self.project_list[0]
+        if self.current_active_project:
+            active_project = self.current_active_project
             dlg = ProjectPreferences(self, active_project)
 #            dlg.size_change.connect(self.set_project_prefs_size)
 #            if self.projects_prefs_dialog_size is not None:
@@ -263,6 +277,8 @@ class Projects(SpyderPluginWidget):
         self.current_active_project = EmptyProject(path)
         self.latest_project = EmptyProject(path)
         self.set_option('current_project_path', self.get_active_project_path())
+        self.update_search_index()
+        self.setup_file_list()
         self.setup_menu_actions()
         self.sig_project_loaded.emit(path)
         self.pythonpath_changed.emit()
@@ -279,6 +295,8 @@ class Projects(SpyderPluginWidget):
             self.set_project_filenames(self.editor.get_open_filenames())
             self.current_active_project = None
             self.set_option('current_project_path', None)
+            self.update_search_index()
+            self.setup_file_list()
             self.setup_menu_actions()
             self.sig_project_closed.emit(path)
             self.pythonpath_changed.emit()
@@ -324,6 +342,87 @@ class Projects(SpyderPluginWidget):
         if self.current_active_project:
             self.current_active_project.set_recent_files(recent_files)
 
+    def update_search_index(self):
+        """
+        Set up the search index of the active project, if it's enabled in
+        its preferences, and update it in the background
+        """
+        if self.search_index is not None:
+            unregister_trigram_index(self.search_index.rootpath)
+            self.search_index = None
+        project = self.current_active_project
+        if project is None:
+            return
+        conf = project.get_conf_files()[WORKSPACE]
+        if not conf.get(WORKSPACE, 'search_index', True):
+            return
+        max_size = conf.get(WORKSPACE, 'search_index_max_size', 100)
+        index_path = osp.join(project.root_path, PROJECT_FOLDER,
+                              'search_index')
+        self.search_index = TrigramIndex(project.root_path, index_path,
+                                         max_size=max_size * 1024 * 1024,
+                                         exclude=self.get_exclude_regexp())
+        register_trigram_index(self.search_index)
+        worker = self._worker_manager.create_python_worker(
+            self.search_index.update)
+        worker.start()
+
+    def update_search_index_file(self, filename):
+        """Index again a file saved in the editor, on the next search"""
+        if self.search_index is not None:
+            self.search_index.file_changed(filename)
+
+    def get_exclude_regexp(self):
+        """Return the compiled exclude patterns of the active project"""
+        conf = self.current_active_project.get_conf_files()[WORKSPACE]
+        try:
+            return re.compile(conf.get(WORKSPACE, 'exclude', EXCLUDE_PATTERN))
+        except re.error:
+            return re.compile(EXCLUDE_PATTERN)
+
+    def setup_file_list(self):
+        """
+        Set up the list of files of the active project, used by the file
+        switcher, and update it in the background
+        """
+        if self.file_list is not None:
+            self.file_list.close()
+            self.file_list = None
+            self._file_list_worker = None
+        project = self.current_active_project
+        if project is None:
+            return
+        self.file_list = FileList(project.root_path,
+                                  osp.join(project.root_path, PROJECT_FOLDER),
+                                  exclude=self.get_exclude_regexp())
+        self.update_file_list()
+
+    def update_file_list(self):
+        """
+        Update the list of files of the active project in the background,
+        listing again only the folders that changed
+        """
+        if self.file_list is None or self._file_list_worker is not None:
+            return
+        file_list = self.file_list
+
+        def worker_output(worker, output, error):
+            """Worker finished callback."""
+            if worker is not self._file_list_worker:
+                return
+            self._file_list_worker = None
+            if output:
+                self.sig_file_list_updated.emit()
+
+        worker = self._worker_manager.create_python_worker(file_list.update)
+        worker.sig_finished.connect(worker_output)
+        self._file_list_worker = worker
+        worker.start()
+
+    def get_file_list(self):
+        """Get the list of files of the active project, or None"""
+        return self.file_list
+
     def get_active_project_path(self):
         """Get path of the active project"""
         active_project_path = None
@@ -252,6 +252,32 @@ def test_unicode_vars(ipyconsole, qtbot):
     assert shell.get_value('д') == 20
 
 
+@flaky(max_runs=3)
+def test_value_windows(ipyconsole, qtbot):
+    """
+    Test that large variables can be transferred by windows.
+    """
+    # Wait until the window is fully up
+    shell = ipyconsole.get_current_shellwidget()
+    qtbot.waitUntil(lambda: shell._prompt_html is not None, timeout=SHELL_TIMEOUT)
+
+    with qtbot.waitSignal(shell.executed):
+        shell.execute('import numpy as np; a = np.arange(10**6.)')
+
+    # Get its description and a window of it
+    info = shell.get_value_info('a')
+    assert info['shape'] == (10**6, 1)
+    assert info['limits'] == (0, 10**6 - 1)
+    window = shell.get_value_window('a', (10, 20), (0, 1))
+    assert window['shape'] == (10, 1)
+    assert len(window['buffer']) == 10 * 8
+
+    # Edit some of its items
+    shell.set_value_items('a', serialize_object({(10, 0): -1}))
+    qtbot.wait(1000)
+    assert shell.get_value('a')[10] == -1
+
+
 @flaky(max_runs=3)
 def test_read_stderr(ipyconsole, qtbot):
     """
@@ -587,5 +613,82 @@ def test_sys_argv_clear(ipyconsole, qtbot):
     assert argv == ['']
 
 
+@flaky(max_runs=3)
+@pytest.mark.skipif(os.name == 'nt', reason="It times out on Windows")
+def test_spare_kernels(ipyconsole, qtbot):
+    """Test that new clients use spare kernels started in the background."""
+    CONF.set('ipython_console', 'spare_kernels', 1)
+    ipyconsole.update_spare_kernels()
+    assert len(ipyconsole.spare_kernels) == 1
+    kernel_manager = ipyconsole.spare_kernels[0][0]
+
+    # The spare kernel is used by the next client
+    ipyconsole.create_new_client()
+    shell = ipyconsole.get_current_shellwidget()
+    assert shell.kernel_manager is kernel_manager
+    assert not ipyconsole.spare_kernels
+    qtbot.waitUntil(lambda: shell._prompt_html is not None,
+                    timeout=SHELL_TIMEOUT)
+    with qtbot.waitSignal(shell.executed):
+        shell.execute('a = 10')
+    assert shell.get_value('a') == 10
+
+    # Spare kernels started with other settings are not used
+    ipyconsole.update_spare_kernels()
+    kernel_manager = ipyconsole.spare_kernels[0][0]
+    CONF.set('ipython_console', 'startup/run_lines', 'b = 20')
+    ipyconsole.create_new_client()
+    shell = ipyconsole.get_current_shellwidget()
+    assert shell.kernel_manager is not kernel_manager
+    assert not ipyconsole.spare_kernels
+    CONF.set('ipython_console', 'startup/run_lines', '')
+    CONF.set('ipython_console', 'spare_kernels', 0)
+    ipyconsole.update_spare_kernels()
+
+def test_spyder_breakpoints_enabled(qtbot):
+    """
+    Test that clients always get a dict of breakpoints, which is sent again
+    when breakpoints are enabled or disabled.
+    """
+    class Editor(object):
+        def get_breakpoints(self):
+            return {'spam.py': [(1, None)]}
+
+    class ShellWidget(object):
+        breakpoints = None
+        updates = 0
+
+        def set_spyder_breakpoints(self, breakpoints):
+            self.breakpoints = dict(breakpoints)
+
+        def update_spyder_breakpoints(self, breakpoints):
+            self.updates += 1
+
+    class Client(object):
+        shellwidget = ShellWidget()
+
+    console = IPythonConsole(None, testing=True)
+    qtbot.addWidget(console)
+    console.editor = Editor()
+    client = Client()
+    console.clients = [client]
+
+    CONF.set('run', 'breakpoints/enabled', False)
+    try:
+        assert console.refresh_spyder_breakpoints()
+        assert client.shellwidget.breakpoints == {}
+        console.update_spyder_breakpoints({'spam.py': [(1, None)]})
+        assert client.shellwidget.updates == 0
+
+        CONF.set('run', 'breakpoints/enabled', True)
+        console.update_spyder_breakpoints({'spam.py': [(1, None)]})
+        assert client.shellwidget.breakpoints == {'spam.py': [(1, None)]}
+        console.update_spyder_breakpoints({'spam.py': [(1, None)]})
+        assert client.shellwidget.updates == 1
+        assert not console.refresh_spyder_breakpoints()
+    finally:
+        CONF.set('run', 'breakpoints/enabled', True)
+
+
 if __name__ == "__main__":
     pytest.main()
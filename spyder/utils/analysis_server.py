@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Code analysis server, a process running checkers for the Editor
+
+Requests and responses are pickled objects prefixed by their size, sent
+through the standard input and output of the process. A request is a
+(job_id, checker_name, source_code, filename) tuple and its response is a
+(job_id, (results, elapsed)) tuple, as returned by `run_checker`.
+"""
+
+import os
+import pickle
+import struct
+import sys
+
+# Size of a message length prefix
+HEADER = struct.Struct('>I')
+
+
+def pack_message(obj):
+    """Return obj pickled and prefixed by its size"""
+    data = pickle.dumps(obj, 2)
+    return HEADER.pack(len(data)) + data
+
+
+def unpack_messages(buffer):
+    """Return the complete messages at the start of buffer (bytes), and the
+    bytes left"""
+    messages = []
+    while len(buffer) >= HEADER.size:
+        size, = HEADER.unpack(buffer[:HEADER.size])
+        end = HEADER.size + size
+        if len(buffer) < end:
+            break
+        messages.append(pickle.loads(buffer[HEADER.size:end]))
+        buffer = buffer[end:]
+    return messages, buffer
+
+
+def _read_exactly(stream, size):
+    """Read size bytes from stream, or return None at the end of it"""
+    data = b''
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            return
+        data += chunk
+    return data
+
+
+def serve(stdin, stdout):
+    """Run the checkers requested through stdin until it's closed"""
+    from spyder.utils import codeanalysis
+    while 1:
+        header = _read_exactly(stdin, HEADER.size)
+        if header is None:
+            return
+        data = _read_exactly(stdin, HEADER.unpack(header)[0])
+        if data is None:
+            return
+        job_id, checker_name, source_code, filename = pickle.loads(data)
+        checker = getattr(codeanalysis, checker_name)
+        result = codeanalysis.run_checker(checker, source_code, filename)
+        stdout.write(pack_message((job_id, result)))
+        stdout.flush()
+
+
+if __name__ == '__main__':
+    if os.name == 'nt':
+        import msvcrt
+        msvcrt.setmode(sys.stdin.fileno(), os.O_BINARY)
+        msvcrt.setmode(sys.stdout.fileno(), os.O_BINARY)
+    stdin = getattr(sys.stdin, 'buffer', sys.stdin)
+    stdout = getattr(sys.stdout, 'buffer', sys.stdout)
+    # Keep the output of checkers, if any, out of the responses
+    sys.stdout = sys.stderr
+    serve(stdin, stdout)
@@ -8,16 +8,25 @@
 Source code analysis utilities
 """
 
+import ast
+import io
 import sys
 import re
 import os
+import symtable
+import hashlib
+import multiprocessing
 import tempfile
+import threading
+import time
 import traceback
+from collections import OrderedDict
 
 # Local import
 from spyder.config.base import _, DEBUG
 from spyder.utils import programs, encoding
-from spyder.py3compat import to_text_string, to_binary_string, PY3
+from spyder.py3compat import (is_text_string, to_text_string,
+                               to_binary_string, PY2, PY3)
 from spyder import dependencies
 DEBUG_EDITOR = DEBUG >= 3
 
@@ -179,6 +188,552 @@ def check_with_pep8(source_code, filename=None):
     return results
 
 
+#==============================================================================
+# Incremental code analysis
+#==============================================================================
+# Source code is split into top-level blocks (a top-level statement with
+# the blank lines, comments and decorators before it). Results are cached
+# by block contents, so unchanged blocks are not checked again.
+
+# Maximum number of blocks kept in each cache
+BLOCK_CACHE_SIZE = 5000
+
+# Lines starting with these keywords continue the previous statement
+CONTINUATION_KEYWORDS = ('else', 'elif', 'except', 'finally')
+
+# Function and class definitions
+DEFINITION_NODES = tuple(getattr(ast, name) for name in
+                         ('FunctionDef', 'AsyncFunctionDef', 'ClassDef')
+                         if hasattr(ast, name))
+
+# Definition lines, as found by pycodestyle when looking for the definition
+# following a line
+DEFINITION_PROG = re.compile(r'(async\s+def|def|class)\s')
+
+_block_info_cache = OrderedDict()
+_pyflakes_cache = OrderedDict()
+_pycodestyle_cache = OrderedDict()
+# Checkers run in threads when they can't run in other processes
+_cache_lock = threading.Lock()
+
+
+def _cache_get(cache, key):
+    """Return a cached value and mark it as the most recently used"""
+    with _cache_lock:
+        value = cache.pop(key, None)
+        if value is not None:
+            cache[key] = value
+        return value
+
+
+def _cache_set(cache, key, value):
+    """Cache a value, discarding the least recently used ones"""
+    with _cache_lock:
+        cache[key] = value
+        while len(cache) > BLOCK_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def get_block_starts(lines, indent=''):
+    """Return the indexes of the lines starting a block.
+
+    A block starts with the blank lines, comments and decorators before a
+    line indented with *indent* that doesn't continue a previous statement.
+    Note that blocks may start inside a multiline string, which is handled
+    by `get_blocks`."""
+    starts = [0]
+    leading = None
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        rest = line[len(indent):] if line.startswith(indent) else ' '
+        if not stripped or stripped[0] == '#' or rest[0] == '@':
+            if leading is None:
+                leading = index
+            continue
+        keyword = re.match(r'\w*', stripped).group()
+        if (rest[0] in ' \t)]}' or keyword in CONTINUATION_KEYWORDS or
+                index == 0):
+            leading = None
+            continue
+        start = index if leading is None else leading
+        if start > starts[-1]:
+            starts.append(start)
+        leading = None
+    return starts
+
+
+def _get_statement_kind(node):
+    """Return the kind of a statement, as needed by pycodestyle
+
+    Definitions ending with a docstring are told apart, because pycodestyle
+    doesn't expect a blank line between a docstring and a method."""
+    if isinstance(node, DEFINITION_NODES):
+        last = node
+        while True:
+            bodies = [getattr(last, field) for field in
+                      ('body', 'orelse', 'handlers', 'finalbody')
+                      if getattr(last, field, None)]
+            if not bodies or not isinstance(bodies[0], list):
+                break
+            last = max((body[-1] for body in bodies),
+                       key=lambda child: child.lineno)
+        if _get_statement_kind(last) == 'docstring':
+            return 'definition_docstring'
+        return 'definition'
+    value = getattr(node, 'value', None)
+    if (isinstance(node, ast.Expr) and
+            is_text_string(getattr(value, 's', getattr(value, 'value', 0)))):
+        return 'docstring'
+    return 'statement'
+
+
+def _get_global_loads(table):
+    """Return the global names used in a symbol table and its children"""
+    loads = set(symbol.get_name() for symbol in table.get_symbols()
+                if symbol.is_referenced() and
+                (symbol.is_global() or table.get_type() == 'module'))
+    for child in table.get_children():
+        loads |= _get_global_loads(child)
+    return loads
+
+
+def _get_local_binds(table):
+    """Return the local names bound in the children of a symbol table, and
+    whether they declare global names"""
+    binds, declares_global = set(), False
+    for child in table.get_children():
+        for symbol in child.get_symbols():
+            if symbol.is_declared_global():
+                declares_global = True
+            elif symbol.is_local() or symbol.is_parameter():
+                binds.add(symbol.get_name())
+        child_binds, child_declares_global = _get_local_binds(child)
+        binds |= child_binds
+        declares_global = declares_global or child_declares_global
+    return binds, declares_global
+
+
+def get_block_info(text, prefix='', nested=False):
+    """Return information about a block of code, or None if it can't be
+    compiled on its own
+
+    *prefix* is compiled before the block, e.g. to compile class methods.
+    If *nested* is True, the block is a class whose body is checked by
+    blocks."""
+    key = (prefix, nested, text)
+    info = _cache_get(_block_info_cache, key)
+    if info is not None:
+        return info or None
+    try:
+        tree = compile(prefix + text, '<block>', 'exec', ast.PyCF_ONLY_AST)
+        table = symtable.symtable(prefix + text, '<block>', 'exec')
+    except (SyntaxError, ValueError, TypeError):
+        _cache_set(_block_info_cache, key, False)
+        return
+    shadows, declares_global = _get_local_binds(table)
+    body = tree.body
+    if prefix:
+        body = body[0].body[1:]
+    elif nested:
+        body = body[0].body
+    definition = (len(body) == 1 and isinstance(body[0], DEFINITION_NODES)
+                  and not declares_global)
+    binds = [symbol.get_name() for symbol in table.get_symbols()
+             if symbol.is_assigned() or symbol.is_imported()]
+    info = dict(hash=hashlib.md5(to_binary_string(text, 'utf-8')).hexdigest(),
+                definition=definition, binds=binds, body_indent=None,
+                last=_get_statement_kind(body[-1]) if body else None,
+                loads=_get_global_loads(table))
+    if definition:
+        # Warnings about local names shadowing unused global names depend
+        # on the names used by the other blocks
+        info.update(name=body[0].name, lineno=body[0].lineno,
+                    shadows=shadows)
+        if isinstance(body[0], ast.ClassDef) and not prefix:
+            first = body[0].body[0]
+            line = text.splitlines()[first.lineno - 1]
+            if (first.lineno > body[0].lineno and
+                    not line[:first.col_offset].strip()):
+                info['body_indent'] = line[:first.col_offset]
+    _cache_set(_block_info_cache, key, info)
+    return info
+
+
+def get_blocks(lines, indent=''):
+    """Split source code lines into blocks.
+
+    Returns a list of (start, end, info) tuples, or None if the code has
+    syntax errors. Blocks that can't be compiled on their own (e.g. if they
+    start inside a multiline string) are merged with the next ones.
+
+    Blocks are top-level statements by default. If *indent* is given,
+    *lines* must be a class definition, and blocks are the statements of
+    its body (the first one includes the class header)."""
+    starts = get_block_starts(lines, indent) + [len(lines)]
+    prefix = 'class _:\n%spass\n' % indent if indent else ''
+    blocks = []
+    start = 0
+    for end in starts[1:]:
+        text = ''.join(lines[start:end])
+        if start:
+            info = get_block_info(text, prefix)
+        else:
+            info = get_block_info(text, nested=bool(indent))
+        if info is not None:
+            blocks.append((start, end, info))
+            start = end
+    if start < len(lines):
+        return
+    return blocks
+
+
+def _is_ignored(lines, lineno):
+    """Return True if results for a line must be ignored"""
+    return 0 < lineno <= len(lines) and 'analysis:ignore' in lines[lineno-1]
+
+
+def _decode_source(source_code):
+    """Return source code as text, as it's compiled by Python"""
+    if not isinstance(source_code, bytes):
+        return source_code
+    try:
+        return source_code.decode('utf-8')
+    except UnicodeDecodeError:
+        return to_text_string(source_code, encoding.get_coding(source_code))
+
+
+def _check_blocks_with_pyflakes(lines, blocks, filename):
+    """Run pyflakes on the blocks, reusing the results of unchanged
+    function and class definitions.
+
+    The module checked by pyflakes contains the other blocks, the
+    definitions that changed, and one-line stubs for the unchanged ones,
+    which bind the same name and use the same global names."""
+    from pyflakes import messages as pyflakes_messages
+    from pyflakes.checker import Checker
+
+    binds = sorted(name for _start, _end, info in blocks
+                   for name in info['binds'])
+    context = hashlib.md5(to_binary_string(repr(binds),
+                                           'utf-8')).hexdigest()
+    module_lines = []
+    # Number of blocks using each global name after the current one
+    following_loads = {}
+    for _start, _end, info in blocks:
+        for name in info['loads']:
+            following_loads[name] = following_loads.get(name, 0) + 1
+    previous_loads = set()
+    definitions, checked, stubs = [], [], []
+    stubbed_lines = 0
+    for start, end, info in blocks:
+        for name in info['loads']:
+            following_loads[name] -= 1
+        cached = key = None
+        if info['definition']:
+            following = set(name for name in info['shadows']
+                            if following_loads.get(name))
+            key = (info['hash'], context,
+                   tuple(sorted(previous_loads & info['shadows'])),
+                   tuple(sorted(following)))
+            cached = _cache_get(_pyflakes_cache, key)
+            definitions.append((start, end, info, key))
+        previous_loads |= info['loads']
+        if cached is None:
+            module_lines += lines[start:end]
+            if info['definition']:
+                checked.append((start, end, info, key))
+        else:
+            loads = sorted(info['loads'] | set([info['name']]))
+            stub = 'def %s(): (%s,)\n' % (info['name'], ', '.join(loads))
+            module_lines += (['\n'] * (info['lineno'] - 1) + [stub] +
+                             ['\n'] * (end - start - info['lineno']))
+            stubs.append((start, info, cached))
+            stubbed_lines += end - start
+    if 2 * stubbed_lines < len(lines):
+        # Stubs aren't worth it if most of the code changed
+        module_lines, checked, stubs = lines, definitions, []
+
+    tree = compile(''.join(module_lines), filename, 'exec',
+                   ast.PyCF_ONLY_AST)
+    checker = Checker(tree, filename)
+    stub_lines = set(start + info['lineno'] for start, info, _ in stubs)
+    messages = []
+    results = [[] for _block in checked]
+    for warning in checker.messages:
+        if (warning.lineno in stub_lines and
+                isinstance(warning, (pyflakes_messages.UndefinedName,
+                                     pyflakes_messages.ImportStarUsage))):
+            # Warning about the names used by a stub
+            continue
+        args = warning.message_args
+        messages.append((warning.message % args, warning.lineno))
+        for index, (start, end, _info, _key) in enumerate(checked):
+            if start < warning.lineno <= end and results[index] is not None:
+                if 'line %r' in warning.message:
+                    if not start < args[-1] <= end:
+                        # Warnings referring to other blocks can't be
+                        # reused, because those blocks may move
+                        results[index] = None
+                        continue
+                    args = args[:-1] + (args[-1] - start,)
+                results[index].append((warning.lineno - start,
+                                       warning.message, args))
+    for (_start, _end, _info, key), block_results in zip(checked, results):
+        if block_results is not None:
+            _cache_set(_pyflakes_cache, key, block_results)
+    for start, info, cached in stubs:
+        for lineno, message, args in cached:
+            if 'line %r' in message:
+                args = args[:-1] + (args[-1] + start,)
+            message = (message % args, lineno + start)
+            # Warnings in the definition line are also found for the stub
+            if lineno != info['lineno'] or message not in messages:
+                messages.append(message)
+    return sorted(messages, key=lambda result: result[1])
+
+
+def check_with_pyflakes_incremental(source_code, filename=None):
+    """Check source code with pyflakes, re-checking only the top-level
+    blocks that changed since previous checks
+
+    Returns the same results as `check_with_pyflakes`, which is used when
+    the code has syntax errors"""
+    if PY2:
+        return check_with_pyflakes(source_code, filename)
+    try:
+        lines = (_decode_source(source_code) + '\n').splitlines(True)
+        blocks = get_blocks(lines)
+        if blocks is None:
+            return check_with_pyflakes(source_code, filename)
+        results = []
+        for message, lineno in _check_blocks_with_pyflakes(
+                lines, blocks, filename or '<string>'):
+            if not _is_ignored(lines, lineno):
+                results.append((message, lineno))
+    except Exception:
+        # Never return None to avoid lock in spyder/widgets/editor.py
+        # See Issue 1547
+        results = []
+        if DEBUG_EDITOR:
+            traceback.print_exc()  # Print exception in internal console
+    return results
+
+
+def _get_pycodestyle_options(filename=None):
+    """Return the options of pycodestyle, read from the same configuration
+    files as its command line, i.e. the user's one and the setup.cfg or
+    tox.ini of the project of *filename*"""
+    import pycodestyle
+    paths = [os.path.dirname(os.path.abspath(filename))] if filename else []
+    return pycodestyle.StyleGuide(paths=paths, quiet=True).options
+
+
+def _check_lines_with_pycodestyle(lines, options=None):
+    """Run pycodestyle in this process on some lines
+
+    Returns its results and whether code other than imports was found,
+    which pycodestyle needs to check following lines"""
+    import pycodestyle
+
+    class Report(pycodestyle.BaseReport):
+        def __init__(self, options):
+            super(Report, self).__init__(options)
+            self.results = []
+
+        def error(self, line_number, offset, text, check):
+            code = super(Report, self).error(line_number, offset, text,
+                                              check)
+            if code:
+                self.results.append((text, line_number))
+            return code
+
+    if options is None:
+        options = _get_pycodestyle_options()
+    report = Report(options)
+    checker = pycodestyle.Checker(lines=lines, options=options,
+                                  report=report)
+    checker.check_all()
+    state = getattr(checker, '_checker_states', {}).get(
+        'module_imports_on_top_of_file', {})
+    return report.results, state.get('seen_non_imports', False)
+
+
+def _get_pycodestyle_context(previous, seen_code, indent, body_indent=None):
+    """Return some lines standing for the code before a block
+
+    *previous* is the kind of the statement before the block. If
+    *body_indent* is given, the block is in the body of a class."""
+    if body_indent is not None:
+        return ['class _:\n'] + {
+            'definition': [body_indent + 'def _(self):\n',
+                           body_indent * 2 + 'pass\n'],
+            'definition_docstring': [body_indent + 'def _(self):\n',
+                                     body_indent * 2 + '"""_"""\n'],
+            'docstring': [body_indent + '"""_"""\n'],
+            'statement': [body_indent + '_ = 0\n']}[previous]
+    elif previous is None:
+        return []
+    elif previous == 'definition':
+        return ['def _():\n', indent + 'pass\n']
+    elif previous == 'definition_docstring':
+        return ['def _():\n', indent + '"""_"""\n']
+    elif seen_code:
+        return ['_ = 0\n']
+    else:
+        return ['__all__ = []\n']
+
+
+def _get_pycodestyle_following(lines):
+    """Return the lines standing for the code after each line (and after
+    the last one), for the blocks checked by pycodestyle
+
+    To tell one-liner definitions, pycodestyle looks for the next definition
+    line, even after the block, and at the indentation of the line after
+    it, so these are the lines given. They are in a string, so that their
+    indentation is valid and they don't stand for code after imports."""
+    following = [[]]
+    indent = ''
+    for line in reversed(lines):
+        if DEFINITION_PROG.match(line.lstrip()):
+            following.append(["if '''\n", 'def _():\n', indent + '_\n',
+                              "''': pass\n"])
+        else:
+            following.append(following[-1])
+        if line.strip():
+            indent = line[:len(line) - len(line.lstrip())]
+    following.reverse()
+    return following
+
+
+def _get_pycodestyle_units(lines, blocks):
+    """Yield the (start, end, previous, body_indent) units checked by
+    pycodestyle, as needed by `_get_pycodestyle_context`
+
+    Units are top-level blocks, except for classes, which are split in
+    blocks too, so that changes in a method don't check the whole class
+    again."""
+    previous = None
+    for start, end, info in blocks:
+        body_indent = info['body_indent']
+        sub_blocks = None
+        if body_indent is not None:
+            sub_blocks = get_blocks(lines[start:end], body_indent)
+        if sub_blocks is None:
+            yield start, end, previous, None
+        else:
+            yield start, start + sub_blocks[0][1], previous, None
+            sub_previous = sub_blocks[0][2]['last']
+            for sub_start, sub_end, sub_info in sub_blocks[1:]:
+                yield (start + sub_start, start + sub_end, sub_previous,
+                       body_indent)
+                sub_previous = sub_info['last'] or sub_previous
+        previous = info['last'] or previous
+
+
+def check_with_pep8_incremental(source_code, filename=None):
+    """Check source code with pycodestyle in this process, re-checking only
+    the top-level blocks and methods that changed since previous checks
+
+    Each block is checked after some lines standing for the previous one,
+    so that checks involving blank lines and imports see the same context.
+    Falls back to `check_with_pep8` if pycodestyle can't be imported."""
+    try:
+        import pycodestyle  # analysis:ignore
+    except ImportError:
+        # check_with_pep8 would check the file instead of the source code
+        return check_with_pep8(source_code)
+    try:
+        # Lines are split as pycodestyle reads them from a file, i.e. with
+        # universal newlines
+        lines = io.StringIO(_decode_source(source_code),
+                            newline=None).readlines()
+        options = _get_pycodestyle_options(filename)
+        blocks = get_blocks(lines)
+        if blocks is None:
+            return [(message, lineno) for message, lineno
+                    in _check_lines_with_pycodestyle(lines, options)[0]
+                    if not _is_ignored(lines, lineno)]
+        options_hash = get_source_hash(repr(sorted(
+            (name, value) for name, value in vars(options).items()
+            if name != 'paths')))
+
+        # Indentation of the lines standing for a previous definition
+        indent = '    '
+        for line in lines:
+            if line[:1] in (' ', '\t') and line.strip():
+                indent = line[:len(line) - len(line.lstrip())]
+                break
+
+        results = []
+        seen_code = False
+        following = _get_pycodestyle_following(lines)
+        for start, end, previous, body_indent in _get_pycodestyle_units(
+                lines, blocks):
+            context = _get_pycodestyle_context(previous, seen_code, indent,
+                                               body_indent)
+            key = (get_source_hash(''.join(lines[start:end])),
+                   ''.join(context), ''.join(following[end]),
+                   end == len(lines), options_hash)
+            cached = _cache_get(_pycodestyle_cache, key)
+            if cached is None:
+                cached = _check_lines_with_pycodestyle(
+                    context + lines[start:end] + following[end], options)
+                _cache_set(_pycodestyle_cache, key, cached)
+            unit_results, seen_code = cached
+            for message, lineno in unit_results:
+                lineno += start - len(context)
+                if (start < lineno <= end and
+                        not _is_ignored(lines, lineno)):
+                    results.append((message, lineno))
+    except Exception:
+        # Never return None to avoid lock in spyder/widgets/editor.py
+        # See Issue 1547
+        results = []
+        if DEBUG_EDITOR:
+            traceback.print_exc()  # Print exception in internal console
+    return results
+
+
+#==============================================================================
+# Code analysis in other processes (see spyder/utils/analysis_server.py)
+#==============================================================================
+# Maximum number of processes used to run checkers
+MAX_ANALYSIS_PROCESSES = 8
+
+
+def get_analysis_processes():
+    """Return the number of processes used to run checkers, which scales
+    with the number of cores (leaving one for the user interface)"""
+    try:
+        cores = multiprocessing.cpu_count()
+    except NotImplementedError:
+        cores = 1
+    return max(1, min(cores - 1, MAX_ANALYSIS_PROCESSES))
+
+
+def get_source_hash(source_code):
+    """Return a hash of source code (binary or text) to cache results"""
+    if not isinstance(source_code, bytes):
+        source_code = to_binary_string(source_code, 'utf-8')
+    return hashlib.md5(source_code).hexdigest()
+
+
+def run_checker(checker, source_code, filename=None):
+    """Run *checker* on source code, and on the name of its file if given.
+
+    Returns its results, or None if it failed, and the time it took to run
+    in seconds."""
+    t0 = time.time()
+    args = (source_code,) if filename is None else (source_code, filename)
+    try:
+        results = checker(*args)
+    except Exception:
+        results = None
+        if DEBUG_EDITOR:
+            traceback.print_exc(file=sys.stderr)
+    return results, time.time() - t0
+
+
 if __name__ == '__main__':
 #    fname = __file__
     fname = os.path.join(os.path.dirname(__file__),
@@ -27,6 +27,9 @@ from spyder.utils.external.binaryornot.check import is_binary
 
 PREFERRED_ENCODING = locale.getpreferredencoding()
 
+# Size in bytes of the chunks read by read_chunks
+CHUNK_SIZE = 2 ** 20
+
 def transcode(text, input=PREFERRED_ENCODING, output=PREFERRED_ENCODING):
     """Transcode a text string"""
     try:
@@ -243,6 +246,60 @@ def read(filename, encoding='utf-8'):
     text, encoding = decode( open(filename, 'rb').read() )
     return text, encoding
 
+def read_chunks(filename, chunk_size=CHUNK_SIZE):
+    """
+    Read text from file ('filename') in chunks of about chunk_size bytes
+    Yield text, encoding and the offset in bytes of each chunk in the file
+
+    The encoding is detected as in 'decode' and chunks always end with a
+    complete line. If decoding fails further in
+    the file, reading starts again from the beginning with the next
+    candidate encoding, which is signalled by a chunk at offset 0.
+    """
+    with open(filename, 'rb') as textfile:
+        # The encoding is declared or detected in the first two lines
+        head = textfile.readline() + textfile.readline()
+        codings = []
+        # UTF-16 and UTF-32 decoders skip the BOM themselves
+        if head.startswith(BOM_UTF8):
+            codings.append(('utf-8', 'utf-8-bom', len(BOM_UTF8)))
+        elif head.startswith(BOM_UTF16):
+            codings.append(('utf-16', 'utf-16', 0))
+        elif head.startswith(BOM_UTF32):
+            codings.append(('utf-32', 'utf-32', 0))
+        else:
+            coding = get_coding(head)
+            if coding:
+                codings.append((coding, coding, 0))
+        codings += [('utf-8', 'utf-8-guessed', 0),
+                    ('latin-1', 'latin-1-guessed', 0)]
+        for codec, coding, skip in codings:
+            try:
+                decoder = getincrementaldecoder(codec)()
+            except LookupError:
+                continue
+            textfile.seek(skip)
+            position = None
+            pending = ''
+            while True:
+                offset = textfile.tell()
+                data = textfile.read(chunk_size)
+                try:
+                    text = pending + decoder.decode(data, final=not data)
+                except UnicodeError:
+                    break
+                if data:
+                    # Keep the last incomplete line for the next chunk
+                    index = text.rfind('\n') + 1
+                    text, pending = text[:index], text[index:]
+                if text or (position is None and not data):
+                    # The first chunk is always at offset 0
+                    position = 0 if position is None else offset
+                    yield text, coding, position
+                if not data:
+                    return
+
+
 def readlines(filename, encoding='utf-8'):
     """
     Read lines from file ('filename')
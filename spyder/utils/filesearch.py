@@ -0,0 +1,753 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Find in files search engine
+
+This module has no Qt dependency: it contains a persistent per-root file
+index, used to avoid walking directories and sniffing binary files on
+repeated searches, the functions used to scan files in large chunks
+from a pool of worker threads, and the trigram index that projects can
+keep to only read the files that may contain the searched text.
+"""
+
+# Standard library imports
+import binascii
+import hashlib
+import multiprocessing
+import os
+import os.path as osp
+import re
+import sre_constants
+import sre_parse
+import threading
+import time
+
+# Local imports
+from spyder.config.base import get_conf_path
+from spyder.py3compat import PY2, is_text_string, pickle, to_binary_string
+from spyder.utils.external.binaryornot.helpers import is_binary_string
+
+if PY2:
+    from itertools import izip as zip
+
+
+# Size of the blocks read from disk when scanning a file
+CHUNK_SIZE = 1024 * 1024
+
+# Number of bytes used to decide if a file is binary (same as binaryornot)
+SNIFF_SIZE = 1024
+
+# Extensions always considered as binary (same as binaryornot)
+BINARY_EXTENSIONS = ('pyc', 'iso', 'zip', 'pdf')
+
+# Number of threads used to scan files
+SEARCH_WORKERS = max(2, min(8, multiprocessing.cpu_count()))
+
+# Directory where file indexes are saved
+INDEX_PATH = get_conf_path('findinfiles')
+
+# Bump this when the pickled index layout changes
+INDEX_VERSION = 1
+
+# Indexes already loaded in this session
+_INDEXES = {}
+
+
+#==============================================================================
+# File index
+#==============================================================================
+def _list_dir(path):
+    """
+    Return sorted lists of subdirectory and file names of path.
+
+    Links to directories are left out, like os.walk does, so that link
+    cycles can't be followed forever.
+    """
+    dirs, files = [], []
+    if hasattr(os, 'scandir'):
+        for entry in os.scandir(path):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif not entry.is_dir():
+                    files.append(entry.name)
+            except OSError:
+                pass
+    else:
+        for name in os.listdir(path):
+            fullname = osp.join(path, name)
+            if not osp.isdir(fullname):
+                files.append(name)
+            elif not osp.islink(fullname):
+                dirs.append(name)
+    dirs.sort()
+    files.sort()
+    return dirs, files
+
+
+class FileIndex(object):
+    """
+    Persistent index of the files found under a root directory.
+
+    Directories are stored with their mtime and contents, so that unchanged
+    directories are not listed again. Files are stored with their mtime,
+    size and a text/binary flag, which is filled by the search workers.
+    """
+
+    def __init__(self, rootpath, index_path=INDEX_PATH):
+        self.rootpath = osp.abspath(rootpath)
+        self.filename = osp.join(index_path, hashlib.md5(
+            to_binary_string(self.rootpath, 'utf-8')).hexdigest())
+        self.dirs = {}
+        self.files = {}
+        self.modified = False
+
+    def load(self):
+        """Load index from disk, if it exists and it's valid."""
+        try:
+            with open(self.filename, 'rb') as fdesc:
+                version, rootpath, dirs, files = pickle.load(fdesc)
+        except Exception:
+            return False
+        if version != INDEX_VERSION or rootpath != self.rootpath:
+            return False
+        self.dirs, self.files = dirs, files
+        self.modified = False
+        return True
+
+    def save(self):
+        """Save index to disk if it was modified."""
+        if not self.modified:
+            return
+        dirname = osp.dirname(self.filename)
+        tmp_filename = self.filename + '.tmp'
+        try:
+            if not osp.isdir(dirname):
+                os.makedirs(dirname)
+            with open(tmp_filename, 'wb') as fdesc:
+                pickle.dump((INDEX_VERSION, self.rootpath, self.dirs,
+                             self.files), fdesc, pickle.HIGHEST_PROTOCOL)
+            if os.name == 'nt' and osp.isfile(self.filename):
+                os.remove(self.filename)
+            os.rename(tmp_filename, self.filename)
+            self.modified = False
+        except (IOError, OSError):
+            pass
+
+    def _get_dir(self, path):
+        """Return (dirs, files) of path, listing it only if it changed."""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        cached = self.dirs.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
+        try:
+            dirs, files = _list_dir(path)
+        except OSError:
+            dirs, files = [], []
+        if cached is not None:
+            for name in set(cached[2]) - set(files):
+                self.files.pop(osp.join(path, name), None)
+        self.dirs[path] = (mtime, dirs, files)
+        self.modified = True
+        return dirs, files
+
+    def iter_files(self, exclude=None, stopped=None, relative=False):
+        """
+        Yield (filename, entry) for every file under the root directory.
+
+        `entry` is the cached (mtime, size, is_text) tuple, or None if the
+        file was never scanned. Directories and files whose path matches the
+        `exclude` regexp are skipped; the path is absolute (as Find in Files
+        always did), or relative to the root directory if `relative` is True
+        (as for project files). Iteration ends as soon as `stopped()` is
+        True.
+        """
+        prefix = len(osp.join(self.rootpath, '')) if relative else 0
+        stack = [self.rootpath]
+        while stack:
+            if stopped is not None and stopped():
+                return
+            path = stack.pop()
+            dirs, files = self._get_dir(path)
+            for name in files:
+                filename = osp.join(path, name)
+                if (exclude is not None and
+                        exclude.search(filename[prefix:])):
+                    continue
+                yield filename, self.files.get(filename)
+            for name in reversed(dirs):
+                dirname = osp.join(path, name)
+                if (exclude is not None and
+                        exclude.search(dirname[prefix:] + os.sep)):
+                    continue
+                stack.append(dirname)
+
+    def update_file(self, filename, entry):
+        """Update the cached entry of a file."""
+        if entry is None:
+            if self.files.pop(filename, None) is not None:
+                self.modified = True
+        elif self.files.get(filename) != entry:
+            self.files[filename] = entry
+            self.modified = True
+
+
+class FileList(object):
+    """
+    Sorted list of the files under a root directory.
+
+    The list is updated from a persistent FileIndex, so that only the
+    directories whose mtime changed are listed again. Directories and files
+    whose path relative to the root directory matches the `exclude` regexp
+    are left out (like in project preferences).
+    """
+
+    def __init__(self, rootpath, index_path, exclude=None):
+        self.rootpath = osp.abspath(rootpath)
+        self.exclude = exclude
+        self.file_index = FileIndex(self.rootpath, index_path=index_path)
+        self.file_index.filename = osp.join(index_path, 'file_list')
+        self.lock = threading.Lock()
+        self.closed = False
+        self.loaded = False
+        # (revision, paths relative to the root directory, base names)
+        self.files = (0, [], [])
+
+    def close(self):
+        """Stop any running update."""
+        self.closed = True
+
+    def update(self, stopped=None):
+        """
+        Update the list (used to build it in the background).
+
+        Return True if the list changed.
+        """
+        def _stopped():
+            return self.closed or (stopped is not None and stopped())
+
+        with self.lock:
+            if not self.loaded:
+                self.file_index.load()
+                self.loaded = True
+            start = len(osp.join(self.rootpath, ''))
+            paths = [filename[start:] for filename, _entry in
+                     self.file_index.iter_files(exclude=self.exclude,
+                                                stopped=_stopped,
+                                                relative=True)]
+            if _stopped():
+                return False
+            self.file_index.save()
+            paths.sort()
+            revision, old_paths, _names = self.files
+            if paths == old_paths:
+                return False
+            self.files = (revision + 1, paths,
+                          [osp.basename(path) for path in paths])
+            return True
+
+
+def get_file_index(rootpath):
+    """Return the (loaded) file index associated to rootpath."""
+    rootpath = osp.abspath(rootpath)
+    index = _INDEXES.get(rootpath)
+    if index is None:
+        index = FileIndex(rootpath)
+        index.load()
+        _INDEXES[rootpath] = index
+    return index
+
+
+#==============================================================================
+# File scanning
+#==============================================================================
+def _is_text_chunk(filename, chunk):
+    """Return True if chunk (start of filename) looks like text."""
+    if filename.endswith(BINARY_EXTENSIONS):
+        return False
+    return not is_binary_string(chunk[:SNIFF_SIZE])
+
+
+def _get_prefilters(texts, text_re):
+    """Return the functions used to discard blocks without matches."""
+    if not text_re:
+        return [lambda block, text=text: text in block for text, _enc in texts]
+    prefilters = []
+    for text, _enc in texts:
+        pattern = text.pattern
+        if is_text_string(pattern):
+            pattern = to_binary_string(pattern, 'utf-8')
+        if b'\\A' in pattern or b'\\Z' in pattern:
+            # These anchors can't be checked on a block of several lines
+            return [lambda block: True]
+        regexp = re.compile(text.pattern, text.flags | re.MULTILINE)
+        prefilters.append(regexp.search)
+    return prefilters
+
+
+def find_in_line(line, texts, text_re):
+    """
+    Return the matches found in line as a list of (start, end, line_dec).
+
+    `texts` is a list of (text, encoding) tuples, with text being a binary
+    string or a compiled regexp. The first text found in line is used, and
+    line is decoded with its encoding.
+    """
+    found = None
+    for text, enc in texts:
+        if text_re:
+            found = text.search(line)
+            if found is not None:
+                break
+        else:
+            found = line.find(text)
+            if found > -1:
+                break
+    if found is None or found == -1:
+        return []
+    try:
+        line_dec = line.decode(enc)
+    except UnicodeDecodeError:
+        line_dec = line
+    matches = []
+    if text_re:
+        for match in text.finditer(line):
+            matches.append((match.start(), match.end(), line_dec))
+    else:
+        while found > -1:
+            matches.append((found, found + len(text), line_dec))
+            found = line.find(text, found + 1)
+    return matches
+
+
+def find_in_file(filename, texts, text_re, entry=None, chunk_size=CHUNK_SIZE):
+    """
+    Search texts in filename.
+
+    The file is read in blocks of `chunk_size` bytes, and only blocks
+    accepted by a fast whole-block scan are split into lines.
+
+    `entry` is the (mtime, size, is_text) tuple cached for this file; it's
+    used to skip known binary files without reading them.
+
+    Return (entry, matches), with the updated entry (None if the file can't
+    be accessed) and a list of (lineno, start, end, line_dec) tuples.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None, []
+    mtime, size = stat.st_mtime, stat.st_size
+    known = entry is not None and entry[:2] == (mtime, size)
+    if known and not entry[2]:
+        return entry, []
+
+    prefilters = _get_prefilters(texts, text_re)
+    matches = []
+    lineno = 1
+    remainder = b''
+    with open(filename, 'rb') as fdesc:
+        chunk = fdesc.read(chunk_size)
+        if not known:
+            is_text = _is_text_chunk(filename, chunk)
+            entry = (mtime, size, is_text)
+            if not is_text:
+                return entry, []
+        while chunk:
+            block = remainder + chunk
+            chunk = fdesc.read(chunk_size)
+            if chunk:
+                end = block.rfind(b'\n') + 1
+                block, remainder = block[:end], block[end:]
+            if block and any(prefilter(block) for prefilter in prefilters):
+                lines = block.split(b'\n')
+                last = lines.pop()
+                for offset, line in enumerate(lines):
+                    for match in find_in_line(line + b'\n', texts, text_re):
+                        matches.append((lineno + offset,) + match)
+                if last:
+                    for match in find_in_line(last, texts, text_re):
+                        matches.append((lineno + len(lines),) + match)
+            lineno += block.count(b'\n')
+    return entry, matches
+
+
+#==============================================================================
+# Trigram index
+#==============================================================================
+# Files bigger than this are never indexed (they are always searched)
+MAX_INDEXED_FILE_SIZE = 1024 * 1024
+
+# Minimum and maximum number of bits of a file signature
+MIN_SIGNATURE_BITS = 256
+MAX_SIGNATURE_BITS = 32768
+
+# Trigram indexes registered by projects, by root path
+_TRIGRAM_INDEXES = {}
+
+
+def get_trigrams(data):
+    """Return the set of trigrams (as integers) of a binary string."""
+    data = bytearray(data)
+    return set((a << 16) | (b << 8) | c
+               for a, b, c in zip(data, data[1:], data[2:]))
+
+
+def get_signature(trigrams, nbits):
+    """
+    Return the signature of a set of trigrams: an integer of nbits bits
+    (a power of two), with the bit associated to each trigram set.
+    """
+    shift = 32 - (nbits.bit_length() - 1)
+    buf = bytearray(nbits // 8)
+    for trigram in trigrams:
+        bit = ((trigram * 0x9E3779B1) & 0xFFFFFFFF) >> shift
+        buf[bit >> 3] |= 1 << (bit & 7)
+    return int(binascii.hexlify(bytes(buf)), 16)
+
+
+def get_signature_bits(num_trigrams):
+    """Return the signature size used for a file with num_trigrams."""
+    nbits = MIN_SIGNATURE_BITS
+    while nbits < 4 * num_trigrams and nbits < MAX_SIGNATURE_BITS:
+        nbits *= 2
+    return nbits
+
+
+def _get_regexp_literals(regexp):
+    """Return the literal strings that must be part of any regexp match."""
+    if regexp.flags & re.IGNORECASE:
+        return []
+    try:
+        parsed = sre_parse.parse(regexp.pattern, regexp.flags)
+    except Exception:
+        return []
+    state = getattr(parsed, 'state', None) or getattr(parsed, 'pattern')
+    if state.flags & re.IGNORECASE:
+        return []
+
+    literals = []
+
+    def add_literals(items):
+        """Add the literals of items; return False if they can't be used."""
+        current = bytearray()
+        for opcode, value in items:
+            if opcode == sre_constants.LITERAL and value < 256:
+                current.append(value)
+                continue
+            if len(current) >= 3:
+                literals.append(bytes(current))
+            current = bytearray()
+            if opcode == sre_constants.SUBPATTERN:
+                # Groups with scoped flags, like (?i:spam), are stored as
+                # (group, add_flags, del_flags, pattern) since Python 3.6
+                if len(value) == 4 and (value[1] or value[2]):
+                    return False
+                if not add_literals(value[-1]):
+                    return False
+        if len(current) >= 3:
+            literals.append(bytes(current))
+        return True
+
+    if not add_literals(parsed):
+        return []
+    return literals
+
+
+def get_query_literals(texts, text_re):
+    """
+    Return, for each searched text, the literal strings any match must
+    contain; return None if a text has no literal of three bytes or more.
+    """
+    queries = []
+    for text, _enc in texts:
+        if text_re:
+            literals = _get_regexp_literals(text)
+        elif len(text) >= 3:
+            literals = [text]
+        else:
+            literals = []
+        if not literals:
+            return None
+        queries.append(literals)
+    return queries
+
+
+def is_excluded(filename, rootpath, exclude, cache=None, relative=False):
+    """
+    Return True if the path of filename, or of one of its directories under
+    rootpath, matches the exclude regexp (in the same way as
+    FileIndex.iter_files, with paths relative to rootpath if `relative` is
+    True).
+    """
+    if exclude is None:
+        return False
+    prefix = len(osp.join(rootpath, '')) if relative else 0
+    if exclude.search(filename[prefix:]):
+        return True
+    dirname = osp.dirname(filename)
+    while len(dirname) > len(rootpath):
+        if cache is not None and dirname in cache:
+            excluded = cache[dirname]
+        else:
+            excluded = exclude.search(dirname[prefix:] + os.sep) is not None
+            if cache is not None:
+                cache[dirname] = excluded
+        if excluded:
+            return True
+        dirname = osp.dirname(dirname)
+    return False
+
+
+class TrigramIndex(object):
+    """
+    Persistent trigram index of the text files of a directory.
+
+    For each file, a signature is kept: a bit array in which a bit is set
+    for each trigram (sequence of three bytes) of the file. A file can only
+    contain a string if its signature has the bits of all the trigrams of
+    that string set, so queries only need to read the files whose signature
+    matches. Files are re-indexed when their mtime or size change.
+
+    Files are not indexed (and are always searched) if they're too big or if
+    their signature would make all signatures take more than `max_size`
+    bytes. This only bounds the signatures: the index also keeps the mtime
+    and size of every file, so it takes somewhat more space on disk.
+
+    Each query checks all files for changes first: only the directories
+    whose mtime changed are listed again, but every file is stat'ed, so that
+    files modified outside Spyder are found. Files passed to `file_changed`
+    are indexed again even if their mtime and size didn't change.
+    Directories and files whose path relative to the root directory matches
+    the `exclude` regexp (like in project preferences), as well as the index
+    itself, are not indexed.
+    """
+
+    def __init__(self, rootpath, index_path, max_size=None, exclude=None):
+        self.rootpath = osp.abspath(rootpath)
+        self.index_path = osp.abspath(index_path)
+        self.filename = osp.join(index_path, 'trigrams')
+        self.max_size = max_size
+        self.exclude = exclude
+        self.file_index = FileIndex(self.rootpath, index_path=index_path)
+        self.file_index.filename = osp.join(index_path, 'files')
+        self.lock = threading.Lock()
+        self.closed = False
+        # filename -> (mtime, size, nbits, signature)
+        # nbits is 0 for binary files and None for files not indexed
+        self.files = {}
+        self.signatures_size = 0
+        self.modified = False
+        self.loaded = False
+        self.changed_files = set()
+        self.build_time = None
+        self.query_time = None
+        self.num_candidates = None
+
+    def load(self):
+        """Load index from disk, if it exists and it's valid."""
+        self.file_index.load()
+        try:
+            with open(self.filename, 'rb') as fdesc:
+                version, rootpath, files = pickle.load(fdesc)
+        except Exception:
+            return False
+        if version != INDEX_VERSION or rootpath != self.rootpath:
+            return False
+        self.files = files
+        self.signatures_size = sum(entry[2] // 8 for entry in files.values()
+                                   if entry[2])
+        return True
+
+    def save(self):
+        """Save index to disk if it was modified."""
+        self.file_index.save()
+        if not self.modified:
+            return
+        dirname = osp.dirname(self.filename)
+        tmp_filename = self.filename + '.tmp'
+        try:
+            if not osp.isdir(dirname):
+                os.makedirs(dirname)
+            with open(tmp_filename, 'wb') as fdesc:
+                pickle.dump((INDEX_VERSION, self.rootpath, self.files), fdesc,
+                            pickle.HIGHEST_PROTOCOL)
+            if os.name == 'nt' and osp.isfile(self.filename):
+                os.remove(self.filename)
+            os.rename(tmp_filename, self.filename)
+            self.modified = False
+        except (IOError, OSError):
+            pass
+
+    def get_size_on_disk(self):
+        """Return the size of the saved index, in bytes."""
+        size = 0
+        for filename in (self.filename, self.file_index.filename):
+            try:
+                size += os.stat(filename).st_size
+            except OSError:
+                pass
+        return size
+
+    def close(self):
+        """Stop any running update."""
+        self.closed = True
+
+    def file_changed(self, filename):
+        """Index filename again on the next query (e.g. after saving it)."""
+        filename = osp.abspath(filename)
+        if filename.startswith(osp.join(self.rootpath, '')):
+            self.changed_files.add(filename)
+
+    def _index_file(self, filename, stat):
+        """Return the index entry of a file."""
+        mtime, size = stat.st_mtime, stat.st_size
+        if size > MAX_INDEXED_FILE_SIZE:
+            return (mtime, size, None, None)
+        with open(filename, 'rb') as fdesc:
+            data = fdesc.read()
+        if not _is_text_chunk(filename, data):
+            return (mtime, size, 0, 0)
+        trigrams = get_trigrams(data)
+        nbits = get_signature_bits(len(trigrams))
+        if (self.max_size is not None and
+                self.signatures_size + nbits // 8 > self.max_size):
+            return (mtime, size, None, None)
+        return (mtime, size, nbits, get_signature(trigrams, nbits))
+
+    def _update_file(self, filename, force=False):
+        """
+        Index filename again if it changed (or if `force` is True), or drop
+        it if it's gone.
+        """
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            stat = None
+        entry = self.files.get(filename)
+        if (not force and stat is not None and entry is not None and
+                entry[:2] == (stat.st_mtime, stat.st_size)):
+            return
+        if entry is not None and entry[2]:
+            self.signatures_size -= entry[2] // 8
+        if stat is None:
+            if self.files.pop(filename, None) is not None:
+                self.modified = True
+            return
+        try:
+            entry = self._index_file(filename, stat)
+        except (IOError, OSError):
+            # Keep the signatures size consistent with self.files
+            if self.files.pop(filename, None) is not None:
+                self.modified = True
+            return
+        if entry[2]:
+            self.signatures_size += entry[2] // 8
+        self.files[filename] = entry
+        self.modified = True
+
+    def _update(self, stopped=None):
+        """Update the index with the files that changed since last time."""
+        if not self.loaded:
+            self.load()
+            self.loaded = True
+        t0 = time.time()
+        found = set()
+        index_prefix = osp.join(self.index_path, '')
+        changed_files, self.changed_files = self.changed_files, set()
+        for filename, _entry in self.file_index.iter_files(
+                exclude=self.exclude, stopped=stopped, relative=True):
+            if self.closed or (stopped is not None and stopped()):
+                self.changed_files |= changed_files
+                return False
+            if filename.startswith(index_prefix):
+                continue
+            found.add(filename)
+            self._update_file(filename, force=filename in changed_files)
+        for filename in set(self.files) - found:
+            entry = self.files.pop(filename)
+            if entry[2]:
+                self.signatures_size -= entry[2] // 8
+            self.modified = True
+        self.save()
+        self.build_time = time.time() - t0
+        return True
+
+    def update(self, stopped=None):
+        """Update the index (used to build it in the background)."""
+        with self.lock:
+            return self._update(stopped)
+
+    def query(self, texts, text_re, stopped=None):
+        """
+        Return the files that may contain one of texts, as a sorted list of
+        filenames, or None if the index can't be used for this query or if
+        it's being updated.
+        """
+        queries = get_query_literals(texts, text_re)
+        if queries is None:
+            return None
+        if not self.lock.acquire(False):
+            return None
+        try:
+            if not self._update(stopped):
+                return None
+            t0 = time.time()
+            masks = {}
+            candidates = []
+            for filename, entry in self.files.items():
+                nbits, signature = entry[2:]
+                if nbits is None:
+                    candidates.append(filename)
+                    continue
+                if not nbits:
+                    continue
+                if nbits not in masks:
+                    masks[nbits] = [
+                        get_signature(set().union(*[get_trigrams(literal)
+                                                    for literal in literals]),
+                                      nbits)
+                        for literals in queries]
+                for mask in masks[nbits]:
+                    if signature & mask == mask:
+                        candidates.append(filename)
+                        break
+            candidates.sort()
+            self.query_time = time.time() - t0
+            self.num_candidates = len(candidates)
+            return candidates
+        finally:
+            self.lock.release()
+
+    def get_stats(self):
+        """Return a dict with the index statistics."""
+        return dict(num_files=len(self.files),
+                    size_on_disk=self.get_size_on_disk(),
+                    build_time=self.build_time,
+                    query_time=self.query_time,
+                    num_candidates=self.num_candidates)
+
+
+def register_trigram_index(index):
+    """Make index available to searches under its root path."""
+    _TRIGRAM_INDEXES[index.rootpath] = index
+
+
+def unregister_trigram_index(rootpath):
+    """Remove the index registered for rootpath, if any, and return it."""
+    index = _TRIGRAM_INDEXES.pop(osp.abspath(rootpath), None)
+    if index is not None:
+        index.close()
+    return index
+
+
+def get_trigram_index(rootpath):
+    """Return the trigram index registered for rootpath, or None."""
+    return _TRIGRAM_INDEXES.get(osp.abspath(rootpath))
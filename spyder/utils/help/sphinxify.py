@@ -17,19 +17,26 @@ www.sagemath.org/doc/reference/sagenb/misc/sphinxify.html
 """
 
 # Stdlib imports
+import atexit
+from collections import OrderedDict
 import codecs
 import os
 import os.path as osp
 import shutil
 import sys
+import threading
 from tempfile import mkdtemp
 from xml.sax.saxutils import escape
 
 # 3rd party imports
+from docutils.core import publish_doctree
+from docutils.io import StringOutput
+from docutils.transforms.universal import FilterMessages
 from docutils.utils import SystemMessage as SystemMessage
 from jinja2 import Environment, FileSystemLoader
 import sphinx
 from sphinx.application import Sphinx
+from sphinx.util.docutils import sphinx_domains
 
 # Local imports
 from spyder.config.base import (_, get_module_data_path,
@@ -59,6 +66,16 @@ JQUERY_PATH = get_module_data_path('spyder',
                                                     JS_PATH),
                                    attr_name='JQUERYPATH')
 
+# Number of rendered docstrings kept in memory
+CACHE_SIZE = 100
+
+# Rendered docstrings, from least to most recently used, and Sphinx renderers
+# by builder name
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_renderers = {}
+_renderers_lock = threading.Lock()
+
 #-----------------------------------------------------------------------------
 # Utility functions
 #-----------------------------------------------------------------------------
@@ -146,6 +163,9 @@ def sphinxify(docstring, context, buildername='html'):
     """
     Runs Sphinx on a docstring and outputs the processed documentation.
 
+    Rendered docstrings are cached, so rendering the same docstring with
+    the same context again returns immediately.
+
     Parameters
     ----------
     docstring : str
@@ -163,18 +183,11 @@ def sphinxify(docstring, context, buildername='html'):
     An Sphinx-processed string, in either HTML or plain text format, depending
     on the value of `buildername`
     """
-
-    srcdir = mkdtemp()
-    srcdir = encoding.to_unicode_from_fs(srcdir)
-
-    base_name = osp.join(srcdir, 'docstring')
-    rst_name = base_name + '.rst'
-
-    if buildername == 'html':
-        suffix = '.html'
-    else:
-        suffix = '.txt'
-    output_name = base_name + suffix
+    key = (docstring, buildername, tuple(sorted(context.items())))
+    with _cache_lock:
+        if key in _cache:
+            _cache[key] = output = _cache.pop(key)
+            return output
 
     # This is needed so users can type \\ on latex eqnarray envs inside raw
     # docstrings
@@ -189,51 +202,126 @@ def sphinxify(docstring, context, buildername='html'):
     for char in ['=', ',', '(', ')', '*', '**']:
         argspec = argspec.replace(char,
                          '<span class="argspec-highlight">' + char + '</span>')
-    context['argspec'] = argspec
-
-    doc_file = codecs.open(rst_name, 'w', encoding='utf-8')
-    doc_file.write(docstring)
-    doc_file.close()
-    
-    temp_confdir = False
-    if temp_confdir:
-        # TODO: This may be inefficient. Find a faster way to do it.
-        confdir = mkdtemp()
-        confdir = encoding.to_unicode_from_fs(confdir)
-        generate_configuration(confdir)
-    else:
-        confdir = osp.join(get_module_source_path('spyder.utils.help'))
-
-    confoverrides = {'html_context': context}
-
-    doctreedir = osp.join(srcdir, 'doctrees')
-
-    sphinx_app = Sphinx(srcdir, confdir, srcdir, doctreedir, buildername,
-                        confoverrides, status=None, warning=None,
-                        freshenv=True, warningiserror=False, tags=None)
-    try:
-        sphinx_app.build(None, [rst_name])
-    except SystemMessage:
+    context = dict(context, argspec=argspec)
+
+    with _renderers_lock:
+        renderer = _renderers.get(buildername)
+        if renderer is None:
+            renderer = _renderers[buildername] = SphinxRenderer(buildername)
+        try:
+            output = renderer.render(docstring, context)
+        except SystemMessage:
+            output = None
+    if output is None:
         output = _("It was not possible to generate rich text help for this "
                     "object.</br>"
                     "Please see it in plain text.")
         return warning(output)
+    output = output.replace('<pre>', '<pre class="literal-block">')
 
-    # TODO: Investigate if this is necessary/important for us
-    if osp.exists(output_name):
-        output = codecs.open(output_name, 'r', encoding='utf-8').read()
-        output = output.replace('<pre>', '<pre class="literal-block">')
-    else:
-        output = _("It was not possible to generate rich text help for this "
-                    "object.</br>"
-                    "Please see it in plain text.")
-        return warning(output)
+    with _cache_lock:
+        _cache[key] = output
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return output
 
-    if temp_confdir:
-        shutil.rmtree(confdir, ignore_errors=True)
-    shutil.rmtree(srcdir, ignore_errors=True)
 
-    return output
+class SphinxRenderer(object):
+    """
+    Sphinx application kept between docstring renders.
+
+    Creating a Sphinx application loads its configuration and extensions
+    and compiles the layout templates, which takes longer than rendering
+    a docstring, so the same application is used for all docstrings. The
+    application is created again when the math option changes, because it
+    selects the extensions to load.
+
+    Docstrings are parsed with docutils in the Sphinx environment and
+    written by the Sphinx builder in memory, so nothing is read from or
+    written to disk after the application is created.
+    """
+
+    docname = 'docstring'
+
+    def __init__(self, buildername='html'):
+        self.buildername = buildername
+        self.app = None
+        self.math_on = None
+        self.page = None
+        self.srcdir = encoding.to_unicode_from_fs(mkdtemp())
+        atexit.register(shutil.rmtree, self.srcdir, ignore_errors=True)
+
+    def render(self, docstring, context):
+        """
+        Render docstring with the layout template variables in context.
+
+        Returns the processed docstring, or None if Sphinx did not write
+        it.
+        """
+        if self.app is None or context['math_on'] != self.math_on:
+            self.create_app(context)
+
+        try:
+            doctree = self.read(docstring)
+            return self.write(doctree, context)
+        except Exception:
+            # Don't reuse an application left in an unknown state
+            self.app = None
+            raise
+
+    def create_app(self, context):
+        """Create the Sphinx application and prepare its builder."""
+        outdir = osp.join(self.srcdir, 'output')
+        doctreedir = osp.join(self.srcdir, 'doctrees')
+        self.app = Sphinx(self.srcdir, CONFDIR_PATH, outdir, doctreedir,
+                          self.buildername, {'html_context': context},
+                          status=None, warning=None, freshenv=True,
+                          warningiserror=False, tags=None)
+        self.app.builder.prepare_writing({self.docname})
+        if self.buildername == 'html':
+            # Keep pages instead of writing them to the output directory
+            self.app.builder.handle_page = self.handle_page
+        self.math_on = context['math_on']
+
+    def read(self, docstring):
+        """Parse docstring as the Sphinx builder does for a source file."""
+        env = self.app.env
+        env.prepare_settings(self.docname)
+        # Sphinx logs the docutils warnings instead of writing them to
+        # stderr and leaving them in the document, and the application
+        # doesn't show its warnings
+        settings = dict(env.settings, report_level=5)
+        with sphinx_domains(env):
+            doctree = publish_doctree(docstring, source_path=self.docname,
+                                      settings_overrides=settings)
+        doctree.transformer.add_transform(FilterMessages)
+        doctree.transformer.apply_transforms()
+        # Let extensions and the environment collect titles and tocs
+        self.app.emit('doctree-read', doctree)
+        env.resolve_references(doctree, self.docname, self.app.builder)
+        return doctree
+
+    def write(self, doctree, context):
+        """Write doctree with the Sphinx builder and return the output."""
+        builder = self.app.builder
+        if self.buildername == 'html':
+            # Template variables are read at each page
+            builder.globalcontext.update(context)
+            builder.write_doc(self.docname, doctree)
+            page, self.page = self.page, None
+            return page
+        else:
+            builder.current_docname = self.docname
+            builder.secnumbers = {}
+            builder.writer.write(doctree, StringOutput(encoding='unicode'))
+            return builder.writer.output
+
+    def handle_page(self, pagename, addctx, templatename='page.html',
+                    outfilename=None, event_arg=None):
+        """Render the page of the HTML builder in memory."""
+        ctx = self.app.builder.globalcontext.copy()
+        ctx.update(addctx)
+        self.page = self.app.builder.templates.render(templatename, ctx)
 
 
 def generate_configuration(directory):
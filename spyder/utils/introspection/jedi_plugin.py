@@ -18,7 +18,9 @@ from spyder.utils.debug import log_last_error, log_dt
 from spyder.utils.dochelpers import getsignaturefromtext
 from spyder.utils.introspection.manager import (
     DEBUG_EDITOR, LOG_FILENAME, IntrospectionPlugin)
-from spyder.utils.introspection.utils import get_parent_until
+from spyder.utils.introspection.utils import (
+    CacheWarmer, IntrospectionCache, PRELOAD_PACKAGES, get_package_path,
+    get_parent_until)
 from spyder.utils.introspection.manager import JEDI_REQVER
 
 try:
@@ -46,8 +48,23 @@ class JediPlugin(IntrospectionPlugin):
         if not programs.is_module_installed('jedi', JEDI_REQVER):
             raise ImportError('Requires Jedi %s' % JEDI_REQVER)
         jedi.settings.case_insensitive_completion = False
-        for lib in ['numpy', 'matplotlib']:
-            jedi.preload_module(lib)
+
+        # Keep Jedi's parser cache per interpreter and warm it up from
+        # startup and between requests (starting with numpy and
+        # matplotlib), so that the first completion is not slower than the
+        # others
+        self.cache = IntrospectionCache(self.name)
+        jedi.settings.cache_directory = self.cache.path
+        self.warmer = CacheWarmer(self.cache, jedi.preload_module,
+                                  PRELOAD_PACKAGES, evict=self.evict)
+
+    def close_plugin(self):
+        """Save the list of packages to warm up in the next session"""
+        self.cache.save()
+
+    def warm_up_caches(self):
+        """Warm up Jedi's parser cache for the next package queued"""
+        return self.warmer.warm_up_next()
 
     def get_completions(self, info):
         """Return a list of (completion, type) tuples"""
@@ -152,6 +169,24 @@ class JediPlugin(IntrospectionPlugin):
         return module_path, line_nr
 
     # ---- Private API -------------------------------------------------------
+    def evict(self, name):
+        """Drop the modules of a package from Jedi's parser cache"""
+        path = get_package_path(name)
+        if path is None:
+            return
+        try:
+            # Jedi 0.11+ keeps one cache per grammar in parso
+            from parso.cache import parser_cache
+            caches = list(parser_cache.values())
+        except ImportError:
+            from jedi.parser.cache import parser_cache
+            caches = [parser_cache]
+        for cache in caches:
+            for filename in list(cache):
+                if filename and (filename == path or
+                                 filename.startswith(path + osp.sep)):
+                    del cache[filename]
+
 
     def get_jedi_object(self, func_name, info, use_filename=True):
         """Call a desired function on a Jedi Script and return the result"""
@@ -168,6 +203,7 @@ class JediPlugin(IntrospectionPlugin):
 
         if use_filename:
             filename = info['filename']
+            self.warmer.add_from_source(info['source_code'])
         else:
             filename = None
 
@@ -59,26 +59,23 @@ class PluginManager(QObject):
             plugins[name] = plugin
             plugin.received.connect(self.handle_response)
         self.plugins = plugins
-        self.timer = QTimer()
-        self.desired = []
-        self.ids = dict()
-        self.info = None
-        self.request = None
-        self.pending = None
-        self.pending_request = None
-        self.waiting = False
+        # In-flight requests, one per kind of request (i.e. `info.name`)
+        self.requests = dict()
 
     def send_request(self, info):
-        """Handle an incoming request from the user."""
-        if self.waiting:
-            if info.serialize() != self.info.serialize():
-                self.pending_request = info
-            else:
-                debug_print('skipping duplicate request')
+        """Handle an incoming request from the user.
+
+        Requests of different kinds are kept in flight at the same time
+        (each plugin server still runs them one at a time), while a new
+        request supersedes the one of the same kind, if any.
+        """
+        current = self.requests.get(info.name)
+        if (current is not None and current['waiting'] and
+                info.serialize() == current['info'].serialize()):
+            debug_print('skipping duplicate request')
             return
         debug_print('%s request' % info.name)
         desired = None
-        self.info = info
         editor = info.editor
         if (info.name == 'completion' and 'jedi' not in self.plugins and
                 info.line.lstrip().startswith(('import ', 'from '))):
@@ -92,68 +89,74 @@ class PluginManager(QObject):
         plugins = self.plugins.values()
         if desired:
             plugins = [self.plugins[desired]]
-            self.desired = [desired]
+            desired = [desired]
         elif (info.name == 'definition' and not info.editor.is_python() or
               info.name == 'info'):
-            self.desired = list(self.plugins.keys())
+            desired = list(self.plugins.keys())
         else:
             # Use all but the fallback
             plugins = list(self.plugins.values())[:-1]
-            self.desired = list(self.plugins.keys())[:-1]
+            desired = list(self.plugins.keys())[:-1]
 
-        self._start_time = time.time()
-        self.waiting = True
+        request = dict(info=info, desired=desired, ids=dict(), pending=None,
+                       waiting=True, start_time=time.time())
+        self.requests[info.name] = request
         method = 'get_%s' % info.name
         value = info.serialize()
-        self.ids = dict()
         for plugin in plugins:
             request_id = plugin.request(method, value)
-            self.ids[request_id] = plugin.name
-        self.timer.stop()
-        self.timer.singleShot(LEAD_TIME_SEC * 1000, self._handle_timeout)
+            request['ids'][request_id] = plugin.name
+        QTimer.singleShot(LEAD_TIME_SEC * 1000,
+                          lambda: self._handle_timeout(request))
 
     def validate(self):
         for plugin in self.plugins.values():
             plugin.request('validate')
 
     def handle_response(self, response):
-        name = self.ids.get(response['request_id'], None)
-        if not name:
+        for request in list(self.requests.values()):
+            name = request['ids'].get(response['request_id'], None)
+            if name:
+                break
+        else:
+            return
+        if response.get('cancelled', False):
             return
         if response.get('error', None):
             debug_print('Response error:', response['error'])
             return
-        if name == self.desired[0] or not self.waiting:
+        if name == request['desired'][0] or not request['waiting']:
             if response.get('result', None):
-                self._finalize(response)
+                self._finalize(request, response)
         else:
-            self.pending = response
+            request['pending'] = response
 
     def close(self):
         for name, plugin in self.plugins.items():
             plugin.close()
             debug_print("Introspection Plugin Closed: {}".format(name))
 
-    def _finalize(self, response):
-        self.waiting = False
-        self.pending = None
-        if self.info:
-            delta = time.time() - self._start_time
-            debug_print('%s request from %s finished: "%s" in %.1f sec'
-                % (self.info.name, response['name'],
-                   str(response['result'])[:100], delta))
-            response['info'] = self.info
-            self.introspection_complete.emit(response)
-            self.info = None
-        if self.pending_request:
-            info = self.pending_request
-            self.pending_request = None
-            self.send_request(info)
-
-    def _handle_timeout(self):
-        self.waiting = False
-        if self.pending:
-            self._finalize(self.pending)
+    def _finalize(self, request, response):
+        info = request['info']
+        if self.requests.get(info.name) is request:
+            del self.requests[info.name]
+        request['waiting'] = False
+        request['pending'] = None
+        delta = time.time() - request['start_time']
+        timing = response.get('timing', {})
+        debug_print('%s request from %s finished: "%s" in %.1f sec '
+                    '(%.2f sec queued, %.2f sec running)'
+            % (info.name, response['name'], str(response['result'])[:100],
+               delta, timing.get('queued', 0), timing.get('elapsed', 0)))
+        response['info'] = info
+        self.introspection_complete.emit(response)
+
+    def _handle_timeout(self, request):
+        if self.requests.get(request['info'].name) is not request:
+            return
+        request['waiting'] = False
+        if request['pending']:
+            self._finalize(request, request['pending'])
         else:
             debug_print('No valid responses acquired')
 
@@ -342,6 +345,17 @@ class IntrospectionPlugin(object):
         """Initialize the plugin"""
         pass
 
+    def close_plugin(self):
+        """Save the plugin state before its server quits"""
+        pass
+
+    def warm_up_caches(self):
+        """
+        Do a bit of work to warm up the plugin caches while there are no
+        requests, and return True if there's more work left
+        """
+        return False
+
     def get_completions(self, info):
         """Get a list of completions"""
         pass
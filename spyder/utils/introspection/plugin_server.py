@@ -4,27 +4,114 @@
 # Licensed under the terms of the MIT License
 # (see spyder/__init__.py for details)
 
+from collections import OrderedDict
 import sys
+import threading
 import time
 import traceback
 
 import zmq
 
+from spyder.py3compat import Queue
+
 
 # Timeout in milliseconds
 TIMEOUT = 10000
 
+# Polling interval in milliseconds while requests are running
+POLL_INTERVAL = 10
+
+
+class RequestWorker(threading.Thread):
+
+    """
+    Thread running the requests of a server, one at a time.
+
+    Introspection libraries are not thread-safe, so the object of a server
+    is only used from this thread, and requests of different kinds don't
+    run concurrently: a slow request delays the ones queued after it.
+    Requests run in the order their kind was first queued, and only the
+    most recent request of each kind is kept waiting; submitting a new one
+    returns the request it supersedes, if any.
+
+    The idle method of the server is called when the worker starts and
+    whenever there are no requests, until it returns False, and again
+    after each request.
+    """
+
+    def __init__(self, server):
+        super(RequestWorker, self).__init__()
+        self.daemon = True
+        self.server = server
+        self.condition = threading.Condition()
+        # func_name -> request
+        self.requests = OrderedDict()
+        self.stopped = False
+        self.idle = True
+
+    def submit(self, request):
+        """Queue a request and return the one it supersedes."""
+        with self.condition:
+            func_name = request['func_name']
+            superseded = self.requests.get(func_name)
+            self.requests[func_name] = request
+            self.idle = True
+            self.condition.notify()
+        return superseded
+
+    def stop(self, timeout=None):
+        """Drop the waiting requests and wait for the running one."""
+        with self.condition:
+            self.stopped = True
+            self.requests.clear()
+            self.condition.notify()
+        self.join(timeout)
+
+    def run(self):
+        while 1:
+            with self.condition:
+                while (not self.requests and not self.idle and
+                       not self.stopped):
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                if self.requests:
+                    _func_name, request = self.requests.popitem(last=False)
+                else:
+                    request = None
+                    self.idle = False
+            if request is not None:
+                self.server.responses.put(
+                    self.server.handle_request(request))
+                continue
+            try:
+                more = self.server.idle()
+            except Exception:
+                traceback.print_exc()
+                more = False
+            if more:
+                with self.condition:
+                    self.idle = True
+
 
 class AsyncServer(object):
 
     """
     Introspection server, provides a separate process
     for interacting with an object.
+
+    Requests run in a worker thread, started with the server, so the
+    server keeps answering heartbeats meanwhile. A request waiting for the
+    worker is cancelled when a newer one of the same kind (i.e. with the
+    same `func_name`) arrives.
     """
 
     def __init__(self, port, *args):
         self.port = port
         self.object = self.initialize(*args)
+        self.worker = None
+        self.responses = Queue.Queue()
+        self.running = 0
         self.context = zmq.Context()
         self.socket = self.context.socket(zmq.PAIR)
         self.socket.connect("tcp://localhost:%s" % port)
@@ -35,28 +122,55 @@ class AsyncServer(object):
         """
         return object()
 
+    def finalize(self):
+        """Clean up the object before quitting.
+        """
+        pass
+
+    def idle(self):
+        """Do some background work while there are no requests.
+
+        This runs in the worker thread. Return True if there's more work
+        left.
+        """
+        return False
+
     def run(self):
         """Handle requests from the client.
         """
+        self.worker = RequestWorker(self)
+        self.worker.start()
+        try:
+            self._run()
+        finally:
+            self.socket.close(linger=0)
+            self.context.term()
+
+    def _run(self):
+        """Handle requests until the client quits or times out.
+        """
         t0 = time.time()
         initialized = False
-        timed_out = False
+        last_message = t0
         while 1:
+            self.send_responses()
+
             # Poll for events, handling a timeout.
             try:
-                events = self.socket.poll(TIMEOUT)
+                events = self.socket.poll(POLL_INTERVAL if self.running
+                                          else TIMEOUT)
             except KeyboardInterrupt:
                 time.sleep(0.1)
                 continue
-            if events == 0 and initialized:
-                if timed_out:
+            if events == 0:
+                if (initialized and
+                        time.time() - last_message > 2 * TIMEOUT / 1000.):
                     delta = int(time.time() - t0)
                     print('Timed out after %s sec' % delta)  # spyder: test-skip
                     return
-                timed_out = True
                 continue
-            timed_out = False
             initialized = True
+            last_message = time.time()
             # Drain all exising requests, handling quit and heartbeat.
             requests = []
             while 1:
@@ -65,9 +179,12 @@ class AsyncServer(object):
                 except KeyboardInterrupt:
                     time.sleep(0.1)
                     continue
+                request['received'] = time.time()
                 if request['func_name'] == 'server_quit':
                     print('Quitting')  # spyder: test-skip
                     sys.stdout.flush()
+                    self.worker.stop(TIMEOUT / 1000.)
+                    self.finalize()
                     return
                 elif request['func_name'] != 'server_heartbeat':
                     requests.append(request)
@@ -80,23 +197,52 @@ class AsyncServer(object):
                     continue
                 if events == 0:
                     break
-            # Select the most recent request.
-            if not requests:
-                continue
-            request = requests[-1]
+            for request in requests:
+                self.submit(request)
 
-            # Gather the response
-            response = dict(func_name=request['func_name'],
-                            request_id=request['request_id'])
-            try:
-                func = getattr(self.object, request['func_name'])
-                args = request.get('args', [])
-                kwargs = request.get('kwargs', {})
-                response['result'] = func(*args, **kwargs)
-            except Exception:
-                response['error'] = traceback.format_exc()
+    def submit(self, request):
+        """Hand a request to the worker.
 
-            # Send the response to the client.
+        The request of the same kind waiting for the worker, if any, is
+        cancelled.
+        """
+        func_name = request['func_name']
+        superseded = self.worker.submit(request)
+        if superseded is None:
+            self.running += 1
+        else:
+            self.socket.send_pyobj(dict(func_name=func_name,
+                                        request_id=superseded['request_id'],
+                                        cancelled=True))
+
+    def handle_request(self, request):
+        """Run a request and return its response.
+
+        The response includes the time the request waited for its worker
+        and the time it took to run, in seconds.
+        """
+        start = time.time()
+        response = dict(func_name=request['func_name'],
+                        request_id=request['request_id'])
+        try:
+            func = getattr(self.object, request['func_name'])
+            args = request.get('args', [])
+            kwargs = request.get('kwargs', {})
+            response['result'] = func(*args, **kwargs)
+        except Exception:
+            response['error'] = traceback.format_exc()
+        response['timing'] = dict(queued=start - request['received'],
+                                  elapsed=time.time() - start)
+        return response
+
+    def send_responses(self):
+        """Send the responses of the finished requests to the client."""
+        while 1:
+            try:
+                response = self.responses.get_nowait()
+            except Queue.Empty:
+                return
+            self.running -= 1
             self.socket.send_pyobj(response)
 
 
@@ -118,6 +264,19 @@ class PluginServer(AsyncServer):
         plugin.load_plugin()
         return plugin
 
+    def finalize(self):
+        """Let the plugin save its state before quitting.
+        """
+        try:
+            self.object.close_plugin()
+        except Exception:
+            traceback.print_exc()
+
+    def idle(self):
+        """Let the plugin warm up its caches while there are no requests.
+        """
+        return self.object.warm_up_caches()
+
 
 if __name__ == '__main__':
     args = sys.argv[1:]
@@ -10,6 +10,7 @@ Rope introspection plugin
 
 import time
 import imp
+import os.path as osp
 
 from spyder.config.base import get_conf_path, STDERR
 from spyder.utils import encoding, programs
@@ -21,6 +22,8 @@ from spyder.utils.introspection.manager import (
     DEBUG_EDITOR, LOG_FILENAME, IntrospectionPlugin)
 from spyder.utils.introspection.module_completion import (
     get_preferred_submodules)
+from spyder.utils.introspection.utils import (
+    CacheWarmer, IntrospectionCache, PRELOAD_PACKAGES, get_package_path)
 from spyder.utils.introspection.manager import ROPE_REQVER
 
 try:
@@ -61,6 +64,7 @@ class RopePlugin(IntrospectionPlugin):
         if not programs.is_module_installed('rope', ROPE_REQVER):
             raise ImportError('Requires Rope %s' % ROPE_REQVER)
         self.project = None
+        self.cache = IntrospectionCache(self.name)
         self.create_rope_project(root_path=get_conf_path())
         submods = get_preferred_submodules()
         actual = []
@@ -73,6 +77,20 @@ class RopePlugin(IntrospectionPlugin):
         if self.project is not None:
             self.project.prefs.set('extension_modules', actual)
 
+        # Warm up Rope's module cache from startup and between requests, so
+        # that the first completion is not slower than the others
+        self.warmer = CacheWarmer(self.cache, self.warm_up, PRELOAD_PACKAGES,
+                                  evict=self.evict)
+
+    def close_plugin(self):
+        """Save Rope's object database and the packages to warm up"""
+        self.close_rope_project()
+        self.cache.save()
+
+    def warm_up_caches(self):
+        """Warm up Rope's module cache for the next package queued"""
+        return self.warmer.warm_up_next()
+
     def get_completions(self, info):
         """Get a list of (completion, type) tuples using Rope"""
         if self.project is None:
@@ -80,6 +98,7 @@ class RopePlugin(IntrospectionPlugin):
         filename = info['filename']
         source_code = info['source_code']
         offset = info['position']
+        self.warmer.add_from_source(source_code)
 
         # Prevent Rope from returning import completions because
         # it can't handle them. Only Jedi can do it!
@@ -123,6 +142,7 @@ class RopePlugin(IntrospectionPlugin):
         filename = info['filename']
         source_code = info['source_code']
         offset = info['position']
+        self.warmer.add_from_source(source_code)
 
         if PY2:
             filename = filename.encode('utf-8')
@@ -214,6 +234,7 @@ class RopePlugin(IntrospectionPlugin):
         filename = info['filename']
         source_code = info['source_code']
         offset = info['position']
+        self.warmer.add_from_source(source_code)
 
         if PY2:
             filename = filename.encode('utf-8')
@@ -253,6 +274,22 @@ class RopePlugin(IntrospectionPlugin):
 
     # ---- Private API -------------------------------------------------------
 
+    def warm_up(self, name):
+        """Load a module in Rope's module cache"""
+        if self.project is None:
+            return
+        get_module = getattr(self.project, 'get_module',
+                             self.project.pycore.get_module)
+        get_module(name)
+
+    def evict(self, name):
+        """Drop the changed modules of a package from Rope's caches"""
+        path = get_package_path(name)
+        if self.project is None or path is None:
+            return
+        resource = rope.base.libutils.path_to_resource(self.project, path)
+        self.project.validate(resource)
+
     def create_rope_project(self, root_path):
         """Create a Rope project on a desired path"""
         if PY2:
@@ -263,7 +300,11 @@ class RopePlugin(IntrospectionPlugin):
             pass
         try:
             import rope.base.project
-            self.project = rope.base.project.Project(root_path, **ROPE_PREFS)
+            # Keep Rope's data (e.g. its object database) per interpreter
+            ropefolder = osp.relpath(self.cache.path,
+                                     root_path).replace(osp.sep, '/')
+            self.project = rope.base.project.Project(
+                root_path, ropefolder=ropefolder, **ROPE_PREFS)
         except ImportError:
             print >>STDERR, 'project error'
             self.project = None
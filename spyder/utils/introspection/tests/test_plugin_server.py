@@ -10,12 +10,54 @@ Tests for plugin_server.py
 
 # Standard library imports
 import sys
+import threading
+import time
 
 # Test library imports
 import pytest
+import zmq
 
 # Local imports
-from spyder.utils.introspection.plugin_server import PluginServer
+from spyder.utils.introspection.plugin_server import AsyncServer, PluginServer
+
+
+class SlowObject(object):
+    """Object whose completions take a while."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.threads = set()
+
+    def get_completions(self, value):
+        self.threads.add(threading.current_thread())
+        self.event.wait(5)
+        return value
+
+    def get_info(self, value):
+        self.threads.add(threading.current_thread())
+        return value
+
+
+class SlowServer(AsyncServer):
+
+    def initialize(self):
+        return SlowObject()
+
+
+class IdleServer(SlowServer):
+    """Server with 100 steps of background work of 0.1 seconds."""
+
+    def initialize(self):
+        self.started = threading.Event()
+        self.steps = 0
+        return SlowObject()
+
+    def idle(self):
+        self.started.set()
+        time.sleep(0.1)
+        self.steps += 1
+        return self.steps < 100
+
 
 def test_plugin_server(qtbot):
     """Test creation of a separate process for interacting with a plugin."""
@@ -25,5 +67,78 @@ def test_plugin_server(qtbot):
        plugin.run()
        assert plugin
 
+
+def test_async_server_requests():
+    """Test that requests run one at a time, in the same thread, and that
+    waiting requests are cancelled by newer ones of the same kind."""
+    context = zmq.Context()
+    socket = context.socket(zmq.PAIR)
+    port = socket.bind_to_random_port('tcp://*')
+    server = SlowServer(port)
+    thread = threading.Thread(target=server.run)
+    thread.daemon = True
+    thread.start()
+    assert socket.recv_pyobj() == port
+
+    def request(func_name, request_id):
+        socket.send_pyobj(dict(func_name=func_name, request_id=request_id,
+                               args=[request_id]))
+
+    request('get_completions', 'c1')
+    time.sleep(0.1)
+    request('get_completions', 'c2')
+    request('get_completions', 'c3')
+    request('get_info', 'i1')
+
+    # c2 is superseded while c1 is still running
+    response = socket.recv_pyobj()
+    assert response['request_id'] == 'c2'
+    assert response['cancelled']
+
+    # get_info waits for the running completions
+    assert not socket.poll(200)
+    server.object.event.set()
+    responses = [socket.recv_pyobj() for i in range(3)]
+    assert [r['result'] for r in responses] == ['c1', 'c3', 'i1']
+    assert set(responses[0]['timing']) == {'queued', 'elapsed'}
+    assert responses[2]['timing']['queued'] > 0
+    assert len(server.object.threads) == 1
+
+    # The server closes its socket and context when quitting
+    request('server_quit', 'quit')
+    thread.join(5)
+    assert not thread.is_alive()
+    assert server.socket.closed
+    assert server.context.closed
+    context.destroy(linger=0)
+
+
+def test_async_server_idle():
+    """Test that the server works in the background from the start."""
+    context = zmq.Context()
+    socket = context.socket(zmq.PAIR)
+    port = socket.bind_to_random_port('tcp://*')
+    server = IdleServer(port)
+    thread = threading.Thread(target=server.run)
+    thread.daemon = True
+    thread.start()
+    assert socket.recv_pyobj() == port
+
+    # Background work is done before any request arrives, and requests
+    # only wait for a single step of it
+    assert server.started.wait(5)
+    socket.send_pyobj(dict(func_name='get_info', request_id='i1',
+                           args=['i1']))
+    response = socket.recv_pyobj()
+    assert response['result'] == 'i1'
+    assert response['timing']['queued'] < 1
+
+    socket.send_pyobj(dict(func_name='server_quit', request_id='quit'))
+    thread.join(5)
+    assert not thread.is_alive()
+    assert server.steps < 100
+    context.destroy(linger=0)
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -10,12 +10,17 @@ Tests for utils.py
 
 # Standard library imports
 import pickle
+import sys
 
 # Test library imports
 import pytest
 
 # Local imports
-from spyder.utils.introspection.utils import CodeInfo
+from spyder.utils.introspection.utils import (CHECK_INTERVAL, CacheWarmer,
+                                              CodeInfo,
+                                              IntrospectionCache,
+                                              get_package_key,
+                                              get_source_imports)
 
 def test_codeinfo():
     """Test CodeInfo."""
@@ -28,5 +33,95 @@ def test_codeinfo():
     test3 = pickle.loads(pickle.dumps(test2.__dict__))
     assert test3['full_obj'] == 'numpy'    
 
+
+def test_get_source_imports():
+    """Test that top-level imported packages are found."""
+    code = ("import os.path\nfrom numpy import ones\n"
+            "    import spam, eggs\nfrom . import ham\n# import os\n")
+    assert get_source_imports(code) == ['os', 'numpy', 'spam']
+
+
+def test_get_package_key(tmpdir, monkeypatch):
+    """Test that package keys change with their version and mtime."""
+    pkg = tmpdir.mkdir('spam')
+    pkg.join('__init__.py').write('')
+    tmpdir.mkdir('spam-1.0.dist-info')
+    monkeypatch.syspath_prepend(str(tmpdir))
+    version, mtime = get_package_key('spam')
+    assert version == '1.0'
+
+    pkg.join('__init__.py').setmtime(mtime + 10)
+    assert get_package_key('spam') == ('1.0', mtime + 10)
+    assert get_package_key('spam_not_installed') is None
+
+
+def test_introspection_cache(tmpdir, monkeypatch):
+    """Test that the cache is kept per interpreter and across sessions."""
+    monkeypatch.syspath_prepend(str(tmpdir))
+    tmpdir.mkdir('spam').join('__init__.py').write('')
+    warmed = []
+    cache = IntrospectionCache('jedi', cache_path=str(tmpdir))
+    warmer = CacheWarmer(cache, warmed.append)
+    warmer.add_from_source('import spam\nimport spam_not_installed')
+    while warmer.warm_up_next():
+        pass
+    assert warmed == ['spam']
+    assert list(cache.packages) == ['spam']
+
+    # The packages are loaded again in a new session
+    new_cache = IntrospectionCache('jedi', cache_path=str(tmpdir))
+    assert new_cache.path == cache.path
+    new_cache.load()
+    assert not new_cache.is_stale('spam', get_package_key('spam'))
+
+    # Other interpreters use a different directory
+    other = IntrospectionCache('jedi', cache_path=str(tmpdir),
+                               executable=sys.executable + '2')
+    assert other.path != cache.path
+
+
+def test_cache_warmer_evict(tmpdir, monkeypatch):
+    """Test that changed packages are evicted and warmed up again."""
+    monkeypatch.syspath_prepend(str(tmpdir))
+    init = tmpdir.mkdir('spam').join('__init__.py')
+    init.write('')
+    warmed, evicted = [], []
+    cache = IntrospectionCache('jedi', cache_path=str(tmpdir))
+    warmer = CacheWarmer(cache, warmed.append, ['spam'],
+                         evict=evicted.append)
+    while warmer.warm_up_next():
+        pass
+    assert warmed == ['spam']
+    assert evicted == []
+
+    # Nothing is checked again until CHECK_INTERVAL has elapsed
+    init.setmtime(init.mtime() + 10)
+    assert not warmer.warm_up_next()
+    warmer.last_check -= CHECK_INTERVAL
+    while warmer.warm_up_next():
+        pass
+    assert warmed == ['spam', 'spam']
+    assert evicted == ['spam']
+
+
+def test_cache_warmer_submodules(tmpdir, monkeypatch):
+    """Test that packages are warmed up one public submodule at a time."""
+    monkeypatch.syspath_prepend(str(tmpdir))
+    pkg = tmpdir.mkdir('spam')
+    for name in ['__init__.py', 'eggs.py', '_private.py', 'conftest.py']:
+        pkg.join(name).write('')
+    pkg.mkdir('ham').join('__init__.py').write('')
+    pkg.mkdir('tests').join('__init__.py').write('')
+    warmed = []
+    cache = IntrospectionCache('jedi', cache_path=str(tmpdir))
+    warmer = CacheWarmer(cache, warmed.append, ['spam'])
+    assert warmer.warm_up_next()
+    assert warmed == []
+    for expected in ['spam.eggs', 'spam.ham', 'spam']:
+        assert warmer.warm_up_next()
+        assert warmed[-1] == expected
+        assert ('spam' in cache.packages) == (expected == 'spam')
+    assert not warmer.warm_up_next()
+
 if __name__ == "__main__":
     pytest.main()
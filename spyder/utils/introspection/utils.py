@@ -8,12 +8,20 @@
 Introspection utilities used by Spyder
 """
 
+from collections import deque
+import hashlib
 import imp
 import os
 import pickle
+import pkgutil
 import os.path as osp
 import re
+import sys
+import threading
+import time
 
+from spyder.config.base import debug_print, get_conf_path
+from spyder.py3compat import to_binary_string
 from spyder.utils.misc import memoize
 
 from spyder.utils.syntaxhighlighters import (
@@ -261,3 +269,281 @@ def get_parent_until(path):
         except ImportError:
             break
     return '.'.join(reversed(items))
+
+
+#==============================================================================
+# Persistent caches
+#==============================================================================
+CACHE_PATH = get_conf_path('introspection')
+
+# Bump this when the pickled manifest layout changes
+CACHE_VERSION = 1
+
+# Packages warmed up on startup, besides the ones used in previous sessions
+PRELOAD_PACKAGES = ['numpy', 'matplotlib', 'pandas']
+
+# Submodules of packages that are not warmed up
+SKIPPED_SUBMODULES = ('conftest', 'setup', 'testing', 'tests')
+
+# Minimum time between two checks for changes of the packages warmed up,
+# in seconds
+CHECK_INTERVAL = 60
+
+IMPORT_REGEX = re.compile(r'^[ \t]*(?:from|import)[ \t]+([^\d\W]\w*)',
+                          re.MULTILINE | re.UNICODE)
+
+
+def get_source_imports(source_code):
+    """Return the top-level packages imported by some source code."""
+    names = []
+    for name in IMPORT_REGEX.findall(source_code):
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def get_package_version(name, path):
+    """
+    Return the version of a package installed at *path*, or None.
+
+    The version is read from the name of the package metadata directory, so
+    the package is not imported.
+    """
+    dirname = osp.dirname(path)
+    try:
+        entries = os.listdir(dirname)
+    except OSError:
+        return
+    for entry in entries:
+        base, ext = osp.splitext(entry)
+        if ext in ('.dist-info', '.egg-info'):
+            parts = base.split('-')
+            if len(parts) > 1 and parts[0].lower() == name.lower():
+                return parts[1]
+
+
+def get_package_path(name):
+    """
+    Return the path of the top-level package *name*.
+
+    Return None if the package can't be found or if it's a builtin module.
+    """
+    try:
+        return imp.find_module(name)[1] or None
+    except (ImportError, SyntaxError):
+        return
+
+
+def get_submodules(name):
+    """
+    Return the names of the public submodules of the top-level package
+    *name*, without importing it.
+    """
+    path = get_package_path(name)
+    if path is None or not osp.isdir(path):
+        return []
+    return ['%s.%s' % (name, modname)
+            for _finder, modname, _ispkg in pkgutil.iter_modules([path])
+            if not (modname.startswith('_') or modname in SKIPPED_SUBMODULES)]
+
+
+def get_package_key(name):
+    """
+    Return a (version, mtime) key of the top-level package *name*.
+
+    Return None if the package can't be found or if it's a builtin module.
+    """
+    path = get_package_path(name)
+    if path is None:
+        return
+    try:
+        mtime = osp.getmtime(path)
+        if osp.isdir(path):
+            for filename in os.listdir(path):
+                if filename.startswith('__init__.'):
+                    mtime = max(mtime, osp.getmtime(osp.join(path, filename)))
+    except OSError:
+        return
+    return get_package_version(name, path), mtime
+
+
+class IntrospectionCache(object):
+    """
+    On-disk cache directory of an introspection plugin.
+
+    There's a directory per plugin and interpreter, where plugins keep their
+    parse and inference caches. It also holds a manifest with the packages
+    warmed up in previous sessions, keyed on their version and mtime, so
+    that they can be warmed up again on startup and changed packages are
+    detected.
+    """
+
+    def __init__(self, name, cache_path=CACHE_PATH, executable=None):
+        executable = executable or sys.executable
+        key = hashlib.md5(to_binary_string(
+            osp.abspath(executable) + sys.version, 'utf-8')).hexdigest()
+        self.path = osp.join(cache_path, '%s-%s' % (name, key))
+        self.filename = osp.join(self.path, 'packages')
+        self.packages = {}
+        self.loaded = False
+        self.modified = False
+        self.lock = threading.Lock()
+
+    def create(self):
+        """Create the cache directory, if needed."""
+        try:
+            if not osp.isdir(self.path):
+                os.makedirs(self.path)
+        except OSError:
+            pass
+
+    def load(self):
+        """Load the manifest from disk, only the first time it's called."""
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+            try:
+                with open(self.filename, 'rb') as fdesc:
+                    version, packages = pickle.load(fdesc)
+            except Exception:
+                return
+            if version == CACHE_VERSION:
+                self.packages = packages
+
+    def save(self):
+        """Save the manifest to disk if it was modified."""
+        with self.lock:
+            if not self.modified:
+                return
+            self.create()
+            tmp_filename = self.filename + '.tmp'
+            try:
+                with open(tmp_filename, 'wb') as fdesc:
+                    pickle.dump((CACHE_VERSION, self.packages), fdesc,
+                                pickle.HIGHEST_PROTOCOL)
+                if os.name == 'nt' and osp.isfile(self.filename):
+                    os.remove(self.filename)
+                os.rename(tmp_filename, self.filename)
+                self.modified = False
+            except (IOError, OSError):
+                pass
+
+    def is_stale(self, name, key):
+        """Return True if package *name* changed since it was cached."""
+        return self.packages.get(name) != key
+
+    def update(self, name, key):
+        """Store the key of package *name*, or remove it if key is None."""
+        with self.lock:
+            if key is None:
+                if self.packages.pop(name, None) is not None:
+                    self.modified = True
+            elif self.packages.get(name) != key:
+                self.packages[name] = key
+                self.modified = True
+
+
+class CacheWarmer(object):
+    """
+    Warm up the caches of an introspection plugin, one module at a time.
+
+    Introspection libraries are not thread-safe, so warm_up_next has to be
+    called from the thread that runs the plugin requests, while it has
+    nothing else to do. Each call only warms up a single module, so that
+    requests don't wait long for it to return.
+
+    *warm* is called with the name of each public submodule of the
+    packages added, and then with the name of the package, the first time
+    it's seen in a session. The packages warmed up in previous sessions are
+    added after the ones passed to the constructor. Packages whose
+    (version, mtime) key changed since they were cached are passed to
+    *evict*, if given, and warmed up again.
+    """
+
+    def __init__(self, cache, warm, packages=None, evict=None):
+        self.cache = cache
+        self.warm = warm
+        self.evict = evict
+        self.seen = set()
+        self.queue = deque()
+        # Modules left to warm up for the current package
+        self.steps = deque()
+        self.current = None
+        self.loaded = False
+        self.last_check = None
+        self.add(packages or [])
+
+    def add(self, names):
+        """Queue packages to be warmed up."""
+        for name in names:
+            if name not in self.seen:
+                self.seen.add(name)
+                self.queue.append(name)
+
+    def add_from_source(self, source_code):
+        """Queue the packages imported by some source code."""
+        self.add(get_source_imports(source_code))
+
+    def warm_up_next(self):
+        """
+        Warm up the next module queued, if any.
+
+        When there are none, the packages already warmed up are checked
+        for changes, at most every CHECK_INTERVAL seconds. Return False if
+        there's nothing left to do.
+        """
+        if not self.loaded:
+            self.loaded = True
+            self.cache.load()
+            self.add(sorted(self.cache.packages))
+        if not self.steps:
+            if not self.queue:
+                now = time.time()
+                if (self.last_check is not None and
+                        now - self.last_check < CHECK_INTERVAL):
+                    return False
+                self.last_check = now
+                self.queue.extend(
+                    name for name in sorted(self.cache.packages)
+                    if self.cache.is_stale(name, get_package_key(name)))
+                if not self.queue:
+                    self.cache.save()
+                    return False
+            self.start(self.queue.popleft())
+            return True
+        self.warm_up(self.steps.popleft())
+        return True
+
+    def start(self, name):
+        """Evict a package if it changed and queue its modules."""
+        key = get_package_key(name)
+        if key is None:
+            self.cache.update(name, None)
+            return
+        if self.cache.is_stale(name, key):
+            debug_print('Caching %s for introspection' % name)
+            if self.evict is not None and name in self.cache.packages:
+                try:
+                    self.evict(name)
+                except Exception as e:
+                    debug_print('Error evicting %s: %s' % (name, e))
+        self.current = (name, key)
+        self.steps.extend(get_submodules(name))
+        self.steps.append(name)
+
+    def warm_up(self, module):
+        """
+        Warm up the caches for a module, and update the manifest once the
+        package itself is done.
+        """
+        name, key = self.current
+        try:
+            self.warm(module)
+        except Exception as e:
+            debug_print('Error warming up %s: %s' % (module, e))
+            if module == name:
+                key = None
+        if module == name:
+            self.cache.update(name, key)
+            self.current = None
@@ -186,13 +186,33 @@ except:
     save_matlab = None
 
 
+# .npy files larger than this (in bytes) are opened as copy-on-write
+# memory maps instead of being read into memory
+MMAP_SIZE = 2**28
+
+
 try:
     import numpy as np  # analysis:ignore
 
-    def load_array(filename):
+    def load_array(filename, mmap_mode=None):
+        """
+        Load a .npy or .npz file.
+
+        Large .npy files are memory mapped with *mmap_mode* 'c', so that
+        only the parts being used are read and changes are not written
+        back to the file. Pass 'c' or 'r' to always memory map them.
+        """
         try:
             name = osp.splitext(osp.basename(filename))[0]
-            data = np.load(filename)
+            if (mmap_mode is None and filename.lower().endswith('.npy') and
+                    osp.getsize(filename) > MMAP_SIZE):
+                try:
+                    data = np.load(filename, mmap_mode='c')
+                except ValueError:
+                    # Arrays of Python objects can't be memory mapped
+                    data = np.load(filename)
+            else:
+                data = np.load(filename, mmap_mode=mmap_mode)
             if hasattr(data, 'keys'):
                 return data, None
             else:
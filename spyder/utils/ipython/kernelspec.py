@@ -73,6 +73,8 @@ class SpyderKernelSpec(KernelSpec):
         # 3. spy_pythonpath: Paths saved by our users with our PYTHONPATH
         #    manager
         sc_path = osp.join(self.spy_path, 'utils', 'site')
+        # Kernels read our options from the .ini file
+        CONF.sync()
         spy_pythonpath = CONF.get('main', 'spyder_pythonpath', default=[])
 
         default_interpreter = CONF.get('main_interpreter', 'default')
@@ -100,6 +102,7 @@ class SpyderKernelSpec(KernelSpec):
             'EXTERNAL_INTERPRETER': not default_interpreter,
             'UMR_ENABLED': CONF.get('main_interpreter', 'umr/enabled'),
             'UMR_VERBOSE': CONF.get('main_interpreter', 'umr/verbose'),
+            'UMR_INCREMENTAL': CONF.get('main_interpreter', 'umr/incremental'),
             'UMR_NAMELIST': ','.join(umr_namelist)
         }
 
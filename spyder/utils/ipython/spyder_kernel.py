@@ -11,6 +11,7 @@ Spyder kernel for Jupyter
 # Standard library imports
 import os
 import os.path as osp
+import time
 
 # Third-party imports
 from ipykernel.datapub import publish_data
@@ -28,8 +29,9 @@ if not IS_EXT_INTERPRETER:
     from spyder.utils.dochelpers import isdefined, getdoc, getsource
     from spyder.utils.iofuncs import iofunctions
     from spyder.utils.misc import fix_reference_name
-    from spyder.widgets.variableexplorer.utils import (get_remote_data,
-                                                       make_remote_view)
+    from spyder.widgets.variableexplorer.utils import (
+        PreviewEngine, get_fingerprint, get_remote_data, get_window,
+        get_window_info, is_windowed, make_remote_view, set_window_items)
 else:
     # We add "spyder" to sys.path for external interpreters, so this works!
     # See create_kernel_spec of plugins/ipythonconsole
@@ -37,8 +39,9 @@ else:
     from utils.dochelpers import isdefined, getdoc, getsource
     from utils.iofuncs import iofunctions
     from utils.misc import fix_reference_name
-    from widgets.variableexplorer.utils import (get_remote_data,
-                                                make_remote_view)
+    from widgets.variableexplorer.utils import (
+        PreviewEngine, get_fingerprint, get_remote_data, get_window,
+        get_window_info, is_windowed, make_remote_view, set_window_items)
 
 
 # XXX --- Disable canning for Numpy arrays for now ---
@@ -48,13 +51,17 @@ else:
 # See this link for interesting ideas on how to solve this
 # in the future:
 # http://stackoverflow.com/q/30698004/438386
-ipykernel.pickleutil.can_map.pop('numpy.ndarray')
+ipykernel.pickleutil.can_map.pop('numpy.ndarray', None)
 
 
 # Excluded variables from the Variable Explorer (i.e. they are not
 # shown at all there)
 EXCLUDED_NAMES = ['In', 'Out', 'exit', 'get_ipython', 'quit']
 
+# Maximum time spent computing pending previews of variables in each call
+# to get_namespace_previews, so user code doesn't wait much for them
+PREVIEWS_TIME = 0.5
+
 
 class SpyderKernel(IPythonKernel):
     """Spyder kernel for Jupyter"""
@@ -62,9 +69,14 @@ class SpyderKernel(IPythonKernel):
     def __init__(self, *args, **kwargs):
         super(SpyderKernel, self).__init__(*args, **kwargs)
 
+        self._namespace_fingerprints = {}
+        self._namespace_version = 0
+        self._previews = PreviewEngine()
         self.namespace_view_settings = {}
         self._pdb_obj = None
         self._pdb_step = None
+        # Breakpoints sent by Spyder, by filename
+        self._spyder_breakpoints = None
 
         kernel_config = self.config.get('IPKernelApp', None)
         if kernel_config is not None:
@@ -91,8 +103,106 @@ class SpyderKernel(IPythonKernel):
         else:
             return {}
 
+    @property
+    def namespace_view_settings(self):
+        """Settings used to filter and show the namespace"""
+        return self._namespace_view_settings
+
+    @namespace_view_settings.setter
+    def namespace_view_settings(self, settings):
+        # The next namespace update has to contain all variables
+        self._namespace_view_settings = settings
+        self._namespace_fingerprints = {}
+        self._namespace_version += 1
+
     # -- Public API ---------------------------------------------------
     # --- For the Variable Explorer
+    def get_namespace_update(self, version=None):
+        """
+        Return the changes in the namespace since the last update
+
+        This merges get_namespace_view and get_var_properties, but only
+        for the variables that changed, which are detected with cheap
+        fingerprints of their values. It's a dictionary with the
+        following structure
+
+        {'version': 3, 'full': False, 'removed': ['b'],
+         'view': {'a': {...}}, 'properties': {'a': {...}}}
+
+        Here:
+        * 'version' identifies this update
+        * 'full' is True if all variables are sent. That happens when
+          *version* is not the one of the last update, i.e. when the
+          frontend missed an update or never got one.
+        * 'removed' are the names of the variables that were deleted
+        * 'view' and 'properties' are the entries of get_namespace_view
+          and get_var_properties of the new and changed variables
+
+        Views that can't be computed within their budget contain a
+        placeholder and 'pending' is True. The frontend then asks for
+        them with get_namespace_previews.
+        """
+        settings = self.namespace_view_settings
+        if not settings:
+            return
+        ns = self._get_current_namespace()
+        data = get_remote_data(ns, settings, mode='editable',
+                               more_excluded_names=EXCLUDED_NAMES)
+
+        full = version != self._namespace_version
+        if full:
+            previous = {}
+        else:
+            previous = self._namespace_fingerprints
+        fingerprints = {}
+        changed = {}
+        for name, value in list(data.items()):
+            fingerprints[name] = get_fingerprint(value)
+            if previous.get(name) != fingerprints[name]:
+                changed[name] = value
+        removed = [name for name in previous if name not in fingerprints]
+
+        view = {}
+        properties = {}
+        for name, value in list(changed.items()):
+            view[name] = self._previews.get_view(
+                name, value, settings['minmax'], fingerprints[name])
+            properties[name] = self._get_var_properties(value)
+            if self._previews.is_pending(name):
+                # Send it again until its preview is available
+                fingerprints[name] = None
+        self._previews.prune(fingerprints)
+
+        self._namespace_fingerprints = fingerprints
+        self._namespace_version += 1
+        return {'version': self._namespace_version,
+                'full': full,
+                'removed': removed,
+                'view': view,
+                'properties': properties,
+                'pending': self._previews.has_pending()}
+
+    def get_namespace_previews(self, version):
+        """
+        Compute the previews left pending by the namespace update
+        *version*, for at most PREVIEWS_TIME seconds.
+
+        The frontend calls this after getting that update, so previews are
+        computed while no user code is running. It returns a dictionary
+        with the following structure
+
+        {'version': 3, 'view': {'a': {...}}, 'pending': False}
+
+        where 'pending' is True if there are previews left to compute.
+        It returns None if *version* is not the last update.
+        """
+        if version != self._namespace_version:
+            return
+        views = self._previews.compute_pending(time.time() + PREVIEWS_TIME)
+        return {'version': version,
+                'view': views,
+                'pending': self._previews.has_pending()}
+
     def get_namespace_view(self):
         """
         Return the namespace view
@@ -126,17 +236,7 @@ class SpyderKernel(IPythonKernel):
 
             properties = {}
             for name, value in list(data.items()):
-                properties[name] = {
-                    'is_list':  isinstance(value, (tuple, list)),
-                    'is_dict':  isinstance(value, dict),
-                    'len': self._get_len(value),
-                    'is_array': self._is_array(value),
-                    'is_image': self._is_image(value),
-                    'is_data_frame': self._is_data_frame(value),
-                    'is_series': self._is_series(value),
-                    'array_shape': self._get_array_shape(value),
-                    'array_ndim': self._get_array_ndim(value)
-                }
+                properties[name] = self._get_var_properties(value)
 
             return properties
         else:
@@ -156,6 +256,49 @@ class SpyderKernel(IPythonKernel):
             value = None
             publish_data({'__spy_data__': value})
 
+    def get_value_info(self, name):
+        """
+        Get the description of a variable that has to be transferred
+        by windows (see get_value_window)
+        """
+        ns = self._get_current_namespace()
+        try:
+            info = get_window_info(ns[name])
+        except Exception as error:
+            info = {'error': repr(error)}
+        publish_data({'__spy_data__': info})
+
+    def get_value_window(self, name, rows, cols, request_id=None):
+        """
+        Get a window of a large variable.
+
+        *rows* and *cols* are (start, stop) tuples. NumPy data is
+        published as a raw buffer, so that it's not pickled. If
+        *request_id* is given, the window was asked asynchronously and
+        it's published with it so the frontend can dispatch it.
+        """
+        ns = self._get_current_namespace()
+        try:
+            meta, buffer = get_window(ns[name], rows, cols)
+        except Exception as error:
+            meta, buffer = {'rows': rows, 'cols': cols,
+                            'error': repr(error)}, None
+        data = {}
+        if buffer is not None:
+            data['__spy_buffer__'] = buffer
+        if request_id is None:
+            data['__spy_data__'] = meta
+        else:
+            meta['request_id'] = request_id
+            data['__spy_window__'] = meta
+        publish_data(data)
+
+    def set_value_items(self, name, items):
+        """Set the items edited in a window of a variable"""
+        ns = self._get_reference_namespace(name)
+        items = deserialize_object(items)[0]
+        set_window_items(ns[name], items)
+
     def set_value(self, name, value):
         """Set the value of a variable"""
         ns = self._get_reference_namespace(name)
@@ -220,6 +363,32 @@ class SpyderKernel(IPythonKernel):
                          step = self._pdb_step)
             publish_data({'__spy_pdb_state__': state})
 
+    def set_spyder_breakpoints(self, breakpoints):
+        """
+        Set all Spyder breakpoints
+
+        *breakpoints* is a dict of lists of (lineno, condition) tuples
+        by filename.
+        """
+        self._spyder_breakpoints = dict(breakpoints)
+        self._set_spyder_breakpoints()
+
+    def update_spyder_breakpoints(self, breakpoints):
+        """
+        Update the Spyder breakpoints of the files in *breakpoints*
+
+        Files whose list of breakpoints is empty are removed.
+        """
+        if self._spyder_breakpoints is None:
+            # We don't have the breakpoints of the other files yet
+            return
+        for filename, file_breakpoints in breakpoints.items():
+            if file_breakpoints:
+                self._spyder_breakpoints[filename] = file_breakpoints
+            else:
+                self._spyder_breakpoints.pop(filename, None)
+        self._set_spyder_breakpoints()
+
     # --- For the Help plugin
     def is_defined(self, obj, force_import=False):
         """Return True if object is defined in current namespace"""
@@ -316,6 +485,21 @@ class SpyderKernel(IPythonKernel):
         else:
             return self.shell.user_ns
 
+    def _get_var_properties(self, value):
+        """Return the properties of a variable"""
+        return {
+            'is_list':  isinstance(value, (tuple, list)),
+            'is_dict':  isinstance(value, dict),
+            'len': self._get_len(value),
+            'is_array': self._is_array(value),
+            'is_image': self._is_image(value),
+            'is_data_frame': self._is_data_frame(value),
+            'is_series': self._is_series(value),
+            'array_shape': self._get_array_shape(value),
+            'array_ndim': self._get_array_ndim(value),
+            'is_windowed': is_windowed(value)
+        }
+
     def _get_len(self, var):
         """Return sequence length"""
         try:
@@ -16,6 +16,7 @@ from spyder.config.main import CONF
 from spyder.py3compat import PY2, is_binary_string
 from spyder.utils.encoding import to_fs_from_unicode
 from spyder.utils.ipython.kernelspec import SpyderKernelSpec
+from spyder.utils.ipython.spyder_kernel import SpyderKernel
 
 
 @pytest.mark.skipif(os.name != 'nt' or not PY2,
@@ -40,5 +41,42 @@ def test_env_vars():
     CONF.set('main', 'spyder_pythonpath', [])
 
 
+def test_spyder_breakpoints():
+    """Test that breakpoints sent by Spyder are kept in the kernel"""
+    kernel = SpyderKernel()
+    kernel.update_spyder_breakpoints({'spam.py': [(1, None)]})
+    assert kernel._spyder_breakpoints is None
+
+    # Breakpoints are set in the active pdb session when they change
+    class Pdb(object):
+        breakpoints = None
+        def set_spyder_breakpoints(self):
+            self.breakpoints = dict(kernel._spyder_breakpoints)
+    pdb_obj = Pdb()
+    kernel._register_pdb_session(pdb_obj)
+    kernel.set_spyder_breakpoints({'spam.py': [(1, None)]})
+    assert pdb_obj.breakpoints == {'spam.py': [(1, None)]}
+    kernel.update_spyder_breakpoints({'spam.py': [],
+                                      'eggs.py': [(2, 'x > 1')]})
+    assert pdb_obj.breakpoints == {'eggs.py': [(2, 'x > 1')]}
+
+
+def test_namespace_previews():
+    """Test that previews over budget are computed when they're asked"""
+    kernel = SpyderKernel()
+    kernel.namespace_view_settings = dict(
+        check_all=False, exclude_private=True, exclude_uppercase=True,
+        exclude_capitalized=False, exclude_unsupported=False,
+        excluded_names=[], minmax=False)
+    kernel._previews.size_budget = 10
+    kernel.shell.user_ns['spam'] = dict((i, i) for i in range(100))
+    update = kernel.get_namespace_update()
+    assert update['pending']
+    assert kernel.get_namespace_previews(update['version'] - 1) is None
+    previews = kernel.get_namespace_previews(update['version'])
+    assert previews['view']['spam']['view'].startswith('{0: 0')
+    assert not previews['pending']
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -11,13 +11,14 @@ from __future__ import print_function
 from distutils.version import LooseVersion
 from getpass import getuser
 import imp
-import inspect
+import json
 import os
 import os.path as osp
 import re
 import subprocess
 import sys
 import tempfile
+import threading
 
 # Local imports
 from spyder.utils import encoding
@@ -34,6 +35,34 @@ else:
     username = encoding.to_unicode_from_fs(getuser())
     TEMPDIR = tempfile.gettempdir() + osp.sep + 'spyder-' + username
 
+# Modules whose versions are always checked in other interpreters, because
+# our consoles need them
+PROBED_MODULES = ['Cython', 'IPython', 'PyQt4', 'PyQt5', '_tkinter',
+                  'ipykernel', 'matplotlib', 'sympy']
+
+# Code run by other interpreters to print the versions of the modules given
+# as arguments and the directories of their sys.path
+PROBE_CODE = """
+import json, os, sys
+versions = {}
+for name in sys.argv[1:]:
+    try:
+        module = __import__(name)
+    except Exception:
+        continue
+    version = getattr(module, '__version__', getattr(module, 'VERSION', None))
+    if isinstance(version, tuple):
+        version = '.'.join([str(i) for i in version])
+    versions[name] = None if version is None else str(version)
+paths = [path for path in sys.path if path and os.path.isdir(path)]
+sys.stdout.write('\\n' + json.dumps({'versions': versions, 'paths': paths})
+                 + '\\n')
+"""
+
+# Module versions of other interpreters, by interpreter
+_module_versions = None
+_module_versions_lock = threading.Lock()
+
 
 def is_program_installed(basename):
     """
@@ -382,6 +411,83 @@ def get_module_version(module_name):
     return getattr(mod, '__version__', getattr(mod, 'VERSION', None))
 
 
+def _get_mtimes(paths):
+    """Return the modification times of paths (None if they don't exist)"""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime)
+        except OSError:
+            mtimes.append(None)
+    return mtimes
+
+
+def _get_module_versions_file():
+    """Return the file where module versions of interpreters are saved"""
+    from spyder.config.base import get_conf_path
+    return get_conf_path('module_versions.json')
+
+
+def get_module_versions(interpreter, module_names=None):
+    """
+    Return the versions of the modules installed in interpreter, as a
+    dict with their names as keys
+
+    Modules that aren't installed are not in the dict, and the version of
+    those that don't have one is None.
+
+    The versions of PROBED_MODULES and *module_names* are all checked by
+    running interpreter once. They are saved until the interpreter or the
+    directories of its sys.path change.
+    """
+    global _module_versions
+    module_names = set(PROBED_MODULES) | set(module_names or [])
+    with _module_versions_lock:
+        if _module_versions is None:
+            try:
+                with open(_get_module_versions_file()) as f:
+                    _module_versions = json.load(f)
+            except (IOError, OSError, ValueError):
+                _module_versions = {}
+        info = _module_versions.get(interpreter)
+        if (info is not None and module_names <= set(info['modules']) and
+                _get_mtimes(info['paths']) == info['mtimes']):
+            return dict(info['versions'])
+
+        if info is not None:
+            module_names |= set(info['modules'])
+        module_names = sorted(module_names)
+        proc = run_program(interpreter, ['-c', PROBE_CODE] + module_names)
+        output, _err = proc.communicate()
+        try:
+            probe = json.loads(output.decode().splitlines()[-1])
+        except (IndexError, ValueError):
+            # Don't save anything, so that it's checked again next time
+            return {}
+        paths = [interpreter] + probe['paths']
+        _module_versions[interpreter] = dict(modules=module_names,
+                                             versions=probe['versions'],
+                                             paths=paths,
+                                             mtimes=_get_mtimes(paths))
+        try:
+            with open(_get_module_versions_file(), 'w') as f:
+                json.dump(_module_versions, f)
+        except (IOError, OSError):
+            pass
+        return dict(probe['versions'])
+
+
+def update_module_versions(interpreter):
+    """
+    Check the versions of the modules installed in interpreter in a
+    thread, if they changed, so that they're ready when needed
+    """
+    thread = threading.Thread(target=get_module_versions, args=(interpreter,))
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
 def is_module_installed(module_name, version=None, installed_version=None,
                         interpreter=None):
     """
@@ -398,33 +504,18 @@ def is_module_installed(module_name, version=None, installed_version=None,
     """
     if interpreter:
         if osp.isfile(interpreter) and ('python' in interpreter):
-            checkver = inspect.getsource(check_version)
-            get_modver = inspect.getsource(get_module_version)
-            stable_ver = inspect.getsource(is_stable_version)
-            ismod_inst = inspect.getsource(is_module_installed)
-            fd, script = tempfile.mkstemp(suffix='.py', dir=TEMPDIR)
-            with os.fdopen(fd, 'w') as f:
-                f.write("# -*- coding: utf-8 -*-" + "\n\n")
-                f.write("from distutils.version import LooseVersion" + "\n")
-                f.write("import re" + "\n\n")
-                f.write(stable_ver + "\n")
-                f.write(checkver + "\n")
-                f.write(get_modver + "\n")
-                f.write(ismod_inst + "\n")
-                if version:
-                    f.write("print(is_module_installed('%s','%s'))"\
-                            % (module_name, version))
-                else:
-                    f.write("print(is_module_installed('%s'))" % module_name)
             try:
-                proc = run_program(interpreter, [script])
-                output, _err = proc.communicate()
-            except subprocess.CalledProcessError:
+                versions = get_module_versions(interpreter, [module_name])
+            except (ProgramError, OSError):
+                return True
+            if module_name not in versions:
+                return False
+            elif version is None:
                 return True
-            if output:  # TODO: Check why output could be empty!
-                return eval(output.decode())
-            else:
+            elif versions[module_name] is None:
                 return False
+            return is_module_installed(module_name, version,
+                                       installed_version=versions[module_name])
         else:
             # Try to not take a wrong decision if there is no interpreter
             # available (needed for the change_pystartup method of ExtConsole
@@ -447,7 +538,8 @@ def is_module_installed(module_name, version=None, installed_version=None,
             if ';' in version:
                 output = True
                 for ver in version.split(';'):
-                    output = output and is_module_installed(module_name, ver)
+                    output = output and is_module_installed(
+                        module_name, ver, installed_version=actver)
                 return output
             match = re.search('[0-9]', version)
             assert match is not None, "Invalid version number"
@@ -9,6 +9,7 @@
 # Spyder consoles sitecustomize
 #
 
+import ast
 import bdb
 import io
 import os
@@ -316,16 +317,25 @@ class SpyderPdb(pdb.Pdb):
         bdb.Breakpoint.bplist = {}
         bdb.Breakpoint.bpbynumber = [None]
         #------
-        from spyder.config.main import CONF
-        CONF.load_from_ini()
-        if CONF.get('run', 'breakpoints/enabled', True):
-            breakpoints = CONF.get('run', 'breakpoints', {})
-            i = 0
-            for fname, data in list(breakpoints.items()):
-                for linenumber, condition in data:
-                    i += 1
-                    self.set_break(self.canonic(fname), linenumber,
-                                   cond=condition)
+        from IPython.core.getipython import get_ipython
+        ipython_shell = get_ipython()
+        breakpoints = None
+        if ipython_shell:
+            # Breakpoints are sent by Spyder to the kernel
+            breakpoints = getattr(ipython_shell.kernel,
+                                  '_spyder_breakpoints', None)
+        if breakpoints is None:
+            # Spyder didn't send them yet, so read them from its config
+            from spyder.config.main import CONF
+            CONF.load_from_ini()
+            if CONF.get('run', 'breakpoints/enabled', True):
+                breakpoints = CONF.get('run', 'breakpoints', {})
+            else:
+                breakpoints = {}
+        for fname, data in list(breakpoints.items()):
+            for linenumber, condition in data:
+                self.set_break(self.canonic(fname), linenumber,
+                               cond=condition)
 
     def notify_spyder(self, frame):
         if not frame:
@@ -513,8 +523,11 @@ class UserModuleReloader(object):
 
     pathlist [list]: blacklist in terms of module path
     namelist [list]: blacklist in terms of module name
+    incremental [bool]: only delete user modules whose file changed since
+                        they were imported, and the user modules importing
+                        them, directly or not
     """
-    def __init__(self, namelist=None, pathlist=None):
+    def __init__(self, namelist=None, pathlist=None, incremental=False):
         if namelist is None:
             namelist = []
         spy_modules = ['sitecustomize', 'spyder', 'spyderplugins']
@@ -524,7 +537,13 @@ class UserModuleReloader(object):
         if pathlist is None:
             pathlist = []
         self.pathlist = pathlist
-        self.previous_modules = list(sys.modules.keys())
+        self.previous_modules = set(sys.modules.keys())
+
+        # Incremental mode: file modification times of user modules, and
+        # modules imported by their file with its modification time
+        self.incremental = incremental
+        self.mtimes = {}
+        self.imports = {}
 
     def is_module_blacklisted(self, modname, modpath):
         if modname.startswith('_cython_inline'):
@@ -536,15 +555,9 @@ class UserModuleReloader(object):
         else:
             return set(modname.split('.')) & set(self.namelist)
 
-    def run(self, verbose=False):
-        """
-        Del user modules to force Python to deeply reload them
-
-        Do not del modules which are considered as system modules, i.e.
-        modules installed in subdirectories of Python interpreter's binary
-        Do not del C modules
-        """
-        log = []
+    def get_user_modules(self):
+        """Return a dict of user module paths by module name"""
+        modules = {}
         for modname, module in list(sys.modules.items()):
             if modname not in self.previous_modules:
                 modpath = getattr(module, '__file__', None)
@@ -554,12 +567,143 @@ class UserModuleReloader(object):
                     # choose to ignore it.
                     continue
                 if not self.is_module_blacklisted(modname, modpath):
-                    log.append(modname)
-                    del sys.modules[modname]
-        if verbose and log:
+                    modules[modname] = modpath
+        return modules
+
+    def record(self):
+        """Save file modification times of user modules (incremental mode)"""
+        if not self.incremental:
+            return
+        for modname, modpath in self.get_user_modules().items():
+            if modname not in self.mtimes:
+                self.mtimes[modname] = _get_mtime(_get_source_path(modpath))
+
+    def get_changed_modules(self, modules):
+        """
+        Return the names of the user modules in dict *modules* whose file
+        changed, and of the modules importing them, directly or not
+
+        Modules imported since the last call to record are considered as
+        changed, because their file may have changed since then.
+        """
+        importers = {}
+        changed = set()
+        for modname, modpath in modules.items():
+            path = _get_source_path(modpath)
+            mtime = _get_mtime(path)
+            if mtime is None or mtime != self.mtimes.get(modname):
+                changed.add(modname)
+            if self.imports.get(modname, (None, None))[:2] != (path, mtime):
+                is_package = osp.splitext(osp.basename(path))[0] == '__init__'
+                self.imports[modname] = (path, mtime,
+                                         _get_imports(modname, path,
+                                                      is_package))
+            # Submodules are imported after their package
+            imported = set(self.imports[modname][2])
+            imported.add(modname.rpartition('.')[0])
+            for name in imported:
+                importers.setdefault(name, set()).add(modname)
+
+        # Forget the modules removed since the last call
+        for modname in set(self.imports) - set(modules):
+            del self.imports[modname]
+        for modname in set(self.mtimes) - set(modules):
+            del self.mtimes[modname]
+
+        names = list(changed)
+        while names:
+            for importer in importers.get(names.pop(), ()):
+                if importer not in changed:
+                    changed.add(importer)
+                    names.append(importer)
+        return changed
+
+    def run(self, verbose=False):
+        """
+        Del user modules to force Python to deeply reload them
+
+        Do not del modules which are considered as system modules, i.e.
+        modules installed in subdirectories of Python interpreter's binary
+        Do not del C modules
+        """
+        start = time.time()
+        modules = self.get_user_modules()
+        if self.incremental:
+            names = self.get_changed_modules(modules)
+        else:
+            names = modules
+        log = []
+        for modname in modules:
+            if modname in names:
+                log.append(modname)
+                del sys.modules[modname]
+                self.mtimes.pop(modname, None)
+        if verbose and self.incremental:
+            _print("\x1b[4;33m%s\x1b[24m%s\x1b[0m"\
+                   % ("Reloaded modules", " (%d of %d, checked in %d ms)%s"
+                      % (len(log), len(modules), 1000 * (time.time() - start),
+                         ": " + ", ".join(sorted(log)) if log else "")))
+        elif verbose and log:
             _print("\x1b[4;33m%s\x1b[24m%s\x1b[0m"\
                    % ("Reloaded modules", ": "+", ".join(log)))
 
+
+def _get_source_path(modpath):
+    """Return the source file of a module file, if it exists"""
+    root, ext = osp.splitext(modpath)
+    if ext in ('.pyc', '.pyo') and osp.isfile(root + '.py'):
+        return root + '.py'
+    return modpath
+
+
+def _get_mtime(path):
+    """Return the modification time of a file, or None if it doesn't exist"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _get_imports(modname, path, is_package):
+    """
+    Return the names of the modules that may be imported by the module
+    *modname* in file *path*, and of their packages
+    """
+    if osp.splitext(path)[1] not in ('.py', '.pyw'):
+        return []
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), path)
+    except (IOError, OSError, SyntaxError, TypeError, ValueError):
+        return []
+    package = modname if is_package else modname.rpartition('.')[0]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                names.add(alias.name)
+                if package:
+                    # Implicit relative imports in Python 2
+                    names.add(package + '.' + alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split('.')
+                base = '.'.join(parts[:len(parts) - node.level + 1])
+                if node.module:
+                    base = base + '.' + node.module if base else node.module
+            else:
+                base = node.module
+            if not base:
+                continue
+            names.add(base)
+            for alias in node.names:
+                names.add(base + '.' + alias.name)
+    for name in list(names):
+        while '.' in name:
+            name = name.rpartition('.')[0]
+            names.add(name)
+    return sorted(names)
+
 __umr__ = None
 
 
@@ -660,7 +804,10 @@ def runfile(filename, args=None, wdir=None, namespace=None, post_mortem=False):
             namelist = os.environ.get("UMR_NAMELIST", None)
             if namelist is not None:
                 namelist = namelist.split(',')
-            __umr__ = UserModuleReloader(namelist=namelist)
+            incremental = os.environ.get("UMR_INCREMENTAL",
+                                         "").lower() == "true"
+            __umr__ = UserModuleReloader(namelist=namelist,
+                                         incremental=incremental)
         else:
             verbose = os.environ.get("UMR_VERBOSE", "").lower() == "true"
             __umr__.run(verbose=verbose)
@@ -683,14 +830,18 @@ def runfile(filename, args=None, wdir=None, namespace=None, post_mortem=False):
         os.chdir(wdir)
     if post_mortem:
         set_post_mortem()
-    if HAS_CYTHON and os.path.splitext(filename)[1].lower() == '.pyx':
-        # Cython files
-        with io.open(filename, encoding='utf-8') as f:
-            from IPython.core.getipython import get_ipython
-            ipython_shell = get_ipython()
-            ipython_shell.run_cell_magic('cython', '', f.read())
-    else:
-        execfile(filename, namespace)
+    try:
+        if HAS_CYTHON and os.path.splitext(filename)[1].lower() == '.pyx':
+            # Cython files
+            with io.open(filename, encoding='utf-8') as f:
+                from IPython.core.getipython import get_ipython
+                ipython_shell = get_ipython()
+                ipython_shell.run_cell_magic('cython', '', f.read())
+        else:
+            execfile(filename, namespace)
+    finally:
+        if __umr__ is not None:
+            __umr__.record()
 
     clear_post_mortem()
     sys.argv = ['']
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for sitecustomize.py
+"""
+
+# Standard library imports
+import os.path as osp
+import sys
+
+# Test library imports
+import pytest
+
+
+@pytest.fixture
+def user_package(tmpdir, monkeypatch):
+    """Return a UserModuleReloader in incremental mode and the directory of
+    a small package it reloads"""
+    # sitecustomize is meant to be imported at startup by the kernels
+    monkeypatch.setenv('QT_API', 'pyqt5')
+    monkeypatch.syspath_prepend(osp.join(osp.dirname(__file__), osp.pardir))
+    from sitecustomize import UserModuleReloader
+
+    pkg = tmpdir.mkdir('spam_pkg')
+    pkg.join('__init__.py').write('from . import sub\n')
+    pkg.join('sub.py').write('from .base import x\n')
+    pkg.join('base.py').write('x = 1\n')
+    pkg.join('other.py').write('y = 2\n')
+    tmpdir.join('spam_main.py').write('import spam_pkg\n')
+    tmpdir.join('spam_alone.py').write('z = 3\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    umr = UserModuleReloader(incremental=True)
+    __import__('spam_main')
+    __import__('spam_alone')
+    __import__('spam_pkg.other')
+    yield umr, pkg
+    for modname in list(sys.modules):
+        if modname.startswith('spam_'):
+            del sys.modules[modname]
+
+
+def test_get_changed_modules(user_package):
+    """Test that changed modules and their importers are found."""
+    umr, pkg = user_package
+    modules = umr.get_user_modules()
+    assert set(modules) == {'spam_main', 'spam_alone', 'spam_pkg',
+                            'spam_pkg.sub', 'spam_pkg.base',
+                            'spam_pkg.other'}
+
+    # Modules imported before the first record are considered as changed
+    assert umr.get_changed_modules(modules) == set(modules)
+    umr.record()
+    assert umr.get_changed_modules(modules) == set()
+
+    # Relative imports are followed, and the submodules of a changed
+    # package are changed too
+    base = pkg.join('base.py')
+    base.setmtime(base.mtime() + 10)
+    assert umr.get_changed_modules(modules) == {
+        'spam_main', 'spam_pkg', 'spam_pkg.sub', 'spam_pkg.base',
+        'spam_pkg.other'}
+
+    # Removed modules are forgotten
+    del sys.modules['spam_alone']
+    umr.get_changed_modules(umr.get_user_modules())
+    assert 'spam_alone' not in umr.imports
+    assert 'spam_alone' not in umr.mtimes
+
+
+if __name__ == "__main__":
+    pytest.main()
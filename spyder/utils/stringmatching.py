@@ -8,12 +8,17 @@
 String search and match utilities usefull when filtering a list of texts.
 """
 
+import heapq
 import re
 
 
 NOT_FOUND_SCORE = -1
 NO_SCORE = 0
 
+# Choices longer than this can have a substring match with a score worse
+# than the one of a match letter by letter
+MAX_PRUNED_LENGTH = 10000
+
 
 def get_search_regex(query, ignore_case=True):
     """Returns a compiled regex pattern to search for query letters in order.
@@ -108,8 +113,9 @@ def get_search_score(query, choice, ignore_case=True, apply_regex=True,
         let = u'x'  # Nonmatches (except spaed) will be replaced by this
         score = 0
 
-        exact_words = [query == word for word in choice.split(u' ')]
-        partial_words = [query in word for word in choice.split(u' ')]
+        words = choice.split(u' ')
+        exact_words = [query == word for word in words]
+        partial_words = [query in word for word in words]
 
         if any(exact_words) or any(partial_words):
             pos_start = choice.find(query)
@@ -161,9 +167,7 @@ def get_search_score(query, choice, ignore_case=True, apply_regex=True,
         for i in reversed(range(1, len(query) + 1)):
             score += (len(query) - patterns_text.count(sep*i))*100000
 
-        temp = patterns_text.split(sep)
-        while u'' in temp:
-            temp.remove(u'')
+        temp = [pat for pat in patterns_text.split(sep) if pat]
         if not patterns_text.startswith(sep):
             temp = temp[1:]
         if not patterns_text.endswith(sep):
@@ -177,7 +181,7 @@ def get_search_score(query, choice, ignore_case=True, apply_regex=True,
 
 
 def get_search_scores(query, choices, ignore_case=True, template='{}',
-                      valid_only=False, sort=False):
+                      valid_only=False, sort=False, limit=None):
     """Search for query inside choices and return a list of tuples.
 
     Returns a list of tuples of text with the enriched text (if a template is
@@ -195,39 +199,187 @@ def get_search_scores(query, choices, ignore_case=True, template='{}',
         Optional template string to surround letters found in choices. This is
         useful when using a rich text editor ('{}' by default).
         Examples: '<b>{}</b>', '<code>{}</code>', '<i>{}</i>'
+    valid_only : bool, optional
+        Return only the choices where query was found (False by default).
+    sort : bool, optional
+        Sort results by score (False by default).
+    limit : int, optional
+        Return at most this number of choices where query was found, with
+        the best scores and sorted by score (None by default).
 
     Returns
     -------
     results : list of tuples
         List of tuples where the first item is the text (enriched if a
         template was used) and a search score. Lower scores means better match.
+
+    Notes
+    -----
+    Use a FuzzyMatcher to search the same choices several times.
     """
-    # First remove spaces from query
-    query = query.replace(' ', '')
-    pattern = get_search_regex(query, ignore_case)
-    results = []
+    matcher = FuzzyMatcher(choices, ignore_case=ignore_case)
+    return matcher.get_scores(query, template=template, valid_only=valid_only,
+                              sort=sort, limit=limit)
 
-    for choice in choices:
-        r = re.search(pattern, choice)
-        if query and r:
-            result = get_search_score(query, choice, ignore_case=ignore_case,
-                                      apply_regex=False, template=template)
+
+def get_char_mask(text):
+    """Returns a bit mask of the characters in text.
+
+    If the mask of a query has bits not set in the mask of a text, some
+    query letters can't be found in the text.
+    """
+    mask = 0
+    for char in set(text):
+        mask |= 1 << (ord(char) & 63)
+    return mask
+
+
+class FuzzyMatcher(object):
+    """Search for queries inside a list of choices.
+
+    Choices are preprocessed once (lowercased and their letters summarized
+    in bit masks), and the choices found for a query are kept, so that only
+    them are searched again when the query grows, as it happens when it's
+    typed.
+
+    Parameters
+    ----------
+    choices : list of str
+        List of sentences/words in which to search for queries.
+    ignore_case : bool, optional
+        Optional value perform a case insensitive search (True by default).
+    """
+
+    def __init__(self, choices, ignore_case=True):
+        self.choices = list(choices)
+        self.ignore_case = ignore_case
+        if ignore_case:
+            self._texts = [choice.lower() for choice in self.choices]
         else:
-            if query:
-                result = (choice, choice, NOT_FOUND_SCORE)
+            self._texts = self.choices
+        self._masks = [get_char_mask(text) for text in self._texts]
+
+        # Indexes of the choices found for the last queries, each query
+        # starting with the previous one
+        self._found = [(u'', list(range(len(self.choices))))]
+
+    def search(self, query):
+        """Returns the indexes of the choices with query letters in order."""
+        query = query.replace(' ', '')
+        if self.ignore_case:
+            query = query.lower()
+        if not query:
+            return self._found[0][1]
+
+        # Regex special characters can match other ones, so that only
+        # queries made of word characters can be narrowed down
+        if re.match(r'\w+$', query, re.UNICODE) is None:
+            pattern = get_search_regex(query, self.ignore_case)
+            return [index for index, choice in enumerate(self.choices)
+                    if pattern.search(choice)]
+
+        while not query.startswith(self._found[-1][0]):
+            self._found.pop()
+        last_query, indexes = self._found[-1]
+        if query == last_query:
+            return indexes
+
+        pattern = get_search_regex(query, ignore_case=False)
+        mask = get_char_mask(query)
+        texts, masks = self._texts, self._masks
+        indexes = [index for index in indexes
+                   if masks[index] & mask == mask and
+                   pattern.search(texts[index])]
+        self._found.append((query, indexes))
+        return indexes
+
+    def get_best_candidates(self, query, indexes, limit):
+        """Returns the indexes of the choices that can get the best scores.
+
+        get_search_score scores a choice containing query as a substring
+        better than any other one, unless it contains the '-' character it
+        uses to mark the letters found. Among those choices, the score only
+        grows with the position of query and with query not being a whole
+        word. So if there are `limit` of them, only the best ones and the
+        choices with that character need to be scored.
+        """
+        if self.ignore_case:
+            query = query.lower()
+        texts = self._texts
+        substrings = []
+        others = []
+        for index in indexes:
+            text = texts[index]
+            position = text.find(query)
+            if (position < 0 or u'-' in text or
+                    len(text) >= MAX_PRUNED_LENGTH):
+                others.append(index)
+            elif query in text.split(u' '):
+                substrings.append((position + 1, index))
             else:
-                result = (choice, choice, NO_SCORE)
-
-        if valid_only:
-            if result[-1] != NOT_FOUND_SCORE:
-                results.append(result)
+                substrings.append((position + 100, index))
+        if len(substrings) < limit:
+            return indexes
+        best = [index for _key, index in heapq.nsmallest(limit, substrings)]
+        best.extend(index for index in others if u'-' in texts[index] or
+                    len(texts[index]) >= MAX_PRUNED_LENGTH)
+        return sorted(best)
+
+    def get_best_scores(self, query, limit, template='{}'):
+        """Search for query and return the choices with the best scores.
+
+        Returns a list of at most `limit` tuples of the index of a choice
+        where query was found, its enriched text and its score, sorted by
+        score.
+        """
+        query = query.replace(' ', '')
+        choices = self.choices
+        if not query:
+            return [(index, choices[index], NO_SCORE)
+                    for index in range(min(limit, len(choices)))]
+        indexes = self.get_best_candidates(query, self.search(query), limit)
+        results = []
+        for index in indexes:
+            _choice, enriched_text, score = get_search_score(
+                query, choices[index], ignore_case=self.ignore_case,
+                apply_regex=False, template=template)
+            results.append((index, enriched_text, score))
+        return heapq.nsmallest(limit, results, key=lambda row: row[-1])
+
+    def get_scores(self, query, template='{}', valid_only=False, sort=False,
+                   limit=None):
+        """Search for query and return a list of tuples.
+
+        Takes the same arguments and returns the same results as
+        get_search_scores.
+        """
+        choices = self.choices
+        if limit is not None:
+            return [(choices[index], enriched_text, score)
+                    for index, enriched_text, score in
+                    self.get_best_scores(query, limit, template=template)]
+
+        query = query.replace(' ', '')
+        if not query:
+            results = [(choice, choice, NO_SCORE) for choice in choices]
         else:
-            results.append(result)
+            indexes = self.search(query)
+            found = [get_search_score(query, choices[index],
+                                      ignore_case=self.ignore_case,
+                                      apply_regex=False, template=template)
+                     for index in indexes]
+            if valid_only:
+                results = found
+            else:
+                results = [(choice, choice, NOT_FOUND_SCORE)
+                           for choice in choices]
+                for index, result in zip(indexes, found):
+                    results[index] = result
 
-    if sort:
-        results = sorted(results, key=lambda row: row[-1])
+        if sort:
+            results = sorted(results, key=lambda row: row[-1])
 
-    return results
+        return results
 
 
 def test():
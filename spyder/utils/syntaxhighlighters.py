@@ -11,13 +11,14 @@ Editor widget syntax highlighters based on QtGui.QSyntaxHighlighter
 
 # Standard library imports
 from __future__ import print_function
+import bisect
 import keyword
 import os
 import re
 import weakref
 
 # Third party imports
-from qtpy.QtCore import Qt
+from qtpy.QtCore import Qt, QTimer
 from qtpy.QtGui import (QColor, QCursor, QFont, QSyntaxHighlighter,
                         QTextCharFormat, QTextOption)
 from qtpy.QtWidgets import QApplication
@@ -95,6 +96,34 @@ def get_color_scheme(name):
     return scheme
 
 
+def update_block_data(data, first, last, delta):
+    """
+    Update data indexed by block number after blocks first to last replaced
+    blocks first to last - delta, the other keys being left as is.
+
+    Data of the replaced blocks is removed and the block numbers after them
+    are shifted. Return True if data changed.
+    """
+    old_last = last - delta
+    if not delta and old_last - first < len(data):
+        changed = False
+        for block_nb in range(first, old_last + 1):
+            if data.pop(block_nb, None) is not None:
+                changed = True
+        return changed
+    changed = False
+    shifted = {}
+    for block_nb in list(data):
+        if not isinstance(block_nb, int) or block_nb < first:
+            continue
+        value = data.pop(block_nb)
+        changed = True
+        if block_nb > old_last:
+            shifted[block_nb + delta] = value
+    data.update(shifted)
+    return changed
+
+
 #==============================================================================
 # Syntax highlighting color schemes
 #==============================================================================
@@ -111,7 +140,11 @@ class BaseSH(QSyntaxHighlighter):
     def __init__(self, parent, font=None, color_scheme='Spyder'):
         QSyntaxHighlighter.__init__(self, parent)
 
+        # Outline explorer data by block number, kept in sync with text
+        # changes, and number of changes made to it
         self.outlineexplorer_data = {}
+        self.outlineexplorer_revision = 0
+        self._block_count = 0
 
         self.font = font
         if is_text_string(color_scheme):
@@ -132,9 +165,62 @@ class BaseSH(QSyntaxHighlighter):
         self.setup_formats(font)
         
         self.cell_separators = None
+
+        # In deferred mode (used for large files), only blocks in the range
+        # of block numbers last given to highlight_blocks are highlighted,
+        # the others are left for when they are shown
+        self.deferred = False
+        self._shown_blocks = None
         self.fold_detector = None
         self.editor = None
-        
+
+        # Track changes before QSyntaxHighlighter highlights the changed
+        # blocks
+        self.setDocument(self.document())
+
+    def setDocument(self, document):
+        """
+        Reimplemented Qt method.
+
+        Connect to text changes before QSyntaxHighlighter, so that its
+        slot is called after ours.
+        """
+        previous = self.document()
+        if previous is not None:
+            try:
+                previous.contentsChange.disconnect(self._document_changed)
+            except (TypeError, RuntimeError):
+                pass
+        QSyntaxHighlighter.setDocument(self, None)
+        if document is not None:
+            document.contentsChange.connect(self._document_changed)
+            self._block_count = document.blockCount()
+        QSyntaxHighlighter.setDocument(self, document)
+
+    def _document_changed(self, position, removed, added):
+        """Update data indexed by block number for a text change."""
+        document = self.document()
+        if document is None:
+            return
+        block_count = document.blockCount()
+        delta = block_count - self._block_count
+        self._block_count = block_count
+        first = document.findBlock(position).blockNumber()
+        last = document.findBlock(
+            min(position + added, document.characterCount() - 1)
+        ).blockNumber()
+        self.blocks_changed(max(first, 0), max(last, first), delta)
+
+    def blocks_changed(self, first, last, delta):
+        """
+        Blocks first to last were changed, from first to last - delta before
+        the change, and will be highlighted again.
+
+        Reimplement this to update other data indexed by block number.
+        """
+        if update_block_data(self.outlineexplorer_data, first, last, delta):
+            self.outlineexplorer_revision += 1
+
     def get_background_color(self):
         return QColor(self.background_color)
 
@@ -222,10 +308,18 @@ class BaseSH(QSyntaxHighlighter):
 
         :param text: text to highlight.
         """
+        current_block = self.currentBlock()
+        if self.deferred:
+            number = current_block.blockNumber()
+            if (self._shown_blocks is None or
+                    not self._shown_blocks[0] <= number <= self._shown_blocks[1]):
+                # Mark the block as not highlighted
+                self.setCurrentBlockState(-1)
+                return
+
         self.highlight_block(text)
 
         # Process blocks for fold detection
-        current_block = self.currentBlock()
         previous_block = self._find_prev_non_blank_block(current_block)
         if self.editor:
             if self.fold_detector is not None:
@@ -233,6 +327,25 @@ class BaseSH(QSyntaxHighlighter):
                 self.fold_detector.process_block(
                     current_block, previous_block, text)
 
+        if self.deferred and self.currentBlockState() == -1:
+            self.setCurrentBlockState(self.NORMAL)
+
+    def highlight_blocks(self, blocks):
+        """
+        Highlight the blocks not highlighted yet among the given ones.
+
+        In deferred mode, text changes are then highlighted right away in
+        the range of these blocks only.
+        """
+        blocks = [block for block in blocks if block.isValid()]
+        if not blocks:
+            return
+        self._shown_blocks = (blocks[0].blockNumber(),
+                              blocks[-1].blockNumber())
+        for block in blocks:
+            if block.userState() == -1:
+                self.rehighlightBlock(block)
+
     def highlight_block(self, text):
         """
         Abstract method. Override this to apply syntax highlighting.
@@ -275,8 +388,20 @@ class BaseSH(QSyntaxHighlighter):
     def get_outlineexplorer_data(self):
         return self.outlineexplorer_data
 
+    def set_outlineexplorer_data(self, block_nb, oedata):
+        """Set the outline explorer data of a block, None to remove it."""
+        if oedata is None:
+            if self.outlineexplorer_data.pop(block_nb, None) is None:
+                return
+        elif self.outlineexplorer_data.get(block_nb) is oedata:
+            return
+        else:
+            self.outlineexplorer_data[block_nb] = oedata
+        self.outlineexplorer_revision += 1
+
     def rehighlight(self):
         self.outlineexplorer_data = {}
+        self.outlineexplorer_revision += 1
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
         QSyntaxHighlighter.rehighlight(self)
         QApplication.restoreOverrideCursor()
@@ -320,14 +445,25 @@ def any(name, alternates):
     "Return a named group pattern matching list of alternates."
     return "(?P<%s>" % name + "|".join(alternates) + ")"
 
-def make_python_patterns(additional_keywords=[], additional_builtins=[]):
-    "Strongly inspired from idlelib.ColorDelegator.make_pat"
+def make_python_names(additional_keywords=[], additional_builtins=[]):
+    "Return the lists of Python keywords and builtins"
     kwlist = keyword.kwlist + additional_keywords
     builtinlist = [str(name) for name in dir(builtins)
                    if not name.startswith('_')] + additional_builtins
     repeated = set(kwlist) & set(builtinlist)
     for repeated_element in repeated:
         kwlist.remove(repeated_element)
+    return kwlist, builtinlist
+
+def make_python_patterns(additional_keywords=[], additional_builtins=[],
+                         names=False):
+    """Strongly inspired from idlelib.ColorDelegator.make_pat
+
+    If *names* is True, keywords and builtins are matched by a "name" group
+    matching all names, which is much faster than trying all keywords and
+    builtins at each position: they have to be told apart afterwards."""
+    kwlist, builtinlist = make_python_names(additional_keywords,
+                                            additional_builtins)
     kw = r"\b" + any("keyword", kwlist) + r"\b"
     builtin = r"([^.'\"\\#]\b|^)" + any("builtin", builtinlist) + r"\b"
     comment = any("comment", [r"#[^\n]*"])
@@ -353,6 +489,12 @@ def make_python_patterns(additional_keywords=[], additional_builtins=[]):
     ufstring2 = any("uf_dqstring", [uf_dqstring])
     ufstring3 = any("uf_sq3string", [uf_sq3string])
     ufstring4 = any("uf_dq3string", [uf_dq3string])
+    if names:
+        # Names must be tried last, because strings may start with a prefix
+        return "|".join([instance, comment,
+                         ufstring1, ufstring2, ufstring3, ufstring4, string,
+                         number, any("name", [r"[^\W\d]\w*"]),
+                         any("SYNC", [r"\n"])])
     return "|".join([instance, kw, builtin, comment,
                      ufstring1, ufstring2, ufstring3, ufstring4, string,
                      number, any("SYNC", [r"\n"])])
@@ -362,11 +504,17 @@ class OutlineExplorerData(object):
     FUNCTION_TOKEN = 'def'
     CLASS_TOKEN = 'class'
 
-    def __init__(self):
-        self.text = None
-        self.fold_level = None
-        self.def_type = None
-        self.def_name = None
+    # Data is kept for each block with outline explorer data, so it is
+    # stored compactly
+    __slots__ = ('text', 'fold_level', 'def_type', 'def_name', 'color')
+
+    def __init__(self, text=None, fold_level=None, def_type=None,
+                 def_name=None, color=None):
+        self.text = text
+        self.fold_level = fold_level
+        self.def_type = def_type
+        self.def_name = def_name
+        self.color = color
         
     def is_not_class_nor_function(self):
         return self.def_type not in (self.CLASS, self.FUNCTION)
@@ -398,149 +546,181 @@ class PythonSH(BaseSH):
     """Python Syntax Highlighter"""
     # Syntax highlighting rules:
     add_kw = ['async', 'await']
-    PROG = re.compile(make_python_patterns(additional_keywords=add_kw), re.S)
+    PROG = re.compile(make_python_patterns(additional_keywords=add_kw,
+                                           names=True), re.S)
+    KEYWORDS, BUILTINS = [set(names) for names in
+                          make_python_names(additional_keywords=add_kw)]
+    WORDPROG = re.compile(r"\w", re.S)
+    # Characters that can't be found before a builtin
+    NOT_BUILTIN_PREFIXES = ".'\"\\#"
     IDPROG = re.compile(r"\s+(\w+)", re.S)
     ASPROG = re.compile(r".*?\b(as)\b")
     # Syntax highlighting states (from one text block to another):
     (NORMAL, INSIDE_SQ3STRING, INSIDE_DQ3STRING,
      INSIDE_SQSTRING, INSIDE_DQSTRING) = list(range(5))
+    # Text added before a block to continue the string of the previous one
+    STATE_PREFIXES = {INSIDE_SQ3STRING: "''' ", INSIDE_DQ3STRING: '""" ',
+                      INSIDE_SQSTRING: "' ", INSIDE_DQSTRING: '" '}
+    # States after unfinished strings
+    UF_STRING_STATES = {"uf_sq3string": INSIDE_SQ3STRING,
+                        "uf_dq3string": INSIDE_DQ3STRING,
+                        "uf_sqstring": INSIDE_SQSTRING,
+                        "uf_dqstring": INSIDE_DQSTRING}
     DEF_TYPES = {"def": OutlineExplorerData.FUNCTION,
                  "class": OutlineExplorerData.CLASS}
     # Comments suitable for Outline Explorer
     OECOMMENT = re.compile('^(# ?--[-]+|##[#]+ )[ -]*[^- ]+')
+    # Maximum number of tokenized blocks kept in cache
+    BLOCK_CACHE_SIZE = 100000
     
     def __init__(self, parent, font=None, color_scheme='Spyder'):
         BaseSH.__init__(self, parent, font, color_scheme)
         self.import_statements = {}
         self.found_cell_separators = False
         self.cell_separators = CELL_LANGUAGES['Python']
+        self.block_cache = {}
+
+    def setup_formats(self, font=None):
+        BaseSH.setup_formats(self, font)
+        # Cached outline explorer data refers to the formats
+        self.block_cache = {}
+        # Use normal format for indentation and trailing spaces.
+        self.formats['leading'] = self.formats['normal']
+        self.formats['trailing'] = self.formats['normal']
+
+    def tokenize_block(self, text, prev_state):
+        """Tokenize a block of text, given the state of the previous one
+
+        Returns a tuple with a list of (start, length, format name), the
+        state of the block, its outline explorer data and its import
+        statement."""
+        prefix = self.STATE_PREFIXES.get(prev_state, '')
+        offset = -len(prefix)
+        text = prefix + text
 
-    def highlight_block(self, text):
-        """Implement specific highlight for Python."""
-        text = to_text_string(text)
-        prev_state = tbh.get_state(self.currentBlock().previous())
-        if prev_state == self.INSIDE_DQ3STRING:
-            offset = -4
-            text = r'""" '+text
-        elif prev_state == self.INSIDE_SQ3STRING:
-            offset = -4
-            text = r"''' "+text
-        elif prev_state == self.INSIDE_DQSTRING:
-            offset = -2
-            text = r'" '+text
-        elif prev_state == self.INSIDE_SQSTRING:
-            offset = -2
-            text = r"' "+text
-        else:
-            offset = 0
-            prev_state = self.NORMAL
-        
         oedata = None
         import_stmt = None
-
-        self.setFormat(0, len(text), self.formats["normal"])
-        
+        formats = [(0, len(text), "normal")]
         state = self.NORMAL
         match = self.PROG.search(text)
         while match:
-            for key, value in list(match.groupdict().items()):
-                if value:
-                    start, end = match.span(key)
-                    start = max([0, start+offset])
-                    end = max([0, end+offset])
-                    if key == "uf_sq3string":
-                        self.setFormat(start, end-start,
-                                       self.formats["string"])
-                        state = self.INSIDE_SQ3STRING
-                    elif key == "uf_dq3string":
-                        self.setFormat(start, end-start,
-                                       self.formats["string"])
-                        state = self.INSIDE_DQ3STRING
-                    elif key == "uf_sqstring":
-                        self.setFormat(start, end-start,
-                                       self.formats["string"])
-                        state = self.INSIDE_SQSTRING
-                    elif key == "uf_dqstring":
-                        self.setFormat(start, end-start,
-                                       self.formats["string"])
-                        state = self.INSIDE_DQSTRING
-                    else:
-                        self.setFormat(start, end-start, self.formats[key])
-                        if key == "comment":
-                            if text.lstrip().startswith(self.cell_separators):
-                                self.found_cell_separators = True
-                                oedata = OutlineExplorerData()
-                                oedata.text = to_text_string(text).strip()
-                                oedata.fold_level = start
-                                oedata.def_type = OutlineExplorerData.CELL
-                                oedata.def_name = text.strip()
-                            elif self.OECOMMENT.match(text.lstrip()):
-                                oedata = OutlineExplorerData()
-                                oedata.text = to_text_string(text).strip()
-                                oedata.fold_level = start
-                                oedata.def_type = OutlineExplorerData.COMMENT
-                                oedata.def_name = text.strip()
-                        elif key == "keyword":
-                            if value in ("def", "class"):
-                                match1 = self.IDPROG.match(text, end)
-                                if match1:
-                                    start1, end1 = match1.span(1)
-                                    self.setFormat(start1, end1-start1,
-                                                   self.formats["definition"])
-                                    oedata = OutlineExplorerData()
-                                    oedata.text = to_text_string(text)
-                                    oedata.fold_level = start
-                                    oedata.def_type = self.DEF_TYPES[
-                                                        to_text_string(value)]
-                                    oedata.def_name = text[start1:end1]
-                                    oedata.color = self.formats["definition"]
-                            elif value in ("elif", "else", "except", "finally",
-                                           "for", "if", "try", "while",
-                                           "with"):
-                                if text.lstrip().startswith(value):
-                                    oedata = OutlineExplorerData()
-                                    oedata.text = to_text_string(text).strip()
-                                    oedata.fold_level = start
-                                    oedata.def_type = \
-                                        OutlineExplorerData.STATEMENT
-                                    oedata.def_name = text.strip()
-                            elif value == "import":
-                                import_stmt = text.strip()
-                                # color all the "as" words on same line, except
-                                # if in a comment; cheap approximation to the
-                                # truth
-                                if '#' in text:
-                                    endpos = text.index('#')
-                                else:
-                                    endpos = len(text)
-                                while True:
-                                    match1 = self.ASPROG.match(text, end,
-                                                               endpos)
-                                    if not match1:
-                                        break
-                                    start, end = match1.span(1)
-                                    self.setFormat(start, end-start,
-                                                   self.formats["keyword"])
-                    
+            key = match.lastgroup
+            value = match.group(key)
+            start, end = match.span(key)
+            if key == "name":
+                previous = text[start-1:start]
+                if previous and self.WORDPROG.match(previous):
+                    # Not the start of a name
+                    key = None
+                elif value in self.KEYWORDS:
+                    key = "keyword"
+                elif (value in self.BUILTINS and
+                        (not previous or
+                         previous not in self.NOT_BUILTIN_PREFIXES)):
+                    key = "builtin"
+                else:
+                    key = None
+                if key is None:
+                    match = self.PROG.search(text, match.end())
+                    continue
+            if offset:
+                start = max([0, start+offset])
+                end = max([0, end+offset])
+            if key in self.UF_STRING_STATES:
+                formats.append((start, end-start, "string"))
+                state = self.UF_STRING_STATES[key]
+            else:
+                formats.append((start, end-start, key))
+                if key == "comment":
+                    if text.lstrip().startswith(self.cell_separators):
+                        oedata = OutlineExplorerData(
+                            text.strip(), start, OutlineExplorerData.CELL,
+                            text.strip())
+                    elif self.OECOMMENT.match(text.lstrip()):
+                        oedata = OutlineExplorerData(
+                            text.strip(), start, OutlineExplorerData.COMMENT,
+                            text.strip())
+                elif key == "keyword":
+                    if value in ("def", "class"):
+                        match1 = self.IDPROG.match(text, end)
+                        if match1:
+                            start1, end1 = match1.span(1)
+                            formats.append((start1, end1-start1,
+                                            "definition"))
+                            oedata = OutlineExplorerData(
+                                text, start, self.DEF_TYPES[value],
+                                text[start1:end1],
+                                self.formats["definition"])
+                    elif value in ("elif", "else", "except", "finally",
+                                   "for", "if", "try", "while", "with"):
+                        if text.lstrip().startswith(value):
+                            oedata = OutlineExplorerData(
+                                text.strip(), start,
+                                OutlineExplorerData.STATEMENT, text.strip())
+                    elif value == "import":
+                        import_stmt = text.strip()
+                        # color all the "as" words on same line, except
+                        # if in a comment; cheap approximation to the
+                        # truth
+                        if '#' in text:
+                            endpos = text.index('#')
+                        else:
+                            endpos = len(text)
+                        while True:
+                            match1 = self.ASPROG.match(text, end, endpos)
+                            if not match1:
+                                break
+                            start, end = match1.span(1)
+                            formats.append((start, end-start, "keyword"))
             match = self.PROG.search(text, match.end())
-        
-        tbh.set_state(self.currentBlock(), state)
-        
-        # Use normal format for indentation and trailing spaces.
-        self.formats['leading'] = self.formats['normal']
-        self.formats['trailing'] = self.formats['normal']
-        self.highlight_spaces(text, offset)
-        
+        return formats, state, oedata, import_stmt
+
+    def highlight_block(self, text):
+        """Implement specific highlight for Python.
+
+        Tokens are cached by text and state of the previous block, so
+        unchanged blocks are not tokenized again (e.g. when rehighlighting
+        the whole document). Note that QSyntaxHighlighter stops highlighting
+        the following blocks as soon as the state of a block is unchanged."""
+        text = to_text_string(text)
+        block = self.currentBlock()
+        prev_state = tbh.get_state(block.previous())
+        if prev_state not in self.STATE_PREFIXES:
+            prev_state = self.NORMAL
+        key = (text, prev_state)
+        tokens = self.block_cache.get(key)
+        if tokens is None:
+            if len(self.block_cache) >= self.BLOCK_CACHE_SIZE:
+                self.block_cache.clear()
+            tokens = self.tokenize_block(text, prev_state)
+            self.block_cache[key] = tokens
+        formats, state, oedata, import_stmt = tokens
+
+        for start, length, name in formats:
+            self.setFormat(start, length, self.formats[name])
+        tbh.set_state(block, state)
+        prefix = self.STATE_PREFIXES.get(prev_state, '')
+        self.highlight_spaces(prefix + text, -len(prefix))
+
+        block_nb = block.blockNumber()
+        self.set_outlineexplorer_data(block_nb, oedata)
         if oedata is not None:
-            block_nb = self.currentBlock().blockNumber()
-            self.outlineexplorer_data[block_nb] = oedata
+            if oedata.def_type == OutlineExplorerData.CELL:
+                self.found_cell_separators = True
             self.outlineexplorer_data['found_cell_separators'] = self.found_cell_separators
         if import_stmt is not None:
-            block_nb = self.currentBlock().blockNumber()
             self.import_statements[block_nb] = import_stmt
+        else:
+            self.import_statements.pop(block_nb, None)
+
+    def blocks_changed(self, first, last, delta):
+        """Reimplemented BaseSH method"""
+        BaseSH.blocks_changed(self, first, last, delta)
+        update_block_data(self.import_statements, first, last, delta)
             
     def get_import_statements(self):
-        return list(self.import_statements.values())
+        return [self.import_statements[block_nb]
+                for block_nb in sorted(self.import_statements)]
             
     def rehighlight(self):
         self.import_statements = {}
@@ -563,7 +743,11 @@ class CythonSH(PythonSH):
     ADDITIONAL_BUILTINS = C_TYPES.split() + [
         "array", "bint", "Py_ssize_t", "intern", "reload", "sizeof", "NULL"]
     PROG = re.compile(make_python_patterns(ADDITIONAL_KEYWORDS,
-                                           ADDITIONAL_BUILTINS), re.S)
+                                           ADDITIONAL_BUILTINS, names=True),
+                      re.S)
+    KEYWORDS, BUILTINS = [set(names) for names in
+                          make_python_names(ADDITIONAL_KEYWORDS,
+                                            ADDITIONAL_BUILTINS)]
     IDPROG = re.compile(r"\s+([\w\.]+)", re.S)
 
 
@@ -576,7 +760,11 @@ class EnamlSH(PythonSH):
                            "func"]
     ADDITIONAL_BUILTINS = []
     PROG = re.compile(make_python_patterns(ADDITIONAL_KEYWORDS,
-                                           ADDITIONAL_BUILTINS), re.S)
+                                           ADDITIONAL_BUILTINS, names=True),
+                      re.S)
+    KEYWORDS, BUILTINS = [set(names) for names in
+                          make_python_names(ADDITIONAL_KEYWORDS,
+                                            ADDITIONAL_BUILTINS)]
     IDPROG = re.compile(r"\s+([\w\.]+)", re.S)
 
 
@@ -1106,6 +1294,17 @@ class PygmentsSH(BaseSH):
 
     # Syntax highlighting states (from one text block to another):
     NORMAL = 0
+
+    # Number of spans before a change that must be highlighted as before to
+    # start parsing there, and after it to stop parsing
+    RESTART_SPANS = 8
+    SYNC_SPANS = 8
+
+    # Delay in ms after parsing only the changed lines to parse the whole
+    # text again, as the lexer could be in a different state where parsing
+    # was started or stopped
+    FULL_PARSE_DELAY = 2000
+
     def __init__(self, parent, font=None, color_scheme=None):
         # Warning: do not move out those import statements
         # (pygments is an optional dependency)
@@ -1123,6 +1322,7 @@ class PygmentsSH(BaseSH):
                         Comment: "comment",
                         String: "string",
                         Number: "number"}
+        self._format_names = {}
         # Load Pygments' Lexer
         if self._lang_name is not None:
             self._lexer = get_lexer_by_name(self._lang_name)
@@ -1132,84 +1332,323 @@ class PygmentsSH(BaseSH):
         # This worker runs in a thread to avoid blocking when doing full file
         # parsing
         self._worker_manager = WorkerManager()
+        self._worker = None
+
+        # Format spans of the text after Pygments parsing: start offset and
+        # format name of each run of characters with the same format
+        self._span_starts = []
+        self._span_formats = []
+        self._length = 0
+
+        # Range changed since the last parsing, as the offset of its start
+        # and the number of characters left unchanged at the end
+        self._dirty = None
+
+        self._timer_full_parse = QTimer(self)
+        self._timer_full_parse.setSingleShot(True)
+        self._timer_full_parse.setInterval(self.FULL_PARSE_DELAY)
+        self._timer_full_parse.timeout.connect(
+            lambda: self.make_spans(full=True))
+
+    def _document_changed(self, position, removed, added):
+        """Update the range of text changed since the last parsing."""
+        BaseSH._document_changed(self, position, removed, added)
+        document = self.document()
+        if document is None:
+            return
+        length = document.characterCount() - 1
+        position = min(position, length)
+        suffix = max(length - position - added, 0)
+        if self._dirty is not None:
+            position = min(position, self._dirty[0])
+            suffix = min(suffix, self._dirty[1])
+        self._dirty = (position, suffix)
+
+    def make_spans(self, full=False):
+        """
+        Parse the text changed since the last call and update format spans.
 
-        # Store the format for all the tokens after Pygments parsing
-        self._charlist = []
-
-        # Flag variable to avoid unnecessary highlights if the worker has not
-        # yet finished processing
-        self._allow_highlight = True
-
-    def make_charlist(self):
-        """Parses the complete text and stores format for each character."""
+        The whole text is parsed the first time or if full is True, and only
+        the lines around the changes otherwise.
+        """
+        document = self.document()
+        if document is None or self._lexer is None:
+            return
+        if self._span_starts and self._dirty is None and not full:
+            return
+        self._timer_full_parse.stop()
+        if self._span_starts and not (full and self._dirty is not None):
+            spans = (self._span_starts, self._span_formats, self._length)
+        else:
+            spans = None
+        text = to_text_string(document.toPlainText())
+        dirty = None if full else self._dirty
+        revision = document.revision()
 
         def worker_output(worker, output, error):
             """Worker finished callback."""
-            self._charlist = output
-            if error is None and output:
-                self._allow_highlight = True
+            if worker is not self._worker:
+                return
+            self._worker = None
+            if error is not None or output is None:
+                return
+            if (self.document() is not document or
+                    document.revision() != revision):
+                # The text changed while it was being parsed
+                self.make_spans()
+                return
+            starts, names, start, end = output
+            self._span_starts, self._span_formats = starts, names
+            self._length = len(text)
+            self._dirty = None
+            if spans is None:
                 self.rehighlight()
-            self._allow_highlight = False
-
-        text = to_text_string(self.document().toPlainText())
-        tokens = self._lexer.get_tokens(text)
+                return
+            if dirty is not None:
+                self._timer_full_parse.start()
+            block = document.findBlock(start)
+            while block.isValid() and block.position() < max(end, start + 1):
+                self.rehighlightBlock(block)
+                block = block.next()
 
         # Before starting a new worker process make sure to end previous
         # incarnations
         self._worker_manager.terminate_all()
 
         worker = self._worker_manager.create_python_worker(
-            self._make_charlist,
-            tokens,
-            self._tokmap,
-            self.formats,
+            self._make_spans,
+            text,
+            spans,
+            dirty,
         )
         worker.sig_finished.connect(worker_output)
+        self._worker = worker
         worker.start()
 
-    def _make_charlist(self, tokens, tokmap, formats):
-        """
-        Parses the complete text and stores format for each character.
-
-        Uses the attached lexer to parse into a list of tokens and Pygments
-        token types.  Then breaks tokens into individual letters, each with a
-        Spyder token type attached.  Stores this list as self._charlist.
-
-        It's attached to the contentsChange signal of the parent QTextDocument
-        so that the charlist is updated whenever the document changes.
-        """
-
-        def _get_fmt(typ):
-            """Get the Spyder format code for the given Pygments token type."""
-            # Exact matches first
-            if typ in tokmap:
-                return tokmap[typ]
+    def _get_format_name(self, typ):
+        """Get the Spyder format name for the given Pygments token type."""
+        try:
+            return self._format_names[typ]
+        except KeyError:
+            pass
+        # Exact matches first
+        name = self._tokmap.get(typ)
+        if name is None:
+            name = 'normal'
             # Partial (parent-> child) matches
-            for key, val in tokmap.items():
+            for key, val in self._tokmap.items():
                 if typ in key: # Checks if typ is a subtype of key.
-                    return val
+                    name = val
+                    break
+        self._format_names[typ] = name
+        return name
+
+    def _iter_spans(self, text, start):
+        """Parse text from offset start, yielding (offset, format) spans."""
+        length = len(text)
+        text = text[start:]
+        # Most lexers expect a newline at the end of the text
+        if not text.endswith('\n'):
+            text += '\n'
+        name = None
+        # Token indexes can't be used, as lexers delegating parts of the
+        # text to other lexers (e.g. reStructuredText's) give them relative
+        # to these parts
+        offset = start
+        for _index, typ, value in self._lexer.get_tokens_unprocessed(text):
+            if not value:
+                continue
+            if offset >= length:
+                break
+            token_name = self._get_format_name(typ)
+            if token_name != name:
+                name = token_name
+                yield offset, name
+            offset += len(value)
+
+    def _make_spans(self, text, spans=None, dirty=None):
+        """
+        Parse text and return its format spans.
+
+        If the spans of the previous text and the range changed since then
+        are given, parsing restarts at a line before the change where the
+        previous spans are reproduced for RESTART_SPANS spans, as the lexer
+        is then most likely in its initial state there, and stops at the
+        first line after the change where the previous spans are reproduced
+        again for SYNC_SPANS spans. If only the previous spans are given,
+        the whole text is parsed and compared with them.
+
+        The state of the lexer is not known where parsing restarts or
+        stops, so the spans after a change may differ from those of a full
+        parse (e.g. when a C comment is opened or closed). make_spans parses
+        the whole text again FULL_PARSE_DELAY ms later to fix them.
+
+        Returns the lists of span starts and format names, and the range of
+        text whose formats changed.
+        """
+        length = len(text)
+        if spans is None or dirty is None:
+            starts, names = [], []
+            for start, name in self._iter_spans(text, 0):
+                starts.append(start)
+                names.append(name)
+            if spans is None:
+                return starts, names, 0, length
+            start, end = _get_changed_range(spans[0], spans[1], starts, names,
+                                            length)
+            return starts, names, start, end
+
+        old_starts, old_names, old_length = spans
+        delta = length - old_length
+        dirty_start, dirty_suffix = dirty
+        restart_spans = self.RESTART_SPANS
+        while True:
+            # Restart at the beginning of a line before the change and at
+            # least restart_spans spans before it
+            restart = dirty_start
+            if restart > 0:
+                restart = text.rfind('\n', 0, restart - 1) + 1
+            index = bisect.bisect_left(old_starts, dirty_start) - restart_spans
+            if index <= 0:
+                restart = 0
+            elif old_starts[index] < restart:
+                restart = text.rfind('\n', 0, old_starts[index]) + 1
+            new_starts, new_names = [], []
+            iter_spans = self._iter_spans(text, restart)
+            for start, name in iter_spans:
+                new_starts.append(start)
+                new_names.append(name)
+                if start >= dirty_start:
+                    break
+            if restart == 0 or (
+                    _clip_spans(new_starts, new_names, restart, dirty_start) ==
+                    _clip_spans(old_starts, old_names, restart, dirty_start)):
+                break
+            restart_spans *= 4
+
+        # Parse after the change until the first line where the next lines
+        # with SYNC_SPANS spans are highlighted as before
+        change_end = length - dirty_suffix
+        if change_end == 0 or text[change_end - 1] == '\n':
+            sync = change_end
+        else:
+            sync = text.find('\n', change_end) + 1 or length
+        parsed = False
+        while sync < length:
+            window_end = sync
+            while True:
+                window_end = text.find('\n', window_end) + 1 or length
+                while not parsed and (not new_starts or
+                                      new_starts[-1] < window_end):
+                    try:
+                        start, name = next(iter_spans)
+                    except StopIteration:
+                        parsed = True
+                    else:
+                        new_starts.append(start)
+                        new_names.append(name)
+                if (window_end == length or
+                        bisect.bisect_left(new_starts, window_end) -
+                        bisect.bisect_left(new_starts, sync) >=
+                        self.SYNC_SPANS):
+                    break
+            if (_clip_spans(new_starts, new_names, sync, window_end) ==
+                    _clip_spans(old_starts, old_names, sync - delta,
+                                window_end - delta, offset=delta)):
+                break
+            sync = text.find('\n', sync) + 1 or length
+        if sync == length:
+            for start, name in iter_spans:
+                new_starts.append(start)
+                new_names.append(name)
+
+        # Keep the spans before the restart and after the sync point
+        index = bisect.bisect_left(old_starts, restart)
+        starts, names = old_starts[:index], old_names[:index]
+        for start, name in zip(new_starts, new_names):
+            if start >= sync:
+                break
+            if not names or names[-1] != name:
+                starts.append(start)
+                names.append(name)
+        if sync < length:
+            index = max(bisect.bisect_right(old_starts, sync - delta) - 1, 0)
+            if not names or names[-1] != old_names[index]:
+                starts.append(sync)
+                names.append(old_names[index])
+            starts.extend([start + delta for start in old_starts[index + 1:]])
+            names.extend(old_names[index + 1:])
+        return starts, names, restart, sync
 
-            return 'normal'
+    def highlightBlock(self, text):
+        """ Actually highlight the block"""
+        start = self.currentBlock().position()
+        end = start + len(text)
+        if self._dirty is None:
+            self._set_span_formats(start, start, end)
+        else:
+            # Characters in the changed range are left unformatted until the
+            # text is parsed again
+            dirty_start, dirty_suffix = self._dirty
+            length = self.document().characterCount() - 1
+            self._set_span_formats(start, start, min(end, dirty_start))
+            self._set_span_formats(start, max(start, length - dirty_suffix),
+                                   end, offset=self._length - length)
+        self.highlight_spaces(text)
 
-        charlist = []
-        for typ, token in tokens:
-            fmt = formats[_get_fmt(typ)]
-            for letter in token:
-                charlist.append((fmt, letter))
+    def _set_span_formats(self, block_start, start, end, offset=0):
+        """
+        Set formats of the block characters in [start, end) from spans.
 
-        return charlist
+        offset is added to character positions to get span positions.
+        """
+        starts = self._span_starts
+        count = len(starts)
+        index = max(bisect.bisect_right(starts, start + offset) - 1, 0)
+        while start < end and index < count:
+            if index + 1 < count:
+                span_end = min(starts[index + 1] - offset, end)
+            else:
+                span_end = end
+            if span_end > start:
+                self.setFormat(start - block_start, span_end - start,
+                               self.formats[self._span_formats[index]])
+                start = span_end
+            index += 1
+
+
+def _get_changed_range(old_starts, old_names, starts, names, length):
+    """Return the range of text with different formats in two span lists."""
+    count = min(len(old_starts), len(starts))
+    first = 0
+    while (first < count and old_starts[first] == starts[first] and
+           old_names[first] == names[first]):
+        first += 1
+    if first == len(old_starts) == len(starts):
+        return length, length
+    last = 0
+    while (last < count - first and
+           old_starts[-1 - last] == starts[-1 - last] and
+           old_names[-1 - last] == names[-1 - last]):
+        last += 1
+    start = min(old_starts[first] if first < len(old_starts) else length,
+                starts[first] if first < len(starts) else length)
+    end = starts[-last] if last else length
+    return start, end
+
+
+def _clip_spans(starts, names, start, end, offset=0):
+    """
+    Return the (offset, format) spans in the range [start, end).
 
-    def highlightBlock(self, text):
-        """ Actually highlight the block"""
-        # Note that an undefined blockstate is equal to -1, so the first block
-        # will have the correct behaviour of starting at 0.
-        if self._allow_highlight:
-            start = self.previousBlockState() + 1
-            end = start + len(text)
-            for i, (fmt, letter) in enumerate(self._charlist[start:end]):
-                self.setFormat(i, 1, fmt)
-            self.setCurrentBlockState(end)
-            self.highlight_spaces(text)
+    offset is added to the returned span offsets.
+    """
+    spans = []
+    index = max(bisect.bisect_right(starts, start) - 1, 0)
+    while index < len(starts) and starts[index] < end:
+        spans.append((max(starts[index], start) + offset, names[index]))
+        index += 1
+    return spans
 
 
 def guess_pygments_highlighter(filename):
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""
+Benchmark of the Python syntax highlighter throughput.
+
+Reports the lines highlighted per second when the whole document is
+highlighted with an empty block cache and again with the cache filled.
+It's not collected by pytest; run it with:
+
+    python -m spyder.utils.tests.benchmark_syntaxhighlighters [file ...]
+
+syntaxhighlighters.py is highlighted if no file is given.
+"""
+
+from __future__ import print_function
+
+import io
+import os
+import sys
+import time
+
+from qtpy.QtGui import QTextDocument
+
+from spyder.utils.qthelpers import qapplication
+from spyder.utils.syntaxhighlighters import PythonSH
+
+
+REPEATS = 5
+
+
+def get_throughput(sh, lines, clear_cache):
+    """Return the best lines/s of REPEATS highlightings of the document."""
+    best = None
+    for __ in range(REPEATS):
+        if clear_cache:
+            sh.block_cache.clear()
+        start = time.time()
+        sh.rehighlight()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return lines / max(best, 1e-6)
+
+
+def benchmark(path):
+    """Print the highlighting throughput of the file in path."""
+    with io.open(path, encoding='utf-8') as f:
+        txt = f.read()
+    lines = txt.count('\n') + 1
+    doc = QTextDocument(txt)
+    sh = PythonSH(doc, color_scheme='Spyder')
+    uncached = get_throughput(sh, lines, clear_cache=True)
+    cached = get_throughput(sh, lines, clear_cache=False)
+    print("%s (%d lines): %d lines/s, %d lines/s with cache"
+          % (os.path.basename(path), lines, uncached, cached))
+
+
+def main(paths):
+    app = qapplication()
+    if not paths:
+        paths = [os.path.join(os.path.dirname(__file__), os.pardir,
+                              'syntaxhighlighters.py')]
+    for path in paths:
+        benchmark(path)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
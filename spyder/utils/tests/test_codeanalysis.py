@@ -15,11 +15,15 @@ import os
 import pytest
 
 # Local imports
+from spyder.utils import codeanalysis
 from spyder.utils.codeanalysis import (check_with_pep8, check_with_pyflakes,
-                                       find_tasks)
+                                       check_with_pep8_incremental,
+                                       check_with_pyflakes_incremental,
+                                       find_tasks, get_blocks)
 from spyder.py3compat import PY2
 
 TEST_FILE = os.path.join(os.path.dirname(__file__), 'data/example.py')
+ROOT_PATH = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)
 
 def test_codeanalysis():
     """Test codeanalysis with pyflakes and pep8."""
@@ -33,5 +37,92 @@ def test_codeanalysis():
     assert len(check_results) == num_results
 
 
+def test_get_blocks():
+    """Test splitting code in top-level blocks."""
+    lines = ["import os\n", "\n", "\n", "# Comment\n", "@decorator\n",
+             "def spam(eggs=(1,\n", "              2)):\n",
+             "    return '''\n", "ham\n", "'''\n", "x = 1\n"]
+    blocks = get_blocks(lines)
+    assert [(start, end) for start, end, _info in blocks] == \
+        [(0, 1), (1, 10), (10, 11)]
+    assert blocks[1][2]['definition']
+    assert blocks[1][2]['name'] == 'spam'
+    assert get_blocks(["def spam(:\n", "    pass\n"]) is None
+
+
+@pytest.mark.parametrize('edit', [
+    lambda lines: lines,
+    lambda lines: ["import re\n", "\n"] + lines,
+    lambda lines: lines[:30] + lines[31:],
+    lambda lines: lines[:40] + ["def spam(x):\n", "    return os\n"] +
+    lines[40:],
+])
+def test_incremental_codeanalysis(edit):
+    """Test that incremental code analysis gives the same results."""
+    lines = open(TEST_FILE).read().splitlines(True)
+    check_with_pyflakes_incremental(''.join(lines).encode('utf-8'))
+    check_with_pep8_incremental(''.join(lines).encode('utf-8'))
+    code = ''.join(edit(lines)).encode('utf-8')
+    assert (sorted(check_with_pyflakes_incremental(code)) ==
+            sorted(check_with_pyflakes(code)))
+    # Compare with pycodestyle in this process, which may not be the
+    # version used by check_with_pep8
+    results = codeanalysis._check_lines_with_pycodestyle(
+        code.decode('utf-8').splitlines(True))[0]
+    assert sorted(check_with_pep8_incremental(code)) == sorted(results)
+
+
+@pytest.mark.parametrize('path', [
+    TEST_FILE,
+    os.path.join(ROOT_PATH, 'app', 'tour.py'),
+    os.path.join(ROOT_PATH, 'utils', 'codeanalysis.py'),
+    os.path.join(ROOT_PATH, 'utils', 'site', 'sitecustomize.py'),
+    os.path.join(ROOT_PATH, 'widgets', 'mixins.py'),
+])
+def test_incremental_pep8_parity(path):
+    """Test that incremental pycodestyle checks give the same results as
+    checking whole files, as done by check_with_pep8."""
+    import pycodestyle
+    with open(path, 'rb') as f:
+        code = f.read()
+    # Run the pycodestyle in this process, as in test_incremental_codeanalysis
+    lines = pycodestyle.readlines(path)
+    options = codeanalysis._get_pycodestyle_options(path)
+    results = [(message, lineno) for message, lineno
+               in codeanalysis._check_lines_with_pycodestyle(lines, options)[0]
+               if not codeanalysis._is_ignored(lines, lineno)]
+    assert sorted(check_with_pep8_incremental(code, path)) == sorted(results)
+
+
+def test_incremental_pep8_following_code():
+    """Test that definitions after a block are seen by pycodestyle."""
+    code = ("def spam():\n"
+            "    x = 1\n"
+            "    def eggs(a,\n"
+            "             b):\n"
+            "        return a\n"
+            "    return eggs\n"
+            "\n"
+            "\n"
+            "def ham():\n"
+            "    pass\n")
+    results = codeanalysis._check_lines_with_pycodestyle(
+        code.splitlines(True))[0]
+    assert sorted(check_with_pep8_incremental(code)) == sorted(results)
+    assert 'E306' not in ' '.join(message for message, _lineno in results)
+    results = check_with_pep8_incremental(code.replace('\n', '\r\n'))
+    assert sorted(check_with_pep8_incremental(code)) == sorted(results)
+
+
+def test_pycodestyle_project_config(tmpdir):
+    """Test that pycodestyle reads the configuration of the project."""
+    tmpdir.join('setup.cfg').write('[pycodestyle]\nmax-line-length = 120\n')
+    filename = str(tmpdir.mkdir('spam').join('eggs.py'))
+    code = ('x = %r\n' % ('x' * 90)).encode('utf-8')
+    assert [lineno for _message, lineno
+            in check_with_pep8_incremental(code)] == [1]
+    assert check_with_pep8_incremental(code, filename) == []
+
+
 if __name__ == "__main__":
     pytest.main()
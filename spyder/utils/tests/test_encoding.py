@@ -8,7 +8,7 @@
 import pytest
 import os
 
-from spyder.utils.encoding import is_text_file, get_coding
+from spyder.utils.encoding import is_text_file, get_coding, read, read_chunks
 
 __location__ = os.path.realpath(os.path.join(os.getcwd(),
                                              os.path.dirname(__file__)))
@@ -34,5 +34,25 @@ def test_files_encodings(expected_encoding, text_file):
         assert get_coding(text).lower() == expected_encoding.lower()
 
 
+@pytest.mark.parametrize('data', [
+    u'# -*- coding: utf-8 -*-\nx = "\u00e9"\r\n'.encode('utf-8') * 20,
+    u'x = "\u00e9"\n'.encode('utf-8') * 20 + u'\u00e9\n'.encode('latin-1'),
+    u'x = "\u00e9"\n'.encode('utf-16') * 20,
+    ])
+def test_read_chunks(tmpdir, data):
+    p = tmpdir.join("chunks.txt")
+    p.write(data, mode='wb')
+    text, encoding = read(str(p))
+    for chunk, chunk_encoding, position in read_chunks(str(p), 16):
+        if position == 0:
+            chunks, encodings = [], set()
+        chunks.append(chunk)
+        encodings.add(chunk_encoding)
+    assert encodings == {encoding}
+    assert len(chunks) > 1
+    assert all(chunk.endswith('\n') for chunk in chunks)
+    assert ''.join(chunks) == text
+
+
 if __name__ == '__main__':
     pytest.main()
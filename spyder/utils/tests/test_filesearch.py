@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Tests for filesearch.py"""
+
+import os
+import os.path as osp
+import re
+
+import pytest
+
+from spyder.utils.filesearch import (FileIndex, FileList, TrigramIndex,
+                                     find_in_file, get_query_literals,
+                                     is_excluded)
+
+
+TEXT = b"spam spam ham\neggs\nham\n  spam\nlast spam"
+
+
+@pytest.mark.parametrize('chunk_size', [3, 7, 1024])
+def test_find_in_file_literal(tmpdir, chunk_size):
+    p = tmpdir.join("spam.txt")
+    p.write_binary(TEXT)
+    entry, matches = find_in_file(str(p), [(b'spam', 'utf-8')], False,
+                                  chunk_size=chunk_size)
+    assert entry[2]
+    assert [m[:3] for m in matches] == [(1, 0, 4), (1, 5, 9), (4, 2, 6),
+                                        (5, 5, 9)]
+    assert matches[0][3] == u"spam spam ham\n"
+
+
+@pytest.mark.parametrize('chunk_size', [5, 1024])
+def test_find_in_file_regexp(tmpdir, chunk_size):
+    p = tmpdir.join("spam.txt")
+    p.write_binary(TEXT)
+    texts = [(re.compile(b'^ham$'), 'utf-8')]
+    _entry, matches = find_in_file(str(p), texts, True,
+                                   chunk_size=chunk_size)
+    assert [m[:3] for m in matches] == [(3, 0, 3)]
+
+
+def test_find_in_file_binary(tmpdir):
+    p = tmpdir.join("spam.bin")
+    p.write_binary(b"spam\x00\x01\x02\x03" * 100)
+    entry, matches = find_in_file(str(p), [(b'spam', 'utf-8')], False)
+    assert not entry[2]
+    assert matches == []
+
+    # Known binary files are not read again
+    p.write_binary(b"spam")
+    p.setmtime(entry[0])
+    entry = (entry[0], 4, False)
+    assert find_in_file(str(p), [(b'spam', 'utf-8')], False, entry) == \
+        (entry, [])
+
+
+def test_file_index(tmpdir):
+    root = tmpdir.mkdir("root")
+    root.join("spam.py").write("spam")
+    root.mkdir("sub").join("eggs.py").write("eggs")
+    root.mkdir("build").join("ham.py").write("ham")
+    index_path = str(tmpdir.mkdir("index"))
+    exclude = re.compile(r"build")
+
+    index = FileIndex(str(root), index_path=index_path)
+    files = [f for f, _entry in index.iter_files(exclude)]
+    assert files == [str(root.join("spam.py")),
+                     str(root.join("sub", "eggs.py"))]
+    for filename in files:
+        index.update_file(filename, find_in_file(filename, [], False)[0])
+    index.save()
+
+    # A new index for the same root reads the saved data
+    index = FileIndex(str(root), index_path=index_path)
+    assert index.load()
+    assert not index.modified
+    entries = dict(index.iter_files(exclude))
+    assert all(entries[f] is not None for f in files)
+    assert not index.modified
+
+    # Removed files are dropped from the index
+    root.join("spam.py").remove()
+    assert list(dict(index.iter_files(exclude))) == files[1:]
+    assert files[0] not in index.files
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink'), reason="Needs symlinks")
+def test_file_index_link_cycle(tmpdir):
+    root = tmpdir.mkdir("root")
+    sub = root.mkdir("sub")
+    sub.join("spam.py").write("spam")
+    os.symlink(str(root), str(sub.join("loop")))
+    index = FileIndex(str(root), index_path=str(tmpdir.mkdir("index")))
+    files = [f for f, _entry in index.iter_files()]
+    assert files == [str(sub.join("spam.py"))]
+
+
+def test_file_list(tmpdir):
+    root = tmpdir.mkdir("root")
+    root.join("spam.py").write("spam")
+    sub = root.mkdir("sub")
+    sub.join("eggs.py").write("eggs")
+    root.mkdir(".git").join("config").write("")
+    index_path = str(tmpdir.mkdir("index"))
+
+    file_list = FileList(str(root), index_path, exclude=re.compile(r"\.git"))
+    assert file_list.update()
+    revision, paths, names = file_list.files
+    assert paths == ["spam.py", osp.join("sub", "eggs.py")]
+    assert names == ["spam.py", "eggs.py"]
+    assert not file_list.update()
+    assert file_list.files[0] == revision
+
+    # Only changed directories are listed again
+    sub.join("ham.py").write("ham")
+    sub.setmtime(sub.mtime() + 10)
+    file_list = FileList(str(root), index_path, exclude=re.compile(r"\.git"))
+    listed = []
+    _get_dir = file_list.file_index._get_dir
+    def get_dir(path):
+        dirs = file_list.file_index.dirs
+        if dirs.get(path, [None])[0] != os.stat(path).st_mtime:
+            listed.append(path)
+        return _get_dir(path)
+    file_list.file_index._get_dir = get_dir
+    assert file_list.update()
+    assert listed == [str(sub)]
+    assert file_list.files[1] == ["spam.py", osp.join("sub", "eggs.py"),
+                                  osp.join("sub", "ham.py")]
+
+
+def test_exclude_relative_paths(tmpdir):
+    """
+    Test that absolute paths are excluded by default, and paths relative to
+    the root directory when asked to.
+    """
+    root = tmpdir.mkdir("spam.github.io")
+    root.join("spam.py").write("spam")
+    git = root.mkdir(".git")
+    git.join("config").write("")
+    exclude = re.compile(r"\.git")
+    index = FileIndex(str(root), index_path=str(tmpdir.join("index")))
+    assert list(index.iter_files(exclude)) == []
+    assert is_excluded(str(root.join("spam.py")), str(root), exclude)
+
+    files = [f for f, _entry in index.iter_files(exclude, relative=True)]
+    assert files == [str(root.join("spam.py"))]
+    assert not is_excluded(str(root.join("spam.py")), str(root), exclude,
+                           relative=True)
+    assert is_excluded(str(git.join("config")), str(root), exclude,
+                       relative=True)
+
+
+@pytest.mark.parametrize('pattern, literals', [
+    (b'spam', [b'spam']),
+    (b'^spam.*eggs$', [b'spam', b'eggs']),
+    (b'sp(am)? eggs', [b' eggs']),
+    (b'(spam)+', []),
+    (b'spam|eggs', []),
+    (b'(?i)spam', []),
+    (b'(?i:spam) eggs', []),
+])
+def test_get_query_literals(pattern, literals):
+    texts = [(re.compile(pattern), 'utf-8')]
+    queries = get_query_literals(texts, True)
+    if literals:
+        assert queries == [literals]
+    else:
+        assert queries is None
+
+
+def test_trigram_index(tmpdir):
+    root = tmpdir.mkdir("root")
+    root.join("spam.py").write("import spam\n")
+    root.join("eggs.py").write("import eggs\n")
+    root.mkdir("sub").join("ham.txt").write("spam and ham\n")
+    index_path = str(tmpdir.join("index"))
+
+    index = TrigramIndex(str(root), index_path)
+    assert index.update()
+    query = [(b'spam', 'utf-8')]
+    assert index.query(query, False) == [str(root.join("spam.py")),
+                                         str(root.join("sub", "ham.txt"))]
+    assert index.query([(re.compile(b'^import eggs'), 'utf-8')], True) == \
+        [str(root.join("eggs.py"))]
+
+    # Queries without literals of three bytes can't use the index
+    assert index.query([(b'sp', 'utf-8')], False) is None
+
+    # Modified files are re-indexed and the index is saved
+    root.join("eggs.py").write("import spam, eggs\n")
+    index = TrigramIndex(str(root), index_path)
+    assert index.query(query, False) == [str(root.join("eggs.py")),
+                                         str(root.join("spam.py")),
+                                         str(root.join("sub", "ham.txt"))]
+    stats = index.get_stats()
+    assert stats['num_files'] == 3
+    assert stats['num_candidates'] == 3
+    assert stats['size_on_disk'] > 0
+
+
+def test_trigram_index_max_size(tmpdir):
+    root = tmpdir.mkdir("root")
+    root.join("spam.py").write("import spam\n")
+    root.join("eggs.py").write("import eggs\n")
+
+    # Files that don't fit in the index are always candidates
+    index = TrigramIndex(str(root), str(tmpdir.join("index")), max_size=16)
+    assert index.query([(b'spam', 'utf-8')], False) == \
+        [str(root.join("eggs.py")), str(root.join("spam.py"))]
+
+
+def test_trigram_index_changed_files(tmpdir):
+    root = tmpdir.mkdir("root")
+    root.join("spam.py").write("import spam\n")
+    root.join("eggs.py").write("import eggs\n")
+    index = TrigramIndex(str(root), str(tmpdir.join("index")))
+    query = [(b'spam', 'utf-8')]
+    assert index.query(query, False) == [str(root.join("spam.py"))]
+
+    # Files modified or added outside Spyder are found by the next query
+    root.join("eggs.py").write("import spam, eggs\n")
+    root.join("ham.py").write("import spam, ham\n")
+    assert index.query(query, False) == [str(root.join("eggs.py")),
+                                         str(root.join("ham.py")),
+                                         str(root.join("spam.py"))]
+
+    # Files reported as changed are indexed again, even if their mtime and
+    # size didn't change
+    filename = str(root.join("ham.py"))
+    stat = os.stat(filename)
+    root.join("ham.py").write("import eggs, ham\n")
+    os.utime(filename, (stat.st_atime, stat.st_mtime))
+    assert index.query(query, False) == [str(root.join("eggs.py")),
+                                         str(root.join("ham.py")),
+                                         str(root.join("spam.py"))]
+    index.file_changed(filename)
+    assert index.query(query, False) == [str(root.join("eggs.py")),
+                                         str(root.join("spam.py"))]
+
+
+def test_trigram_index_exclude(tmpdir):
+    root = tmpdir.mkdir("root")
+    root.join("spam.py").write("import spam\n")
+    root.mkdir(".git").join("spam").write("spam\n")
+    index_path = root.mkdir(".spyproject").join("search_index")
+
+    # Excluded files and the index itself are not indexed
+    index = TrigramIndex(str(root), str(index_path),
+                         exclude=re.compile(r"\.git"))
+    assert index.query([(b'spam', 'utf-8')], False) == \
+        [str(root.join("spam.py"))]
+    assert index.query([(b'spam', 'utf-8')], False) == \
+        [str(root.join("spam.py"))]
+    assert index.get_stats()['num_files'] == 1
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -86,6 +86,21 @@ def test_spydata_import(spydata_values):
         valid = valid and bool(np.mean(spydata_values[var] == data[var]))
     assert valid
 
+def test_load_array_memory_map(tmpdir, monkeypatch):
+    """Test that large .npy files are memory mapped."""
+    path = str(tmpdir.join('spam.npy'))
+    np.save(path, np.arange(10))
+    data, error = iofuncs.load_array(path)
+    assert not isinstance(data['spam'], np.memmap)
+
+    monkeypatch.setattr(iofuncs, 'MMAP_SIZE', 0)
+    data, error = iofuncs.load_array(path)
+    assert isinstance(data['spam'], np.memmap)
+
+    # Changes are not written to the file
+    data['spam'][0] = 10
+    assert np.load(path)[0] == 0
+
 @pytest.mark.skipif(iofuncs.load_matlab is None, reason="SciPy required")
 def test_matlabstruct():
     """Test support for matlab stlye struct."""
@@ -6,6 +6,7 @@
 """Tests for programs.py"""
 
 import os
+import sys
 
 from flaky import flaky
 import pytest
@@ -14,7 +15,8 @@ from spyder.utils.programs import (run_python_script_in_terminal,
                                    is_python_interpreter,
                                    is_python_interpreter_valid_name,
                                    find_program, shell_split, check_version,
-                                   is_module_installed)
+                                   is_module_installed, get_module_versions)
+from spyder.utils import programs
 
 
 if os.name == 'nt':
@@ -96,6 +98,32 @@ def test_is_module_installed():
     assert not is_module_installed('IPython', '>=1.0;<3.0')
     assert is_module_installed('jedi', '>=0.7.0')
 
+def test_get_module_versions(tmpdir, monkeypatch):
+    """Test that module versions of interpreters are checked once."""
+    versions_file = str(tmpdir.join('module_versions.json'))
+    monkeypatch.setattr(programs, '_get_module_versions_file',
+                        lambda: versions_file)
+    monkeypatch.setattr(programs, '_module_versions', None)
+    versions = get_module_versions(sys.executable)
+    assert 'IPython' in versions
+    assert 'spam_eggs' not in versions
+    assert is_module_installed('IPython', '>=4.0;<100.0',
+                               interpreter=sys.executable)
+    assert not is_module_installed('spam_eggs', interpreter=sys.executable)
+
+    # Versions are saved and only checked again for new modules
+    run_program = programs.run_program
+    def _run_program(*args, **kwargs):
+        raise AssertionError("Interpreter run again")
+    monkeypatch.setattr(programs, 'run_program', _run_program)
+    monkeypatch.setattr(programs, '_module_versions', None)
+    assert get_module_versions(sys.executable) == versions
+    with pytest.raises(AssertionError):
+        get_module_versions(sys.executable, ['pytest'])
+    monkeypatch.setattr(programs, 'run_program', run_program)
+    assert 'pytest' in get_module_versions(sys.executable, ['pytest'])
+
+
 if __name__ == '__main__':
     pytest.main()
     
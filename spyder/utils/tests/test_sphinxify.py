@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for sphinxify.py
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.py3compat import to_text_string
+from spyder.utils.help import sphinxify as sphinxify_module
+from spyder.utils.help.sphinxify import generate_context, sphinxify
+
+
+def test_sphinxify_cache(monkeypatch):
+    """Test that docstrings are rendered again only if not cached."""
+    monkeypatch.setattr(sphinxify_module, 'CACHE_SIZE', 2)
+    monkeypatch.setattr(sphinxify_module, '_cache',
+                        sphinxify_module.OrderedDict())
+    context = generate_context(name='spam', argspec='(x, y=1)')
+    html = sphinxify('Spam with *eggs*', context)
+    assert '<em>eggs</em>' in html
+    assert 'argspec-highlight' in html
+    assert context['argspec'] == '(x, y=1)'
+
+    # The same application renders other docstrings and contexts
+    other_html = sphinxify('Spam with *ham*', dict(context, name='ham'))
+    assert '<em>ham</em>' in other_html
+    assert '<em>eggs</em>' not in other_html
+
+    builds = []
+    renderer = sphinxify_module._renderers['html']
+    render = renderer.render
+    def _render(*args):
+        builds.append(args[0])
+        return render(*args)
+    monkeypatch.setattr(renderer, 'render', _render)
+    assert sphinxify('Spam with *eggs*', context) == html
+    assert not builds
+
+    # Least recently used docstrings are rendered again
+    sphinxify('Spam with *bacon*', context)
+    assert sphinxify('Spam with *eggs*', context) == html
+    assert not builds[1:]
+    assert sphinxify('Spam with *ham*', dict(context, name='ham')) == \
+        other_html
+    assert builds == ['Spam with *bacon*', 'Spam with *ham*']
+
+
+def test_sphinxify_in_memory(tmpdir):
+    """Test that docstrings are rendered without writing files."""
+    context = generate_context(name='spam', math=False, collapse=True)
+    renderer = sphinxify_module.SphinxRenderer()
+    renderer.srcdir = to_text_string(tmpdir)
+    html = renderer.render('Spam\n\nEggs\n----\n\nwith :func:`ham`', context)
+    assert '<h1> spam </h1>' in html
+    assert '<code class="xref py py-func' in html
+    assert 'id="outline"' in html and '#eggs' in html
+    files = [osp.relpath(osp.join(root, name), renderer.srcdir)
+             for root, dirs, names in os.walk(renderer.srcdir)
+             for name in names]
+    assert not [name for name in files if 'docstring' in name]
+
+    # The text builder also renders in memory
+    renderer = sphinxify_module.SphinxRenderer('text')
+    text = renderer.render('Spam with *eggs*', context)
+    assert text.strip() == 'Spam with *eggs*'
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -15,7 +15,8 @@ import os
 import pytest
 
 # Local imports
-from spyder.utils.stringmatching import get_search_scores
+from spyder.utils.stringmatching import (FuzzyMatcher, get_char_mask,
+                                         get_search_scores)
 
 TEST_FILE = os.path.join(os.path.dirname(__file__), 'data/example.py')
 
@@ -216,5 +217,43 @@ def test_stringmatching_order_filter():
                                      'use previous <b>lay</b>out', 400113)]
 
 
+def test_fuzzy_matcher():
+    """Test that FuzzyMatcher gives the results of get_search_scores."""
+    names = ['layout preferences', 'use next layout', 'save current layout',
+             'use previous layout', 'Last edit location', 'clear line',
+             'close pane', 're-run last script']
+    matcher = FuzzyMatcher(names)
+    for query in ['l', 'la', 'lay', 'la', 'lst', 'L ast', '', 're-', 'x']:
+        for valid_only in [False, True]:
+            assert (matcher.get_scores(query, valid_only=valid_only,
+                                       sort=True) ==
+                    get_search_scores(query, names, valid_only=valid_only,
+                                      sort=True))
+
+    # Only the choices found for a query are searched again when it grows
+    assert matcher.search('lay') == [0, 1, 2, 3]
+    matcher._texts[4] = 'layout'
+    matcher._masks[4] = get_char_mask('layout')
+    assert matcher.search('layo') == [0, 1, 2, 3]
+    assert matcher.search('yo') == [0, 1, 2, 3, 4]
+
+
+def test_fuzzy_matcher_limit():
+    """Test getting only the best results."""
+    names = ['save current layout', 'use next layout', 'layout preferences',
+             'close pane']
+    matcher = FuzzyMatcher(names)
+    results = matcher.get_scores('lay', limit=2)
+    assert [text for text, rich_text, score in results] == \
+        ['layout preferences', 'use next layout']
+    assert [index for index, rich_text, score in
+            matcher.get_best_scores('lay', 3)] == [2, 1, 0]
+
+    # Choices with '-' characters can't be left out without scoring them
+    names = ['l-a-y-out'] + names
+    results = get_search_scores('lay', names, valid_only=True, sort=True)
+    assert FuzzyMatcher(names).get_scores('lay', limit=2) == results[:2]
+
+
 if __name__ == "__main__":
     pytest.main()
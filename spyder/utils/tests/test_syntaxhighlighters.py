@@ -5,11 +5,15 @@
 
 """Tests for syntaxhighlighters.py"""
 
+import io
+import os
+
 import pytest
 from qtpy.QtWidgets import QApplication
-from qtpy.QtGui import QTextDocument
+from qtpy.QtGui import QTextCursor, QTextDocument
 
-from spyder.utils.syntaxhighlighters import HtmlSH, PythonSH, MarkdownSH
+from spyder.utils.syntaxhighlighters import (HtmlSH, PythonSH, MarkdownSH,
+                                             guess_pygments_highlighter)
 
 def compare_formats(actualFormats, expectedFormats, sh):
     assert len(actualFormats) == len(expectedFormats)
@@ -20,6 +24,10 @@ def compare_formats(actualFormats, expectedFormats, sh):
         assert (actual.format.foreground().color().name()
                 == sh.formats[expected[2]].foreground().color().name())
 
+def get_formats(block):
+    return [(f.start, f.length, f.format.foreground().color().name())
+            for f in block.layout().additionalFormats()]
+
 def test_HtmlSH_basic():
     txt = '<p style="color:red;">Foo <!--comment--> bar.</p>'
     doc = QTextDocument(txt)
@@ -81,5 +89,158 @@ def test_python_not_an_outline_explorer_comment(line):
     assert not PythonSH.OECOMMENT.match(line)
 
 
+def test_PythonSH_basic(qtbot):
+    txt = "import os as o  # len\nif len(self.x):\n    x = '''a\nb''' + 3"
+    doc = QTextDocument(txt)
+    sh = PythonSH(doc, color_scheme='Spyder')
+    sh.rehighlight()
+
+    block = doc.firstBlock()
+    res = [(0, 6, 'keyword'),    # |import|
+           (6, 4, 'normal'),     # | os |
+           (10, 2, 'keyword'),   # |as|
+           (12, 4, 'normal'),    # | o  |
+           (16, 5, 'comment')]   # |# len|
+    compare_formats(block.layout().additionalFormats(), res, sh)
+    block = block.next()
+    res = [(0, 2, 'keyword'),    # |if|
+           (2, 1, 'normal'),     # | |
+           (3, 3, 'builtin'),    # |len|
+           (6, 1, 'normal'),     # |(|
+           (7, 4, 'instance'),   # |self|
+           (11, 4, 'normal')]    # |.x):|
+    compare_formats(block.layout().additionalFormats(), res, sh)
+    block = block.next()
+    res = [(0, 8, 'normal'),     # |    x = |
+           (8, 4, 'string')]     # |'''a|
+    compare_formats(block.layout().additionalFormats(), res, sh)
+    block = block.next()
+    res = [(0, 4, 'string'),     # |b'''|
+           (4, 3, 'normal'),     # | + |
+           (7, 1, 'number')]     # |3|
+    compare_formats(block.layout().additionalFormats(), res, sh)
+
+    oedata = sh.get_outlineexplorer_data()[1]
+    assert oedata.def_type == oedata.STATEMENT
+    assert sh.get_import_statements() == ['import os as o  # len']
+
+
+def test_PythonSH_block_cache(qtbot):
+    path = os.path.join(os.path.dirname(__file__), os.pardir,
+                        'syntaxhighlighters.py')
+    with io.open(path, encoding='utf-8') as f:
+        txt = f.read()
+    doc = QTextDocument(txt)
+    sh = PythonSH(doc, color_scheme='Spyder')
+    sh.rehighlight()
+    oedata = sh.get_outlineexplorer_data()
+    formats = get_formats(doc.lastBlock().previous())
+
+    # Unchanged blocks are not tokenized again
+    sh.tokenize_block = None
+    sh.rehighlight()
+    assert sh.get_outlineexplorer_data() == oedata
+    assert get_formats(doc.lastBlock().previous()) == formats
+
+
+def test_PythonSH_outline_data_updates(qtbot):
+    txt = "import os\ndef spam():\n    pass\nclass Eggs:\n    pass\n"
+    doc = QTextDocument(txt)
+    doc.documentLayout()
+    sh = PythonSH(doc, color_scheme='Spyder')
+    sh.rehighlight()
+
+    def get_names():
+        data = sh.get_outlineexplorer_data()
+        return sorted((block_nb, data[block_nb].def_name) for block_nb in data
+                      if block_nb != 'found_cell_separators')
+
+    # Block numbers follow lines inserted and removed before definitions
+    revision = sh.outlineexplorer_revision
+    cursor = QTextCursor(doc)
+    cursor.insertText("import re\n\n")
+    assert get_names() == [(3, 'spam'), (5, 'Eggs')]
+    assert sh.get_import_statements() == ['import re', 'import os']
+    assert sh.outlineexplorer_revision > revision
+    cursor.setPosition(doc.findBlockByNumber(3).position())
+    cursor.setPosition(doc.findBlockByNumber(5).position(),
+                       QTextCursor.KeepAnchor)
+    cursor.removeSelectedText()
+    assert get_names() == [(3, 'Eggs')]
+
+    # Changes within lines without definitions change nothing
+    revision = sh.outlineexplorer_revision
+    cursor.setPosition(doc.findBlockByNumber(4).position())
+    cursor.insertText("    x = 1  # ")
+    assert sh.outlineexplorer_revision == revision
+
+
+def test_PygmentsSH_spans(qtbot):
+    txt = 'int x = 1; /* comment */\n' * 10 + 'char *s = "a";\n'
+    doc = QTextDocument(txt)
+    doc.documentLayout()
+    sh = guess_pygments_highlighter('test.c')(doc, color_scheme='Spyder')
+    sh.make_spans()
+    qtbot.waitUntil(lambda: sh._worker is None)
+
+    # Spans are the start offset and format of each run of characters
+    assert list(zip(sh._span_starts, sh._span_formats))[:6] == [
+        (0, 'keyword'), (3, 'normal'), (8, 'number'), (9, 'normal'),
+        (11, 'comment'), (24, 'normal')]
+    block = doc.lastBlock().previous()
+    res = [(0, 4, 'keyword'),    # |char|
+           (4, 6, 'normal'),     # | *s = |
+           (10, 3, 'string'),    # |"a"|
+           (13, 1, 'normal')]    # |;|
+    compare_formats(block.layout().additionalFormats(), res, sh)
+
+    # Only the lines around a change are parsed again
+    starts = []
+    iter_spans = sh._iter_spans
+    def _iter_spans(text, start):
+        starts.append(start)
+        return iter_spans(text, start)
+    sh._iter_spans = _iter_spans
+    cursor = QTextCursor(doc)
+    cursor.setPosition(block.position())
+    cursor.insertText('/*\n')
+    sh.make_spans()
+    qtbot.waitUntil(lambda: sh._worker is None)
+    assert starts and min(starts) > 0
+    compare_formats(block.layout().additionalFormats(), [(0, 2, 'comment')],
+                    sh)
+    compare_formats(block.next().layout().additionalFormats(),
+                    [(0, 14, 'comment')], sh)
+    assert (sh._span_starts, sh._span_formats) == \
+        sh._make_spans(doc.toPlainText())[:2]
+
+    # The whole text is parsed again later, giving the same spans as a
+    # full parse after any edit
+    assert sh._timer_full_parse.isActive()
+    cursor.setPosition(doc.findBlockByNumber(2).position() + 12)
+    cursor.insertText('*/ "')
+    sh.make_spans()
+    qtbot.waitUntil(lambda: sh._worker is None)
+    sh.make_spans(full=True)
+    qtbot.waitUntil(lambda: sh._worker is None)
+    assert (sh._span_starts, sh._span_formats) == \
+        sh._make_spans(doc.toPlainText())[:2]
+
+
+def test_PygmentsSH_nested_lexers(qtbot):
+    """Test spans of lexers giving relative offsets for nested code."""
+    txt = ('Title\n=====\n\n.. code-block:: python\n\n'
+           '    def spam():\n        return "eggs"\n\nText\n')
+    doc = QTextDocument(txt)
+    sh = guess_pygments_highlighter('test.rst')(doc, color_scheme='Spyder')
+    starts, names = sh._make_spans(txt)[:2]
+    assert starts == sorted(starts)
+    spans = [(txt[start:end], name) for start, end, name
+             in zip(starts, starts[1:] + [len(txt)], names)]
+    assert ('def', 'keyword') in spans
+    assert ('return', 'keyword') in spans
+    assert ('"eggs"', 'string') in spans
+
+
 if __name__ == '__main__':
     pytest.main()
@@ -16,20 +16,22 @@ from __future__ import print_function
 import os
 import os.path as osp
 import sys
-from collections import MutableSequence
+from collections import MutableSequence, OrderedDict
+import itertools
 
 # Third party imports
 from qtpy import is_pyqt46
 from qtpy.compat import getsavefilename
-from qtpy.QtCore import (QByteArray, QFileInfo, QObject, QPoint, QSize, Qt,
-                         QThread, QTimer, Signal, Slot)
-from qtpy.QtGui import QFont
+from qtpy.QtCore import (QByteArray, QFileInfo, QObject, QPoint, QProcess,
+                         QProcessEnvironment, QSize, Qt, QThread, QTimer,
+                         Signal, Slot)
+from qtpy.QtGui import QFont, QTextCursor
 from qtpy.QtWidgets import (QAction, QApplication, QHBoxLayout, QMainWindow,
                             QMessageBox, QMenu, QSplitter, QVBoxLayout,
                             QWidget, QListWidget, QListWidgetItem)
 
 # Local imports
-from spyder.config.base import _, DEBUG, STDERR, STDOUT
+from spyder.config.base import _, DEBUG, STDOUT, get_module_path
 from spyder.config.gui import config_shortcut, get_shortcut
 from spyder.config.utils import (get_edit_filetypes, get_edit_filters,
                                  get_filter)
@@ -37,6 +39,7 @@ from spyder.py3compat import qbytearray_to_str, to_text_string
 from spyder.utils import icon_manager as ima
 from spyder.utils import (codeanalysis, encoding, sourcecode,
                           syntaxhighlighters)
+from spyder.utils.analysis_server import pack_message, unpack_messages
 from spyder.utils.qthelpers import (add_actions, create_action,
                                     create_toolbutton, mimedata2url)
 from spyder.widgets.editortools import OutlineExplorerWidget
@@ -54,56 +57,235 @@ from spyder.widgets.explorer import show_in_external_file_explorer
 
 DEBUG_EDITOR = DEBUG >= 3
 
+# Number of code analysis results kept by checker and source code hash
+ANALYSIS_CACHE_SIZE = 100
+
+# Size in bytes from which files are loaded in chunks and highlighted only
+# where they are shown, without code analysis nor outline
+LARGE_FILE_SIZE = 5 * 2 ** 20
+
 
 class AnalysisThread(QThread):
-    """Analysis thread"""
-    def __init__(self, parent, checker, source_code):
+    """Analysis thread, used when checkers can't run in other processes"""
+    def __init__(self, parent, checker, source_code, filename=None):
         super(AnalysisThread, self).__init__(parent)
         self.checker = checker
         self.results = None
         self.source_code = source_code
+        self.filename = filename
 
     def run(self):
         """Run analysis"""
-        try:
-            self.results = self.checker(self.source_code)
-        except Exception:
-            if DEBUG_EDITOR:
-                import traceback
-                traceback.print_exc(file=STDERR)
+        self.results = codeanalysis.run_checker(self.checker,
+                                                self.source_code,
+                                                self.filename)
+
+
+class AnalysisJob(object):
+    """Code analysis job, i.e. a checker to run on some source code, and on
+    the name of its file if the checker needs it"""
+    def __init__(self, checker, end_callback, source_code, parent_id,
+                 filename=None):
+        self.checker = checker
+        self.end_callback = end_callback
+        self.source_code = source_code
+        self.parent_id = parent_id
+        self.filename = filename
+        self.key = (parent_id, checker.__name__)
+        self.cache_key = (checker.__name__,
+                          codeanalysis.get_source_hash(source_code),
+                          filename)
+        self.cancelled = False
+
+
+class AnalysisProcess(QObject):
+    """
+    Process running checkers, one job at a time.
+
+    The process is started with the first job, and started again with the
+    next one if it dies. Jobs are sent through its standard input, see
+    spyder/utils/analysis_server.py.
+    """
+    def __init__(self, parent=None):
+        super(AnalysisProcess, self).__init__(parent)
+        self.process = None
+        self.buffer = b''
+        # job_id -> callback
+        self.callbacks = {}
+        self.job_ids = itertools.count()
+
+    def start(self):
+        """Start the process, and return False if it can't be started"""
+        process = QProcess(self)
+        env = QProcessEnvironment.systemEnvironment()
+        python_path = osp.dirname(get_module_path('spyder'))
+        if env.contains('PYTHONPATH'):
+            python_path = os.pathsep.join([python_path,
+                                           env.value('PYTHONPATH')])
+        env.insert('PYTHONPATH', python_path)
+        process.setProcessEnvironment(env)
+        process.readyReadStandardOutput.connect(self.read_output)
+        process.readyReadStandardError.connect(
+            lambda: process.readAllStandardError())
+        process.finished.connect(self.process_finished)
+        process.start(sys.executable,
+                      ['-u', '-m', 'spyder.utils.analysis_server'])
+        if not process.waitForStarted():
+            process.finished.disconnect(self.process_finished)
+            process.deleteLater()
+            return False
+        self.process = process
+        return True
+
+    def run_job(self, job, callback):
+        """Send a job to the process, and return False if it can't run
+        there. callback is called with its (results, elapsed) result."""
+        if self.process is None and not self.start():
+            return False
+        job_id = next(self.job_ids)
+        self.callbacks[job_id] = callback
+        self.process.write(pack_message((job_id, job.checker.__name__,
+                                         job.source_code, job.filename)))
+        return True
+
+    def read_output(self):
+        """Handle the results sent by the process"""
+        self.buffer += self.process.readAllStandardOutput().data()
+        messages, self.buffer = unpack_messages(self.buffer)
+        for job_id, result in messages:
+            callback = self.callbacks.pop(job_id, None)
+            if callback is not None:
+                callback(result)
+
+    def process_finished(self):
+        """Fail the jobs left when the process dies"""
+        if self.process is not None:
+            self.process.deleteLater()
+        self.process = None
+        self.buffer = b''
+        callbacks = list(self.callbacks.values())
+        self.callbacks.clear()
+        for callback in callbacks:
+            callback((None, 0))
+
+    def close(self):
+        """Stop the process, which quits when its input is closed"""
+        process = self.process
+        if process is None:
+            return
+        process.finished.disconnect(self.process_finished)
+        process.closeWriteChannel()
+        if not process.waitForFinished(1000):
+            process.kill()
+            process.waitForFinished(1000)
+        self.process_finished()
+
+
+class AnalysisPool(QObject):
+    """
+    Pool of processes shared by all editors to run checkers.
+
+    The jobs of a file always run in the same process, where the analysis
+    of its unchanged parts is cached (see spyder/utils/codeanalysis.py).
+    """
+    def __init__(self, processes, parent=None):
+        super(AnalysisPool, self).__init__(parent)
+        self.processes = [AnalysisProcess(self) for _i in range(processes)]
+        # parent_id -> process
+        self.assigned = {}
+        self.next_process = 0
+
+    def run_job(self, job, callback):
+        """Run a job in the process of its file, and return False if it
+        can't run in a process"""
+        if getattr(codeanalysis, job.checker.__name__, None) is not \
+                job.checker:
+            return False
+        process = self.assigned.get(job.parent_id)
+        if process is None:
+            process = self.processes[self.next_process]
+            self.next_process = (self.next_process + 1) % len(self.processes)
+            self.assigned[job.parent_id] = process
+        return process.run_job(job, callback)
+
+    def forget(self, parent_id):
+        """Forget the process of a closed file"""
+        self.assigned.pop(parent_id, None)
+
+    def close(self):
+        """Stop all processes"""
+        for process in self.processes:
+            process.close()
+
+
+_analysis_pool = None
+
+
+def get_analysis_pool():
+    """Return the pool of processes shared by all editors to run checkers,
+    or None if checkers have to run in threads (i.e. in frozen apps, where
+    Python modules can't be run)"""
+    global _analysis_pool
+    if _analysis_pool is None and not getattr(sys, 'frozen', False):
+        _analysis_pool = AnalysisPool(codeanalysis.get_analysis_processes())
+        QApplication.instance().aboutToQuit.connect(close_analysis_pool)
+    return _analysis_pool
+
+
+def close_analysis_pool():
+    """Stop the processes running checkers, if any"""
+    global _analysis_pool
+    if _analysis_pool is not None:
+        _analysis_pool.close()
+        _analysis_pool = None
 
 
 class ThreadManager(QObject):
-    """Analysis thread manager"""
-    def __init__(self, parent, max_simultaneous_threads=2):
+    """
+    Code analysis manager.
+
+    Checkers run in a pool of processes shared by all editors, so that
+    they don't compete with the user interface. A job waiting to run is
+    dropped when a new one is added for the same checker and parent (i.e.
+    file), and the results of a running one are then ignored. Results are
+    cached by checker and source code hash, so they are shown at once when
+    the same code is analyzed again.
+    """
+    # Emitted when a job finishes, possibly from an analysis thread
+    sig_job_finished = Signal(object, object)
+
+    def __init__(self, parent, max_simultaneous_threads=None,
+                 cache_size=ANALYSIS_CACHE_SIZE):
         super(ThreadManager, self).__init__(parent)
+        if max_simultaneous_threads is None:
+            max_simultaneous_threads = codeanalysis.get_analysis_processes()
         self.max_simultaneous_threads = max_simultaneous_threads
-        self.started_threads = {}
-        self.pending_threads = []
-        self.end_callbacks = {}
+        self.cache_size = cache_size
+        self.pending_jobs = OrderedDict()
+        self.started_jobs = []
+        self.results_cache = OrderedDict()
+        # Time taken by the last run of each checker, in seconds
+        self.timings = {}
+        self.sig_job_finished.connect(self.job_finished)
 
     def close_threads(self, parent):
-        """Close threads associated to parent_id"""
+        """Cancel analysis jobs associated to parent (all if None)"""
         if DEBUG_EDITOR:
             print("Call to 'close_threads'", file=STDOUT)
         if parent is None:
-            # Closing all threads
-            self.pending_threads = []
-            threadlist = []
-            for threads in list(self.started_threads.values()):
-                threadlist += threads
+            self.pending_jobs.clear()
+            jobs = self.started_jobs
         else:
             parent_id = id(parent)
-            self.pending_threads = [(_th, _id) for (_th, _id)
-                                    in self.pending_threads
-                                    if _id != parent_id]
-            threadlist = self.started_threads.get(parent_id, [])
-        for thread in threadlist:
-            if DEBUG_EDITOR:
-                print("Waiting for thread %r to finish" % thread, file=STDOUT)
-            while thread.isRunning():
-                # We can't terminate thread safely, so we simply wait...
-                QApplication.processEvents()
+            if _analysis_pool is not None:
+                _analysis_pool.forget(parent_id)
+            for key in [key for key in self.pending_jobs
+                        if key[0] == parent_id]:
+                del self.pending_jobs[key]
+            jobs = [job for job in self.started_jobs
+                    if job.parent_id == parent_id]
+        for job in jobs:
+            job.cancelled = True
 
     def close_all_threads(self):
         """Close all threads"""
@@ -111,49 +293,70 @@ class ThreadManager(QObject):
             print("Call to 'close_all_threads'", file=STDOUT)
         self.close_threads(None)
 
-    def add_thread(self, checker, end_callback, source_code, parent):
-        """Add thread to queue"""
-        parent_id = id(parent)
-        thread = AnalysisThread(self, checker, source_code)
-        self.end_callbacks[id(thread)] = end_callback
-        self.pending_threads.append((thread, parent_id))
+    def add_thread(self, checker, end_callback, source_code, parent,
+                   filename=None):
+        """Add analysis job to queue"""
+        job = AnalysisJob(checker, end_callback, source_code, id(parent),
+                          filename)
+        self.pending_jobs.pop(job.key, None)
+        for started_job in self.started_jobs:
+            if started_job.key == job.key:
+                started_job.cancelled = True
+        results = self.results_cache.pop(job.cache_key, None)
+        if results is not None:
+            self.results_cache[job.cache_key] = results
+            end_callback(results)
+            return
+        self.pending_jobs[job.key] = job
         if DEBUG_EDITOR:
-            print("Added thread %r to queue" % thread, file=STDOUT)
-        QTimer.singleShot(50, self.update_queue)
+            print("Added job %r to queue" % (job.key,), file=STDOUT)
+        self.update_queue()
 
     def update_queue(self):
-        """Update queue"""
-        started = 0
-        for parent_id, threadlist in list(self.started_threads.items()):
-            still_running = []
-            for thread in threadlist:
-                if thread.isFinished():
-                    end_callback = self.end_callbacks.pop(id(thread))
-                    if thread.results is not None:
-                        #  The thread was executed successfully
-                        end_callback(thread.results)
-                    thread.setParent(None)
-                    thread = None
-                else:
-                    still_running.append(thread)
-                    started += 1
-            threadlist = None
-            if still_running:
-                self.started_threads[parent_id] = still_running
-            else:
-                self.started_threads.pop(parent_id)
+        """Start pending jobs, if there are free processes"""
         if DEBUG_EDITOR:
             print("Updating queue:", file=STDOUT)
-            print("    started:", started, file=STDOUT)
-            print("    pending:", len(self.pending_threads), file=STDOUT)
-        if self.pending_threads and started < self.max_simultaneous_threads:
-            thread, parent_id = self.pending_threads.pop(0)
-            thread.finished.connect(self.update_queue)
-            threadlist = self.started_threads.get(parent_id, [])
-            self.started_threads[parent_id] = threadlist+[thread]
+            print("    started:", len(self.started_jobs), file=STDOUT)
+            print("    pending:", len(self.pending_jobs), file=STDOUT)
+        while (self.pending_jobs and
+               len(self.started_jobs) < self.max_simultaneous_threads):
+            _key, job = self.pending_jobs.popitem(last=False)
+            self.started_jobs.append(job)
+            self.start_job(job)
+
+    def start_job(self, job):
+        """Run a job in the pool of processes, or in a thread"""
+        pool = get_analysis_pool()
+        if pool is not None and pool.run_job(
+                job, lambda result: self.sig_job_finished.emit(job, result)):
+            return
+        thread = AnalysisThread(self, job.checker, job.source_code,
+                                job.filename)
+        thread.finished.connect(
+            lambda: self.sig_job_finished.emit(job, thread.results))
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
+
+    def job_finished(self, job, result):
+        """Handle the results of a job"""
+        self.started_jobs = [_job for _job in self.started_jobs
+                             if _job is not job]
+        try:
+            results, elapsed = result
+            self.timings[job.checker.__name__] = elapsed
             if DEBUG_EDITOR:
-                print("===>starting:", thread, file=STDOUT)
-            thread.start()
+                print("Job %r finished in %.3f sec" % (job.key, elapsed),
+                      file=STDOUT)
+            if results is not None:
+                #  The checker was executed successfully
+                self.results_cache[job.cache_key] = results
+                while len(self.results_cache) > self.cache_size:
+                    self.results_cache.popitem(last=False)
+                if not job.cancelled:
+                    job.end_callback(results)
+        finally:
+            # Free the job slot even if the results can't be shown
+            self.update_queue()
 
 
 class FileInfo(QObject):
@@ -175,6 +378,8 @@ class FileInfo(QObject):
         self.encoding = encoding
         self.editor = editor
         self.path = []
+        # True while a large file is loaded in chunks
+        self.loading = False
 
         self.classes = (filename, None, None)
         self.analysis_results = []
@@ -204,7 +409,7 @@ class FileInfo(QObject):
                    codeanalysis.get_checker_executable('pycodestyle') is not None
         self.pyflakes_results = []
         self.pep8_results = []
-        if self.editor.is_python():
+        if self.editor.is_python() and not self.editor.large_file:
             enc = self.encoding.replace('-guessed', '').replace('-bom', '')
             source_code, enc = encoding.encode(self.get_source_code(), enc)
             if run_pyflakes:
@@ -212,13 +417,14 @@ class FileInfo(QObject):
             if run_pep8:
                 self.pep8_results = None
             if run_pyflakes:
-                self.threadmanager.add_thread(codeanalysis.check_with_pyflakes,
-                                              self.pyflakes_analysis_finished,
-                                              source_code, self)
+                self.threadmanager.add_thread(
+                    codeanalysis.check_with_pyflakes_incremental,
+                    self.pyflakes_analysis_finished, source_code, self)
             if run_pep8:
-                self.threadmanager.add_thread(codeanalysis.check_with_pep8,
-                                              self.pep8_analysis_finished,
-                                              source_code, self)
+                self.threadmanager.add_thread(
+                    codeanalysis.check_with_pep8_incremental,
+                    self.pep8_analysis_finished, source_code, self,
+                    self.filename)
 
     def pyflakes_analysis_finished(self, results):
         """Pyflakes code analysis thread has finished"""
@@ -249,7 +455,7 @@ class FileInfo(QObject):
 
     def run_todo_finder(self):
         """Run TODO finder"""
-        if self.editor.is_python():
+        if self.editor.is_python() and not self.editor.large_file:
             self.threadmanager.add_thread(codeanalysis.find_tasks,
                                           self.todo_finished,
                                           self.get_source_code(), self)
@@ -761,6 +967,9 @@ class EditorStack(QWidget):
     def clone_from(self, other):
         """Clone EditorStack from other instance"""
         for other_finfo in other.data:
+            if other_finfo.loading:
+                # It will be cloned everywhere once it's loaded
+                continue
             self.clone_editor_from(other_finfo, set_current=True)
         self.set_stack_index(other.get_stack_index())
 
@@ -1476,6 +1685,8 @@ class EditorStack(QWidget):
             index = self.get_stack_index()
 
         finfo = self.data[index]
+        if finfo.loading:
+            return False
         if not (finfo.editor.document().isModified() or
                 finfo.newly_created) and not force:
             return True
@@ -1503,13 +1714,6 @@ class EditorStack(QWidget):
             self.analyze_script(index)
             self.introspector.validate()
 
-            #XXX CodeEditor-only: re-scan the whole text to rebuild outline
-            # explorer data from scratch (could be optimized because
-            # rehighlighting text means searching for all syntax coloring
-            # patterns instead of only searching for class/def patterns which
-            # would be sufficient for outline explorer data.
-            finfo.editor.rehighlight()
-
             self._refresh_outlineexplorer(index)
             return True
         except EnvironmentError as error:
@@ -1549,6 +1753,8 @@ class EditorStack(QWidget):
             # Save the currently edited file
             index = self.get_stack_index()
         finfo = self.data[index]
+        if finfo.loading:
+            return False
         # The next line is necessary to avoid checking if the file exists
         # While running __check_file_status
         # See issues 3678 and 3026
@@ -1584,6 +1790,8 @@ class EditorStack(QWidget):
             # Save the currently edited file
             index = self.get_stack_index()
         finfo = self.data[index]
+        if finfo.loading:
+            return False
         filename = self.select_savename(finfo.filename)
         if filename:
             ao_index = self.has_filename(filename)
@@ -1727,7 +1935,7 @@ class EditorStack(QWidget):
         enable = False
         if self.data:
             finfo = self.data[index]
-            if finfo.editor.is_python():
+            if finfo.editor.is_python() and not finfo.editor.large_file:
                 enable = True
                 oe.setEnabled(True)
                 oe.set_current_editor(finfo.editor, finfo.filename,
@@ -1876,6 +2084,8 @@ class EditorStack(QWidget):
     def reload(self, index):
         """Reload file from disk"""
         finfo = self.data[index]
+        if finfo.loading:
+            return
         txt, finfo.encoding = encoding.read(finfo.filename)
         finfo.lastmodified = QFileInfo(finfo.filename).lastModified()
         position = finfo.editor.get_position('cursor')
@@ -1884,13 +2094,6 @@ class EditorStack(QWidget):
         finfo.editor.set_cursor_position(position)
         self.introspector.validate()
 
-        #XXX CodeEditor-only: re-scan the whole text to rebuild outline
-        # explorer data from scratch (could be optimized because
-        # rehighlighting text means searching for all syntax coloring
-        # patterns instead of only searching for class/def patterns which
-        # would be sufficient for outline explorer data.
-        finfo.editor.rehighlight()
-
         self._refresh_outlineexplorer(index)
 
     def revert(self):
@@ -1909,7 +2112,7 @@ class EditorStack(QWidget):
         self.reload(index)
 
     def create_new_editor(self, fname, enc, txt, set_current, new=False,
-                          cloned_from=None):
+                          cloned_from=None, large_file=False):
         """
         Create a new editor instance
         Returns finfo object (instead of editor as in previous releases)
@@ -1966,7 +2169,8 @@ class EditorStack(QWidget):
                 cloned_from=cloned_from,
                 filename=fname,
                 show_class_func_dropdown=self.show_class_func_dropdown,
-                indent_guides=self.indent_guides)
+                indent_guides=self.indent_guides,
+                large_file=large_file)
         if cloned_from is None:
             editor.set_text(txt)
             editor.document().setModified(False)
@@ -2043,18 +2247,31 @@ class EditorStack(QWidget):
     def load(self, filename, set_current=True):
         """
         Load filename, create an editor instance and return it
+        (None if it was closed while loading a large file, or if it's
+        already being loaded)
         *Warning* This is loading file, creating editor but not executing
         the source code analysis -- the analysis must be done by the editor
         plugin (in case multiple editorstack instances are handled)
         """
         filename = osp.abspath(to_text_string(filename))
+        index = self.has_filename(filename)
+        if index is not None and self.data[index].loading:
+            # It's already being loaded
+            return None
         self.starting_long_process.emit(_("Loading %s...") % filename)
-        text, enc = encoding.read(filename)
-        finfo = self.create_new_editor(filename, enc, text, set_current)
+        if osp.getsize(filename) >= LARGE_FILE_SIZE:
+            finfo = self._load_large_file(filename, set_current)
+            text = None
+            if finfo not in self.data:
+                self.ending_long_process.emit("")
+                return None
+        else:
+            text, enc = encoding.read(filename)
+            finfo = self.create_new_editor(filename, enc, text, set_current)
         index = self.data.index(finfo)
         self._refresh_outlineexplorer(index, update=True)
         self.ending_long_process.emit("")
-        if self.isVisible() and self.checkeolchars_enabled \
+        if self.isVisible() and self.checkeolchars_enabled and text \
            and sourcecode.has_mixed_eol_chars(text):
             name = osp.basename(filename)
             QMessageBox.warning(self, self.title,
@@ -2066,10 +2283,59 @@ class EditorStack(QWidget):
         self.is_analysis_done = False
         return finfo
 
+    def _load_large_file(self, filename, set_current):
+        """
+        Load a large file in chunks, showing progress, and return its finfo
+
+        The editor is shown with the first chunk and the rest of the
+        application stays responsive meanwhile, but the file is read-only
+        and it can't be saved, run or modified by editor actions until the
+        whole file is loaded (see FileInfo.loading). It can be closed.
+        """
+        size = max(osp.getsize(filename), 1)
+        finfo = None
+        for text, enc, position in encoding.read_chunks(filename):
+            if finfo is None:
+                finfo = self.create_new_editor(filename, enc, text,
+                                               set_current, large_file=True)
+                finfo.loading = True
+                editor = finfo.editor
+                read_only = editor.isReadOnly()
+                editor.setReadOnly(True)
+                self.set_stack_title(self.data.index(finfo), False)
+                document = editor.document()
+                document.setUndoRedoEnabled(False)
+                cursor = QTextCursor(document)
+            elif finfo not in self.data:
+                # The file was closed while loading
+                break
+            elif position == 0:
+                # Decoding failed, the file is read again with another
+                # encoding
+                finfo.encoding = enc
+                editor.set_text(text)
+            else:
+                cursor.movePosition(QTextCursor.End)
+                cursor.insertText(text)
+            # So that closing the file doesn't ask to save it
+            document.setModified(False)
+            self.starting_long_process.emit(
+                _("Loading %s... (%d%%)") % (filename, 100 * position // size))
+            QApplication.processEvents()
+        if finfo is not None:
+            finfo.loading = False
+        if finfo in self.data:
+            document.setUndoRedoEnabled(True)
+            editor.setReadOnly(read_only)
+            self.set_stack_title(self.data.index(finfo), False)
+        return finfo
+
     def set_os_eol_chars(self, index=None):
         if index is None:
             index = self.get_stack_index()
         finfo = self.data[index]
+        if finfo.loading:
+            return
         eol_chars = sourcecode.get_eol_chars_from_os_name(os.name)
         finfo.editor.set_eol_chars(eol_chars)
         finfo.editor.document().setModified(True)
@@ -2079,6 +2345,8 @@ class EditorStack(QWidget):
         if index is None:
             index = self.get_stack_index()
         finfo = self.data[index]
+        if finfo.loading:
+            return
         finfo.editor.remove_trailing_spaces()
 
     def fix_indentation(self, index=None):
@@ -2086,6 +2354,8 @@ class EditorStack(QWidget):
         if index is None:
             index = self.get_stack_index()
         finfo = self.data[index]
+        if finfo.loading:
+            return
         finfo.editor.fix_indentation()
 
     #------ Run
@@ -2101,6 +2371,8 @@ class EditorStack(QWidget):
         cursor there. If cursor is on last line and that line is empty, then do
         not move cursor.
         """
+        if self.get_current_finfo().loading:
+            return
         text = self.get_current_editor().get_selection_as_executable_code()
         if text:
             self.exec_in_extconsole.emit(text, self.focus_to_editor)
@@ -2118,7 +2390,7 @@ class EditorStack(QWidget):
         """Run current cell"""
         text = self.get_current_editor().get_cell_as_executable_code()
         finfo = self.get_current_finfo()
-        if finfo.editor.is_python() and text:
+        if finfo.editor.is_python() and text and not finfo.loading:
             self.exec_in_extconsole.emit(text, self.focus_to_editor)
 
     def run_cell_and_advance(self):
@@ -2149,7 +2421,7 @@ class EditorStack(QWidget):
     def re_run_last_cell(self):
         text = self.get_current_editor().get_last_cell_as_executable_code()
         finfo = self.get_current_finfo()
-        if finfo.editor.is_python() and text:
+        if finfo.editor.is_python() and text and not finfo.loading:
             self.exec_in_extconsole.emit(text, self.focus_to_editor)
 
     #------ Drag and drop
@@ -8,6 +8,7 @@
 
 # Standard library imports
 from __future__ import print_function
+from difflib import SequenceMatcher
 import os.path as osp
 import re
 
@@ -17,11 +18,12 @@ from qtpy.QtCore import Qt, Signal, Slot
 from qtpy.QtWidgets import QHBoxLayout, QTreeWidgetItem, QVBoxLayout, QWidget
 
 # Local imports
-from spyder.config.base import _, STDOUT
+from spyder.config.base import _
 from spyder.py3compat import to_text_string
 from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import (create_action, create_toolbutton,
                                     set_item_user_text)
+from spyder.utils.syntaxhighlighters import OutlineExplorerData as OED
 from spyder.widgets.onecolumntree import OneColumnTree
 
 
@@ -82,10 +84,20 @@ class TreeItem(QTreeWidgetItem):
                 QTreeWidgetItem.__init__(self, parent, preceding,
                                          QTreeWidgetItem.Type)
         self.setText(0, name)
-        parent_text = from_qvariant(parent.data(0, Qt.UserRole),
-                                    to_text_string)
-        set_item_user_text(self, parent_text+'/'+name)
+        self.update_user_text()
         self.line = line
+
+    def set_name(self, name):
+        self.setText(0, name)
+        self.update_user_text()
+
+    def update_user_text(self):
+        """Update user text of item and children from their names"""
+        parent_text = from_qvariant(self.parent().data(0, Qt.UserRole),
+                                    to_text_string)
+        set_item_user_text(self, parent_text+'/'+to_text_string(self.text(0)))
+        for index in range(self.childCount()):
+            self.child(index).update_user_text()
         
     def set_icon(self, icon):
         self.setIcon(0, icon)
@@ -164,20 +176,15 @@ def item_at_line(root_item, line):
         previous_item = item
 
 
-def remove_from_tree_cache(tree_cache, line=None, item=None):
-    if line is None:
-        for line, (_it, _level, _debug) in list(tree_cache.items()):
-            if _it is item:
-                break
-    item, _level, debug = tree_cache.pop(line)
+def remove_item(item):
+    """Remove item from its parent, if not done already"""
     try:
-        for child in [item.child(_i) for _i in range(item.childCount())]:
-            remove_from_tree_cache(tree_cache, item=child)
-        item.parent().removeChild(item)
+        parent = item.parent()
+        if parent is not None:
+            parent.removeChild(item)
     except RuntimeError:
         # Item has already been deleted
-        #XXX: remove this debug-related fragment of code
-        print("unable to remove tree item: ", debug, file=STDOUT)
+        pass
 
 
 class OutlineExplorerTreeWidget(OneColumnTree):
@@ -191,6 +198,9 @@ class OutlineExplorerTreeWidget(OneColumnTree):
         self.freeze = False # Freezing widget to avoid any unwanted update
         self.editor_items = {}
         self.editor_tree_cache = {}
+        # Highlighter and outline explorer data revision of the last update
+        # of the items of each editor
+        self.editor_revisions = {}
         self.editor_ids = {}
         self.current_editor = None
         title = _("Outline")
@@ -241,6 +251,7 @@ class OutlineExplorerTreeWidget(OneColumnTree):
     @Slot(bool)
     def toggle_show_comments(self, state):
         self.show_comments = state
+        self.editor_revisions = {}
         self.update_all()
             
     def set_fullpath_sorting(self, state):
@@ -272,16 +283,14 @@ class OutlineExplorerTreeWidget(OneColumnTree):
                 self.root_item_selected(item)
                 self.__hide_or_show_root_items(item)
             if update:
-                self.save_expanded_state()
-                tree_cache = self.editor_tree_cache[editor_id]
-                self.populate_branch(editor, item, tree_cache)
-                self.restore_expanded_state()
+                self.__update_branch(editor, editor_id)
         else:
     #        import time
     #        t0 = time.time()
             root_item = FileRootItem(fname, self)
             root_item.set_text(fullpath=self.show_fullpath)
             tree_cache = self.populate_branch(editor, root_item)
+            self.editor_revisions[editor_id] = self.__get_revision(editor)
             self.__sort_toplevel_items()
             self.__hide_or_show_root_items(root_item)
             self.root_item_selected(root_item)
@@ -302,12 +311,23 @@ class OutlineExplorerTreeWidget(OneColumnTree):
             self.__sort_toplevel_items()
         
     def update_all(self):
-        self.save_expanded_state()
         for editor, editor_id in list(self.editor_ids.items()):
-            item = self.editor_items[editor_id]
-            tree_cache = self.editor_tree_cache[editor_id]
-            self.populate_branch(editor, item, tree_cache)
-        self.restore_expanded_state()
+            self.__update_branch(editor, editor_id)
+
+    def __get_revision(self, editor):
+        highlighter = editor.highlighter
+        return (id(highlighter), highlighter.outlineexplorer_revision)
+
+    def __update_branch(self, editor, editor_id):
+        """Update the items of an editor if its symbols changed"""
+        revision = self.__get_revision(editor)
+        if self.editor_revisions.get(editor_id) == revision:
+            return
+        item = self.editor_items[editor_id]
+        tree_cache = self.editor_tree_cache[editor_id]
+        self.editor_tree_cache[editor_id] = self.populate_branch(
+            editor, item, tree_cache)
+        self.editor_revisions[editor_id] = revision
         
     def remove_editor(self, editor):
         if editor in self.editor_ids:
@@ -317,6 +337,7 @@ class OutlineExplorerTreeWidget(OneColumnTree):
             if editor_id not in list(self.editor_ids.values()):
                 root_item = self.editor_items.pop(editor_id)
                 self.editor_tree_cache.pop(editor_id)
+                self.editor_revisions.pop(editor_id, None)
                 try:
                     self.takeTopLevelItem(self.indexOfTopLevelItem(root_item))
                 except RuntimeError:
@@ -331,114 +352,121 @@ class OutlineExplorerTreeWidget(OneColumnTree):
         self.sort_top_level_items(key=sort_func)
             
     def populate_branch(self, editor, root_item, tree_cache=None):
+        """
+        Update the items of a file from its outline explorer data
+
+        tree_cache is the list of (key, item) for the items of the file in
+        line order, as returned by the previous call. Items whose key is
+        unchanged are kept, with their line updated, classes and functions
+        which were renamed are renamed in place and the other items are
+        removed or inserted.
+        """
         if tree_cache is None:
-            tree_cache = {}
-        
-        # Removing cached items for which line is > total line nb
-        for _l in list(tree_cache.keys()):
-            if _l >= editor.get_line_count():
-                # Checking if key is still in tree cache in case one of its 
-                # ancestors was deleted in the meantime (deleting all children):
-                if _l in tree_cache:
-                    remove_from_tree_cache(tree_cache, line=_l)
-                    
-        ancestors = [(root_item, 0)]
-        previous_item = None
-        previous_level = None
-        
+            tree_cache = []
         oe_data = editor.highlighter.get_outlineexplorer_data()
         editor.has_cell_separators = oe_data.get('found_cell_separators', False)
-        for block_nb in range(editor.get_line_count()):
-            line_nb = block_nb+1
-            data = oe_data.get(block_nb)
-            if data is None:
-                level = None
+        symbols = self.get_symbols(oe_data)
+        old_keys = [key for key, _item in tree_cache]
+        new_keys = [key for key, _line_nb, _data, _parent in symbols]
+
+        # Match the previous items with the new symbols
+        items = [None]*len(symbols)
+        renamed = set()
+        removed = []
+        matcher = SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            for index in range(i1, i2):
+                j = j1 + index - i1
+                old_type, _old_name, old_level = old_keys[index]
+                if tag == 'equal':
+                    items[j] = tree_cache[index][1]
+                elif (j < j2 and old_type == new_keys[j][0] and
+                      old_level == new_keys[j][2] and
+                      old_type in (OED.CLASS, OED.FUNCTION)):
+                    items[j] = tree_cache[index][1]
+                    renamed.add(j)
+                else:
+                    removed.append(tree_cache[index][1])
+        for item in reversed(removed):
+            remove_item(item)
+
+        previous_item = root_item
+        for index, (key, line_nb, data, parent_index) in enumerate(symbols):
+            if parent_index is None:
+                parent = root_item
             else:
-                level = data.fold_level
-            citem, clevel, _d = tree_cache.get(line_nb, (None, None, ""))
-            
-            # Skip iteration if line is not the first line of a foldable block
-            if level is None:
-                if citem is not None:
-                    remove_from_tree_cache(tree_cache, line=line_nb)
-                continue
-            
+                parent = items[parent_index]
+            item = items[index]
+            if item is not None and item.parent() is not parent:
+                # Parent changed: the item is created again
+                removed.append(item)
+                remove_item(item)
+                item = None
+            if item is None:
+                def_type, name, _level = key
+                if def_type == OED.CLASS:
+                    item = ClassItem(name, line_nb, parent, previous_item)
+                elif def_type == OED.FUNCTION:
+                    item = FunctionItem(name, line_nb, parent, previous_item)
+                elif def_type == OED.CELL:
+                    item = CellItem(name, line_nb, parent, previous_item)
+                elif def_type == OED.COMMENT:
+                    item = CommentItem(name, line_nb, parent, previous_item)
+                else:
+                    item = TreeItem(name, line_nb, parent, previous_item)
+                item.setup()
+            elif index in renamed or item.line != line_nb:
+                if index in renamed:
+                    item.set_name(key[1])
+                item.line = line_nb
+                item.setup()
+            items[index] = item
+            previous_item = item
+
+        return list(zip(new_keys, items))
+
+    def get_symbols(self, oe_data):
+        """
+        Return the symbols to show from outline explorer data, as a list of
+        (key, line number, data, index of the parent symbol or None)
+        """
+        symbols = []
+        ancestors = [(None, 0)]
+        previous_index = None
+        previous_level = None
+        for block_nb in sorted(key for key in oe_data
+                               if isinstance(key, int)):
+            data = oe_data[block_nb]
+            level = data.fold_level
+
             # Searching for class/function statements
-            not_class_nor_function = data.is_not_class_nor_function()
-            if not not_class_nor_function:
-                class_name = data.get_class_name()
-                if class_name is None:
-                    func_name = data.get_function_name()
-                    if func_name is None:
-                        if citem is not None:
-                            remove_from_tree_cache(tree_cache, line=line_nb)
-                        continue
-                
+            if data.is_not_class_nor_function():
+                name = data.text
+            else:
+                name = data.get_class_name() or data.get_function_name()
+                if name is None:
+                    continue
+
             if previous_level is not None:
                 if level == previous_level:
                     pass
                 elif level > previous_level+4: # Invalid indentation
                     continue
                 elif level > previous_level:
-                    ancestors.append((previous_item, previous_level))
+                    ancestors.append((previous_index, previous_level))
                 else:
                     while len(ancestors) > 1 and level <= previous_level:
                         ancestors.pop(-1)
-                        _item, previous_level = ancestors[-1]
-            parent, _level = ancestors[-1]
-            
-            if citem is not None:
-                cname = to_text_string(citem.text(0))
-                
-            preceding = root_item if previous_item is None else previous_item
-            if not_class_nor_function:
-                if data.is_comment() and not self.show_comments:
-                    if citem is not None:
-                        remove_from_tree_cache(tree_cache, line=line_nb)
-                    continue
-                if citem is not None:
-                    if data.text == cname and level == clevel:
-                        previous_level = clevel
-                        previous_item = citem
-                        continue
-                    else:
-                        remove_from_tree_cache(tree_cache, line=line_nb)
-                if data.is_comment():
-                    if data.def_type == data.CELL:
-                        item = CellItem(data.text, line_nb, parent, preceding)
-                    else:
-                        item = CommentItem(
-                            data.text, line_nb, parent, preceding)
-                else:
-                    item = TreeItem(data.text, line_nb, parent, preceding)
-            elif class_name is not None:
-                if citem is not None:
-                    if class_name == cname and level == clevel:
-                        previous_level = clevel
-                        previous_item = citem
-                        continue
-                    else:
-                        remove_from_tree_cache(tree_cache, line=line_nb)
-                item = ClassItem(class_name, line_nb, parent, preceding)
-            else:
-                if citem is not None:
-                    if func_name == cname and level == clevel:
-                        previous_level = clevel
-                        previous_item = citem
-                        continue
-                    else:
-                        remove_from_tree_cache(tree_cache, line=line_nb)
-                item = FunctionItem(func_name, line_nb, parent, preceding)
-                
-            item.setup()
-            debug = "%s -- %s/%s" % (str(item.line).rjust(6),
-                                     to_text_string(item.parent().text(0)),
-                                     to_text_string(item.text(0)))
-            tree_cache[line_nb] = (item, level, debug)
+                        _index, previous_level = ancestors[-1]
+            parent_index, _level = ancestors[-1]
+
+            if data.is_comment() and not self.show_comments:
+                continue
+            symbols.append(((data.def_type, name, level), block_nb+1, data,
+                            parent_index))
+            previous_index = len(symbols) - 1
             previous_level = level
-            previous_item = item
-            
-        return tree_cache
+        return symbols
 
     def root_item_selected(self, item):
         """Root item has been selected: expanding it and collapsing others"""
@@ -20,7 +20,7 @@ from qtpy.QtWidgets import (QDialog, QHBoxLayout, QLabel, QLineEdit,
 from spyder.config.base import _
 from spyder.py3compat import iteritems, to_text_string
 from spyder.utils import icon_manager as ima
-from spyder.utils.stringmatching import get_search_scores
+from spyder.utils.stringmatching import FuzzyMatcher
 from spyder.widgets.helperwidgets import HelperToolButton, HTMLDelegate
 
 
@@ -223,6 +223,7 @@ class FilesFilterLine(QLineEdit):
 class FileSwitcher(QDialog):
     """A Sublime-like file switcher."""
     sig_goto_file = Signal(int, object)
+    sig_open_file = Signal(str, object)
 
     # Constants that define the mode in which the list widget is working
     # FILE_MODE is for a list of files, SYMBOL_MODE if for a list of symbols
@@ -230,6 +231,9 @@ class FileSwitcher(QDialog):
     FILE_MODE, SYMBOL_MODE = [1, 2]
     MAX_WIDTH = 600
 
+    # Maximum number of project files shown
+    MAX_PROJECT_FILES = 100
+
     def __init__(self, parent, plugin, tabs, data, icon):
         QDialog.__init__(self, parent)
 
@@ -245,6 +249,8 @@ class FileSwitcher(QDialog):
         self.initial_widget = None        # Initial active editor
         self.line_number = None           # Selected line number in filer
         self.is_visible = False           # Is the switcher visible?
+        self.matchers = {}                # {choices name: FuzzyMatcher}
+        self.project_files = None         # FileList of the active project
 
         help_text = _("Press <b>Enter</b> to switch files or <b>Esc</b> to "
                       "cancel.<br><br>Type to filter filenames.<br><br>"
@@ -302,7 +308,7 @@ class FileSwitcher(QDialog):
 
     @property
     def line_count(self):
-        return [widget.get_line_count() for widget in self.widgets]
+        return [widget.get_line_count() for widget, plugin in self.widgets]
 
     @property
     def save_status(self):
@@ -372,7 +378,20 @@ class FileSwitcher(QDialog):
             except AttributeError:
                 pass
 
+    def set_project_files(self, file_list):
+        """Set the list of files of the active project, or None."""
+        self.project_files = file_list
+
     def accept(self):
+        # Project files are opened when they're chosen
+        row = self.current_row()
+        if self.mode == self.FILE_MODE and 0 <= row < len(self.filtered_path):
+            path = self.filtered_path[row]
+            if path not in self.paths:
+                line_number = self.line_number
+                if line_number:
+                    line_number = int(line_number)
+                self.sig_open_file.emit(path, line_number)
         self.is_visible = False
         QDialog.accept(self)
         self.list.clear()
@@ -419,15 +438,9 @@ class FileSwitcher(QDialog):
         Get the max size (width and height) for the elements of a list of
         strings as a QLabel.
         """
-        strings = []
         if content:
-            for rich_text in content:
-                label = QLabel(rich_text)
-                label.setTextFormat(Qt.PlainText)
-                strings.append(label.text())
-                fm = label.fontMetrics()
-
-            return (max([fm.width(s) * 1.3 for s in strings]), fm.height())
+            fm = QLabel().fontMetrics()
+            return (max([fm.width(s) * 1.3 for s in content]), fm.height())
 
     def fix_size(self, content):
         """
@@ -598,23 +611,36 @@ class FileSwitcher(QDialog):
                 line_number = self.filtered_symbol_lines[row]
                 self.goto_line(line_number)
 
+    def get_matcher(self, name, choices):
+        """
+        Get a matcher to search choices, reusing the last one with the same
+        name if choices didn't change.
+        """
+        matcher = self.matchers.get(name)
+        if matcher is None or matcher.choices != choices:
+            matcher = FuzzyMatcher(choices)
+            self.matchers[name] = matcher
+        return matcher
+
     def setup_file_list(self, filter_text, current_path):
         """Setup list widget content for file list display."""
-        short_paths = shorten_paths(self.paths, self.save_status)
         paths = self.paths
+        short_paths = shorten_paths(paths, self.save_status)
         icons = self.icons
+        widgets = self.widgets
         results = []
         trying_for_line_number = ':' in filter_text
 
         # Get optional line number
         if trying_for_line_number:
             filter_text, line_number = filter_text.split(':')
+            line_count = self.line_count
         else:
             line_number = None
 
         # Get all available filenames and get the scores for "fuzzy" matching
-        scores = get_search_scores(filter_text, self.filenames,
-                                   template="<b>{0}</b>")
+        matcher = self.get_matcher('files', self.filenames)
+        scores = matcher.get_scores(filter_text, template="<b>{0}</b>")
 
         # Get max width to determine if shortpaths should be used
         max_width = self.get_item_size(paths)[0]
@@ -626,7 +652,7 @@ class FileSwitcher(QDialog):
             if score_value != -1:
                 text_item = '<big>' + rich_text.replace('&', '') + '</big>'
                 if trying_for_line_number:
-                    text_item += " [{0:} {1:}]".format(self.line_count[index],
+                    text_item += " [{0:} {1:}]".format(line_count[index],
                                                        _("lines"))
                 if max_width > self.list.width():
                     text_item += u"<br><i>{0:}</i>".format(short_paths[index])
@@ -643,7 +669,7 @@ class FileSwitcher(QDialog):
             icon = icons[index]
             text = ''
             try:
-                title = self.widgets[index][1].get_plugin_title().split(' - ')
+                title = widgets[index][1].get_plugin_title().split(' - ')
                 if plugin != title[0]:
                     plugin = title[0]
                     text += '<br><big><b>' + plugin + '</b></big><br>'
@@ -664,6 +690,10 @@ class FileSwitcher(QDialog):
             self.list.addItem(item)
             self.filtered_path.append(path)
 
+        # Add the project files that match best
+        if filter_text and self.project_files is not None:
+            self.setup_project_file_list(filter_text, paths)
+
         # To adjust the delegate layout for KDE themes
         self.list.files_list = True
 
@@ -677,6 +707,42 @@ class FileSwitcher(QDialog):
         self.line_number = line_number
         self.goto_line(line_number)
 
+    def setup_project_file_list(self, filter_text, open_paths):
+        """Add the project files that best match filter_text to the list."""
+        rootpath = self.project_files.rootpath
+        _revision, paths, names = self.project_files.files
+        matcher = self.get_matcher('project_files', names)
+        open_paths = set(open_paths)
+        scores = matcher.get_best_scores(
+            filter_text, self.MAX_PROJECT_FILES + len(open_paths),
+            template="<b>{0}</b>")
+        results = []
+        for index, rich_text, score_value in scores:
+            path = osp.join(rootpath, paths[index])
+            if path not in open_paths:
+                results.append((path, paths[index], rich_text))
+        results = results[:self.MAX_PROJECT_FILES]
+        if not results:
+            return
+
+        text = '<br><big><b>' + _("Project files") + '</b></big><br>'
+        item = QListWidgetItem(text)
+        item.setToolTip(rootpath)
+        item.setSizeHint(QSize(0, 25))
+        item.setFlags(Qt.ItemIsEditable)
+        self.list.addItem(item)
+        self.filtered_path.append(results[0][0])
+
+        icon = ima.icon('FileIcon')
+        for path, relpath, rich_text in results:
+            text = '<big>' + rich_text.replace('&', '') + '</big>'
+            text += u"<br><i>{0:}</i>".format(relpath)
+            item = QListWidgetItem(icon, text)
+            item.setToolTip(path)
+            item.setSizeHint(QSize(0, 25))
+            self.list.addItem(item)
+            self.filtered_path.append(path)
+
     def setup_symbol_list(self, filter_text, current_path):
         """Setup list widget content for symbol list display."""
         # Get optional symbol name
@@ -696,7 +762,8 @@ class FileSwitcher(QDialog):
         symbol_list = process_python_symbol_data(oedata)
         line_fold_token = [(item[0], item[2], item[3]) for item in symbol_list]
         choices = [item[1] for item in symbol_list]
-        scores = get_search_scores(symbol_text, choices, template="<b>{0}</b>")
+        matcher = self.get_matcher('symbols', choices)
+        scores = matcher.get_scores(symbol_text, template="<b>{0}</b>")
 
         # Build the text that will appear on the list widget
         results = []
@@ -13,20 +13,25 @@
 
 # Standard library imports
 from __future__ import with_statement, print_function
+from array import array
+from collections import OrderedDict
 import fnmatch
-import os
 import os.path as osp
 import re
 import sys
 import math
+from multiprocessing.pool import ThreadPool
+import time
 import traceback
 
 # Third party imports
-from qtpy.compat import getexistingdirectory
+from qtpy.compat import getexistingdirectory, to_qvariant
 from qtpy.QtGui import QAbstractTextDocumentLayout, QTextDocument
-from qtpy.QtCore import QMutex, QMutexLocker, Qt, QThread, Signal, Slot, QSize
-from qtpy.QtWidgets import (QHBoxLayout, QLabel, QRadioButton, QSizePolicy,
-                            QTreeWidgetItem, QVBoxLayout, QWidget,
+from qtpy.QtCore import (QAbstractItemModel, QModelIndex, QMutex,
+                         QMutexLocker, Qt, QThread, QTimer, Signal, Slot,
+                         QSize)
+from qtpy.QtWidgets import (QHBoxLayout, QLabel, QMenu, QRadioButton,
+                            QSizePolicy, QTreeView, QVBoxLayout, QWidget,
                             QStyledItemDelegate, QStyleOptionViewItem,
                             QApplication, QStyle)
 
@@ -34,10 +39,12 @@ from qtpy.QtWidgets import (QHBoxLayout, QLabel, QRadioButton, QSizePolicy,
 from spyder.config.base import _
 from spyder.py3compat import getcwd, to_text_string
 from spyder.utils import icon_manager as ima
-from spyder.utils.qthelpers import create_toolbutton
-from spyder.utils.encoding import is_text_file
+from spyder.utils.qthelpers import (add_actions, create_action,
+                                    create_toolbutton)
+from spyder.utils.filesearch import (find_in_file, get_file_index,
+                                     get_trigram_index, is_excluded,
+                                     SEARCH_WORKERS)
 from spyder.widgets.comboboxes import PatternComboBox
-from spyder.widgets.onecolumntree import OneColumnTree
 
 from spyder.config.gui import get_font
 from spyder.widgets.waitingspinner import QWaitingSpinner
@@ -46,13 +53,18 @@ from spyder.widgets.waitingspinner import QWaitingSpinner
 ON = 'on'
 OFF = 'off'
 
+# Maximum number of matches shown before asking to load more
+MAX_RESULTS = 1000
+
+# Interval (in ms) between two updates of the results browser
+UPDATE_INTERVAL = 100
+
 
 class SearchThread(QThread):
     """Find in files search thread"""
     sig_finished = Signal(bool)
     sig_current_file = Signal(str)
     sig_current_folder = Signal(str)
-    sig_file_match = Signal(tuple, int)
     sig_out_print = Signal(object)
 
     def __init__(self, parent):
@@ -73,7 +85,10 @@ class SearchThread(QThread):
         self.get_pythonpath_callback = None
         self.results = {}
         self.total_matches = 0
+        self.pending_matches = []
+        self.index_stats = None
         self.is_file = False
+        self.last_file_time = 0
 
     def initialize(self, path, is_file, exclude, texts, text_re):
         self.rootpath = path
@@ -106,77 +121,107 @@ class SearchThread(QThread):
         with QMutexLocker(self.mutex):
             self.stopped = True
 
+    def is_stopped(self):
+        with QMutexLocker(self.mutex):
+            return self.stopped
+
     def find_files_in_path(self, path):
         if self.pathlist is None:
             self.pathlist = []
         self.pathlist.append(path)
-        for path, dirs, files in os.walk(path):
-            with QMutexLocker(self.mutex):
-                if self.stopped:
-                    return False
+        self.error_flag = False
+        index = get_file_index(path)
+        files = None
+        trigram_index = get_trigram_index(path)
+        if trigram_index is not None:
+            candidates = trigram_index.query(self.texts, self.text_re,
+                                             stopped=self.is_stopped)
+            if candidates is not None:
+                self.index_stats = trigram_index.get_stats()
+                rootpath = osp.abspath(path)
+                excluded = {}
+                files = [(filename, index.files.get(filename))
+                         for filename in candidates
+                         if not is_excluded(filename, rootpath, self.exclude,
+                                            excluded)]
+        if files is None:
+            # The index is only read and updated from this thread, so files
+            # are listed here and not by the task handler of the pool
+            files = list(index.iter_files(self.exclude,
+                                          stopped=self.is_stopped))
+        if self.is_stopped():
+            return False
+
+        def search(args):
+            filename, entry = args
             try:
-                for d in dirs[:]:
-                    dirname = os.path.join(path, d)
-                    if re.search(self.exclude, dirname + os.sep):
-                        dirs.remove(d)
-                for f in files:
-                    filename = os.path.join(path, f)
-                    if re.search(self.exclude, filename):
-                        continue
-                    if is_text_file(filename):
-                        self.find_string_in_file(filename)
-            except re.error:
-                self.error_flag = _("invalid regular expression")
-                return False
+                return filename, find_in_file(filename, self.texts,
+                                              self.text_re, entry)
+            except (IOError, OSError):
+                return filename, None
+
+        pool = ThreadPool(SEARCH_WORKERS)
+        try:
+            for filename, found in pool.imap(search, files, chunksize=8):
+                if self.is_stopped():
+                    return False
+                if found is None:
+                    self.error_flag = _("permission denied errors were "
+                                        "encountered")
+                    continue
+                entry, matches = found
+                index.update_file(filename, entry)
+                self.emit_current_file(filename)
+                self.add_matches(filename, matches)
+        finally:
+            pool.terminate()
+            pool.join()
+            index.save()
+        self.completed = True
         return True
 
     def find_string_in_file(self, fname):
         self.error_flag = False
         self.sig_current_file.emit(fname)
         try:
-            for lineno, line in enumerate(open(fname, 'rb')):
-                for text, enc in self.texts:
-                    if self.text_re:
-                        found = re.search(text, line)
-                        if found is not None:
-                            break
-                    else:
-                        found = line.find(text)
-                        if found > -1:
-                            break
-                try:
-                    line_dec = line.decode(enc)
-                except UnicodeDecodeError:
-                    line_dec = line
-                if self.text_re:
-                    for match in re.finditer(text, line):
-                        self.total_matches += 1
-                        self.sig_file_match.emit((osp.abspath(fname),
-                                                  lineno + 1,
-                                                  match.start(),
-                                                  match.end(), line_dec),
-                                                 self.total_matches)
-                else:
-                    found = line.find(text)
-                    while found > -1:
-                        self.total_matches += 1
-                        self.sig_file_match.emit((osp.abspath(fname),
-                                                  lineno + 1,
-                                                  found,
-                                                  found + len(text), line_dec),
-                                                 self.total_matches)
-                        for text, enc in self.texts:
-                            found = line.find(text, found + 1)
-                            if found > -1:
-                                break
+            _entry, matches = find_in_file(fname, self.texts, self.text_re)
+            self.add_matches(fname, matches)
         except IOError as xxx_todo_changeme:
             (_errno, _strerror) = xxx_todo_changeme.args
             self.error_flag = _("permission denied errors were encountered")
         self.completed = True
 
+    def emit_current_file(self, fname):
+        """Report the file being scanned, at most once every 100 ms."""
+        now = time.time()
+        if now - self.last_file_time > 0.1:
+            self.last_file_time = now
+            self.sig_current_file.emit(fname)
+
+    def add_matches(self, fname, matches):
+        """Store matches until they are taken by the results browser"""
+        if not matches:
+            return
+        fname = osp.abspath(fname)
+        with QMutexLocker(self.mutex):
+            for lineno, start, end, line_dec in matches:
+                self.pending_matches.append((fname, lineno, start, end,
+                                             line_dec))
+            self.total_matches += len(matches)
+
+    def take_matches(self):
+        """Return the matches found since the last call and their total"""
+        with QMutexLocker(self.mutex):
+            matches, self.pending_matches = self.pending_matches, []
+            return matches, self.total_matches
+
     def get_results(self):
         return self.results, self.pathlist, self.total_matches, self.error_flag
 
+    def get_index_stats(self):
+        """Return the trigram index statistics if it was used, else None"""
+        return self.index_stats
+
 
 class FindOptions(QWidget):
     """Find widget with options"""
@@ -423,63 +468,6 @@ class FindOptions(QWidget):
             QWidget.keyPressEvent(self, event)
 
 
-class LineMatchItem(QTreeWidgetItem):
-    def __init__(self, parent, lineno, colno, match):
-        self.lineno = lineno
-        self.colno = colno
-        self.match = match
-        QTreeWidgetItem.__init__(self, parent, [self.__repr__()],
-                                 QTreeWidgetItem.Type)
-
-    def __repr__(self):
-        match = to_text_string(self.match).rstrip()
-        font = get_font()
-        _str = to_text_string("<b>{1}</b> ({2}): "
-                              "<span style='font-family:{0};"
-                              "font-size:75%;'>{3}</span>")
-        return _str.format(font.family(), self.lineno, self.colno, match)
-
-    def __unicode__(self):
-        return self.__repr__()
-
-    def __str__(self):
-        return self.__repr__()
-
-    def __lt__(self, x):
-        return self.lineno < x.lineno
-
-    def __ge__(self, x):
-        return self.lineno >= x.lineno
-
-
-class FileMatchItem(QTreeWidgetItem):
-    def __init__(self, parent, filename, sorting):
-
-        self.sorting = sorting
-        self.filename = osp.basename(filename)
-
-        title_format = to_text_string('<b>{0}</b><br>'
-                                      '<small><em>{1}</em>'
-                                      '</small>')
-        title = (title_format.format(osp.basename(filename),
-                                     osp.dirname(filename)))
-        QTreeWidgetItem.__init__(self, parent, [title], QTreeWidgetItem.Type)
-
-        self.setToolTip(0, filename)
-
-    def __lt__(self, x):
-        if self.sorting['status'] == ON:
-            return self.filename < x.filename
-        else:
-            return False
-
-    def __ge__(self, x):
-        if self.sorting['status'] == ON:
-            return self.filename >= x.filename
-        else:
-            return False
-
-
 class ItemDelegate(QStyledItemDelegate):
     def __init__(self, parent):
         QStyledItemDelegate.__init__(self, parent)
@@ -519,35 +507,282 @@ class ItemDelegate(QStyledItemDelegate):
         return QSize(doc.idealWidth(), doc.size().height())
 
 
-class ResultsBrowser(OneColumnTree):
+def truncate_result(line, start, end):
+    """Return the HTML representation of a match, truncated around it"""
+    ellipsis = '...'
+    max_line_length = 80
+    max_num_char_fragment = 40
+
+    html_escape_table = {
+        "&": "&amp;",
+        '"': "&quot;",
+        "'": "&apos;",
+        ">": "&gt;",
+        "<": "&lt;",
+    }
+
+    def html_escape(text):
+        """Produce entities within text."""
+        return "".join(html_escape_table.get(c, c) for c in text)
+
+    line = to_text_string(line)
+    left, match, right = line[:start], line[start:end], line[end:]
+
+    if len(line) > max_line_length:
+        offset = (len(line) - len(match)) // 2
+
+        left = left.split(' ')
+        num_left_words = len(left)
+
+        if num_left_words == 1:
+            left = left[0]
+            if len(left) > max_num_char_fragment:
+                left = ellipsis + left[-offset:]
+            left = [left]
+
+        right = right.split(' ')
+        num_right_words = len(right)
+
+        if num_right_words == 1:
+            right = right[0]
+            if len(right) > max_num_char_fragment:
+                right = right[:offset] + ellipsis
+            right = [right]
+
+        left = left[-4:]
+        right = right[:4]
+
+        if len(left) < num_left_words:
+            left = [ellipsis] + left
+
+        if len(right) < num_right_words:
+            right = right + [ellipsis]
+
+        left = ' '.join(left)
+        right = ' '.join(right)
+
+        if len(left) > max_num_char_fragment:
+            left = ellipsis + left[-30:]
+
+        if len(right) > max_num_char_fragment:
+            right = right[:30] + ellipsis
+
+    line_match_format = to_text_string('{0}<b>{1}</b>{2}')
+    left = html_escape(left)
+    right = html_escape(right)
+    match = html_escape(match)
+    trunc_line = line_match_format.format(left, match, right)
+    return trunc_line
+
+
+class ResultsModel(QAbstractItemModel):
+    """
+    Find in files results model
+
+    Matches are stored as (filename, lineno, colno, match_end, line) tuples,
+    in the order they were found. Only the first `max_results` ones are
+    shown: they are grouped by file, and each file row keeps the indexes
+    of its matches. The HTML shown for each row is only computed when the
+    view asks for it.
+    """
+
+    def __init__(self, parent, max_results=MAX_RESULTS):
+        QAbstractItemModel.__init__(self, parent)
+        self.max_results = max_results
+        self.title = ''
+        self.matches = []
+        self.files_found = set()
+        self.filenames = []
+        self.file_rows = {}
+        self.children = []
+
+    def clear(self):
+        """Remove all results"""
+        self.beginResetModel()
+        self.matches = []
+        self.files_found = set()
+        self.filenames = []
+        self.file_rows = {}
+        self.children = []
+        self.endResetModel()
+
+    def num_shown(self):
+        """Return the number of matches shown"""
+        return min(len(self.matches), self.max_results)
+
+    def has_hidden_results(self):
+        """Return True if some matches are not shown"""
+        return len(self.matches) > self.max_results
+
+    def append_results(self, matches):
+        """Add a batch of matches"""
+        first = self.num_shown()
+        self.matches.extend(matches)
+        self.files_found.update(match[0] for match in matches)
+        self._show_results(first)
+
+    def load_more(self, num_results):
+        """Show num_results more matches"""
+        first = self.num_shown()
+        self.max_results += num_results
+        self._show_results(first)
+
+    def _show_results(self, first):
+        """Insert in the model the matches not shown yet"""
+        last = self.num_shown()
+        if last <= first:
+            return
+        groups = OrderedDict()
+        for index in range(first, last):
+            groups.setdefault(self.matches[index][0], []).append(index)
+
+        new_files = [fname for fname in groups if fname not in self.file_rows]
+        if new_files:
+            row = len(self.filenames)
+            self.beginInsertRows(QModelIndex(), row, row + len(new_files) - 1)
+            for fname in new_files:
+                self.file_rows[fname] = len(self.filenames)
+                self.filenames.append(fname)
+                self.children.append(array('l'))
+            self.endInsertRows()
+
+        for fname, indexes in groups.items():
+            row = self.file_rows[fname]
+            children = self.children[row]
+            self.beginInsertRows(self.index(row, 0), len(children),
+                                 len(children) + len(indexes) - 1)
+            children.extend(indexes)
+            self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort file rows by file name"""
+        rows = sorted(range(len(self.filenames)),
+                      key=lambda row: osp.basename(self.filenames[row]),
+                      reverse=(order == Qt.DescendingOrder))
+        self.beginResetModel()
+        self.filenames = [self.filenames[row] for row in rows]
+        self.children = [self.children[row] for row in rows]
+        self.file_rows = dict((fname, row) for row, fname
+                              in enumerate(self.filenames))
+        self.endResetModel()
+
+    def get_match(self, index):
+        """Return (filename, lineno, colno) of a match row, or None"""
+        if not index.isValid() or index.internalId() == 0:
+            return None
+        match_index = self.children[index.internalId() - 1][index.row()]
+        filename, lineno, colno, _end, _line = self.matches[match_index]
+        return filename, lineno, colno
+
+    def get_shown_matches(self):
+        """Return the (filename, lineno, colno) of all shown matches"""
+        return [self.matches[index][:3] for index in range(self.num_shown())]
+
+    def set_title(self, title):
+        self.title = title
+        self.headerDataChanged.emit(Qt.Horizontal, 0, 0)
+
+    # ---- Qt methods
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if parent.isValid():
+            return self.createIndex(row, column, parent.row() + 1)
+        return self.createIndex(row, column, 0)
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        if not parent.isValid():
+            return len(self.filenames)
+        if parent.internalId() == 0:
+            return len(self.children[parent.row()])
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return to_qvariant(self.title)
+        return to_qvariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return to_qvariant()
+        if index.internalId() == 0:
+            filename = self.filenames[index.row()]
+            if role == Qt.DisplayRole:
+                title_format = to_text_string('<b>{0}</b><br>'
+                                              '<small><em>{1}</em>'
+                                              '</small>')
+                return to_qvariant(title_format.format(osp.basename(filename),
+                                                       osp.dirname(filename)))
+            elif role == Qt.ToolTipRole:
+                return to_qvariant(filename)
+        elif role == Qt.DisplayRole:
+            match_index = self.children[index.internalId() - 1][index.row()]
+            _fname, lineno, colno, match_end, line = self.matches[match_index]
+            match = truncate_result(line, colno, match_end).rstrip()
+            font = get_font()
+            _str = to_text_string("<b>{1}</b> ({2}): "
+                                  "<span style='font-family:{0};"
+                                  "font-size:75%;'>{3}</span>")
+            return to_qvariant(_str.format(font.family(), lineno, colno,
+                                           match))
+        return to_qvariant()
+
+
+class ResultsBrowser(QTreeView):
     sig_edit_goto = Signal(str, int, str)
 
-    def __init__(self, parent):
-        OneColumnTree.__init__(self, parent)
+    def __init__(self, parent, max_results=MAX_RESULTS):
+        QTreeView.__init__(self, parent)
         self.search_text = None
-        self.results = None
-        self.total_matches = None
-        self.error_flag = None
-        self.completed = None
+        self.max_results = max_results
         self.sorting = {}
-        self.data = None
-        self.files = None
+        self.results_model = ResultsModel(self, max_results)
+        self.setModel(self.results_model)
         self.set_title('')
         self.set_sorting(OFF)
-        self.setSortingEnabled(False)
-        self.root_items = None
-        self.sortByColumn(0, Qt.AscendingOrder)
         self.setItemDelegate(ItemDelegate(self))
         self.setUniformRowHeights(False)
         self.header().sectionClicked.connect(self.sort_section)
-
-    def activated(self, item):
+        self.activated.connect(self.activated_item)
+        self.clicked.connect(self.activated_item)
+        self.results_model.rowsInserted.connect(self.expand_new_files)
+        self.results_model.modelReset.connect(self.expandAll)
+
+        # Setup context menu
+        self.menu = QMenu(self)
+        add_actions(self.menu, [
+            create_action(self, text=_('Collapse all'),
+                          icon=ima.icon('collapse'),
+                          triggered=self.collapseAll),
+            create_action(self, text=_('Expand all'),
+                          icon=ima.icon('expand'),
+                          triggered=self.expandAll)])
+
+    @property
+    def data(self):
+        """Shown matches, as a {row: (filename, lineno, colno)} dict"""
+        return dict(enumerate(self.results_model.get_shown_matches()))
+
+    def activated_item(self, index):
         """Double-click event"""
-        itemdata = self.data.get(id(self.currentItem()))
+        itemdata = self.results_model.get_match(index)
         if itemdata is not None:
             filename, lineno, colno = itemdata
             self.sig_edit_goto.emit(filename, lineno, self.search_text)
 
+    def set_title(self, title):
+        self.results_model.set_title(title)
+
     def set_sorting(self, flag):
         """Enable result sorting after search is complete."""
         self.sorting['status'] = flag
@@ -555,104 +790,29 @@ class ResultsBrowser(OneColumnTree):
 
     @Slot(int)
     def sort_section(self, idx):
-        self.setSortingEnabled(True)
+        if self.sorting['status'] == ON:
+            self.results_model.sort(idx)
 
-    def clicked(self, item):
-        """Click event"""
-        self.activated(item)
+    @Slot(QModelIndex, int, int)
+    def expand_new_files(self, parent, first, last):
+        """Expand file rows as they are added"""
+        if not parent.isValid():
+            for row in range(first, last + 1):
+                self.expand(self.results_model.index(row, 0))
 
     def clear_title(self, search_text):
-        self.clear()
-        self.setSortingEnabled(False)
-        self.num_files = 0
-        self.data = {}
-        self.files = {}
+        self.results_model.clear()
+        self.results_model.max_results = self.max_results
         self.set_sorting(OFF)
         self.search_text = search_text
         title = "'%s' - " % search_text
         text = _('String not found')
         self.set_title(title + text)
 
-    def truncate_result(self, line, start, end):
-        ellipsis = '...'
-        max_line_length = 80
-        max_num_char_fragment = 40
-
-        html_escape_table = {
-            "&": "&amp;",
-            '"': "&quot;",
-            "'": "&apos;",
-            ">": "&gt;",
-            "<": "&lt;",
-        }
-
-        def html_escape(text):
-            """Produce entities within text."""
-            return "".join(html_escape_table.get(c, c) for c in text)
-
-        line = to_text_string(line)
-        left, match, right = line[:start], line[start:end], line[end:]
-
-        if len(line) > max_line_length:
-            offset = (len(line) - len(match)) // 2
-
-            left = left.split(' ')
-            num_left_words = len(left)
-
-            if num_left_words == 1:
-                left = left[0]
-                if len(left) > max_num_char_fragment:
-                    left = ellipsis + left[-offset:]
-                left = [left]
-
-            right = right.split(' ')
-            num_right_words = len(right)
-
-            if num_right_words == 1:
-                right = right[0]
-                if len(right) > max_num_char_fragment:
-                    right = right[:offset] + ellipsis
-                right = [right]
-
-            left = left[-4:]
-            right = right[:4]
-
-            if len(left) < num_left_words:
-                left = [ellipsis] + left
-
-            if len(right) < num_right_words:
-                right = right + [ellipsis]
-
-            left = ' '.join(left)
-            right = ' '.join(right)
-
-            if len(left) > max_num_char_fragment:
-                left = ellipsis + left[-30:]
-
-            if len(right) > max_num_char_fragment:
-                right = right[:30] + ellipsis
-
-        line_match_format = to_text_string('{0}<b>{1}</b>{2}')
-        left = html_escape(left)
-        right = html_escape(right)
-        match = html_escape(match)
-        trunc_line = line_match_format.format(left, match, right)
-        return trunc_line
-
-    @Slot(tuple, int)
-    def append_result(self, results, num_matches):
-        """Real-time update of search results"""
-        filename, lineno, colno, match_end, line = results
-
-        if filename not in self.files:
-            file_item = FileMatchItem(self, filename, self.sorting)
-            file_item.setExpanded(True)
-            self.files[filename] = file_item
-            self.num_files += 1
-
+    def update_title(self, num_matches):
         search_text = self.search_text
         title = "'%s' - " % search_text
-        nb_files = self.num_files
+        nb_files = len(self.results_model.files_found)
         if nb_files == 0:
             text = _('String not found')
         else:
@@ -662,12 +822,28 @@ class ResultsBrowser(OneColumnTree):
                 text_files += 's'
             text = "%d %s %d %s" % (num_matches, text_matches,
                                     nb_files, text_files)
+            if self.results_model.has_hidden_results():
+                text += " (%s %d)" % (_('showing the first'),
+                                      self.results_model.num_shown())
         self.set_title(title + text)
 
-        file_item = self.files[filename]
-        line = self.truncate_result(line, colno, match_end)
-        item = LineMatchItem(file_item, lineno, colno, line)
-        self.data[id(item)] = (filename, lineno, colno)
+    def append_results(self, results, num_matches):
+        """Add a batch of (filename, lineno, colno, match_end, line) results"""
+        self.results_model.append_results(results)
+        self.update_title(num_matches)
+
+    def has_hidden_results(self):
+        return self.results_model.has_hidden_results()
+
+    @Slot()
+    def load_more(self):
+        """Show the next batch of hidden results"""
+        self.results_model.load_more(self.max_results)
+        self.update_title(len(self.results_model.matches))
+
+    def contextMenuEvent(self, event):
+        """Override Qt method"""
+        self.menu.popup(event.globalPos())
 
 
 class FileProgressBar(QWidget):
@@ -719,7 +895,8 @@ class FindInFilesWidget(QWidget):
                  exclude=r"\.pyc$|\.orig$|\.hg|\.svn", exclude_idx=None,
                  exclude_regexp=True,
                  supported_encodings=("utf-8", "iso-8859-1", "cp1252"),
-                 in_python_path=False, more_options=False):
+                 in_python_path=False, more_options=False,
+                 max_results=MAX_RESULTS):
         QWidget.__init__(self, parent)
 
         self.setWindowTitle(_('Find in files'))
@@ -728,6 +905,11 @@ class FindInFilesWidget(QWidget):
         self.search_path = ''
         self.get_pythonpath_callback = None
 
+        # Matches are taken from the search thread in batches
+        self.update_timer = QTimer(self)
+        self.update_timer.setInterval(UPDATE_INTERVAL)
+        self.update_timer.timeout.connect(self.update_results)
+
         self.status_bar = FileProgressBar(self)
         self.status_bar.hide()
         self.find_options = FindOptions(self, search_text, search_text_regexp,
@@ -738,7 +920,16 @@ class FindInFilesWidget(QWidget):
         self.find_options.find.connect(self.find)
         self.find_options.stop.connect(self.stop_and_reset_thread)
 
-        self.result_browser = ResultsBrowser(self)
+        self.result_browser = ResultsBrowser(self, max_results)
+        self.load_more_button = create_toolbutton(
+            self, text=_("Load more results"),
+            icon=ima.icon('options_more'),
+            triggered=self.load_more_results,
+            tip=_("Show the next %d results") % max_results,
+            text_beside_icon=True)
+        self.load_more_button.hide()
+        self.index_status = QLabel(self)
+        self.index_status.hide()
 
         hlayout = QHBoxLayout()
         hlayout.addWidget(self.result_browser)
@@ -748,6 +939,8 @@ class FindInFilesWidget(QWidget):
         layout.setContentsMargins(left, 0, right, bottom)
         layout.addWidget(self.find_options)
         layout.addLayout(hlayout)
+        layout.addWidget(self.load_more_button)
+        layout.addWidget(self.index_status)
         layout.addWidget(self.status_bar)
         self.setLayout(layout)
 
@@ -771,23 +964,24 @@ class FindInFilesWidget(QWidget):
         self.search_thread.sig_current_folder.connect(
             lambda x: self.status_bar.set_label_path(x, folder=True)
         )
-        self.search_thread.sig_file_match.connect(
-            self.result_browser.append_result
-        )
         self.search_thread.sig_out_print.connect(
             lambda x: sys.stdout.write(str(x) + "\n")
         )
         self.status_bar.reset()
         self.result_browser.clear_title(
             self.find_options.search_text.currentText())
+        self.load_more_button.hide()
+        self.index_status.hide()
         self.search_thread.initialize(*options)
         self.search_thread.start()
+        self.update_timer.start()
         self.find_options.ok_button.setEnabled(False)
         self.find_options.stop_button.setEnabled(True)
         self.status_bar.show()
 
     def stop_and_reset_thread(self, ignore_results=False):
         """Stop current search thread and clean-up"""
+        self.update_timer.stop()
         if self.search_thread is not None:
             if self.search_thread.isRunning():
                 if ignore_results:
@@ -795,6 +989,8 @@ class FindInFilesWidget(QWidget):
                         self.search_complete)
                 self.search_thread.stop()
                 self.search_thread.wait()
+            if not ignore_results:
+                self.update_results()
             self.search_thread.setParent(None)
             self.search_thread = None
 
@@ -802,8 +998,43 @@ class FindInFilesWidget(QWidget):
         """Perform actions before widget is closed"""
         self.stop_and_reset_thread(ignore_results=True)
 
+    @Slot()
+    def update_results(self):
+        """Send the matches found since the last update to the browser"""
+        if self.search_thread is None:
+            return
+        matches, num_matches = self.search_thread.take_matches()
+        if matches:
+            self.result_browser.append_results(matches, num_matches)
+            self.load_more_button.setVisible(
+                self.result_browser.has_hidden_results())
+
+    @Slot()
+    def load_more_results(self):
+        """Show more results in the results browser"""
+        self.result_browser.load_more()
+        self.load_more_button.setVisible(
+            self.result_browser.has_hidden_results())
+
+    def show_index_stats(self, stats):
+        """Show the statistics of the trigram index used by a search"""
+        if stats is None:
+            self.index_status.hide()
+            return
+        text = _("Search index: {0} files, {1:.1f} MB on disk, "
+                 "updated in {2:.0f} ms. Query: {3:.1f} ms, "
+                 "{4} files read").format(stats['num_files'],
+                                          stats['size_on_disk'] / 1048576.,
+                                          stats['build_time'] * 1000,
+                                          stats['query_time'] * 1000,
+                                          stats['num_candidates'])
+        self.index_status.setText(text)
+        self.index_status.show()
+
     def search_complete(self, completed):
         """Current search thread has finished"""
+        self.update_timer.stop()
+        self.update_results()
         self.result_browser.set_sorting(ON)
         self.find_options.ok_button.setEnabled(True)
         self.find_options.stop_button.setEnabled(False)
@@ -811,6 +1042,7 @@ class FindInFilesWidget(QWidget):
         self.result_browser.expandAll()
         if self.search_thread is None:
             return
+        self.show_index_stats(self.search_thread.get_index_stats())
         self.sig_finished.emit()
         found = self.search_thread.get_results()
         self.stop_and_reset_thread()
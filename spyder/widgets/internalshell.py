@@ -11,15 +11,13 @@
 # pylint: disable=R0911
 # pylint: disable=R0201
 
-#FIXME: Internal shell MT: for i in range(100000): print i -> bug
-
 # Standard library imports
 from time import time
 import os
 import threading
 
 # Third party imports
-from qtpy.QtCore import QEventLoop, QObject, Signal, Slot
+from qtpy.QtCore import QCoreApplication, QEventLoop, QObject, Signal, Slot
 from qtpy.QtWidgets import QMessageBox
 
 # Local imports
@@ -62,17 +60,24 @@ class SysOutput(QObject):
         QObject.__init__(self)
         self.queue = []
         self.lock = threading.Lock()
+        self.data_pending = False
         
     def write(self, val):
         self.lock.acquire()
         self.queue.append(val)
+        # Signal only the first write since the queue was emptied, to avoid
+        # flooding the event loop when writing from another thread
+        notify = not self.data_pending
+        self.data_pending = True
         self.lock.release()
-        self.data_avail.emit()
+        if notify:
+            self.data_avail.emit()
 
     def empty_queue(self):
         self.lock.acquire()
         s = "".join(self.queue)
         self.queue = []
+        self.data_pending = False
         self.lock.release()
         return s
     
@@ -315,6 +320,10 @@ class InternalShell(PythonShellWidget):
     def flush(self, error=False, prompt=False):
         """Reimplement ShellBaseWidget method"""
         PythonShellWidget.flush(self, error=error, prompt=prompt)
+        if not self.multithreaded:
+            # Code is run in the main thread, so let the interface be updated
+            # and keyboard interrupts be received while it writes output
+            QCoreApplication.processEvents()
         if self.interrupted:
             self.interrupted = False
             raise KeyboardInterrupt
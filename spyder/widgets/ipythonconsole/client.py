@@ -73,6 +73,12 @@ def background(f):
     return t
 
 
+def get_stderr_file(connection_file):
+    """Return the filename to save the stderr output of a kernel"""
+    kernel_id = osp.basename(connection_file).split('.json')[0]
+    return osp.join(TEMPDIR, kernel_id + '.stderr')
+
+
 #-----------------------------------------------------------------------------
 # Client widget
 #-----------------------------------------------------------------------------
@@ -162,9 +168,7 @@ class ClientWidget(QWidget, SaveHistoryMixin):
     def stderr_file(self):
         """Filename to save kernel stderr output."""
         if self.connection_file is not None:
-            stderr_file = self.kernel_id + '.stderr'
-            stderr_file = osp.join(TEMPDIR, stderr_file)
-            return stderr_file
+            return get_stderr_file(self.connection_file)
 
     def configure_shellwidget(self, give_focus=True):
         """Configure shellwidget after kernel is started"""
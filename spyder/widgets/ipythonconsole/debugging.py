@@ -13,6 +13,8 @@ from qtpy.QtCore import Qt
 
 from qtconsole.rich_jupyter_widget import RichJupyterWidget
 
+from spyder.py3compat import to_text_string
+
 
 class DebuggingWidget(RichJupyterWidget):
     """
@@ -21,16 +23,43 @@ class DebuggingWidget(RichJupyterWidget):
     Spyder
     """
 
+    # Spyder breakpoints, by filename
+    _spyder_breakpoints = None
+
     # --- Public API --------------------------------------------------
     def write_to_stdin(self, line):
         """Send raw characters to the IPython kernel through stdin"""
         self.kernel_client.input(line)
 
-    def set_spyder_breakpoints(self):
-        """Set Spyder breakpoints into a debugging session"""
-        if self._reading:
-            self.kernel_client.input(
-                "!get_ipython().kernel._set_spyder_breakpoints()")
+    def set_spyder_breakpoints(self, breakpoints):
+        """
+        Set all Spyder breakpoints into the kernel
+
+        They are sent again each time the kernel starts.
+        """
+        self._spyder_breakpoints = dict(breakpoints)
+        self.send_spyder_breakpoints()
+
+    def update_spyder_breakpoints(self, breakpoints):
+        """
+        Update the Spyder breakpoints of the files in *breakpoints*,
+        only sending those to the kernel
+        """
+        if self._spyder_breakpoints is None:
+            return
+        for filename, file_breakpoints in breakpoints.items():
+            if file_breakpoints:
+                self._spyder_breakpoints[filename] = file_breakpoints
+            else:
+                self._spyder_breakpoints.pop(filename, None)
+        self._execute_breakpoints_method('update_spyder_breakpoints',
+                                         breakpoints)
+
+    def send_spyder_breakpoints(self):
+        """Send all Spyder breakpoints to the kernel"""
+        if self._spyder_breakpoints is not None:
+            self._execute_breakpoints_method('set_spyder_breakpoints',
+                                             self._spyder_breakpoints)
 
     def dbg_exec_magic(self, magic, args=''):
         """Run an IPython magic while debugging."""
@@ -57,6 +86,18 @@ class DebuggingWidget(RichJupyterWidget):
         if 'var_properties' in pdb_state:
             self.sig_var_properties.emit(pdb_state['var_properties'])
 
+    # ---- Private API --------------------------------------------------
+    def _execute_breakpoints_method(self, method, breakpoints):
+        """Call a kernel method with a dict of breakpoints as argument"""
+        if self.kernel_client is None:
+            return
+        code = u"get_ipython().kernel.{}({})".format(
+                    method, to_text_string(breakpoints))
+        if self._reading:
+            self.kernel_client.input(u'!' + code)
+        else:
+            self.silent_execute(code)
+
     # ---- Private API (overrode by us) ----------------------------
     def _handle_input_request(self, msg):
         """Save history and add a %plot magic."""
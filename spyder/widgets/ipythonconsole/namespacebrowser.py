@@ -37,6 +37,9 @@ class NamepaceBrowserWidget(RichJupyterWidget):
     _kernel_value = None
     _kernel_is_starting = True
 
+    # Version of the last namespace update received from the kernel
+    _namespace_version = None
+
     # --- Public API --------------------------------------------------
     def set_namespacebrowser(self, namespacebrowser):
         """Set namespace browser widget"""
@@ -49,17 +52,58 @@ class NamepaceBrowserWidget(RichJupyterWidget):
         self.sig_namespace_view.connect(lambda data:
             self.namespacebrowser.process_remote_view(data))
 
+        # Update the variables that changed in the namespace
+        self.sig_namespace_update.connect(lambda data:
+            self.namespacebrowser.process_remote_update(data))
+
         # Update properties of variables
         self.sig_var_properties.connect(lambda data:
             self.namespacebrowser.set_var_properties(data))
 
+        # Receive windows of large variables
+        self.sig_value_window.connect(lambda data:
+            self.namespacebrowser.add_value_window(data))
+
     def refresh_namespacebrowser(self):
-        """Refresh namespace browser"""
+        """
+        Refresh namespace browser
+
+        Only the variables that changed since the last update we got are
+        sent by the kernel.
+        """
         if self.namespacebrowser:
             self.silent_exec_method(
-                'get_ipython().kernel.get_namespace_view()')
+                'get_ipython().kernel.get_namespace_update(%r)' %
+                self._namespace_version)
+
+    def refresh_namespace_previews(self):
+        """
+        Ask the kernel for the previews of variables it couldn't compute
+        within their budget for the last namespace update.
+
+        It computes them when it's done running the code queued before.
+        """
+        if self.namespacebrowser:
             self.silent_exec_method(
-                'get_ipython().kernel.get_var_properties()')
+                'get_ipython().kernel.get_namespace_previews(%r)' %
+                self._namespace_version)
+
+    def update_namespace_previews(self, previews):
+        """
+        Show the previews of variables that the kernel couldn't compute
+        within their budget for a namespace update, and ask for the rest
+        of them if some are still pending.
+        """
+        if previews['version'] != self._namespace_version:
+            return
+        if previews['view']:
+            self.sig_namespace_update.emit({'version': previews['version'],
+                                            'full': False,
+                                            'removed': [],
+                                            'view': previews['view'],
+                                            'properties': {}})
+        if previews.get('pending'):
+            self.refresh_namespace_previews()
 
     def set_namespace_view_settings(self):
         """Set the namespace view settings"""
@@ -70,30 +114,53 @@ class NamepaceBrowserWidget(RichJupyterWidget):
     def get_value(self, name):
         """Ask kernel for a value"""
         code = u"get_ipython().kernel.get_value('%s')" % name
-        if self._reading:
-            method = self.kernel_client.input
-            code = u'!' + code
-        else:
-            method = self.silent_execute
-
-        # Wait until the kernel returns the value
-        wait_loop = QEventLoop()
-        self.sig_got_reply.connect(wait_loop.quit)
-        method(code)
-        wait_loop.exec_()
+        return self._get_kernel_value(code)
+
+    def get_value_info(self, name):
+        """Ask kernel for the description of a large value"""
+        code = u"get_ipython().kernel.get_value_info('%s')" % name
+        info = self._get_kernel_value(code)
+        self._kernel_value = None
+        if info is not None and 'error' in info:
+            raise ValueError(info['error'])
+        return info
+
+    def get_value_window(self, name, rows, cols):
+        """
+        Ask kernel for a window of a large value and wait for it
 
-        # Remove loop connection and loop
-        self.sig_got_reply.disconnect(wait_loop.quit)
-        wait_loop = None
+        *rows* and *cols* are (start, stop) tuples.
+        """
+        code = (u"get_ipython().kernel.get_value_window('%s', %r, %r)" %
+                (name, tuple(rows), tuple(cols)))
+        window = self._get_kernel_value(code)
+        self._kernel_value = None
+        if window is not None and 'error' in window:
+            raise ValueError(window['error'])
+        return window
+
+    def request_value_window(self, name, rows, cols, request_id):
+        """
+        Ask kernel for a window of a large value without waiting for it
 
-        # Handle exceptions
-        if self._kernel_value is None:
-            if self._kernel_reply:
-                msg = self._kernel_reply[:]
-                self._kernel_reply = None
-                raise ValueError(msg)
+        The window is emitted with sig_value_window when it arrives.
+        """
+        code = (u"get_ipython().kernel.get_value_window('%s', %r, %r, %r)" %
+                (name, tuple(rows), tuple(cols), request_id))
+        if self._reading:
+            self.kernel_client.input(u'!' + code)
+        else:
+            self.silent_execute(code)
 
-        return self._kernel_value
+    def set_value_items(self, name, items):
+        """Set the items edited in a window of a large value"""
+        items = to_text_string(items)
+        code = u"get_ipython().kernel.set_value_items('%s', %s)" % (name,
+                                                                   items)
+        if self._reading:
+            self.kernel_client.input(u'!' + code)
+        else:
+            self.silent_execute(code)
 
     def set_value(self, name, value):
         """Set value for a variable"""
@@ -159,6 +226,33 @@ class NamepaceBrowserWidget(RichJupyterWidget):
         return self._kernel_reply
 
     # ---- Private API (defined by us) ------------------------------
+    def _get_kernel_value(self, code):
+        """Execute code that publishes a value and wait for it"""
+        if self._reading:
+            method = self.kernel_client.input
+            code = u'!' + code
+        else:
+            method = self.silent_execute
+
+        # Wait until the kernel returns the value
+        wait_loop = QEventLoop()
+        self.sig_got_reply.connect(wait_loop.quit)
+        method(code)
+        wait_loop.exec_()
+
+        # Remove loop connection and loop
+        self.sig_got_reply.disconnect(wait_loop.quit)
+        wait_loop = None
+
+        # Handle exceptions
+        if self._kernel_value is None:
+            if self._kernel_reply:
+                msg = self._kernel_reply[:]
+                self._kernel_reply = None
+                raise ValueError(msg)
+
+        return self._kernel_value
+
     def _handle_data_message(self, msg):
         """
         Handle raw (serialized) data sent by the kernel
@@ -175,15 +269,27 @@ class NamepaceBrowserWidget(RichJupyterWidget):
             self.sig_got_reply.emit()
             return
 
+        # Raw data of NumPy windows is sent apart from its description
+        buffer = data.get('__spy_buffer__', None)
+
         # Receive values asked for Spyder
         value = data.get('__spy_data__', None)
         if value is not None:
             if isinstance(value, CannedObject):
                 value = value.get_object()
+            if buffer is not None:
+                value['buffer'] = buffer
             self._kernel_value = value
             self.sig_got_reply.emit()
             return
 
+        # Receive windows of large values asked asynchronously
+        window = data.get('__spy_window__', None)
+        if window is not None:
+            window['buffer'] = buffer
+            self.sig_value_window.emit(window)
+            return
+
         # Receive Pdb state and dispatch it
         pdb_state = data.get('__spy_pdb_state__', None)
         if pdb_state is not None and isinstance(pdb_state, dict):
@@ -201,12 +307,15 @@ class NamepaceBrowserWidget(RichJupyterWidget):
         # still be pending.
         self._reading = False
 
-        # Refresh namespacebrowser after the kernel starts running
+        # Refresh namespacebrowser and send breakpoints after the kernel
+        # starts running
         exec_count = msg['content'].get('execution_count', '')
         if exec_count == 0 and self._kernel_is_starting:
+            self._namespace_version = None
             if self.namespacebrowser is not None:
                 self.set_namespace_view_settings()
                 self.refresh_namespacebrowser()
+            self.send_spyder_breakpoints()
             self._kernel_is_starting = False
 
         # Handle silent execution of kernel methods
@@ -229,8 +338,10 @@ class NamepaceBrowserWidget(RichJupyterWidget):
             self._kernel_is_starting = True
         elif state == 'idle' and msg_type == 'shutdown_request':
             # This handles restarts asked by the user
+            self._namespace_version = None
             if self.namespacebrowser is not None:
                 self.set_namespace_view_settings()
                 self.refresh_namespacebrowser()
+            self.send_spyder_breakpoints()
         else:
             super(NamepaceBrowserWidget, self)._handle_status(msg)
@@ -35,6 +35,8 @@ class ShellWidget(NamepaceBrowserWidget, HelpWidget, DebuggingWidget):
     # For NamepaceBrowserWidget
     sig_namespace_view = Signal(object)
     sig_var_properties = Signal(object)
+    sig_namespace_update = Signal(object)
+    sig_value_window = Signal(object)
     sig_show_syspath = Signal(object)
     sig_show_env = Signal(object)
 
@@ -312,6 +314,23 @@ the sympy module (e.g. plot)
                     else:
                         view = None
                     self.sig_namespace_view.emit(view)
+                elif 'get_namespace_update' in method:
+                    if data is not None and 'text/plain' in data:
+                        update = ast.literal_eval(data['text/plain'])
+                    else:
+                        update = None
+                    if update is not None:
+                        self._namespace_version = update['version']
+                    self.sig_namespace_update.emit(update)
+                    if update is not None and update.get('pending'):
+                        self.refresh_namespace_previews()
+                elif 'get_namespace_previews' in method:
+                    if data is not None and 'text/plain' in data:
+                        previews = ast.literal_eval(data['text/plain'])
+                    else:
+                        previews = None
+                    if previews is not None:
+                        self.update_namespace_previews(previews)
                 elif 'get_var_properties' in method:
                     if data is not None and 'text/plain' in data:
                         properties = ast.literal_eval(data['text/plain'])
@@ -410,5 +410,8 @@ class ClassFunctionDropdown(Panel):
 
     @Slot(int, int)
     def _handle_cursor_position_change_event(self, linenum, column):
+        if self.editor.large_file:
+            # Getting fold levels goes through the whole file
+            return
         self._update_data()
         self.update_selected(linenum)
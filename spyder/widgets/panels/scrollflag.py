@@ -41,10 +41,14 @@ class ScrollFlagArea(Panel):
         painter.fillRect(event.rect(), self.editor.sideareas_color)
         block = self.editor.document().firstBlock()
 
-        # Painting warnings and todos
+        # Painting warnings and todos, until all blocks with data are found
+        data_count = len(self.editor.blockuserdata_list)
         for line_number in range(1, self.editor.document().blockCount()+1):
+            if not data_count:
+                break
             data = block.userData()
             if data:
+                data_count -= 1
                 position = self.value_to_position(line_number)
                 if data.code_analysis:
                     # Warnings
@@ -16,6 +16,9 @@ from spyder.config.user import UserConfig
 PROJECT_FILENAME = '.spyproj'
 PROJECT_FOLDER = '.spyproject'
 
+# Files and folders left out of the list of project files
+EXCLUDE_PATTERN = r'\.pyc$|\.pyo$|\.git|\.spyproject|__pycache__'
+
 
 # Project configuration defaults
 WORKSPACE = 'workspace'
@@ -25,6 +28,9 @@ WORKSPACE_DEFAULTS = [
       'save_data_on_exit': True,
       'save_history': True,
       'save_non_project_files': False,
+      'search_index': True,
+      'search_index_max_size': 100,
+      'exclude': EXCLUDE_PATTERN,
       }
      )]
 WORKSPACE_VERSION = '0.1.0'
@@ -15,7 +15,7 @@ from spyder.utils.qthelpers import get_icon
 from spyder.config.user import NoDefault
 from spyder.widgets.projects import EmptyProject
 from spyder.widgets.projects.config import (WORKSPACE, VCS, ENCODING,
-                                            CODESTYLE)
+                                            CODESTYLE, EXCLUDE_PATTERN)
 
 
 class ProjectPreferences(ConfigDialog):
@@ -95,15 +95,44 @@ class WorkspaceConfigPage(ProjectConfigPage):
         interface_layout.addWidget(save_non_project_box)
         interface_group.setLayout(interface_layout)
 
+        # --- Search
+        search_group = QGroupBox(_("Search"))
+        search_index_box = newcb(_("Keep a search index of the project "
+                                   "files"), 'search_index',
+                                 tip=_("Find in files only reads the files "
+                                       "that may contain the searched text"))
+        search_index_size = self.create_spinbox(_("Maximum index size:"),
+                                                _("MB"),
+                                                'search_index_max_size',
+                                                min_=1, max_=10000, step=10)
+        search_index_box.toggled.connect(search_index_size.setEnabled)
+        search_index_size.setEnabled(self.get_option('search_index', True))
+        exclude_edit = self.create_lineedit(
+            _("Exclude patterns:"), 'exclude',
+            default=EXCLUDE_PATTERN,
+            tip=_("Files and folders matching this regular expression are "
+                  "not listed in the file switcher, nor indexed"))
+
+        search_layout = QVBoxLayout()
+        search_layout.addWidget(search_index_box)
+        search_layout.addWidget(search_index_size)
+        search_layout.addWidget(exclude_edit)
+        search_group.setLayout(search_layout)
+
         vlayout = QVBoxLayout()
         vlayout.addWidget(interface_group)
+        vlayout.addWidget(search_group)
         vlayout.addStretch(1)
         self.setLayout(vlayout)
 
     def apply_settings(self, options):
         """ """
-        pass  # TODO:
-        #self.main.apply_settings()
+        if (self.main is not None and
+                options & set(['search_index', 'search_index_max_size',
+                               'exclude'])):
+            self.main.update_search_index()
+        if self.main is not None and 'exclude' in options:
+            self.main.setup_file_list()
 
 
 class CodeConfigPage(ProjectConfigPage):
@@ -22,7 +22,7 @@ import time
 
 # Third party imports
 from qtpy.compat import getsavefilename
-from qtpy.QtCore import Property, QCoreApplication, Qt, QTimer, Signal, Slot
+from qtpy.QtCore import Property, Qt, QTimer, Signal, Slot
 from qtpy.QtGui import QKeySequence, QTextCharFormat, QTextCursor
 from qtpy.QtWidgets import QApplication, QMenu, QMessageBox, QToolTip
 
@@ -90,6 +90,10 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
         self.__flushtimer.setSingleShot(True)
         self.__flushtimer.timeout.connect(self.flush)
 
+        # Drop buffered lines that would be pushed out of the maximum line
+        # count by the following ones anyway
+        self.throughput_mode = False
+
         # Give focus to widget
         self.setFocus()
 
@@ -100,6 +104,10 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
         """Enable/disable wrap mode"""
         self.set_wrap_mode('character' if enable else None)
 
+    def set_throughput_mode(self, state):
+        """Enable/disable dropping output lines exceeding the line count"""
+        self.throughput_mode = state
+
     def set_font(self, font):
         """Set shell styles font"""
         self.setFont(font)
@@ -201,6 +209,8 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
         """
         Print a new prompt and save its (line, index) position
         """
+        # Buffered output has to be written to know where the line ends
+        self.flush()
         if self.get_cursor_line_column()[1] != 0:
             self.write('\n')
         self.write(prompt, prompt=True)
@@ -555,12 +565,40 @@ class ShellBaseWidget(ConsoleBaseWidget, SaveHistoryMixin,
             text = "".join(self.__buffer)
 
         self.__buffer = []
+        if self.throughput_mode and not error and not prompt:
+            text = self.drop_hidden_lines(text)
+        # Insert all text at once, so that the document layout is updated
+        # and lines exceeding the maximum line count are removed only once
+        cursor = self.textCursor()
+        cursor.beginEditBlock()
         self.insert_text(text, at_end=True, error=error, prompt=prompt)
-        QCoreApplication.processEvents()
-        self.repaint()
+        cursor.endEditBlock()
         # Clear input buffer:
         self.new_input_line = True
 
+    def drop_hidden_lines(self, text):
+        """
+        Return text without the lines that would be removed right after
+        being inserted because of the maximum line count.
+
+        Color sequences and form feeds of the dropped lines are kept, so that
+        the remaining lines are shown as if all of them were inserted.
+        """
+        max_count = self.maximumBlockCount()
+        if max_count <= 0:
+            return text
+        index = len(text)
+        for __ in range(max_count):
+            index = text.rfind('\n', 0, index)
+            if index <= 0:
+                return text
+        dropped = text[:index]
+        codes = [match.group()
+                 for match in self.COLOR_PATTERN.finditer(dropped)]
+        if chr(12) in dropped:
+            codes.insert(0, chr(12))
+        return ''.join(codes) + text[index:]
+
 
     #------ Text Insertion
     def insert_text(self, text, at_end=False, error=False, prompt=False):
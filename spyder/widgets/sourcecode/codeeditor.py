@@ -170,6 +170,8 @@ class BlockUserData(QTextBlockUserData):
         self.breakpoint = False
         self.breakpoint_condition = None
         self.code_analysis = []
+        self.code_analysis_selections = []
+        self.code_analysis_revision = None
         self.todo = ''
         self.editor.blockuserdata_list.append(self)
 
@@ -324,6 +326,8 @@ class CodeEditor(TextEditBaseWidget):
 
         self.highlighter_class = sh.TextSH
         self.highlighter = None
+        # Large files are highlighted only where they are shown
+        self.large_file = False
         ccs = 'Spyder'
         if ccs not in sh.COLOR_SCHEME_NAMES:
             ccs = sh.COLOR_SCHEME_NAMES[0]
@@ -565,6 +569,10 @@ class CodeEditor(TextEditBaseWidget):
         """Set as clone editor"""
         self.setDocument(editor.document())
         self.document_id = editor.get_document_id()
+        # The block data of a document is shared by its editors, so they
+        # all need to know every one (e.g. to count them)
+        self.blockuserdata_list = editor.blockuserdata_list
+        self.large_file = editor.large_file
         self.highlighter = editor.highlighter
         self._apply_highlighter_color_scheme()
 
@@ -593,7 +601,7 @@ class CodeEditor(TextEditBaseWidget):
                      add_colons=True, auto_unindent=True, indent_chars=" "*4,
                      tab_stop_width_spaces=4, cloned_from=None, filename=None,
                      occurrence_timeout=1500, show_class_func_dropdown=True,
-                     indent_guides=False):
+                     indent_guides=False, large_file=False):
         
         # Code completion and calltips
         self.set_codecompletion_auto(codecompletion_auto)
@@ -631,6 +639,8 @@ class CodeEditor(TextEditBaseWidget):
         self.linenumberarea.setup_margins(linenumbers, markers)
 
         # Lexer
+        if cloned_from is None:
+            self.large_file = large_file
         self.set_language(language, filename)
 
         # Highlight current cell
@@ -661,7 +671,8 @@ class CodeEditor(TextEditBaseWidget):
 
         # Class/Function dropdown will be disabled if we're not in a Python file.
         self.classfuncdropdown.setVisible(show_class_func_dropdown
-                                          and self.is_python_like())
+                                          and self.is_python_like()
+                                          and not self.large_file)
 
     def set_tab_mode(self, enable):
         """
@@ -742,6 +753,10 @@ class CodeEditor(TextEditBaseWidget):
         if filename is not None and not self.supported_language:
             sh_class = sh.guess_pygments_highlighter(filename)
             self.support_language = sh_class is not sh.TextSH
+        if self.large_file and issubclass(sh_class, (sh.PygmentsSH,
+                                                     sh.MarkdownSH)):
+            # These highlighters need the whole text
+            sh_class = sh.TextSH
         self._set_highlighter(sh_class)
 
     def _set_highlighter(self, sh_class):
@@ -758,6 +773,7 @@ class CodeEditor(TextEditBaseWidget):
 
         self.highlighter.fold_detector = IndentFoldDetector()
         self.highlighter.editor = self
+        self.highlighter.deferred = self.large_file
 
     def is_json(self):
         return (isinstance(self.highlighter, sh.PygmentsSH) and
@@ -924,6 +940,18 @@ class CodeEditor(TextEditBaseWidget):
                         underline_style=QTextCharFormat.SpellCheckUnderline,
                         update=False):
         extra_selections = self.get_extra_selections(key)
+        selection = self.__get_selection(cursor, foreground_color,
+                                         background_color, underline_color,
+                                         underline_style)
+        extra_selections.append(selection)
+        self.set_extra_selections(key, extra_selections)
+        if update:
+            self.update_extra_selections()
+
+    def __get_selection(self, cursor, foreground_color=None,
+                        background_color=None, underline_color=None,
+                        underline_style=QTextCharFormat.SpellCheckUnderline):
+        """Return an extra selection for cursor"""
         selection = QTextEdit.ExtraSelection()
         if foreground_color is not None:
             selection.format.setForeground(foreground_color)
@@ -937,10 +965,7 @@ class CodeEditor(TextEditBaseWidget):
         selection.format.setProperty(QTextFormat.FullWidthSelection,
                                      to_qvariant(True))
         selection.cursor = cursor
-        extra_selections.append(selection)
-        self.set_extra_selections(key, extra_selections)
-        if update:
-            self.update_extra_selections()
+        return selection
 
     def __mark_occurrences(self):
         """Marking occurrences of the currently selected word"""
@@ -1127,10 +1152,16 @@ class CodeEditor(TextEditBaseWidget):
         """Get breakpoints"""
         breakpoints = []
         block = self.document().firstBlock()
+        data_count = len(self.blockuserdata_list)
         for line_number in range(1, self.document().blockCount()+1):
+            if not data_count:
+                break
             data = block.userData()
-            if data and data.breakpoint:
-                breakpoints.append((line_number, data.breakpoint_condition))
+            if data:
+                data_count -= 1
+                if data.breakpoint:
+                    breakpoints.append((line_number,
+                                        data.breakpoint_condition))
             block = block.next()
         return breakpoints
 
@@ -1336,6 +1367,8 @@ class CodeEditor(TextEditBaseWidget):
         self.clear_extra_selections('code_analysis')
         for data in self.blockuserdata_list[:]:
             data.code_analysis = []
+            data.code_analysis_selections = []
+            data.code_analysis_revision = None
             if data.is_empty():
                 del data
         self.setUpdatesEnabled(True)
@@ -1346,24 +1379,53 @@ class CodeEditor(TextEditBaseWidget):
         self.linenumberarea.update()
 
     def process_code_analysis(self, check_results):
-        """Analyze filename code with pyflakes"""
-        self.cleanup_code_analysis()
+        """Analyze filename code with pyflakes
+
+        Results are merged with the previous ones: only the lines whose
+        messages or text changed are highlighted again."""
         if check_results is None:
             # Not able to compile module
+            self.cleanup_code_analysis()
             return
         self.setUpdatesEnabled(False)
-        cursor = self.textCursor()
-        document = self.document()
-        flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
+        results = {}
         for message, line_number in check_results:
-            error = 'syntax' in message
             # Note: line_number start from 1 (not 0)
-            block = self.document().findBlockByNumber(line_number-1)
+            results.setdefault(line_number, []).append(
+                (message, 'syntax' in message))
+        block = self.document().firstBlock()
+        while block.isValid():
             data = block.userData()
-            if not data:
+            code_analysis = results.pop(block.blockNumber() + 1, [])
+            if data is None and code_analysis:
                 data = BlockUserData(self)
-            data.code_analysis.append( (message, error) )
-            block.setUserData(data)
+                block.setUserData(data)
+            if data is not None and (
+                    data.code_analysis != code_analysis or code_analysis and
+                    data.code_analysis_revision != block.revision()):
+                data.code_analysis = code_analysis
+                data.code_analysis_revision = block.revision()
+                data.code_analysis_selections = \
+                    self.__get_code_analysis_selections(block, code_analysis)
+            block = block.next()
+        self.set_extra_selections('code_analysis',
+                                  [selection for data in
+                                   self.blockuserdata_list for selection
+                                   in data.code_analysis_selections])
+        self.update_extra_selections()
+        self.setUpdatesEnabled(True)
+        self.scrollflagarea.update()
+        self.linenumberarea.update()
+        self.classfuncdropdown.update()
+
+    def __get_code_analysis_selections(self, block, code_analysis):
+        """Return the extra selections highlighting the references found
+        in the code analysis messages of a block"""
+        selections = []
+        document = self.document()
+        flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
+        line_number = block.blockNumber() + 1
+        for message, error in code_analysis:
             refs = re.findall(r"\'[a-zA-Z0-9_]*\'", message)
             for ref in refs:
                 # Highlighting found references
@@ -1378,8 +1440,7 @@ class CodeEditor(TextEditBaseWidget):
                 line2 = line_number-1
                 while line2 < self.blockCount()-1 and is_line_splitted(line2):
                     line2 += 1
-                cursor.setPosition(block.position())
-                cursor.movePosition(QTextCursor.StartOfBlock)
+                cursor = QTextCursor(block)
                 regexp = QRegExp(r"\b%s\b" % QRegExp.escape(text),
                                  Qt.CaseSensitive)
                 color = self.error_color if error else self.warning_color
@@ -1391,13 +1452,10 @@ class CodeEditor(TextEditBaseWidget):
                     while cursor and cursor.blockNumber() <= line2 \
                           and cursor.blockNumber() >= line_number-1 \
                           and cursor.position() > 0:
-                        self.__highlight_selection('code_analysis', cursor,
-                                       underline_color=QColor(color))
+                        selections.append(self.__get_selection(
+                            cursor, underline_color=QColor(color)))
                         cursor = document.find(text, cursor, flags)
-        self.update_extra_selections()
-        self.setUpdatesEnabled(True)
-        self.linenumberarea.update()
-        self.classfuncdropdown.update()
+        return selections
 
     def show_code_analysis_results(self, line_number, code_analysis):
         """Show warning/error messages"""
@@ -2619,7 +2677,7 @@ class CodeEditor(TextEditBaseWidget):
     def run_pygments_highlighter(self):
         """Run pygments highlighter."""
         if isinstance(self.highlighter, sh.PygmentsSH):
-            self.highlighter.make_charlist()
+            self.highlighter.make_spans()
 
     def handle_parentheses(self, text):
         """Handle left and right parenthesis depending on editor config."""
@@ -2766,10 +2824,25 @@ class CodeEditor(TextEditBaseWidget):
     #------ Paint event
     def paintEvent(self, event):
         """Overrides paint event to update the list of visible blocks"""
+        if self.large_file:
+            self.highlight_shown_blocks()
         self.update_visible_blocks(event)
         TextEditBaseWidget.paintEvent(self, event)
         self.painted.emit(event)
 
+    def highlight_shown_blocks(self):
+        """Highlight the blocks shown, including partially shown ones"""
+        blocks = []
+        block = self.firstVisibleBlock()
+        top = self.blockBoundingGeometry(block).translated(
+            self.contentOffset()).top()
+        height = self.viewport().height()
+        while block.isValid() and top <= height:
+            blocks.append(block)
+            top += self.blockBoundingRect(block).height()
+            block = block.next()
+        self.highlighter.highlight_blocks(blocks)
+
     def update_visible_blocks(self, event):
         """Update the list of visible blocks/lines position"""
         self.__visible_blocks[:] = []
@@ -56,5 +56,16 @@ def test_activate_panels(setting, panelclass, state):
     assert found
 
 
+def test_clone_breakpoints():
+    """Test that breakpoints set in a clone editor are seen in the other
+    editors of the same document."""
+    editor = construct_editor()
+    editor.set_text('x = 1\ny = 2\nz = 3\n')
+    clone = construct_editor(cloned_from=editor, font=editor.font())
+    clone.add_remove_breakpoint(2)
+    assert editor.blockuserdata_list is clone.blockuserdata_list
+    assert editor.get_breakpoints() == [(2, None)]
+
+
 if __name__ == '__main__':
     pytest.main()
@@ -54,4 +54,27 @@ def test_editor_lower_to_upper(editorbot):
     widget.setTextCursor(cursor)
     widget.transform_to_uppercase()
     new_text = widget.get_text('sof', 'eof')
-    assert text != new_text
\ No newline at end of file
+    assert text != new_text
+
+
+def test_process_code_analysis(editorbot):
+    qtbot, widget = editorbot
+    widget.set_text('import os\nimport sys\n\nx = 1\n')
+    widget.process_code_analysis([("'os' imported but unused", 1),
+                                  ("'sys' imported but unused", 2)])
+    first_block = widget.document().firstBlock()
+    data = first_block.userData()
+    selections = data.code_analysis_selections
+    assert len(widget.get_extra_selections('code_analysis')) == 2
+
+    # Unchanged lines keep their markers, others are updated
+    widget.process_code_analysis([("'os' imported but unused", 1),
+                                  ("undefined name 'x'", 4)])
+    assert data.code_analysis_selections is selections
+    assert first_block.next().userData().code_analysis == []
+    assert widget.document().findBlockByNumber(3).userData().code_analysis \
+        == [("undefined name 'x'", False)]
+    assert len(widget.get_extra_selections('code_analysis')) == 2
+
+    widget.process_code_analysis([])
+    assert widget.get_extra_selections('code_analysis') == []
@@ -17,10 +17,15 @@ except ImportError:
 # Third party imports
 import pytest
 from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QApplication
 
 # Local imports
+from spyder.utils.codeanalysis import check_with_pyflakes, find_tasks
+from spyder.utils import encoding
 from spyder.utils.fixtures import setup_editor
-from spyder.widgets.editor import EditorStack
+from spyder.widgets import editor as editor_module
+from spyder.widgets.editor import (AnalysisJob, AnalysisPool, EditorStack,
+                                   ThreadManager)
 from spyder.widgets.findreplace import FindReplace
 
 # Qt Test Fixtures
@@ -210,5 +215,154 @@ def test_advance_cell(editor_cells_bot):
     assert editor.get_cursor_line_column() == (6, 0)
 
 
+def test_thread_manager(qtbot):
+    """Test that analysis jobs are cached and superseded by file."""
+    manager = ThreadManager(None, max_simultaneous_threads=1)
+    spam, eggs = object(), object()
+    results = []
+    code = b'import os\n# TODO: spam\n'
+
+    # The second pyflakes job for spam supersedes the first one, which is
+    # still waiting for a process
+    manager.add_thread(find_tasks, results.append, code.decode(), eggs)
+    manager.add_thread(check_with_pyflakes, results.append, b'import sys',
+                       spam)
+    manager.add_thread(check_with_pyflakes, results.append, code, spam)
+    assert len(manager.pending_jobs) == 1
+    qtbot.waitUntil(lambda: len(results) == 2)
+    assert results == [[(': spam', 2)], [("'os' imported but unused", 1)]]
+    assert set(manager.timings) == {'find_tasks', 'check_with_pyflakes'}
+
+    # Results for the same code come from the cache
+    manager.add_thread(check_with_pyflakes, results.append, code, eggs)
+    assert results[-1] == [("'os' imported but unused", 1)]
+    assert not manager.pending_jobs and not manager.started_jobs
+
+    # Jobs of closed files are cancelled
+    manager.add_thread(find_tasks, results.append, u'# XXX: eggs', eggs)
+    manager.close_threads(eggs)
+    qtbot.waitUntil(lambda: not manager.started_jobs)
+    assert len(results) == 3
+
+
+def test_analysis_pool(qtbot):
+    """Test that the jobs of a file run in the same process, and that the
+    jobs of a process are failed if it dies."""
+    pool = AnalysisPool(2)
+    spam, eggs = object(), object()
+    results = []
+    for parent in (spam, eggs, spam):
+        job = AnalysisJob(find_tasks, None, u'# TODO: spam', id(parent))
+        assert pool.run_job(job, results.append)
+    assert pool.assigned[id(spam)] is not pool.assigned[id(eggs)]
+    qtbot.waitUntil(lambda: len(results) == 3)
+    assert [result[0] for result in results] == [[(': spam', 1)]] * 3
+
+    # Checkers of other modules can't run in a process
+    job = AnalysisJob(len, None, u'', id(spam))
+    assert not pool.run_job(job, results.append)
+
+    process = pool.assigned[id(spam)]
+    job = AnalysisJob(find_tasks, None, u'# TODO: spam', id(spam))
+    process.process.kill()
+    assert pool.run_job(job, results.append)
+    qtbot.waitUntil(lambda: len(results) == 4)
+    assert results[-1] == (None, 0)
+    assert not process.callbacks
+
+    # The process is started again for the next job
+    assert pool.run_job(job, results.append)
+    qtbot.waitUntil(lambda: len(results) == 5)
+    assert results[-1][0] == [(': spam', 1)]
+    pool.close()
+    assert all(process.process is None for process in pool.processes)
+
+
+def test_load_large_file(base_editor_bot, tmpdir, monkeypatch):
+    """Test that large files are loaded in chunks and partly highlighted."""
+    editor_stack, qtbot = base_editor_bot
+    qtbot.addWidget(editor_stack)
+    text = ''.join('x = {0}  # line {0}\n'.format(i) for i in range(5000))
+    p = tmpdir.join('large.py')
+    p.write(text)
+    monkeypatch.setattr(editor_module, 'LARGE_FILE_SIZE', 1000)
+    read_chunks = encoding.read_chunks
+    monkeypatch.setattr(encoding, 'read_chunks',
+                        lambda filename: read_chunks(filename, 10000))
+    messages = []
+    editor_stack.starting_long_process.connect(messages.append)
+    finfo = editor_stack.load(str(p))
+    editor = finfo.editor
+    assert editor.large_file and not editor.isReadOnly()
+    assert editor.toPlainText() == text
+    assert not editor.document().isModified()
+    assert len(messages) > 2
+
+    # Only the blocks shown are highlighted
+    assert editor.document().firstBlock().userState() == -1
+    editor_stack.show()
+    qtbot.waitForWindowShown(editor_stack)
+    qtbot.waitUntil(lambda: editor.firstVisibleBlock().userState() != -1)
+    assert editor.document().lastBlock().userState() == -1
+    assert not editor.classfuncdropdown.isVisible()
+
+
+def test_load_large_file_guards(base_editor_bot, tmpdir, monkeypatch):
+    """
+    Test that user input is processed while a large file is loaded, but
+    that the file can't be modified, saved or loaded again meanwhile, and
+    that it can be closed.
+    """
+    editor_stack, qtbot = base_editor_bot
+    qtbot.addWidget(editor_stack)
+    text = ''.join('x = {0}  \n'.format(i) for i in range(5000))
+    p = tmpdir.join('large.py')
+    p.write(text)
+    monkeypatch.setattr(editor_module, 'LARGE_FILE_SIZE', 1000)
+    read_chunks = encoding.read_chunks
+    checks = {}
+
+    # User input events are not excluded from the event loop
+    process_events = QApplication.processEvents
+    flags = []
+
+    def process_events_checked(*args):
+        flags.extend(args)
+        process_events()
+
+    monkeypatch.setattr(QApplication, 'processEvents', process_events_checked)
+
+    def read_chunks_checked(filename, close=False):
+        for i, chunk in enumerate(read_chunks(filename, 10000)):
+            if i == 2:
+                index = editor_stack.has_filename(filename)
+                finfo = editor_stack.data[index]
+                checks['loading'] = finfo.loading
+                checks['read_only'] = finfo.editor.isReadOnly()
+                checks['save'] = editor_stack.save(index, force=True)
+                checks['load'] = editor_stack.load(filename)
+                editor_stack.remove_trailing_spaces(index)
+                checks['modified'] = finfo.editor.document().isModified()
+                if close:
+                    editor_stack.close_file(index)
+            yield chunk
+
+    monkeypatch.setattr(encoding, 'read_chunks', read_chunks_checked)
+    finfo = editor_stack.load(str(p))
+    assert checks == dict(loading=True, read_only=True, save=False,
+                          load=None, modified=False)
+    assert not flags
+    assert not finfo.loading and not finfo.editor.isReadOnly()
+    assert finfo.editor.toPlainText() == text
+    assert p.read() == text
+
+    # Closing the file while it's loaded stops loading it
+    editor_stack.close_file()
+    monkeypatch.setattr(encoding, 'read_chunks',
+                        lambda filename: read_chunks_checked(filename, True))
+    assert editor_stack.load(str(p)) is None
+    assert editor_stack.get_stack_count() == 0
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for editortools.py
+"""
+
+# Third party imports
+from qtpy.QtGui import QTextCursor
+import pytest
+
+# Local imports
+from spyder.widgets.editor import codeeditor
+from spyder.widgets.editortools import OutlineExplorerTreeWidget
+
+
+# --- Fixtures
+# -----------------------------------------------------------------------------
+@pytest.fixture
+def outline_bot(qtbot):
+    editor = codeeditor.CodeEditor(None)
+    editor.setup_editor(language='Python')
+    editor.set_text("class Spam(object):\n"
+                    "    def eggs(self):\n"
+                    "        pass\n"
+                    "\n"
+                    "def ham():\n"
+                    "    pass\n")
+    tree = OutlineExplorerTreeWidget(None)
+    tree.set_current_editor(editor, 'spam.py', update=False)
+    qtbot.addWidget(editor)
+    qtbot.addWidget(tree)
+    return editor, tree
+
+
+def get_items(tree):
+    root_item = tree.topLevelItem(0)
+    items = []
+    def add_children(item, depth):
+        for index in range(item.childCount()):
+            child = item.child(index)
+            items.append((depth, child.text(0), child.line))
+            add_children(child, depth + 1)
+    add_children(root_item, 0)
+    return items
+
+
+def insert_text(editor, line, text):
+    cursor = QTextCursor(editor.document().findBlockByNumber(line))
+    cursor.insertText(text)
+
+
+# --- Tests
+# -----------------------------------------------------------------------------
+def test_outline_explorer_updates(outline_bot):
+    """Test that outline explorer items are updated, not created again."""
+    editor, tree = outline_bot
+    assert get_items(tree) == [(0, 'Spam', 1), (1, 'eggs', 2), (0, 'ham', 5)]
+    root_item = tree.topLevelItem(0)
+    spam_item = root_item.child(0)
+    eggs_item = spam_item.child(0)
+
+    # Lines inserted before items only change their line numbers
+    insert_text(editor, 0, "import os\n\n")
+    tree.set_current_editor(editor, 'spam.py', update=True)
+    assert get_items(tree) == [(0, 'Spam', 3), (1, 'eggs', 4), (0, 'ham', 7)]
+    assert root_item.child(0) is spam_item
+    assert spam_item.child(0) is eggs_item
+
+    # Renamed classes keep their item and children
+    cursor = QTextCursor(editor.document().findBlockByNumber(2))
+    cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+    cursor.insertText("class Bacon(object):")
+    tree.set_current_editor(editor, 'spam.py', update=True)
+    assert get_items(tree) == [(0, 'Bacon', 3), (1, 'eggs', 4), (0, 'ham', 7)]
+    assert root_item.child(0) is spam_item
+    assert spam_item.child(0) is eggs_item
+
+    # Items are inserted and removed at their place
+    insert_text(editor, 6, "def sausage():\n    pass\n")
+    tree.set_current_editor(editor, 'spam.py', update=True)
+    assert get_items(tree) == [(0, 'Bacon', 3), (1, 'eggs', 4),
+                               (0, 'sausage', 7), (0, 'ham', 9)]
+    editor.set_text("def ham():\n    pass\n")
+    tree.set_current_editor(editor, 'spam.py', update=True)
+    assert get_items(tree) == [(0, 'ham', 1)]
+
+
+def test_outline_explorer_skips_unchanged(outline_bot, monkeypatch):
+    """Test that only editors whose symbols changed are updated."""
+    editor, tree = outline_bot
+    populated = []
+    populate_branch = tree.populate_branch
+    def _populate_branch(*args):
+        populated.append(args[0])
+        return populate_branch(*args)
+    monkeypatch.setattr(tree, 'populate_branch', _populate_branch)
+
+    insert_text(editor, 2, "        x = 1  # ")
+    tree.update_all()
+    assert not populated
+    insert_text(editor, 0, "\n")
+    tree.update_all()
+    assert populated == [editor]
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -16,6 +16,8 @@ from pytestqt import qtbot
 
 # Local imports
 import spyder.widgets.findinfiles
+from spyder.utils.filesearch import (TrigramIndex, register_trigram_index,
+                                     unregister_trigram_index)
 from spyder.widgets.findinfiles import FindInFilesWidget
 
 LOCATION = os.path.realpath(os.path.join(os.getcwd(),
@@ -99,5 +101,44 @@ def test_exclude_extension(qtbot):
     assert files_filtered
 
 
+def test_max_results(qtbot):
+    """Test that only max_results matches are shown until more are loaded."""
+    find_in_files = setup_findinfiles(qtbot, max_results=5)
+    find_in_files.set_search_text("spam")
+    find_in_files.find_options.set_directory(osp.join(LOCATION, "data"))
+    find_in_files.find()
+    blocker = qtbot.waitSignal(find_in_files.sig_finished)
+    blocker.wait()
+    assert len(find_in_files.result_browser.data) == 5
+    assert find_in_files.result_browser.has_hidden_results()
+
+    find_in_files.load_more_results()
+    assert len(find_in_files.result_browser.data) == 10
+    find_in_files.load_more_results()
+    matches = process_search_results(find_in_files.result_browser.data)
+    assert expected_results() == matches
+    assert not find_in_files.result_browser.has_hidden_results()
+
+
+def test_find_in_files_search_with_index(qtbot, tmpdir):
+    """Test that searches use the trigram index registered for a path."""
+    path = osp.join(LOCATION, "data")
+    index = TrigramIndex(path, str(tmpdir))
+    register_trigram_index(index)
+    try:
+        find_in_files = setup_findinfiles(qtbot)
+        find_in_files.set_search_text("spam")
+        find_in_files.find_options.set_directory(path)
+        find_in_files.find()
+        blocker = qtbot.waitSignal(find_in_files.sig_finished)
+        blocker.wait()
+        matches = process_search_results(find_in_files.result_browser.data)
+        assert expected_results() == matches
+        assert index.get_stats()['num_candidates'] == 3
+        assert not find_in_files.index_status.isHidden()
+    finally:
+        unregister_trigram_index(path)
+
+
 if __name__ == "__main__":
     pytest.main()
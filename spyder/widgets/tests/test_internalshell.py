@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for internalshell.py
+"""
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.widgets.internalshell import InternalShell
+
+
+# --- Fixtures
+# -----------------------------------------------------------------------------
+@pytest.fixture
+def internal_shell(qtbot):
+    shell = InternalShell(None, namespace={}, multithreaded=False,
+                          max_line_count=20)
+    qtbot.addWidget(shell)
+    yield shell
+    shell.interpreter.restore_stds()
+
+
+def get_output(shell, text):
+    shell.write('\x1b[0m', flush=True)
+    shell.clear()
+    shell.write(text, flush=True)
+    color = shell.currentCharFormat().foreground().color().name()
+    return shell.toPlainText(), color
+
+
+# --- Tests
+# -----------------------------------------------------------------------------
+def test_throughput_mode(internal_shell):
+    """Test that dropping hidden lines doesn't change the output shown."""
+    shell = internal_shell
+    text = '\x1b[1;31mstart\n' + ''.join('line %d\n' % i for i in range(100))
+    output = get_output(shell, text)
+    assert output[0].count('\n') == 19
+    assert output[1] != '#000000'
+
+    shell.set_throughput_mode(True)
+    assert shell.drop_hidden_lines(text).count('\n') == 20
+    assert shell.drop_hidden_lines('spam\neggs\n') == 'spam\neggs\n'
+    assert get_output(shell, text) == output
+    assert get_output(shell, 'spam\n' + text) == output
+
+
+def test_output_signals(internal_shell):
+    """Test that only the first write before reading output is signaled."""
+    stdout = internal_shell.interpreter.stdout_write
+    signals = []
+    stdout.data_avail.disconnect()
+    stdout.data_avail.connect(lambda: signals.append(stdout.data_pending))
+    for i in range(10):
+        stdout.write('%d\n' % i)
+    assert len(signals) == 1
+    assert stdout.empty_queue() == ''.join('%d\n' % i for i in range(10))
+    stdout.write('spam')
+    assert len(signals) == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
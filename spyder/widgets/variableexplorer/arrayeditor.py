@@ -38,6 +38,9 @@ from spyder.py3compat import (io, is_binary_string, is_string,
                               to_text_string)
 from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import add_actions, create_action, keybinding
+from spyder.widgets.variableexplorer.utils import (get_array_limits,
+                                                   is_memory_mapped,
+                                                   RemoteArray, WINDOW_PENDING)
 
 
 # Note: string and unicode data types will be formatted with '%s' (see below)
@@ -151,8 +154,18 @@ class ArrayModel(QAbstractTableModel):
         size = self.total_rows * self.total_cols
         
         try:
-            self.vmin = np.nanmin(self.color_func(data))
-            self.vmax = np.nanmax(self.color_func(data))
+            if isinstance(data, RemoteArray):
+                # Computed by the kernel to avoid transferring the array
+                self.vmin, self.vmax = data.get_limits()
+            elif is_memory_mapped(data):
+                # Estimated from a sample to avoid reading the whole file
+                limits = get_array_limits(data, sample=True)
+                if limits is None:
+                    raise ValueError("Color limits are not available")
+                self.vmin, self.vmax = limits
+            else:
+                self.vmin = np.nanmin(self.color_func(data))
+                self.vmax = np.nanmax(self.color_func(data))
             if self.vmax == self.vmin:
                 self.vmin -= 1
             self.hue0 = huerange[0]
@@ -179,6 +192,11 @@ class ArrayModel(QAbstractTableModel):
                 self.cols_loaded = self.COLS_TO_LOAD
             else:
                 self.cols_loaded = self.total_cols
+
+        # Large arrays living in the kernel are shown as their windows
+        # arrive
+        if isinstance(data, RemoteArray):
+            data.window_loaded = self.window_loaded
         
     def get_format(self):
         """Return current format"""
@@ -244,13 +262,27 @@ class ArrayModel(QAbstractTableModel):
     def get_value(self, index):
         i = index.row()
         j = index.column()
-        return self.changes.get((i, j), self._data[i, j])
+        if (i, j) in self.changes:
+            return self.changes[(i, j)]
+        elif isinstance(self._data, RemoteArray):
+            return self._data.get_item(i, j, block=False)
+        else:
+            return self._data[i, j]
+
+    def window_loaded(self, rows, cols):
+        """Update cells after a window of a remote array arrives"""
+        top_left = self.index(rows[0], cols[0])
+        bottom_right = self.index(min(rows[1], self.rowCount()) - 1,
+                                  min(cols[1], self.columnCount()) - 1)
+        self.dataChanged.emit(top_left, bottom_right)
 
     def data(self, index, role=Qt.DisplayRole):
         """Cell content"""
         if not index.isValid():
             return to_qvariant()
         value = self.get_value(index)
+        if value is WINDOW_PENDING:
+            return to_qvariant()
         if is_binary_string(value):
             try:
                 value = to_text_string(value, 'utf8')
@@ -353,7 +385,9 @@ class ArrayDelegate(QItemDelegate):
         """Create editor widget"""
         model = index.model()
         value = model.get_value(index)
-        if model._data.dtype.name == "bool":
+        if value is WINDOW_PENDING:
+            return
+        elif model._data.dtype.name == "bool":
             value = not value
             model.setData(index, to_qvariant(value))
             return
@@ -603,7 +637,8 @@ class ArrayEditor(QDialog):
         return False if data is not supported, True otherwise
         """
         self.data = data
-        self.data.flags.writeable = True
+        if not isinstance(data, RemoteArray):
+            self.data.flags.writeable = True
         is_record_array = data.dtype.names is not None
         is_masked_array = isinstance(data, np.ma.MaskedArray)
 
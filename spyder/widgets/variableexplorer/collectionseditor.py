@@ -18,9 +18,12 @@ Collections (i.e. dictionary, list and tuple) editor widget and dialog
 
 # Standard library imports
 from __future__ import print_function
+import bisect
 import datetime
 import gc
+import itertools
 import sys
+import weakref
 
 # Third party imports
 import ipykernel.pickleutil
@@ -49,7 +52,8 @@ from spyder.widgets.variableexplorer.texteditor import TextEditor
 from spyder.widgets.variableexplorer.utils import (
     array, DataFrame, DatetimeIndex, display_to_value, FakeObject,
     get_color_name, get_human_readable_type, get_size, Image, is_editable_type,
-    is_known_type, MaskedArray, ndarray, np_savetxt, Series, sort_against,
+    is_known_type, make_remote_value, MaskedArray, ndarray, np_savetxt,
+    RemoteArray, RemoteDataFrame, RemoteValue, Series, sort_against,
     try_to_eval, unsorted_unique, value_to_display, get_object_attrs,
     get_type_string)
 
@@ -67,7 +71,7 @@ if DataFrame is not FakeObject:
 # See this link for interesting ideas on how to solve this
 # in the future:
 # http://stackoverflow.com/q/30698004/438386
-ipykernel.pickleutil.can_map.pop('numpy.ndarray')
+ipykernel.pickleutil.can_map.pop('numpy.ndarray', None)
 
 
 LARGE_NROWS = 100
@@ -119,6 +123,8 @@ class ReadOnlyCollectionsModel(QAbstractTableModel):
             self.title = self.title + ' - '
         self.sizes = []
         self.types = []
+        self.sort_column = 0
+        self.sort_order = Qt.AscendingOrder
         self.set_data(data)
         
     def get_data(self):
@@ -170,6 +176,60 @@ class ReadOnlyCollectionsModel(QAbstractTableModel):
         self.set_size_and_type()
         self.reset()
 
+    def update_data(self, changed, removed):
+        """
+        Update rows of a remote model in place
+
+        *changed* maps the names of new and modified variables to their
+        views and *removed* has the names of deleted ones.
+        """
+        for key in removed:
+            if key not in self._data:
+                continue
+            self._data.pop(key)
+            row = self.keys.index(key)
+            self.keys.pop(row)
+            self.total_rows -= 1
+            if row < self.rows_loaded:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self.sizes.pop(row)
+                self.types.pop(row)
+                self.rows_loaded -= 1
+                self.endRemoveRows()
+
+        for key, view in list(changed.items()):
+            is_new = key not in self._data
+            self._data[key] = view
+            if is_new:
+                # Keep rows sorted by name, or sort them again below
+                if self.sort_column == 0:
+                    if self.sort_order == Qt.AscendingOrder:
+                        row = bisect.bisect(self.keys, key)
+                    else:
+                        row = len(self.keys) - bisect.bisect(self.keys[::-1],
+                                                             key)
+                else:
+                    row = len(self.keys)
+                all_loaded = self.rows_loaded == self.total_rows
+                self.keys.insert(row, key)
+                self.total_rows += 1
+                if row < self.rows_loaded or all_loaded:
+                    self.beginInsertRows(QModelIndex(), row, row)
+                    self.sizes.insert(row, view['size'])
+                    self.types.insert(row, view['type'])
+                    self.rows_loaded += 1
+                    self.endInsertRows()
+            else:
+                row = self.keys.index(key)
+                if row < self.rows_loaded:
+                    self.sizes[row] = view['size']
+                    self.types[row] = view['type']
+                    self.dataChanged.emit(self.index(row, 0),
+                                          self.index(row, 3))
+
+        if changed and self.sort_column != 0:
+            self.sort(self.sort_column, self.sort_order)
+
     def set_size_and_type(self, start=None, stop=None):
         data = self._data
         
@@ -200,6 +260,8 @@ class ReadOnlyCollectionsModel(QAbstractTableModel):
 
     def sort(self, column, order=Qt.AscendingOrder):
         """Overriding sort method"""
+        self.sort_column = column
+        self.sort_order = order
         reverse = (order==Qt.DescendingOrder)
         if column == 0:
             self.sizes = sort_against(self.sizes, self.keys, reverse)
@@ -398,6 +460,10 @@ class CollectionsDelegate(QItemDelegate):
     def get_value(self, index):
         if index.isValid():
             return index.model().get_value(index)
+
+    def get_editor_value(self, index):
+        """Return the value to be shown in an editor"""
+        return self.get_value(index)
     
     def set_value(self, index, value):
         if index.isValid():
@@ -437,7 +503,7 @@ class CollectionsDelegate(QItemDelegate):
             if answer == QMessageBox.No:
                 return None
         try:
-            value = self.get_value(index)
+            value = self.get_editor_value(index)
             if value is None:
                 return None
         except Exception as msg:
@@ -450,7 +516,9 @@ class CollectionsDelegate(QItemDelegate):
             return
         key = index.model().get_key(index)
         readonly = isinstance(value, tuple) or self.parent().readonly \
-                   or not is_known_type(value)
+                   or not (is_known_type(value) or
+                           isinstance(value, RemoteValue)) \
+                   or (isinstance(value, RemoteValue) and value.readonly)
         #---editor = CollectionsEditor
         if isinstance(value, (list, tuple, dict)):
             editor = CollectionsEditor()
@@ -460,7 +528,7 @@ class CollectionsDelegate(QItemDelegate):
                                             key=key, readonly=readonly))
             return None
         #---editor = ArrayEditor
-        elif isinstance(value, (ndarray, MaskedArray)) \
+        elif isinstance(value, (ndarray, MaskedArray, RemoteArray)) \
           and ndarray is not FakeObject:
             editor = ArrayEditor(parent)
             if not editor.setup_and_check(value, title=key, readonly=readonly):
@@ -481,7 +549,8 @@ class CollectionsDelegate(QItemDelegate):
                                             conv=conv_func))
             return None
         #--editor = DataFrameEditor
-        elif isinstance(value, (DataFrame, DatetimeIndex, Series)) \
+        elif isinstance(value, (DataFrame, DatetimeIndex, Series,
+                                RemoteDataFrame)) \
           and DataFrame is not FakeObject:
             editor = DataFrameEditor()
             if not editor.setup_and_check(value, title=key):
@@ -1366,6 +1435,12 @@ class RemoteCollectionsDelegate(CollectionsDelegate):
         if index.isValid():
             name = index.model().keys[index.row()]
             return self.parent().get_value(name)
+
+    def get_editor_value(self, index):
+        """Return the value to be shown in an editor"""
+        if index.isValid():
+            name = index.model().keys[index.row()]
+            return self.parent().get_editor_value(name)
     
     def set_value(self, index, value):
         if index.isValid():
@@ -1381,6 +1456,8 @@ class RemoteCollectionsEditorTableView(BaseTableView):
 
         self.shellwidget = shellwidget
         self.var_properties = {}
+        self.remote_values = weakref.WeakValueDictionary()
+        self.request_ids = itertools.count()
 
         self.dictfilter = None
         self.model = None
@@ -1407,10 +1484,52 @@ class RemoteCollectionsEditorTableView(BaseTableView):
         self.shellwidget._kernel_value = None
         return value
 
+    def get_editor_value(self, name):
+        """
+        Get the value of a variable to be shown in an editor
+
+        Large arrays and DataFrames are not transferred. A proxy is
+        returned instead, which asks the kernel for the windows of the
+        variable that are shown.
+        """
+        if not self.is_windowed(name):
+            return self.get_value(name)
+        sw = self.shellwidget
+        info = sw.get_value_info(name)
+        if info is None:
+            return None
+        request_id = next(self.request_ids)
+        fetch = lambda rows, cols: sw.get_value_window(name, rows, cols)
+        request = lambda rows, cols: sw.request_value_window(name, rows, cols,
+                                                             request_id)
+        remote_value = make_remote_value(info, fetch, request=request)
+        self.remote_values[request_id] = remote_value
+        return remote_value
+
+    def update_data(self, view, properties, removed):
+        """Update the variables that changed in the kernel"""
+        for name in removed:
+            self.var_properties.pop(name, None)
+        self.var_properties.update(properties)
+        self.model.update_data(view, removed)
+
+    def add_value_window(self, window):
+        """Add a window asked by a proxy to a large variable"""
+        remote_value = self.remote_values.get(window['request_id'])
+        if remote_value is not None:
+            remote_value.add_window(window)
+
     def new_value(self, name, value):
         """Create new value in data"""
-        value = serialize_object(value)
-        self.shellwidget.set_value(name, value)
+        if isinstance(value, RemoteValue):
+            # Only send the items edited in large variables
+            if not value.changes:
+                return
+            items = serialize_object(value.changes)
+            self.shellwidget.set_value_items(name, items)
+        else:
+            value = serialize_object(value)
+            self.shellwidget.set_value(name, value)
         self.shellwidget.refresh_namespacebrowser()
 
     def remove_values(self, names):
@@ -1460,6 +1579,10 @@ class RemoteCollectionsEditorTableView(BaseTableView):
         """Return array's ndim"""
         return self.var_properties[name]['array_ndim']
 
+    def is_windowed(self, name):
+        """Return True if variable is transferred by windows"""
+        return self.var_properties.get(name, {}).get('is_windowed', False)
+
     def plot(self, name, funcname):
         """Plot item"""
         sw = self.shellwidget
@@ -13,15 +13,19 @@
 Pandas DataFrame Editor Dialog
 """
 
+# Standard library imports
+from collections import OrderedDict
+
 # Third party imports
 from qtpy import API
 from qtpy.compat import from_qvariant, to_qvariant
-from qtpy.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal, Slot
+from qtpy.QtCore import (QAbstractTableModel, QModelIndex, Qt, QThread,
+                         Signal, Slot)
 from qtpy.QtGui import QColor, QCursor
 from qtpy.QtWidgets import (QApplication, QCheckBox, QDialogButtonBox, QDialog,
                             QGridLayout, QHBoxLayout, QInputDialog, QLineEdit,
-                            QMenu, QMessageBox, QPushButton, QTableView,
-                            QHeaderView)
+                            QMenu, QMessageBox, QProgressBar, QPushButton,
+                            QTableView, QHeaderView)
 
 from pandas import DataFrame, DatetimeIndex, Series
 import numpy as np
@@ -37,6 +41,8 @@ from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import (add_actions, create_action,
                                     keybinding, qapplication)
 from spyder.widgets.variableexplorer.arrayeditor import get_idx_rect
+from spyder.widgets.variableexplorer.utils import (RemoteDataFrame,
+                                                   WINDOW_PENDING)
 
 # Supported Numbers and complex numbers
 REAL_NUMBER_TYPES = (float, int, np.int64, np.int32)
@@ -52,6 +58,9 @@ LARGE_SIZE = 5e5
 LARGE_NROWS = 1e5
 LARGE_COLS = 60
 
+# Number of sort permutations kept, to sort again by the same columns
+SORT_CACHE_SIZE = 4
+
 # Background colours
 BACKGROUND_NUMBER_MINHUE = 0.66 # hue for largest number
 BACKGROUND_NUMBER_HUERANGE = 0.33 # (hue for smallest) minus (hue for largest)
@@ -81,9 +90,89 @@ def global_max(col_vals, index):
     return max(max_col), min(min_col)
 
 
+def get_column_stats(col):
+    """
+    Return [vmax, vmin] for the background colors of a column, or None
+    if it's not numerical (see DataFrameModel.max_min_col_update)
+    """
+    if col.dtype in REAL_NUMBER_TYPES + COMPLEX_NUMBER_TYPES:
+        if col.dtype in REAL_NUMBER_TYPES:
+            vmax = col.max(skipna=True)
+            vmin = col.min(skipna=True)
+        else:
+            vmax = col.abs().max(skipna=True)
+            vmin = col.abs().min(skipna=True)
+        if vmax != vmin:
+            return [vmax, vmin]
+        else:
+            return [vmax, vmin - 1]
+    else:
+        return None
+
+
+def argsort_numbers(values, ascending=True, base=None):
+    """
+    Return the permutation that sorts an array of numbers in a stable
+    way, putting NaNs last as Pandas does. If *base* is given, it's the
+    permutation of the values that is sorted.
+    """
+    if base is None:
+        base = np.arange(len(values))
+    else:
+        values = values[base]
+    if values.dtype.kind == 'f':
+        nans = np.isnan(values)
+        if nans.any():
+            values = values[~nans]
+            base, nan_rows = base[~nans], base[nans]
+        else:
+            nan_rows = None
+    else:
+        nan_rows = None
+
+    if ascending:
+        order = base[np.argsort(values, kind='mergesort')]
+    else:
+        # Sort the reversed values and reverse the result, so that equal
+        # values keep their order
+        order = np.argsort(values[::-1], kind='mergesort')[::-1]
+        order = base[len(values) - 1 - order]
+    if nan_rows is not None:
+        order = np.concatenate([order, nan_rows])
+    return order
+
+
+class ColumnStatsThread(QThread):
+    """Compute the statistics of the columns of a large DataFrame"""
+    sig_column_stats = Signal(int, object)
+
+    def __init__(self, df):
+        QThread.__init__(self)
+        self.df = df
+        self.canceled = False
+
+    def run(self):
+        for column in range(self.df.shape[1]):
+            if self.canceled:
+                break
+            try:
+                stats = get_column_stats(self.df.iloc[:, column])
+            except Exception:
+                stats = None
+            self.sig_column_stats.emit(column, stats)
+
+    def stop(self):
+        """Stop after the column being computed"""
+        self.canceled = True
+
+
 class DataFrameModel(QAbstractTableModel):
     """ DataFrame Table Model"""
-    
+
+    # Emitted with the number of columns whose statistics are computed
+    # and the total number of columns
+    sig_stats_progress = Signal(int, int)
+
     ROWS_TO_LOAD = 500
     COLS_TO_LOAD = 40
     
@@ -91,25 +180,38 @@ class DataFrameModel(QAbstractTableModel):
         QAbstractTableModel.__init__(self)
         self.dialog = parent
         self.df = dataFrame
-        self.df_index = dataFrame.index.tolist()
-        self.df_header = dataFrame.columns.tolist()
+        # Index and column labels are read by position when shown
+        self.df_index = dataFrame.index
+        self.df_header = dataFrame.columns
         self._format = format
         self.complex_intran = None
+
+        # Rows are shown in the order of this permutation of the rows
+        # of the DataFrame, if it's not None (see sort)
+        self._order = None
+        self._sort_column = None
+        self._sort_base = None
+        self._sort_cache = OrderedDict()
         
         self.total_rows = self.df.shape[0]
         self.total_cols = self.df.shape[1]
         size = self.total_rows * self.total_cols
 
         self.max_min_col = None
-        if size < LARGE_SIZE:
-            self.max_min_col_update()
-            self.colum_avg_enabled = True
-            self.bgcolor_enabled = True
-            self.colum_avg(1)
-        else:
+        self.stats_loaded = 0
+        self.stats_thread = None
+        if isinstance(dataFrame, RemoteDataFrame):
             self.colum_avg_enabled = False
             self.bgcolor_enabled = False
             self.colum_avg(0)
+        else:
+            if size < LARGE_SIZE:
+                self.max_min_col_update()
+            else:
+                self.start_stats()
+            self.colum_avg_enabled = True
+            self.bgcolor_enabled = True
+            self.colum_avg(1)
 
         # Use paging when the total size, number of rows or number of
         # columns is too large
@@ -126,6 +228,11 @@ class DataFrameModel(QAbstractTableModel):
             else:
                 self.cols_loaded = self.total_cols
 
+        # Large DataFrames living in the kernel are shown as their windows
+        # arrive
+        if isinstance(dataFrame, RemoteDataFrame):
+            dataFrame.window_loaded = self.window_loaded
+
     def max_min_col_update(self):
         """
         Determines the maximum and minimum number in each column.
@@ -143,20 +250,44 @@ class DataFrameModel(QAbstractTableModel):
             return
         self.max_min_col = []
         for dummy, col in self.df.iteritems():
-            if col.dtype in REAL_NUMBER_TYPES + COMPLEX_NUMBER_TYPES:
-                if col.dtype in REAL_NUMBER_TYPES:
-                    vmax = col.max(skipna=True)
-                    vmin = col.min(skipna=True)
-                else:
-                    vmax = col.abs().max(skipna=True)
-                    vmin = col.abs().min(skipna=True)
-                if vmax != vmin:
-                    max_min = [vmax, vmin]
-                else:
-                    max_min = [vmax, vmin - 1]
-            else:
-                max_min = None
-            self.max_min_col.append(max_min)
+            self.max_min_col.append(get_column_stats(col))
+        self.stats_loaded = self.total_cols
+
+    def start_stats(self):
+        """
+        Compute the maximum and minimum of each column in a thread, for
+        DataFrames too large to do it right away.
+
+        Columns are colored as their statistics arrive.
+        """
+        if self.df.shape[0] == 0:
+            return
+        self.max_min_col = [None] * self.total_cols
+        self.stats_loaded = 0
+        self.stats_thread = ColumnStatsThread(self.df)
+        self.stats_thread.sig_column_stats.connect(self.set_column_stats)
+        self.stats_thread.start()
+
+    def stop_stats(self):
+        """Stop computing the statistics of columns"""
+        if self.stats_thread is not None:
+            self.stats_thread.stop()
+            self.stats_thread.wait()
+            self.stats_thread = None
+
+    def set_column_stats(self, column, stats):
+        """Set the statistics of a column computed in a thread"""
+        self.max_min_col[column] = stats
+        self.stats_loaded = column + 1
+        self.sig_stats_progress.emit(self.stats_loaded, self.total_cols)
+        if self.stats_loaded == self.total_cols:
+            self.stats_thread = None
+            # Colors depend on all columns if the global max is used
+            self.reset()
+        elif column < self.cols_loaded:
+            self.dataChanged.emit(self.index(0, column + 1),
+                                  self.index(self.rowCount() - 1,
+                                             column + 1))
 
     def get_format(self):
         """Return current format"""
@@ -230,6 +361,11 @@ class DataFrameModel(QAbstractTableModel):
             return color
         if not self.bgcolor_enabled:
             return
+        if (column > self.stats_loaded or
+                (not self.colum_avg_enabled and
+                 self.stats_loaded < self.total_cols)):
+            # Statistics still being computed
+            return
         value = self.get_value(index.row(), column-1)
         if self.max_min_col[column - 1] is None:
             color = QColor(BACKGROUND_NONNUMBER_COLOR)
@@ -252,8 +388,23 @@ class DataFrameModel(QAbstractTableModel):
                                     BACKGROUND_NUMBER_VALUE, BACKGROUND_NUMBER_ALPHA)
         return color
 
+    def get_row(self, row):
+        """Return the position in the DataFrame of a row shown"""
+        if self._order is None:
+            return row
+        return self._order[row]
+
+    def get_rows(self, start, stop):
+        """Return the DataFrame with the rows shown from start to stop"""
+        if self._order is None:
+            return self.df.iloc[start:stop, :]
+        return self.df.iloc[self._order[start:stop], :]
+
     def get_value(self, row, column):
         """Returns the value of the DataFrame"""
+        if isinstance(self.df, RemoteDataFrame):
+            return self.df.get_item(row, column, block=False)
+        row = self.get_row(row)
         # To increase the performance iat is used but that requires error
         # handling, so fallback uses iloc
         try:
@@ -262,9 +413,12 @@ class DataFrameModel(QAbstractTableModel):
             value = self.df.iloc[row, column]
         return value
 
-    def update_df_index(self):
-        """"Update the DataFrame index"""
-        self.df_index = self.df.index.tolist()
+    def window_loaded(self, rows, cols):
+        """Update cells after a window of a remote DataFrame arrives"""
+        top_left = self.index(rows[0], 0)
+        bottom_right = self.index(min(rows[1], self.rowCount()) - 1,
+                                  min(cols[1], self.columnCount() - 1))
+        self.dataChanged.emit(top_left, bottom_right)
 
     def data(self, index, role=Qt.DisplayRole):
         """Cell content"""
@@ -274,10 +428,15 @@ class DataFrameModel(QAbstractTableModel):
             column = index.column()
             row = index.row()
             if column == 0:
-                return to_qvariant(to_text_string(self.df_index[row]))
+                label = self.df_index[self.get_row(row)]
+                if label is WINDOW_PENDING:
+                    return to_qvariant()
+                return to_qvariant(to_text_string(label))
             else:
                 value = self.get_value(row, column-1)
-                if isinstance(value, float):
+                if value is WINDOW_PENDING:
+                    return to_qvariant()
+                elif isinstance(value, float):
                     try:
                         return to_qvariant(self._format % value)
                     except (ValueError, TypeError):
@@ -297,36 +456,77 @@ class DataFrameModel(QAbstractTableModel):
 
     def sort(self, column, order=Qt.AscendingOrder):
         """Overriding sort method"""
+        if isinstance(self.df, RemoteDataFrame):
+            QMessageBox.critical(self.dialog, "Error",
+                                 _("Sorting is not supported for DataFrames "
+                                   "that are too large to be transferred "
+                                   "from the console"))
+            return False
         if self.complex_intran is not None:
             if self.complex_intran.any(axis=0).iloc[column-1]:
                 QMessageBox.critical(self.dialog, "Error",
                                      "TypeError error: no ordering "
                                      "relation is defined for complex numbers")
                 return False
-        try:
-            ascending = order == Qt.AscendingOrder
-            if column > 0:
-                try:
-                    self.df.sort_values(by=self.df.columns[column-1],
-                                        ascending=ascending, inplace=True,
-                                        kind='mergesort')
-                except AttributeError:
-                    # for pandas version < 0.17
-                    self.df.sort(columns=self.df.columns[column-1],
-                                 ascending=ascending, inplace=True,
-                                 kind='mergesort')
-                self.update_df_index()
-            else:
-                self.df.sort_index(inplace=True, ascending=ascending)
-                self.update_df_index()
-        except TypeError as e:
-            QMessageBox.critical(self.dialog, "Error",
-                                 "TypeError error: %s" % str(e))
-            return False
-
+        ascending = order == Qt.AscendingOrder
+        if column == self._sort_column:
+            # Sorting again by the same column gives the same result as
+            # sorting the rows it sorted
+            base = self._sort_base
+        else:
+            base = self._order
+        cached = self._sort_cache.get((column, ascending))
+        if cached is not None and cached[0] is base:
+            new_order = cached[1]
+        else:
+            try:
+                new_order = self.argsort(column, ascending, base)
+            except TypeError as e:
+                QMessageBox.critical(self.dialog, "Error",
+                                     "TypeError error: %s" % str(e))
+                return False
+            self._sort_cache.pop((column, ascending), None)
+            self._sort_cache[(column, ascending)] = (base, new_order)
+            if len(self._sort_cache) > SORT_CACHE_SIZE:
+                self._sort_cache.popitem(last=False)
+
+        self._order = new_order
+        self._sort_column = column
+        self._sort_base = base
         self.reset()
         return True
 
+    def argsort(self, column, ascending=True, base=None):
+        """
+        Return the permutation of rows that sorts a column (0 being the
+        index), as a stable sort of the rows in the order given by the
+        permutation *base*.
+
+        The DataFrame itself is not sorted.
+        """
+        if column == 0:
+            values = self.df.index.values
+        else:
+            values = self.df.iloc[:, column-1].values
+        if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+            return argsort_numbers(values, ascending, base)
+
+        values = Series(values)
+        if base is not None:
+            # The index of values keeps the original positions
+            values = values.take(base)
+        # DataFrames are sorted in a stable way also in descending order,
+        # contrary to Series
+        frame = values.to_frame(name='values')
+        try:
+            frame = frame.sort_values(by='values', ascending=ascending,
+                                      kind='mergesort')
+        except AttributeError:
+            # for pandas version < 0.17
+            frame = frame.sort(columns='values', ascending=ascending,
+                               kind='mergesort')
+        return frame.index.values
+
     def flags(self, index):
         """Set flags"""
         if index.column() == 0:
@@ -339,6 +539,9 @@ class DataFrameModel(QAbstractTableModel):
         column = index.column()
         row = index.row()
 
+        if not isinstance(self.df, RemoteDataFrame):
+            row = self.get_row(row)
+
         if change_type is not None:
             try:
                 value = self.data(index, role=Qt.DisplayRole)
@@ -350,7 +553,7 @@ class DataFrameModel(QAbstractTableModel):
                 self.df.iloc[row, column - 1] = change_type('0')
         else:
             val = from_qvariant(value, str)
-            current_value = self.get_value(row, column-1)
+            current_value = self.get_value(index.row(), column-1)
             if isinstance(current_value, bool):
                 val = bool_false_check(val)
             supported_types = (bool,) + REAL_NUMBER_TYPES + COMPLEX_NUMBER_TYPES
@@ -367,11 +570,19 @@ class DataFrameModel(QAbstractTableModel):
                                      "The type of the cell is not a supported "
                                      "type")
                 return False
-        self.max_min_col_update()
+        if self.max_min_col is not None and column <= self.stats_loaded:
+            self.max_min_col[column - 1] = get_column_stats(
+                self.df.iloc[:, column - 1])
         return True
 
     def get_data(self):
-        """Return data"""
+        """Return data, with its rows in the order shown"""
+        if self._order is not None:
+            self.df = self.df.iloc[self._order]
+            self._order = None
+            self._sort_column = self._sort_base = None
+            self._sort_cache.clear()
+            self.df_index = self.df.index
         return self.df
 
     def rowCount(self, index=QModelIndex()):
@@ -614,14 +825,13 @@ class DataFrameView(QTableView):
         if col_min == 0:
             col_min = 1
             index = True
-        df = self.model().df
+        df = self.model().get_rows(row_min, row_max+1)
         if col_max == 0:  # To copy indices
-            contents = '\n'.join(map(str, df.index.tolist()[slice(row_min,
-                                                            row_max+1)]))
+            contents = '\n'.join(map(str, df.index.tolist()))
         else:  # To copy DataFrame
             if (col_min == 0 or col_min == 1) and (df.shape[1] == col_max):
                 header = True
-            obj = df.iloc[slice(row_min, row_max+1), slice(col_min-1, col_max)]
+            obj = df.iloc[:, slice(col_min-1, col_max)]
             output = io.StringIO()
             obj.to_csv(output, sep='\t', index=index, header=header)
             if not PY2:
@@ -663,10 +873,14 @@ class DataFrameEditor(QDialog):
         self.layout = QGridLayout()
         self.setLayout(self.layout)
         self.setWindowIcon(ima.icon('arredit'))
+        if isinstance(data, RemoteDataFrame):
+            type_name = data.type_name
+        else:
+            type_name = data.__class__.__name__
         if title:
-            title = to_text_string(title) + " - %s" % data.__class__.__name__
+            title = to_text_string(title) + " - %s" % type_name
         else:
-            title = _("%s editor") % data.__class__.__name__
+            title = _("%s editor") % type_name
         if isinstance(data, Series):
             self.is_series = True
             data = data.to_frame()
@@ -707,6 +921,15 @@ class DataFrameEditor(QDialog):
         self.bgcolor_global.stateChanged.connect(self.dataModel.colum_avg)
         btn_layout.addWidget(self.bgcolor_global)
 
+        # Progress of the statistics used for the background colors
+        self.stats_progress = QProgressBar(self)
+        self.stats_progress.setFormat(_("Colors %p%"))
+        self.stats_progress.setVisible(
+            self.dataModel.stats_thread is not None)
+        self.stats_progress.setRange(0, self.dataModel.total_cols)
+        self.dataModel.sig_stats_progress.connect(self.update_stats_progress)
+        btn_layout.addWidget(self.stats_progress)
+
         btn_layout.addStretch()
         bbox = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         bbox.accepted.connect(self.accept)
@@ -717,6 +940,16 @@ class DataFrameEditor(QDialog):
 
         return True
 
+    def done(self, result):
+        """Reimplemented to stop computing statistics of columns"""
+        self.dataModel.stop_stats()
+        QDialog.done(self, result)
+
+    def update_stats_progress(self, loaded, total):
+        """Show how many columns have their statistics computed"""
+        self.stats_progress.setValue(loaded)
+        self.stats_progress.setVisible(loaded < total)
+
     def change_bgcolor_enable(self, state):
         """
         This is implementet so column min/max is only active when bgcolor is
@@ -231,11 +231,27 @@ class NamespaceBrowser(QWidget):
         if remote_view is not None:
             self.set_data(remote_view)
 
+    def process_remote_update(self, update):
+        """Process the variables that changed in the remote namespace"""
+        if update is None:
+            return
+        if update['full']:
+            self.set_var_properties(update['properties'])
+            self.set_data(update['view'])
+        elif update['view'] or update['removed']:
+            self.editor.update_data(update['view'], update['properties'],
+                                    update['removed'])
+            self.editor.adjust_columns()
+
     def set_var_properties(self, properties):
         """Set properties of variables"""
         if properties is not None:
             self.editor.var_properties = properties
 
+    def add_value_window(self, window):
+        """Add a window of a large value shown in an editor"""
+        self.editor.add_value_window(window)
+
     def set_data(self, data):
         """Set data."""
         if data != self.editor.model.get_data():
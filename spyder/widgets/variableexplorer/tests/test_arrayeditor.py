@@ -18,6 +18,10 @@ from qtpy.QtCore import Qt
 
 # Local imports
 from spyder.widgets.variableexplorer.arrayeditor import ArrayEditor
+from spyder.widgets.variableexplorer.utils import (get_window,
+                                                   get_window_info,
+                                                   RemoteArray,
+                                                   set_window_items)
 
 
 def launch_arrayeditor(data, title="", xlabels=None, ylabels=None):
@@ -120,6 +124,54 @@ def test_arrayeditor_with_3d_array(qtbot):
     assert_array_equal(arr, launch_arrayeditor(arr, "3D array"))
 
 
+def test_arrayeditor_with_remote_array(qtbot):
+    """Test editing a large array that is transferred by windows."""
+    arr = np.arange(1000 * 600, dtype=float).reshape(1000, 600)
+    requests = []
+
+    def fetch(rows, cols):
+        meta, buffer = get_window(arr, rows, cols)
+        meta['buffer'] = buffer
+        return meta
+
+    remote = RemoteArray(get_window_info(arr), fetch,
+                         request=lambda *args: requests.append(args))
+    dlg = setup_arrayeditor(qtbot, remote, "remote array")
+    model = dlg.arraywidget.model
+    assert (model.vmin, model.vmax) == (0, arr.size - 1)
+
+    # Cells are empty until their window arrives
+    index = model.index(1, 2)
+    assert model.data(index) is None
+    assert requests == [((0, 500), (0, 40))]
+    with qtbot.waitSignal(model.dataChanged):
+        remote.add_window(fetch(*requests[0]))
+    assert model.data(index) == '602.000'
+
+    # Only edited cells are sent back
+    assert model.setData(index, '-1')
+    dlg.accept()
+    value = dlg.get_value()
+    assert value is remote
+    assert value.changes == {(1, 2): -1}
+    set_window_items(arr, value.changes)
+    assert arr[1, 2] == -1
+
+
+def test_arrayeditor_with_memory_mapped_array(qtbot, tmpdir, monkeypatch):
+    """Test that color limits of memory maps are computed from a sample."""
+    path = str(tmpdir.join('spam.npy'))
+    np.save(path, np.arange(10**5, dtype=float).reshape(-1, 10))
+    arr = np.load(path, mmap_mode='c')
+    arr[5000, 0] = -1
+    monkeypatch.setattr('spyder.widgets.variableexplorer.utils'
+                        '.LIMITS_SAMPLE_SIZE', 1000)
+    dlg = setup_arrayeditor(qtbot, arr, "memory map")
+    model = dlg.arraywidget.model
+    # The row changed is not in the sample
+    assert (model.vmin, model.vmax) == (0, 10**5 - 1)
+
+
 if __name__ == "__main__":
     pytest.main()
 
@@ -28,6 +28,8 @@ from spyder.utils.programs import is_module_installed
 from spyder.widgets.variableexplorer import dataframeeditor
 from spyder.widgets.variableexplorer.dataframeeditor import (
     DataFrameEditor, DataFrameModel)
+from spyder.widgets.variableexplorer.utils import (get_window, get_window_info,
+                                                   RemoteDataFrame)
 from spyder.py3compat import PY2
 
 FILES_PATH = os.path.dirname(os.path.realpath(__file__))
@@ -83,6 +85,47 @@ def test_dataframemodel_sort_is_stable():   # cf. issue 3010
     assert col2 == [str(x) for x in [1, 3, 4, 6, 11, 12, 15, 17,
                                      2, 5, 7, 8, 9, 10, 13, 14, 16]]
 
+def test_dataframemodel_sort_uses_permutation():
+    df = DataFrame({'colA': [2, 1, 2], 'colB': ['c', 'a', 'b']},
+                   index=['x', 'y', 'z'])
+    dfm = DataFrameModel(df)
+    assert dfm.df_index is df.index
+    assert dfm.sort(1)
+    assert [data(dfm, i, 0) for i in range(3)] == ['y', 'x', 'z']
+    order = dfm._order
+    assert dfm.sort(1, order=Qt.DescendingOrder)
+    assert [data(dfm, i, 0) for i in range(3)] == ['x', 'z', 'y']
+
+    # The DataFrame is not sorted and permutations are reused
+    assert df.index.tolist() == ['x', 'y', 'z']
+    assert dfm.sort(1)
+    assert dfm._order is order
+
+    # Editing and getting the data use the order shown
+    assert dfm.setData(dfm.createIndex(0, 1), '5')
+    assert df.loc['y', 'colA'] == 5
+    assert dfm.get_data().index.tolist() == ['y', 'x', 'z']
+    assert data(dfm, 0, 0) == 'y'
+
+def test_dataframemodel_sort_index_with_nan():
+    df = DataFrame({'colA': [1, 2, 3]}, index=[2.0, numpy.nan, 1.0])
+    dfm = DataFrameModel(df)
+    assert dfm.sort(0, order=Qt.DescendingOrder)
+    assert [data(dfm, i, 0) for i in range(3)] == ['2.0', '1.0', 'nan']
+
+def test_dataframemodel_stats_in_thread(qtbot):
+    df = DataFrame(numpy.random.rand(100000, 6))
+    df[2] = 'spam'
+    dfm = DataFrameModel(df)
+    assert dfm.stats_thread is not None
+    with qtbot.waitSignal(dfm.modelReset, timeout=10000):
+        pass
+    assert dfm.stats_loaded == 6
+    assert dfm.stats_thread is None
+    assert dfm.max_min_col[2] is None
+    assert dfm.max_min_col[0] == [df[0].max(), df[0].min()]
+    assert bgcolor(dfm, 0, 1) is not None
+
 def test_dataframemodel_max_min_col_update():
     df = DataFrame([[1, 2.0], [2, 2.5], [3, 9.0]])
     dfm = DataFrameModel(df)
@@ -228,5 +271,34 @@ def test_dataframeeditor_with_datetimeindex():
     assert data(dfm, 2, 1) == '2015-01-03 00:00:00'
 
 
+def test_dataframeeditor_with_remote_dataframe(monkeypatch):
+    """Test showing a large DataFrame that is transferred by windows."""
+    df = DataFrame(numpy.arange(10**6).reshape(-1, 2), columns=['a', 'b'])
+
+    def fetch(rows, cols):
+        meta, _buffer = get_window(df, rows, cols)
+        return meta
+
+    remote = RemoteDataFrame(get_window_info(df), fetch)
+    editor = DataFrameEditor(None)
+    assert editor.setup_and_check(remote, 'df')
+    assert editor.windowTitle() == 'df - DataFrame'
+    dfm = editor.dataModel
+    assert dfm.rowCount() == 500
+    assert dfm.columnCount() == 3
+    assert dfm.headerData(2, orientation=Qt.Horizontal) == 'b'
+    assert data(dfm, 7, 0) == '7'
+    assert data(dfm, 7, 2) == '15'
+
+    # Sorting would need the whole DataFrame
+    monkeypatch.setattr('spyder.widgets.variableexplorer.dataframeeditor'
+                        '.QMessageBox.critical', Mock())
+    assert not dfm.sort(1)
+
+    assert dfm.setData(dfm.createIndex(7, 2), '-1')
+    assert data(dfm, 7, 2) == '-1'
+    assert editor.get_value().changes == {(7, 1): -1}
+
+
 if __name__ == "__main__":
     pytest.main()
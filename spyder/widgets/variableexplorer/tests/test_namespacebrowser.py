@@ -15,6 +15,7 @@ except ImportError:
 
 # Third party imports
 import pytest
+from qtpy.QtCore import Qt
 
 # Local imports
 from spyder.widgets.variableexplorer.namespacebrowser import NamespaceBrowser
@@ -28,5 +29,44 @@ def test_setup_sets_dataframe_format(qtbot):
     assert browser.editor.model.dataframe_format == '%10.5f'
 
 
+def test_process_remote_update(qtbot):
+    """Test that namespace updates patch the rows that changed."""
+    browser = NamespaceBrowser(None)
+    browser.set_shellwidget(Mock())
+    browser.setup(exclude_private=True, exclude_uppercase=True,
+                  exclude_capitalized=True, exclude_unsupported=True,
+                  minmax=False)
+    view = lambda value: {'type': 'int', 'size': 1, 'color': '#0000ff',
+                          'view': repr(value)}
+    props = lambda value: {'len': None}
+    browser.process_remote_update({
+        'version': 1, 'full': True, 'removed': [],
+        'view': {'b': view(2), 'd': view(4)},
+        'properties': {'b': props(2), 'd': props(4)}})
+    model = browser.editor.model
+    assert model.keys == ['b', 'd']
+
+    # Changed, new and removed variables are patched in place
+    rows_removed = []
+    model.rowsAboutToBeRemoved.connect(
+        lambda parent, first, last: rows_removed.append(first))
+    browser.process_remote_update({
+        'version': 2, 'full': False, 'removed': ['d'],
+        'view': {'a': view(1), 'b': view(20), 'c': view(3)},
+        'properties': {'a': props(1), 'b': props(20), 'c': props(3)}})
+    assert rows_removed == [1]
+    assert model.keys == ['a', 'b', 'c']
+    assert model.rowCount() == 3
+    assert model.data(model.index(1, 3)) == '20'
+    assert sorted(browser.editor.var_properties) == ['a', 'b', 'c']
+
+    # Rows are kept sorted in descending order too
+    model.sort(0, order=Qt.DescendingOrder)
+    browser.process_remote_update({
+        'version': 3, 'full': False, 'removed': [],
+        'view': {'bb': view(5)}, 'properties': {'bb': props(5)}})
+    assert model.keys == ['c', 'bb', 'b', 'a']
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -7,12 +7,52 @@
 Tests for utils.py
 """
 
+# Standard library imports
+import time
+
 # Third party imports
+import numpy as np
+from pandas import DataFrame, Series
 import pytest
 
 # Local imports
 from spyder.config.base import get_supported_types
-from spyder.widgets.variableexplorer.utils import sort_against, is_supported
+from spyder.widgets.variableexplorer import utils
+from spyder.widgets.variableexplorer.utils import (
+    ARRAY_COLOR, CollectionsRepr, get_array_limits, get_color_name,
+    get_fingerprint, get_size, get_window, get_window_info, is_lazy_array,
+    is_memory_mapped, is_supported, is_windowed, make_remote_value,
+    MAX_WINDOWS, PREVIEW_PENDING, PreviewEngine, PreviewTimeout, RemoteArray,
+    RemoteDataFrame, RemoteValue, set_window_items, sort_against,
+    value_to_display, WINDOW_COLS, WINDOW_PENDING, WINDOW_ROWS)
+
+
+# --- Helpers
+# -----------------------------------------------------------------------------
+def fetch_from(value):
+    """Return a function to get windows of value as the kernel sends them"""
+    def fetch(rows, cols):
+        meta, buffer = get_window(value, rows, cols)
+        meta['buffer'] = buffer
+        return meta
+    return fetch
+
+
+class LazyArray(object):
+    """Array-like dataset that is only read when sliced"""
+
+    def __init__(self, data):
+        self.data = data
+        self.shape = data.shape
+        self.dtype = data.dtype
+        self.reads = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, key):
+        self.reads += 1
+        return self.data[key].copy()
 
 
 # --- Tests
@@ -45,5 +85,294 @@ def test_none_values_are_supported():
     assert is_supported(none_tuple, filters=tuple(supported_types[mode]))
 
 
+def test_get_fingerprint():
+    values = [1.5, 'spam', [1, 2], {'a': 1}, np.arange(100),
+              DataFrame({'a': [1.5, 2]}), Series([1, 2]), [np.zeros(3)]]
+    for value in values:
+        assert get_fingerprint(value) == get_fingerprint(value)
+
+    # In place changes of containers are detected
+    lst = list(range(100))
+    fingerprint = get_fingerprint(lst)
+    lst.append(3)
+    assert get_fingerprint(lst) != fingerprint
+    fingerprint = get_fingerprint(lst)
+    lst[0] = 'spam'
+    assert get_fingerprint(lst) != fingerprint
+
+    fingerprint = get_fingerprint(lst)
+    lst[53] = 'eggs'
+    assert get_fingerprint(lst) != fingerprint
+
+    dct = {'a': 1}
+    fingerprint = get_fingerprint(dct)
+    dct['a'] = 2
+    assert get_fingerprint(dct) != fingerprint
+    dct = {i: i for i in range(100)}
+    fingerprint = get_fingerprint(dct)
+    dct[99] = 'spam'
+    assert get_fingerprint(dct) != fingerprint
+
+    # Changes in nested containers too
+    nested = [[1, 2], {'a': [3]}]
+    fingerprint = get_fingerprint(nested)
+    nested[1]['a'].append(4)
+    assert get_fingerprint(nested) != fingerprint
+
+    # Values too large to be checked are always considered changed
+    lst = list(range(utils.FINGERPRINT_ITEMS + 1))
+    assert get_fingerprint(lst) != get_fingerprint(lst)
+
+    arr = np.zeros(1000)
+    fingerprint = get_fingerprint(arr)
+    arr[-1] = 1
+    assert get_fingerprint(arr) != fingerprint
+    fingerprint = get_fingerprint(arr)
+    arr[123] = 1
+    assert get_fingerprint(arr) != fingerprint
+
+    df = DataFrame({'a': [1.5, 2]})
+    fingerprint = get_fingerprint(df)
+    df.iloc[0, 0] = 3
+    assert get_fingerprint(df) != fingerprint
+
+    # Arrays and DataFrames in containers are checked like top-level ones
+    lst = [np.zeros(3), {'df': DataFrame({'a': [1.5, 2]})}]
+    fingerprint = get_fingerprint(lst)
+    lst[0][0] = 5
+    assert get_fingerprint(lst) != fingerprint
+    fingerprint = get_fingerprint(lst)
+    lst[1]['df'].iloc[1, 0] = 3
+    assert get_fingerprint(lst) != fingerprint
+
+
+def test_get_fingerprint_other_objects():
+    """Objects whose contents can't be checked are always changed."""
+    class Spam(object):
+        x = 1
+
+    spam = Spam()
+    for value in [spam, [spam], {'a': spam},
+                  np.array([spam, 1], dtype=object)]:
+        assert get_fingerprint(value) != get_fingerprint(value)
+
+
+def test_collections_repr():
+    # Same items as the standard repr, without sorting all of them
+    dct = dict((i, i) for i in range(1000, 0, -1))
+    assert CollectionsRepr.repr(dct) == ('{1: 1, 2: 2, 3: 3, 4: 4, 5: 5, '
+                                         '6: 6, 7: 7, 8: 8, 9: 9, 10: 10, '
+                                         '...}')
+    assert CollectionsRepr.repr(set(range(20))) == \
+        '{0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...}'
+    assert CollectionsRepr.repr({'a': 1, 2: 'b'}) in ("{'a': 1, 2: 'b'}",
+                                                      "{2: 'b', 'a': 1}")
+    assert CollectionsRepr.repr([np.arange(100)]) == \
+        '[array([ 0,  1..., 97, 98, 99])]'
+
+
+def test_array_repr():
+    threshold = np.get_printoptions()['threshold']
+    assert utils.array_repr(np.arange(100)) == \
+        'array([ 0,  1,  2, ..., 97, 98, 99])'
+    assert utils.array_repr(np.zeros((2, 2))) == \
+        'array([[0., 0.],\n       [0., 0.]])'
+    # Numpy print options are left untouched
+    assert np.get_printoptions()['threshold'] == threshold
+
+
+def test_value_to_display_deadline():
+    class Slow(object):
+        def __repr__(self):
+            time.sleep(0.02)
+            return 'slow'
+
+    value = [Slow() for i in range(5)]
+    with pytest.raises(PreviewTimeout):
+        value_to_display(value, deadline=time.time() + 0.03)
+    assert value_to_display(value) == '[slow, slow, slow, slow, slow]'
+
+
+def test_preview_engine():
+    engine = PreviewEngine(size_budget=100)
+    arr = np.arange(1000)
+    view = engine.get_view('arr', arr, minmax=True)
+    assert view['view'] == 'Min: ~0\nMax: ~999'
+    assert view['size'] == (1000,)
+    dct = dict((i, i) for i in range(1000))
+    assert engine.get_view('dct', dct)['view'] == PREVIEW_PENDING
+    assert engine.get_view('lst', list(range(1000)))['view'].startswith('[0')
+    assert engine.is_pending('arr') and engine.is_pending('dct')
+    assert not engine.is_pending('lst')
+
+    # Pending previews are computed until a deadline and cached
+    assert engine.has_pending()
+    assert engine.compute_pending(deadline=time.time() - 1) == {}
+    views = engine.compute_pending()
+    assert views['arr']['view'] == 'Min: 0\nMax: 999'
+    assert views['dct']['view'].startswith('{0: 0')
+    assert not engine.is_pending('arr')
+    assert not engine.has_pending()
+    assert engine.get_view('arr', arr, minmax=True) is views['arr']
+
+    # Changes of values are detected
+    arr[-1] = 1000
+    assert engine.get_view('arr', arr, minmax=True)['view'] == \
+        'Min: ~0\nMax: ~1000'
+
+    engine.prune(['lst'])
+    assert engine.get_view('dct', dct)['view'] == PREVIEW_PENDING
+
+
+def test_memory_mapped_array(tmpdir, monkeypatch):
+    path = str(tmpdir.join('spam.npy'))
+    np.save(path, np.arange(10**5, dtype=float).reshape(-1, 10))
+    arr = np.load(path, mmap_mode='r')
+    assert is_memory_mapped(arr)
+    assert is_memory_mapped(np.asarray(arr[10:]))
+    assert not is_memory_mapped(np.array(arr))
+
+    # Limits are estimated from chunks of the array
+    monkeypatch.setattr(utils, 'LIMITS_SAMPLE_SIZE', 1000)
+    assert get_array_limits(arr, sample=True) == (0, 10**5 - 1)
+    assert get_window_info(arr)['limits'] == (0, 10**5 - 1)
+    assert value_to_display(arr, minmax=True) == 'Min: ~0.0\nMax: ~99999.0'
+
+
+def test_lazy_array(monkeypatch):
+    monkeypatch.setattr(utils, 'LAZY_ARRAY_MODULES',
+                        (LazyArray.__module__.split('.')[0],))
+    monkeypatch.setattr(utils, 'LIMITS_SAMPLE_SIZE', 1000)
+    value = LazyArray(np.arange(10**5).reshape(-1, 10))
+    assert is_lazy_array(value)
+    assert not is_lazy_array(value.data)
+    assert is_windowed(value)
+    assert get_size(value) == (10**4, 10)
+    assert get_color_name(value) == ARRAY_COLOR
+
+    info = get_window_info(value)
+    assert info['shape'] == (10**4, 10)
+    assert info['limits'] == (0, 10**5 - 1)
+    assert info['readonly']
+    reads = value.reads
+    assert reads <= 17
+
+    # Only the window asked is read
+    remote = make_remote_value(info, fetch_from(value))
+    assert remote.readonly
+    assert remote[1000, 2] == 10002
+    assert value.reads == reads + 1
+
+
+def test_is_windowed():
+    assert not is_windowed(np.zeros(10))
+    assert is_windowed(np.zeros(10**6))
+    assert is_windowed(np.zeros((1000, 1000)))
+    assert not is_windowed(np.zeros((100, 100, 100)))
+    assert not is_windowed(np.zeros(10**6, dtype=object))
+    assert not is_windowed(np.ma.zeros(10**6))
+    assert is_windowed(DataFrame(np.zeros((10**6, 2))))
+    assert is_windowed(Series(np.zeros(10**6)))
+    assert not is_windowed(list(range(10**6)))
+
+
+def test_remote_array():
+    arr = np.arange(1000 * 1200, dtype=float).reshape(1000, 1200)
+    remote = make_remote_value(get_window_info(arr), fetch_from(arr))
+    assert isinstance(remote, RemoteArray)
+    assert remote.shape == (1000, 1200)
+    assert remote.dtype == arr.dtype
+    assert remote.get_limits() == (0, arr.size - 1)
+    assert remote[999, 1199] == arr[999, 1199]
+    assert remote[3, 4] == arr[3, 4]
+    np.testing.assert_array_equal(remote[10:600, 30:50], arr[10:600, 30:50])
+
+    # Only the last windows are kept
+    for row in range(0, 1000, WINDOW_ROWS):
+        for col in range(0, 1200, WINDOW_COLS):
+            assert remote[row, col] == arr[row, col]
+    assert len(remote._windows) == MAX_WINDOWS
+
+    # Edited items are kept apart and can be set in the original array
+    remote[3, 4] = -1
+    assert remote[3, 4] == -1
+    assert remote[0:5, 4][3, 0] == -1
+    set_window_items(arr, remote.changes)
+    assert arr[3, 4] == -1
+
+
+def test_remote_array_1d():
+    arr = np.arange(10**6)
+    remote = make_remote_value(get_window_info(arr), fetch_from(arr))
+    assert remote.shape == (10**6, 1)
+    assert remote[12345, 0] == 12345
+    remote[5, 0] = 7
+    set_window_items(arr, remote.changes)
+    assert arr[5] == 7
+
+
+def test_remote_value_lists():
+    rows = [[row * 100 + col for col in range(100)] for row in range(1000)]
+
+    def fetch(rows_range, cols_range):
+        items = [row[cols_range[0]:cols_range[1]]
+                 for row in rows[rows_range[0]:rows_range[1]]]
+        return {'rows': rows_range, 'cols': cols_range, 'items': items}
+
+    remote = RemoteValue({'shape': (1000, 100)}, fetch)
+    assert remote[600, 50] == 60050
+    remote[3, 4] = -1
+    assert remote[3, 4] == -1
+    assert remote[2:4, 4:6] == [[204, 205], [-1, 305]]
+
+
+def test_remote_value_requests():
+    arr = np.arange(10**6).reshape(-1, 100)
+    fetch = fetch_from(arr)
+    requests, loaded = [], []
+    remote = make_remote_value(get_window_info(arr), fetch,
+                               request=lambda *args: requests.append(args))
+    remote.window_loaded = lambda rows, cols: loaded.append((rows, cols))
+
+    # Windows are asked only once until they arrive
+    assert remote.get_item(600, 50, block=False) is WINDOW_PENDING
+    assert remote.get_item(601, 51, block=False) is WINDOW_PENDING
+    assert requests == [((500, 1000), (40, 80))]
+
+    remote.add_window(fetch(*requests[0]))
+    assert loaded == [((500, 1000), (40, 80))]
+    assert remote.get_item(601, 51, block=False) == arr[601, 51]
+
+
+def test_remote_dataframe():
+    df = DataFrame(np.arange(10**6).reshape(-1, 4), columns=list('abcd'),
+                   index=['r%d' % i for i in range(250000)])
+    remote = make_remote_value(get_window_info(df), fetch_from(df))
+    assert isinstance(remote, RemoteDataFrame)
+    assert remote.shape == (250000, 4)
+    assert remote.type_name == 'DataFrame'
+    assert remote.columns.tolist() == list('abcd')
+    assert remote.index.tolist()[1234] == 'r1234'
+    assert remote.index.tolist()[5:7] == ['r5', 'r6']
+    assert remote.iat[1234, 2] == df.iat[1234, 2]
+    assert remote.iloc[10:12, 1:3].equals(df.iloc[10:12, 1:3])
+
+    remote.iloc[1, 1] = -1
+    set_window_items(df, remote.changes)
+    assert df.iat[1, 1] == -1
+
+
+def test_remote_series():
+    series = Series(np.arange(10**6), name='spam')
+    remote = make_remote_value(get_window_info(series), fetch_from(series))
+    assert remote.shape == (10**6, 1)
+    assert remote.columns.tolist() == ['spam']
+    assert remote.type_name == 'Series'
+    assert remote.iat[999999, 0] == 999999
+    remote.iloc[3, 0] = -1
+    set_window_items(series, remote.changes)
+    assert series.iloc[3] == -1
+
+
 if __name__ == "__main__":
     pytest.main()
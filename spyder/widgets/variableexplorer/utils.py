@@ -10,7 +10,11 @@ Utilities for the Collections editor widget and dialog
 
 from __future__ import print_function
 
+from collections import OrderedDict
+import heapq
+from itertools import islice
 import re
+import time
 
 # Local imports
 from spyder.config.base import get_supported_types
@@ -47,7 +51,7 @@ class FakeObject(object):
 # Numpy arrays and numeric types support
 #==============================================================================
 try:
-    from numpy import (ndarray, array, matrix, recarray,
+    from numpy import (ndarray, array, matrix, recarray, memmap,
                        int64, int32, float64, float32,
                        complex64, complex128)
     from numpy.ma import MaskedArray
@@ -55,7 +59,8 @@ try:
     from numpy import get_printoptions, set_printoptions
 except ImportError:
     ndarray = array = matrix = recarray = MaskedArray = np_savetxt = \
-    int64 = int32 = float64 = float32 = complex64 = complex128 = FakeObject
+    int64 = int32 = float64 = float32 = complex64 = complex128 = \
+    memmap = FakeObject
 
 def get_numpy_dtype(obj):
     """Return NumPy data type associated to obj
@@ -77,6 +82,31 @@ def get_numpy_dtype(obj):
                 return
 
 
+#==============================================================================
+# Memory-mapped and lazy arrays support
+#==============================================================================
+# Modules of array-like datasets that are only read from disk when sliced
+# (e.g. h5py.Dataset). They are shown like arrays and always transferred
+# by windows
+LAZY_ARRAY_MODULES = ('h5py',)
+
+
+def is_lazy_array(value):
+    """Return True if value is an array-like dataset read when sliced"""
+    module = type(value).__module__.split('.')[0]
+    return (module in LAZY_ARRAY_MODULES and hasattr(value, 'shape') and
+            hasattr(value, 'dtype') and hasattr(value, '__getitem__'))
+
+
+def is_memory_mapped(value):
+    """Return True if value is a Numpy array backed by a memory map"""
+    while isinstance(value, ndarray) and ndarray is not FakeObject:
+        if isinstance(value, memmap):
+            return True
+        value = value.base
+    return False
+
+
 #==============================================================================
 # Pandas support
 #==============================================================================
@@ -127,7 +157,7 @@ def get_size(item):
     """Return size of an item of arbitrary type"""
     if isinstance(item, (list, tuple, dict)):
         return len(item)
-    elif isinstance(item, (ndarray, MaskedArray)):
+    elif isinstance(item, (ndarray, MaskedArray)) or is_lazy_array(item):
         return item.shape
     elif isinstance(item, Image):
         return item.size
@@ -153,11 +183,100 @@ def get_object_attrs(obj):
 # Set limits for the amount of elements in the repr of collections (lists,
 # dicts, tuples and sets) and Numpy arrays
 # =============================================================================
-CollectionsRepr = reprlib.Repr()
-CollectionsRepr.maxlist = 10
-CollectionsRepr.maxdict = 10
-CollectionsRepr.maxtuple = 10
-CollectionsRepr.maxset = 10
+def array_repr(value):
+    """Return the repr of a Numpy array, showing at most 10 elements"""
+    from numpy import array2string
+    if type(value) is ndarray:
+        prefix = 'array('
+    else:
+        prefix = type(value).__name__ + '('
+    try:
+        # Numpy print options are global, so they're left untouched
+        return prefix + array2string(value, separator=', ', prefix=prefix,
+                                     threshold=10) + ')'
+    except TypeError:
+        # Numpy < 1.14 doesn't accept a threshold here
+        threshold = get_printoptions().get('threshold')
+        set_printoptions(threshold=10)
+        try:
+            return repr(value)
+        finally:
+            set_printoptions(threshold=threshold)
+
+
+class PreviewTimeout(Exception):
+    """The preview of a value took longer than its time budget"""
+    pass
+
+
+class PreviewRepr(reprlib.Repr):
+    """
+    Repr of collections used to preview them
+
+    The items shown of dicts and sets are selected without sorting the
+    whole collection, and PreviewTimeout is raised if a *deadline*
+    (as given by time.time) is passed before the repr is complete.
+    """
+
+    def __init__(self, deadline=None):
+        reprlib.Repr.__init__(self)
+        self.maxlist = 10
+        self.maxdict = 10
+        self.maxtuple = 10
+        self.maxset = 10
+        self.deadline = deadline
+
+    def repr1(self, x, level):
+        if self.deadline is not None and time.time() > self.deadline:
+            raise PreviewTimeout
+        return reprlib.Repr.repr1(self, x, level)
+
+    def select(self, x, maxiter):
+        """Return the smallest maxiter items of x, in order if possible"""
+        try:
+            return heapq.nsmallest(maxiter, x)
+        except Exception:
+            return list(islice(x, maxiter))
+
+    def repr_dict(self, x, level):
+        if not x:
+            return '{}'
+        if level <= 0:
+            return '{...}'
+        newlevel = level - 1
+        pieces = []
+        for key in self.select(x, self.maxdict):
+            pieces.append('%s: %s' % (self.repr1(key, newlevel),
+                                      self.repr1(x[key], newlevel)))
+        if len(x) > self.maxdict:
+            pieces.append('...')
+        return '{%s}' % ', '.join(pieces)
+
+    def repr_set(self, x, level):
+        if PY2:
+            left, right = 'set([', '])'
+        elif not x:
+            return 'set()'
+        else:
+            left, right = '{', '}'
+        if level <= 0:
+            return left + '...' + right
+        pieces = [self.repr1(item, level - 1)
+                  for item in self.select(x, self.maxset)]
+        if len(x) > self.maxset:
+            pieces.append('...')
+        return left + ', '.join(pieces) + right
+
+    def repr_ndarray(self, x, level):
+        s = array_repr(x)
+        if len(s) > self.maxother:
+            i = max(0, (self.maxother - 3) // 2)
+            j = max(0, self.maxother - 3 - i)
+            s = s[:i] + '...' + s[len(s) - j:]
+        return s
+
+
+CollectionsRepr = PreviewRepr()
 
 
 #==============================================================================
@@ -207,6 +326,8 @@ UNSUPPORTED_COLOR = "#ffffff"
 
 def get_color_name(value):
     """Return color name depending on value type"""
+    if is_lazy_array(value):
+        return ARRAY_COLOR
     if not is_known_type(value):
         return CUSTOM_TYPE_COLOR
     for typ, name in list(COLORS.items()):
@@ -253,34 +374,43 @@ def unsorted_unique(lista):
 #==============================================================================
 # Display <--> Value
 #==============================================================================
-def value_to_display(value, minmax=False):
-    """Convert value for display purpose"""
-    # To save current Numpy threshold
-    np_threshold = FakeObject
+def value_to_display(value, minmax=False, deadline=None):
+    """
+    Convert value for display purpose
+
+    If a *deadline* is given, PreviewTimeout is raised when the repr of
+    a collection can't be completed before it.
+    """
     try:
         numeric_numpy_types = (int64, int32, float64, float32,
                                complex128, complex64)
-        if ndarray is not FakeObject:
-            # Save threshold
-            np_threshold = get_printoptions().get('threshold')
-            # Set max number of elements to show for Numpy arrays
-            # in our display
-            set_printoptions(threshold=10)
         if isinstance(value, recarray):
             fields = value.names
             display = 'Field names: ' + ', '.join(fields)
         elif isinstance(value, MaskedArray):
             display = 'Masked array'
         elif isinstance(value, ndarray):
-            if minmax:
+            if minmax and is_memory_mapped(value):
+                # Avoid reading the whole file
+                try:
+                    display = ('Min: ~%r\nMax: ~%r' %
+                               get_sampled_limits(value))
+                except (TypeError, ValueError):
+                    display = array_repr(value)
+            elif minmax:
                 try:
                     display = 'Min: %r\nMax: %r' % (value.min(), value.max())
                 except (TypeError, ValueError):
-                    display = repr(value)
+                    display = array_repr(value)
             else:
-                display = repr(value)
+                display = array_repr(value)
+        elif is_lazy_array(value):
+            display = repr(value)
         elif isinstance(value, (list, tuple, dict, set)):
-            display = CollectionsRepr.repr(value)
+            if deadline is None:
+                display = CollectionsRepr.repr(value)
+            else:
+                display = PreviewRepr(deadline).repr(value)
         elif isinstance(value, Image):
             display = '%s  Mode: %s' % (address(value), value.mode)
         elif isinstance(value, DataFrame):
@@ -321,6 +451,8 @@ def value_to_display(value, minmax=False):
             # display = repr(value)
             type_str = to_text_string(type(value))
             display = type_str[1:-1]
+    except PreviewTimeout:
+        raise
     except:
         type_str = to_text_string(type(value))
         display = type_str[1:-1]
@@ -330,10 +462,6 @@ def value_to_display(value, minmax=False):
     if len(display) > 80:
         display = display[:80].rstrip() + ' ...'
 
-    # Restore Numpy threshold
-    if np_threshold is not FakeObject:
-        set_printoptions(threshold=np_threshold)
-
     return display
 
 
@@ -410,7 +538,7 @@ def is_known_type(item):
 
 def get_human_readable_type(item):
     """Return human-readable type string of an item"""
-    if isinstance(item, (ndarray, MaskedArray)):
+    if isinstance(item, (ndarray, MaskedArray)) or is_lazy_array(item):
         return item.dtype.name
     elif isinstance(item, Image):
         return "Image"
@@ -495,7 +623,7 @@ def get_remote_data(data, settings, mode, more_excluded_names=None):
     assert mode in list(supported_types.keys())
     excluded_names = settings['excluded_names']
     if more_excluded_names is not None:
-        excluded_names += more_excluded_names
+        excluded_names = excluded_names + more_excluded_names
     return globalsfilter(data, check_all=settings['check_all'],
                          filters=tuple(supported_types[mode]),
                          exclude_private=settings['exclude_private'],
@@ -520,3 +648,632 @@ def make_remote_view(data, settings, more_excluded_names=None):
                        'color': get_color_name(value),
                        'view':  view}
     return remote
+
+
+# Containers with up to this number of items (counting the ones of nested
+# containers) and arrays and DataFrames with up to this number of elements
+# get fingerprints that cover all their contents. Larger values are always
+# considered changed
+FINGERPRINT_ITEMS = 10000
+FINGERPRINT_SIZE = 1e6
+
+
+class _FingerprintOverflow(Exception):
+    """A value is too large to get a fingerprint of all its contents"""
+    pass
+
+
+def _get_fingerprint(value, budget, seen):
+    """
+    Return the fingerprint of the contents of value.
+
+    *budget* is a list with the number of container items and of array
+    elements that can still be visited. _FingerprintOverflow is raised when
+    it runs out, or when value has a type whose contents can't be checked.
+    """
+    if isinstance(value, NUMERIC_TYPES) or value is None:
+        return repr(value)
+    elif isinstance(value, TEXT_TYPES) or is_binary_string(value):
+        return hash(value)
+    elif isinstance(value, (list, tuple, dict, set, frozenset)):
+        if isinstance(value, dict):
+            items = [item for pair in value.items() for item in pair]
+        else:
+            items = list(value)
+        budget[0] -= len(items)
+        if budget[0] < 0:
+            raise _FingerprintOverflow
+        seen.add(id(value))
+        fingerprint = [len(items)]
+        for item in items:
+            if id(item) in seen:
+                # Reference cycle
+                fingerprint.append(id(item))
+            else:
+                fingerprint.append((id(item), type(item),
+                                    _get_fingerprint(item, budget, seen)))
+        return tuple(fingerprint)
+    elif isinstance(value, ndarray) and ndarray is not FakeObject:
+        budget[1] -= value.size
+        if budget[1] < 0 or value.dtype.hasobject:
+            raise _FingerprintOverflow
+        return (value.shape, value.dtype.str, hash(value.tobytes()))
+    elif isinstance(value, (DataFrame, Series)) and \
+      DataFrame is not FakeObject:
+        budget[1] -= value.size
+        if budget[1] < 0:
+            raise _FingerprintOverflow
+        from pandas.util import hash_pandas_object
+        hashes = hash_pandas_object(value).values.tobytes()
+        columns = getattr(value, 'columns', [getattr(value, 'name', '')])
+        return (value.shape, repr(list(columns)), hash(hashes))
+    elif get_numpy_dtype(value) is not None:
+        # NumPy scalars
+        return value.tobytes()
+    else:
+        raise _FingerprintOverflow
+
+
+def get_fingerprint(value):
+    """
+    Return a fingerprint of value, to detect which variables changed
+    between two refreshes of the Variable Explorer.
+
+    It's made of the identity and type of value and of all its contents,
+    including the contents of nested containers, arrays and DataFrames, so
+    in-place changes are detected. For values too large to be checked
+    quickly (see FINGERPRINT_ITEMS and FINGERPRINT_SIZE), or containing
+    objects of other types, whose attributes can change without notice, it
+    never equals a previous fingerprint, so they are always considered
+    changed.
+    """
+    fingerprint = (id(value), type(value))
+    try:
+        return fingerprint + (_get_fingerprint(
+            value, [FINGERPRINT_ITEMS, FINGERPRINT_SIZE], set()),)
+    except Exception:
+        pass
+    # Never equal to any other fingerprint
+    return fingerprint + (object(),)
+
+
+#==============================================================================
+# Budgeted previews of variables
+#==============================================================================
+# Time (in seconds) and number of elements allowed to compute the preview
+# of a variable while refreshing the Variable Explorer. Previews over
+# budget are computed later (see PreviewEngine)
+PREVIEW_TIME_BUDGET = 0.05
+PREVIEW_SIZE_BUDGET = 1e6
+
+# Number of elements sampled to estimate the min and max of large arrays
+MINMAX_SAMPLE_SIZE = 1e4
+
+PREVIEW_PENDING = _("Computing...")
+
+
+def get_preview_cost(value, minmax=False):
+    """
+    Return the number of elements that have to be traversed to compute
+    the preview of value (see value_to_display)
+    """
+    try:
+        if isinstance(value, (dict, set)):
+            # To select the items shown
+            return len(value)
+        elif isinstance(value, (recarray, MaskedArray)):
+            return 0
+        elif (isinstance(value, ndarray) and minmax and
+                not is_memory_mapped(value)):
+            return value.size
+        elif isinstance(value, DataFrame):
+            return len(value.columns)
+    except Exception:
+        pass
+    return 0
+
+
+def get_sampled_limits(value, size=MINMAX_SAMPLE_SIZE):
+    """Return the min and max of a sample of the elements of an array"""
+    import numpy as np
+    indexes = np.linspace(0, value.size - 1,
+                          num=int(min(size, value.size)))
+    sample = value.flat[indexes.astype(np.intp)]
+    return sample.min(), sample.max()
+
+
+def get_preview_placeholder(value, minmax=False):
+    """Return what is shown while the preview of value is computed"""
+    if isinstance(value, ndarray) and minmax and value.size:
+        try:
+            return 'Min: ~%r\nMax: ~%r' % get_sampled_limits(value)
+        except (TypeError, ValueError):
+            pass
+    return PREVIEW_PENDING
+
+
+class PreviewEngine(object):
+    """
+    Compute the views of variables shown in the Variable Explorer
+    (see make_remote_view) within a time and size budget.
+
+    Previews over budget are replaced by a placeholder and left pending,
+    to be computed later with compute_pending. Like the rest of the views,
+    they have to be computed while no user code runs, since values could
+    be changing otherwise. Views are cached by name, object identity and
+    fingerprint, so they are not computed again while the variable
+    doesn't change.
+    """
+
+    def __init__(self, time_budget=PREVIEW_TIME_BUDGET,
+                 size_budget=PREVIEW_SIZE_BUDGET):
+        self.time_budget = time_budget
+        self.size_budget = size_budget
+        self._cache = {}
+        self._pending = {}
+
+    def get_view(self, name, value, minmax=False, fingerprint=None):
+        """Return the view of variable *name*, which could be pending"""
+        if fingerprint is None:
+            fingerprint = get_fingerprint(value)
+        key = (fingerprint, minmax)
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        display = None
+        if get_preview_cost(value, minmax) <= self.size_budget:
+            try:
+                display = value_to_display(
+                    value, minmax=minmax,
+                    deadline=time.time() + self.time_budget)
+            except PreviewTimeout:
+                pass
+        if display is None:
+            self._pending[name] = (key, value)
+            display = get_preview_placeholder(value, minmax)
+            return self._make_view(value, display)
+
+        view = self._make_view(value, display)
+        self._cache[name] = (key, view)
+        return view
+
+    def is_pending(self, name):
+        """Return if the preview of variable *name* is pending"""
+        return name in self._pending
+
+    def has_pending(self):
+        """Return if some previews are pending"""
+        return bool(self._pending)
+
+    def prune(self, names):
+        """Forget the views of variables that are not in *names*"""
+        for cache in (self._cache, self._pending):
+            for name in list(cache):
+                if name not in names:
+                    cache.pop(name, None)
+
+    def compute_pending(self, deadline=None):
+        """
+        Compute the pending views, without budget for each of them, until
+        *deadline* (as given by time.time) is passed
+        """
+        views = {}
+        while self._pending:
+            if deadline is not None and time.time() > deadline:
+                break
+            name, (key, value) = self._pending.popitem()
+            minmax = key[1]
+            try:
+                view = self._make_view(value,
+                                       value_to_display(value, minmax))
+            except Exception:
+                continue
+            self._cache[name] = (key, view)
+            views[name] = view
+        return views
+
+    def _make_view(self, value, display):
+        return {'type':  get_human_readable_type(value),
+                'size':  get_size(value),
+                'color': get_color_name(value),
+                'view':  display}
+
+
+#==============================================================================
+# Windowed transfer of large arrays and DataFrames
+#==============================================================================
+# Arrays and DataFrames with more elements than this are not transferred
+# whole to the Variable Explorer. Only the windows being shown are sent
+WINDOWED_SIZE = 5e5
+WINDOW_ROWS = 500
+WINDOW_COLS = 40
+
+# Maximum number of windows kept for each remote value
+MAX_WINDOWS = 16
+
+# Number of elements processed at once to compute color limits
+LIMITS_CHUNK_SIZE = 1e6
+
+# Number of elements of each of the chunks used to estimate the color
+# limits of arrays read from disk, and number of those chunks
+LIMITS_SAMPLE_SIZE = 1e5
+LIMITS_SAMPLE_CHUNKS = 16
+
+
+class _WindowPending(object):
+    """Marker returned for items whose window is still being transferred"""
+    def __repr__(self):
+        return 'WINDOW_PENDING'
+
+WINDOW_PENDING = _WindowPending()
+
+
+def is_windowed(value):
+    """Return True if value has to be transferred by windows"""
+    if isinstance(value, ndarray) and ndarray is not FakeObject:
+        return (not isinstance(value, MaskedArray) and value.ndim in (1, 2)
+                and value.dtype.names is None and not value.dtype.hasobject
+                and value.size > WINDOWED_SIZE)
+    elif isinstance(value, (DataFrame, Series)) and DataFrame is not FakeObject:
+        return value.size > WINDOWED_SIZE
+    elif is_lazy_array(value):
+        # They can't be transferred whole
+        return (len(value.shape) in (1, 2) and value.dtype.names is None
+                and not value.dtype.hasobject)
+    else:
+        return False
+
+
+def _sample_indexes(length, count=LIMITS_SAMPLE_CHUNKS):
+    """Return up to count + 1 indexes spread over a sequence"""
+    step = max(1, length // count)
+    indexes = list(range(0, length, step))[:count]
+    if length and indexes[-1] != length - 1:
+        indexes.append(length - 1)
+    return indexes
+
+
+def get_array_limits(value, sample=False):
+    """
+    Return the minimum and maximum of an array, as used by the Array
+    editor to color its cells, or None if they can't be computed.
+
+    The array is processed by chunks of rows to avoid copying it. If
+    *sample* is True, only a few chunks spread over the array are read,
+    which is what is done for arrays that live on disk.
+    """
+    import numpy as np
+    if value.dtype in (np.complex64, np.complex128):
+        color_func = np.abs
+    else:
+        color_func = np.real
+    nrows = max(len(value), 1)
+    size = int(np.prod(value.shape))
+    chunk_size = LIMITS_SAMPLE_SIZE if sample else LIMITS_CHUNK_SIZE
+    step = max(1, int(chunk_size // max(size // nrows, 1)))
+    starts = list(range(0, len(value), step))
+    if sample:
+        starts = [starts[i] for i in _sample_indexes(len(starts))]
+    vmins, vmaxs = [], []
+    try:
+        for start in starts:
+            chunk = color_func(value[start:start + step])
+            vmins.append(np.nanmin(chunk))
+            vmaxs.append(np.nanmax(chunk))
+        return np.nanmin(vmins), np.nanmax(vmaxs)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_window_info(value):
+    """
+    Return a dictionary describing a value transferred by windows.
+
+    Arrays are always described as two dimensional, so one dimensional
+    ones are shown as a single column.
+    """
+    if isinstance(value, ndarray) or is_lazy_array(value):
+        if len(value.shape) == 2:
+            shape = value.shape
+        else:
+            shape = (value.shape[0], 1)
+        on_disk = is_lazy_array(value) or is_memory_mapped(value)
+        return {'type': 'array',
+                'shape': shape,
+                'dtype': value.dtype.str,
+                'limits': get_array_limits(value, sample=on_disk),
+                'readonly': is_lazy_array(value)}
+    elif isinstance(value, Series):
+        name = value.name if value.name is not None else 0
+        return {'type': 'dataframe',
+                'shape': (value.shape[0], 1),
+                'columns': [name],
+                'type_name': value.__class__.__name__}
+    else:
+        return {'type': 'dataframe',
+                'shape': value.shape,
+                'columns': value.columns.tolist(),
+                'type_name': value.__class__.__name__}
+
+
+def get_window(value, rows, cols):
+    """
+    Return a window of a value transferred by windows.
+
+    *rows* and *cols* are (start, stop) tuples. This returns a dictionary
+    describing the window and, for arrays, a buffer with their raw data,
+    which is sent without being pickled.
+    """
+    start_row, stop_row = rows
+    start_col, stop_col = cols
+    if isinstance(value, ndarray) or is_lazy_array(value):
+        import numpy as np
+        if len(value.shape) == 1:
+            # Only the window is read for lazy arrays
+            window = np.asarray(value[start_row:stop_row]).reshape(-1, 1)
+            window = window[:, start_col:stop_col]
+        else:
+            window = value[start_row:stop_row, start_col:stop_col]
+        window = np.ascontiguousarray(window)
+        meta = {'rows': rows, 'cols': cols, 'dtype': window.dtype.str,
+                'shape': window.shape}
+        return meta, memoryview(window.reshape(-1).view('u1'))
+    else:
+        if isinstance(value, Series):
+            frame = value.iloc[start_row:stop_row].to_frame()
+        else:
+            frame = value.iloc[start_row:stop_row, start_col:stop_col]
+        return {'rows': rows, 'cols': cols, 'frame': frame}, None
+
+
+def set_window_items(value, items):
+    """Set the items {(row, column): item} edited in a windowed value"""
+    for (row, col), item in items.items():
+        if isinstance(value, ndarray):
+            if value.ndim == 1:
+                value[row] = item
+            else:
+                value[row, col] = item
+        elif isinstance(value, Series):
+            value.iloc[row] = item
+        else:
+            value.iloc[row, col] = item
+
+
+class RemoteValue(object):
+    """
+    Proxy to a large array or DataFrame living in a kernel.
+
+    Windows of WINDOW_ROWS x WINDOW_COLS items are asked with *request*
+    when they are shown and added with *add_window* when they arrive. The
+    last MAX_WINDOWS of them are kept. *fetch* is used instead when a
+    window is needed right away, or when *request* is not given.
+
+    Edited items are kept in *changes*, so they can be sent back to the
+    kernel without transferring the whole value.
+
+    Subclasses change how windows are stored by reimplementing
+    _make_window, _get_window_item and _set_window_item.
+    """
+
+    def __init__(self, info, fetch, request=None):
+        self.info = info
+        self.readonly = info.get('readonly', False)
+        self.shape = tuple(info['shape'])
+        self.ndim = 2
+        self.size = self.shape[0] * self.shape[1]
+        self.changes = {}
+        self.window_loaded = None
+        self._fetch = fetch
+        self._request = request
+        self._windows = OrderedDict()
+        self._pending = set()
+
+    def __len__(self):
+        return self.shape[0]
+
+    def get_window_key(self, row, col):
+        """Return the key of the window that contains an item"""
+        return (row // WINDOW_ROWS, col // WINDOW_COLS)
+
+    def get_window(self, row, col, block=True):
+        """
+        Return the window that contains an item, or None if it has been
+        requested but it's not available yet.
+        """
+        key = self.get_window_key(row, col)
+        window = self._windows.pop(key, None)
+        if window is not None:
+            self._windows[key] = window
+            return window
+        rows = (key[0] * WINDOW_ROWS,
+                min((key[0] + 1) * WINDOW_ROWS, self.shape[0]))
+        cols = (key[1] * WINDOW_COLS,
+                min((key[1] + 1) * WINDOW_COLS, self.shape[1]))
+        if block or self._request is None:
+            return self._store_window(key, self._fetch(rows, cols))
+        if key not in self._pending:
+            self._pending.add(key)
+            self._request(rows, cols)
+
+    def add_window(self, meta):
+        """Add a window requested before"""
+        rows, cols = meta['rows'], meta['cols']
+        key = self.get_window_key(rows[0], cols[0])
+        self._pending.discard(key)
+        if 'error' in meta:
+            return
+        self._store_window(key, meta)
+        if self.window_loaded is not None:
+            self.window_loaded(rows, cols)
+
+    def get_item(self, row, col, block=True):
+        """
+        Return an item, or WINDOW_PENDING if *block* is False and it's
+        not available yet.
+        """
+        if (row, col) in self.changes:
+            return self.changes[(row, col)]
+        window = self.get_window(row, col, block=block)
+        if window is None:
+            return WINDOW_PENDING
+        return self._get_window_item(window, row % WINDOW_ROWS,
+                                     col % WINDOW_COLS)
+
+    def get_slice(self, rows, cols):
+        """Return the values in a range of rows and columns"""
+        start_row, stop_row, _ = rows.indices(self.shape[0])
+        start_col, stop_col, _ = cols.indices(self.shape[1])
+        window = self._make_window(self._fetch((start_row, stop_row),
+                                               (start_col, stop_col)))
+        for (row, col), item in self.changes.items():
+            if start_row <= row < stop_row and start_col <= col < stop_col:
+                window = self._set_window_item(window, row - start_row,
+                                               col - start_col, item)
+        return window
+
+    def __getitem__(self, key):
+        rows, cols = key
+        if isinstance(rows, slice) or isinstance(cols, slice):
+            if not isinstance(rows, slice):
+                rows = slice(rows, rows + 1)
+            if not isinstance(cols, slice):
+                cols = slice(cols, cols + 1)
+            return self.get_slice(rows, cols)
+        return self.get_item(rows, cols)
+
+    def __setitem__(self, key, value):
+        self.changes[key] = value
+
+    def _store_window(self, key, meta):
+        """Save a window, forgetting the least recently used ones"""
+        window = self._make_window(meta)
+        self._windows[key] = window
+        while len(self._windows) > MAX_WINDOWS:
+            self._windows.popitem(last=False)
+        return window
+
+    def _make_window(self, meta):
+        """
+        Create a window from the data sent by the kernel.
+
+        By default, windows are lists of rows, sent as meta['items'].
+        """
+        return meta['items']
+
+    def _get_window_item(self, window, row, col):
+        """Return an item of a window"""
+        return window[row][col]
+
+    def _set_window_item(self, window, row, col, item):
+        """Set an item of a window and return the window"""
+        window[row][col] = item
+        return window
+
+
+class RemoteArray(RemoteValue):
+    """Proxy to a large NumPy array living in a kernel"""
+
+    def __init__(self, info, fetch, request=None):
+        RemoteValue.__init__(self, info, fetch, request=request)
+        import numpy as np
+        self.dtype = np.dtype(info['dtype'])
+
+    def get_limits(self):
+        """Return the minimum and maximum used to color the array"""
+        if self.info['limits'] is None:
+            raise ValueError("Color limits are not available")
+        return self.info['limits']
+
+    def _make_window(self, meta):
+        import numpy as np
+        window = np.frombuffer(meta['buffer'], dtype=meta['dtype'])
+        return window.reshape(meta['shape'])
+
+    def _get_window_item(self, window, row, col):
+        return window[row, col]
+
+    def _set_window_item(self, window, row, col, item):
+        if not window.flags.writeable:
+            window = window.copy()
+        window[row, col] = item
+        return window
+
+
+class RemoteIndex(object):
+    """Lazy list of the index labels of a RemoteDataFrame"""
+
+    def __init__(self, remote_frame):
+        self.remote_frame = remote_frame
+
+    def __len__(self):
+        return self.remote_frame.shape[0]
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            window = self.remote_frame.get_slice(row, slice(0, 0))
+            return window.index.tolist()
+        return self.remote_frame.get_label(row, block=False)
+
+    def tolist(self):
+        return self
+
+
+class _RemoteLocator(object):
+    """Positional indexer (iat/iloc) of a RemoteDataFrame"""
+
+    def __init__(self, remote_frame):
+        self.remote_frame = remote_frame
+
+    def __getitem__(self, key):
+        return self.remote_frame[key]
+
+    def __setitem__(self, key, value):
+        self.remote_frame[key] = value
+
+
+class _RemoteColumns(list):
+    """Column labels of a RemoteDataFrame"""
+
+    def tolist(self):
+        return list(self)
+
+
+class RemoteDataFrame(RemoteValue):
+    """Proxy to a large DataFrame or Series living in a kernel"""
+
+    def __init__(self, info, fetch, request=None):
+        RemoteValue.__init__(self, info, fetch, request=request)
+        self.type_name = info['type_name']
+        self.columns = _RemoteColumns(info['columns'])
+        self.index = RemoteIndex(self)
+        self.iat = self.iloc = _RemoteLocator(self)
+
+    def get_label(self, row, block=True):
+        """
+        Return the index label of a row, or WINDOW_PENDING if *block* is
+        False and it's not available yet.
+        """
+        window = self.get_window(row, 0, block=block)
+        if window is None:
+            return WINDOW_PENDING
+        return window.index[row % WINDOW_ROWS]
+
+    def _make_window(self, meta):
+        return meta['frame']
+
+    def _get_window_item(self, window, row, col):
+        return window.iat[row, col]
+
+    def _set_window_item(self, window, row, col, item):
+        window.iat[row, col] = item
+        return window
+
+
+def make_remote_value(info, fetch, request=None):
+    """Return a proxy to a value transferred by windows"""
+    if info['type'] == 'array':
+        return RemoteArray(info, fetch, request=request)
+    else:
+        return RemoteDataFrame(info, fetch, request=request)
@@ -6,11 +6,11 @@
 
 """I/O plugin for loading/saving HDF5 files
 
-Note that this is a fairly dumb implementation which reads the whole HDF5 file into
+Note that this is a fairly dumb implementation which reads the HDF5 file into
 Spyder's variable explorer.  Since HDF5 files are designed for storing very large
-data-sets, it may be much better to work directly with the HDF5 objects, thus keeping
-the data on disk.  Nonetheless, this plugin gives quick and dirty but convenient 
-access to HDF5 files.
+data-sets, datasets larger than LAZY_SIZE bytes are not read but kept as h5py
+datasets, with the file open for reading.  They are only read when sliced, and
+the Variable Explorer shows them by loading just the visible cells.
 
 There is no support for creating files with compression, chunking etc, although
 these can be read without problem.
@@ -36,14 +36,22 @@ try:
     import imp
     imp.find_module('h5py')
     import numpy as np
+
+    # Datasets larger than this (in bytes) are not read into memory
+    LAZY_SIZE = 2**28
     
-    def load_hdf5(filename):
+    def load_hdf5(filename, lazy_size=LAZY_SIZE):
         import h5py
+        lazy = []
         def get_group(group):
             contents = {}
             for name, obj in list(group.items()):
                 if isinstance(obj, h5py.Dataset):
-                    contents[name] = np.array(obj)
+                    if obj.size * obj.dtype.itemsize > lazy_size:
+                        contents[name] = obj
+                        lazy.append(name)
+                    else:
+                        contents[name] = np.array(obj)
                 elif isinstance(obj, h5py.Group):
                     # it is a group, so call self recursively
                     contents[name] = get_group(obj)
@@ -53,7 +61,10 @@ try:
         try:
             f = h5py.File(filename, 'r')
             contents = get_group(f)
-            f.close()
+            if not lazy:
+                # Otherwise the file is closed when its datasets are
+                # deleted
+                f.close()
             return contents, None
         except Exception as error:
             return None, str(error)